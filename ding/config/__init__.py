@@ -1,4 +1,4 @@
 from .config import Config, read_config, save_config, compile_config, compile_config_parallel, read_config_directly, \
-    read_config_with_system, save_config_py
+    read_config_with_system, save_config_py, get_compile_cache_key, FrozenConfig, freeze_config, unfreeze_config
 from .utils import parallel_transform, parallel_transform_slurm
 from .example import A2C, C51, DDPG, DQN, PG, PPOF, PPOOffPolicy, SAC, SQL, TD3
@@ -8,11 +8,19 @@ import time
 import tempfile
 import subprocess
 import datetime
+import hashlib
+import inspect
+import keyword
+import pickle
+from collections import OrderedDict
 from importlib import import_module
-from typing import Optional, Tuple
+from importlib.util import find_spec
+from typing import Any, List, Optional, Tuple
 from easydict import EasyDict
 from copy import deepcopy
+from ditk import logging
 
+import ding
 from ding.utils import deep_merge_dicts, get_rank
 from ding.envs import get_env_cls, get_env_manager_cls, BaseEnvManager
 from ding.policy import get_policy_cls
@@ -325,6 +333,263 @@ def save_project_state(exp_name: str) -> None:
             f.write(diff)
 
 
+class FrozenConfig(object):
+    """
+    Overview:
+        Read-only config for the hot-path reads. The keys of each (sub) config are the attribute slots of a \
+        ``FrozenConfig`` subclass (one class per key set), so reading ``cfg.policy.learn.batch_size`` is a chain of \
+        slot lookups, and the config can't be modified by mistake. The sub dicts are also frozen and the lists are \
+        converted to tuples. Use ``freeze_config`` to build it and ``unfreeze_config`` to get the ``EasyDict`` back.
+    Interfaces:
+        ``get``, ``keys``, ``values``, ``items``
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("can't set attribute '{}' of frozen config".format(name))
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("can't delete attribute '{}' of frozen config".format(name))
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in type(self).__slots__
+
+    def __iter__(self):
+        return iter(type(self).__slots__)
+
+    def __len__(self) -> int:
+        return len(type(self).__slots__)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in type(self).__slots__ else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return type(self).__slots__
+
+    def values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, k) for k in type(self).__slots__)
+
+    def items(self) -> Tuple[Tuple[str, Any], ...]:
+        return tuple((k, getattr(self, k)) for k in type(self).__slots__)
+
+    def __copy__(self) -> 'FrozenConfig':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'FrozenConfig':
+        return self
+
+    def __reduce__(self) -> Tuple:
+        # the subclasses are created dynamically, so it is pickled as a dict and frozen again when unpickled
+        return freeze_config, (unfreeze_config(self), )
+
+    def __repr__(self) -> str:
+        return 'FrozenConfig({})'.format(dict(self.items()))
+
+
+_FROZEN_CONFIG_RESERVED_KEYS = set(dir(FrozenConfig))
+_frozen_config_classes = {}
+
+
+def _freeze_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return freeze_config(value)
+    elif isinstance(value, (list, tuple)) and not hasattr(value, '_fields'):
+        return tuple(_freeze_value(v) for v in value)
+    return value
+
+
+def freeze_config(cfg: dict) -> FrozenConfig:
+    """
+    Overview:
+        Convert the (compiled) config into the read-only ``FrozenConfig`` .
+    Arguments:
+        - cfg (:obj:`dict`): The config, whose keys must be valid attribute names.
+    Returns:
+        - frozen_cfg (:obj:`FrozenConfig`): The frozen config.
+    Examples:
+        >>> cfg = freeze_config(compile_config(main_config, create_cfg=create_config, auto=True))
+        >>> batch_size = cfg.policy.learn.batch_size
+    """
+    keys = tuple(cfg.keys())
+    for k in keys:
+        if not isinstance(k, str) or not k.isidentifier() or k.startswith('__') or k in _FROZEN_CONFIG_RESERVED_KEYS:
+            raise ValueError("invalid key for frozen config: {}".format(k))
+    cls = _frozen_config_classes.get(keys)
+    if cls is None:
+        cls = type('FrozenConfig', (FrozenConfig, ), {'__slots__': keys})
+        _frozen_config_classes[keys] = cls
+    frozen_cfg = object.__new__(cls)
+    for k, v in cfg.items():
+        object.__setattr__(frozen_cfg, k, _freeze_value(v))
+    return frozen_cfg
+
+
+def unfreeze_config(cfg: FrozenConfig) -> EasyDict:
+    """
+    Overview:
+        Convert the ``FrozenConfig`` back to the mutable ``EasyDict`` config, the tuples are converted to lists.
+    Arguments:
+        - cfg (:obj:`FrozenConfig`): The frozen config.
+    Returns:
+        - cfg (:obj:`EasyDict`): The mutable config.
+    """
+
+    def _unfreeze(value: Any) -> Any:
+        if isinstance(value, FrozenConfig):
+            return {k: _unfreeze(v) for k, v in value.items()}
+        elif isinstance(value, tuple) and not hasattr(value, '_fields'):
+            return [_unfreeze(v) for v in value]
+        return value
+
+    return EasyDict(_unfreeze(cfg))
+
+
+class _UncacheableConfig(Exception):
+    pass
+
+
+def _fingerprint(obj: Any) -> Any:
+    # The json serializable content of config, the types are kept to distinguish e.g. 1 and 1.0, list and tuple.
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return obj
+    elif isinstance(obj, float):
+        return ['float', repr(obj)]
+    elif isinstance(obj, dict):
+        return ['dict', [[_fingerprint(k), _fingerprint(v)] for k, v in obj.items()]]
+    elif isinstance(obj, (list, tuple)):
+        return [type(obj).__name__, [_fingerprint(v) for v in obj]]
+    elif inspect.isclass(obj) or inspect.isfunction(obj) or inspect.isbuiltin(obj):
+        qualname = getattr(obj, '__qualname__', obj.__name__)
+        if '<' in qualname:
+            # lambda and local function can't be identified by name
+            raise _UncacheableConfig(qualname)
+        return ['object', obj.__module__, qualname]
+    else:
+        r = repr(obj)
+        if ' at 0x' in r:
+            # default repr, which can't identify the content of object
+            raise _UncacheableConfig(r)
+        return ['repr', type(obj).__qualname__, r]
+
+
+def _source_version(module_name: Optional[str]) -> Optional[float]:
+    module = sys.modules.get(module_name)
+    path = getattr(module, '__file__', None)
+    if path is None or not os.path.exists(path):
+        return None
+    return os.path.getmtime(path)
+
+
+# The sections of create config whose ``type`` is used to look up the class in ``compile_config`` (auto mode).
+_create_cfg_cls_getters = {
+    'env': get_env_cls,
+    'env_manager': get_env_manager_cls,
+    'policy': get_policy_cls,
+    'collector': get_serial_collector_cls,
+    'replay_buffer': get_buffer_cls,
+    'reward_model': get_reward_model_cls,
+    'world_model': get_world_model_cls,
+}
+
+
+def _create_cfg_classes(create_cfg: dict) -> List[type]:
+    # The classes looked up from the registry by ``create_cfg`` , whose default configs are merged in auto mode.
+    classes = []
+    for name, getter in _create_cfg_cls_getters.items():
+        section = create_cfg.get(name, None)
+        if isinstance(section, dict) and 'type' in section:
+            classes.append(getter(EasyDict(section)))
+    return classes
+
+
+def get_compile_cache_key(cfg: dict, create_cfg: Optional[dict] = None, **kwargs) -> Optional[str]:
+    """
+    Overview:
+        Get the cache key of ``compile_config`` , which is the sha256 hash of the input config content and the \
+        code version, i.e. DI-engine version and the modification time of the source files of the classes (and \
+        their base classes) whose default configs are merged, including the input classes and the classes looked \
+        up by ``type`` in ``create_cfg`` with ``auto=True`` , and the ``import_names`` modules in ``create_cfg`` .
+    Arguments:
+        - cfg (:obj:`dict`): The input config.
+        - create_cfg (:obj:`Optional[dict]`): The input create config.
+        - kwargs (:obj:`dict`): The other arguments of ``compile_config`` , such as ``policy`` and ``seed`` .
+    Returns:
+        - key (:obj:`Optional[str]`): The cache key, None if the config can't be identified by content, e.g. it \
+            contains lambda functions.
+    """
+    try:
+        content = _fingerprint([cfg, create_cfg, sorted(kwargs.items())])
+    except _UncacheableConfig:
+        return None
+    version = [ding.__version__, _source_version(__name__)]
+    classes = [v for v in kwargs.values() if inspect.isclass(v)]
+    if kwargs.get('auto', False) and create_cfg is not None:
+        classes += _create_cfg_classes(create_cfg)
+    for v in classes:
+        version += [[c.__module__, c.__qualname__, _source_version(c.__module__)] for c in inspect.getmro(v)]
+    if create_cfg is not None:
+        for section in create_cfg.values():
+            if not isinstance(section, dict):
+                continue
+            for name in section.get('import_names', []):
+                try:
+                    origin = find_spec(name).origin
+                except (ImportError, AttributeError, ValueError):
+                    origin = None
+                version.append([name, os.path.getmtime(origin) if origin and os.path.exists(origin) else None])
+    data = json.dumps([content, version], sort_keys=False)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+_COMPILE_CACHE_SIZE = 128
+_compile_cache = OrderedDict()
+
+
+def _load_compiled_config(key: str, cache_dir: Optional[str]) -> Optional[EasyDict]:
+    if key in _compile_cache:
+        _compile_cache.move_to_end(key)
+        return deepcopy(_compile_cache[key])
+    if cache_dir is None:
+        return None
+    path = os.path.join(cache_dir, '{}.pkl'.format(key))
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            cfg = pickle.load(f)
+    except Exception as e:
+        logging.warning('failed to load the compiled config {}: {}'.format(path, e))
+        return None
+    _save_compiled_config(key, cfg, None)
+    return cfg
+
+
+def _save_compiled_config(key: str, cfg: EasyDict, cache_dir: Optional[str]) -> None:
+    _compile_cache[key] = deepcopy(cfg)
+    if len(_compile_cache) > _COMPILE_CACHE_SIZE:
+        _compile_cache.popitem(last=False)
+    if cache_dir is None:
+        return
+    try:
+        data = pickle.dumps(cfg)
+    except Exception as e:
+        logging.warning('the compiled config can not be pickled into cache dir: {}'.format(e))
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, '{}.pkl'.format(key))
+    # write a temporary file and rename it, so that the concurrent readers always get a complete file
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
 def compile_config(
         cfg: EasyDict,
         env_manager: type = None,
@@ -342,6 +607,8 @@ def compile_config(
         save_cfg: bool = True,
         save_path: str = 'total_config.py',
         renew_dir: bool = True,
+        use_cache: bool = False,
+        cache_dir: Optional[str] = None,
 ) -> EasyDict:
     """
     Overview:
@@ -363,9 +630,79 @@ def compile_config(
         - save_cfg (:obj:`bool`): Save config or not
         - save_path (:obj:`str`): Path of saving file
         - renew_dir (:obj:`bool`): Whether to new a directory for saving config.
+        - use_cache (:obj:`bool`): Whether to reuse the compiled config of the same input config and code version \
+            (refer to ``get_compile_cache_key`` ) in this process, or in ``cache_dir`` shared by processes.
+        - cache_dir (:obj:`Optional[str]`): The directory of the compiled config files when ``use_cache`` is True, \
+            which is shared by the processes (e.g. the workers of a sweep or ``ding -m`` launches), defaults to \
+            the environment variable ``DI_CONFIG_CACHE_DIR`` . None means only caching in memory.
     Returns:
         - cfg (:obj:`EasyDict`): Config after compiling
+
+    .. note::
+        The code version in the cache key only includes DI-engine version and the source files of the classes \
+        whose default configs are merged and the ``import_names`` modules, so please clear ``cache_dir`` after \
+        modifying the other source files which the default configs depend on.
+
+    .. warning::
+        The cached config files are loaded by ``pickle`` , which can execute arbitrary code, so ``cache_dir`` \
+        must be a trusted directory that only you can write.
     """
+    key = None
+    if use_cache:
+        cache_dir = cache_dir or os.environ.get('DI_CONFIG_CACHE_DIR')
+        key = get_compile_cache_key(
+            cfg,
+            env_manager=env_manager,
+            policy=policy,
+            learner=learner,
+            collector=collector,
+            evaluator=evaluator,
+            buffer=buffer,
+            env=env,
+            reward_model=reward_model,
+            world_model=world_model,
+            seed=seed,
+            auto=auto,
+            create_cfg=create_cfg,
+        )
+    compiled_cfg = None if key is None else _load_compiled_config(key, cache_dir)
+    if compiled_cfg is None:
+        compiled_cfg = _compile_config(
+            cfg, env_manager, policy, learner, collector, evaluator, buffer, env, reward_model, world_model, seed, auto,
+            create_cfg
+        )
+        if key is not None:
+            _save_compiled_config(key, compiled_cfg, cache_dir)
+    cfg = compiled_cfg
+    if save_cfg and get_rank() == 0:
+        if os.path.exists(cfg.exp_name) and renew_dir:
+            cfg.exp_name += datetime.datetime.now().strftime("_%y%m%d_%H%M%S")
+        try:
+            os.makedirs(cfg.exp_name)
+        except FileExistsError:
+            pass
+        save_project_state(cfg.exp_name)
+        save_path = os.path.join(cfg.exp_name, save_path)
+        save_config(cfg, save_path, save_formatted=True)
+    return cfg
+
+
+def _compile_config(
+        cfg: EasyDict,
+        env_manager: type,
+        policy: type,
+        learner: type,
+        collector: type,
+        evaluator: type,
+        buffer: type,
+        env: type,
+        reward_model: type,
+        world_model: type,
+        seed: int,
+        auto: bool,
+        create_cfg: dict,
+) -> EasyDict:
+    # The compilation part of ``compile_config`` without side effect (e.g. saving config), which can be cached.
     cfg, create_cfg = deepcopy(cfg), deepcopy(create_cfg)
     if auto:
         assert create_cfg is not None
@@ -461,16 +798,6 @@ def compile_config(
         cfg.policy.eval.evaluator.n_episode = cfg.env.n_evaluator_episode
     if 'exp_name' not in cfg:
         cfg.exp_name = 'default_experiment'
-    if save_cfg and get_rank() == 0:
-        if os.path.exists(cfg.exp_name) and renew_dir:
-            cfg.exp_name += datetime.datetime.now().strftime("_%y%m%d_%H%M%S")
-        try:
-            os.makedirs(cfg.exp_name)
-        except FileExistsError:
-            pass
-        save_project_state(cfg.exp_name)
-        save_path = os.path.join(cfg.exp_name, save_path)
-        save_config(cfg, save_path, save_formatted=True)
     return cfg
 
 
@@ -0,0 +1,86 @@
+import pickle
+import pytest
+import tempfile
+import os
+from copy import deepcopy
+from easydict import EasyDict
+
+from ding.config import compile_config, get_compile_cache_key, FrozenConfig, freeze_config, unfreeze_config
+from ding.config.config import _compile_cache
+from dizoo.classic_control.cartpole.config.cartpole_dqn_config import main_config, create_config
+
+
+@pytest.mark.unittest
+def test_compile_config_cache():
+    cfg = compile_config(deepcopy(main_config), create_cfg=deepcopy(create_config), auto=True, save_cfg=False)
+    _compile_cache.clear()
+    cached_cfg1 = compile_config(main_config, create_cfg=create_config, auto=True, save_cfg=False, use_cache=True)
+    cached_cfg2 = compile_config(main_config, create_cfg=create_config, auto=True, save_cfg=False, use_cache=True)
+    assert cfg == cached_cfg1 == cached_cfg2
+    assert len(_compile_cache) == 1
+    # the returned configs are independent
+    cached_cfg1.policy.learn.batch_size = -1
+    assert cached_cfg2.policy.learn.batch_size == cfg.policy.learn.batch_size
+
+    # different seed or content means different key, and the lambda function can't be identified
+    key = get_compile_cache_key(main_config, create_cfg=create_config, seed=0, auto=True)
+    assert key == get_compile_cache_key(deepcopy(main_config), create_cfg=create_config, seed=0, auto=True)
+    assert key != get_compile_cache_key(main_config, create_cfg=create_config, seed=1, auto=True)
+    other_config = deepcopy(main_config)
+    other_config.policy.learn.learning_rate = 1
+    assert key != get_compile_cache_key(other_config, create_cfg=create_config, seed=0, auto=True)
+    other_config.policy.learn.learning_rate = lambda x: x
+    assert get_compile_cache_key(other_config, create_cfg=create_config, seed=0, auto=True) is None
+
+    # the compiled config is shared by processes through cache dir
+    with tempfile.TemporaryDirectory() as cache_dir:
+        _compile_cache.clear()
+        compile_config(
+            main_config, create_cfg=create_config, auto=True, save_cfg=False, use_cache=True, cache_dir=cache_dir
+        )
+        assert len(os.listdir(cache_dir)) == 1
+        _compile_cache.clear()
+        loaded_cfg = compile_config(
+            main_config, create_cfg=create_config, auto=True, save_cfg=False, use_cache=True, cache_dir=cache_dir
+        )
+        assert loaded_cfg == cfg
+
+
+@pytest.mark.unittest
+def test_compile_config_cache_version(monkeypatch):
+    # the source files of the classes looked up by ``type`` in create config are in the key of auto mode
+    key = get_compile_cache_key(main_config, create_cfg=create_config, seed=0, auto=True)
+    getmtime = os.path.getmtime
+    monkeypatch.setattr(
+        os.path, 'getmtime', lambda p: getmtime(p) + (1 if p.endswith(os.path.join('policy', 'dqn.py')) else 0)
+    )
+    assert key != get_compile_cache_key(main_config, create_cfg=create_config, seed=0, auto=True)
+
+    # the environment variable alone doesn't enable the cache
+    with tempfile.TemporaryDirectory() as cache_dir:
+        monkeypatch.setenv('DI_CONFIG_CACHE_DIR', cache_dir)
+        _compile_cache.clear()
+        compile_config(main_config, create_cfg=create_config, auto=True, save_cfg=False)
+        assert len(os.listdir(cache_dir)) == 0 and len(_compile_cache) == 0
+        compile_config(main_config, create_cfg=create_config, auto=True, save_cfg=False, use_cache=True)
+        assert len(os.listdir(cache_dir)) == 1
+
+
+@pytest.mark.unittest
+def test_frozen_config():
+    cfg = EasyDict(dict(policy=dict(cuda=False, learn=dict(batch_size=64)), env=dict(shape=[4, 84, 84])))
+    frozen_cfg = freeze_config(cfg)
+    assert isinstance(frozen_cfg, FrozenConfig) and isinstance(frozen_cfg.policy.learn, FrozenConfig)
+    assert frozen_cfg.policy.learn.batch_size == frozen_cfg['policy']['learn']['batch_size'] == 64
+    assert frozen_cfg.env.shape == (4, 84, 84)
+    assert 'policy' in frozen_cfg and len(frozen_cfg) == 2 and list(frozen_cfg) == ['policy', 'env']
+    assert frozen_cfg.policy.get('cuda') is False and frozen_cfg.policy.get('multi_gpu', True)
+    with pytest.raises(AttributeError):
+        frozen_cfg.policy.cuda = True
+    with pytest.raises(KeyError):
+        frozen_cfg['learner']
+    assert deepcopy(frozen_cfg) is frozen_cfg
+    assert unfreeze_config(frozen_cfg) == cfg
+    assert unfreeze_config(pickle.loads(pickle.dumps(frozen_cfg))) == cfg
+    with pytest.raises(ValueError):
+        freeze_config({'items': 1})
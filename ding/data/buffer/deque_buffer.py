@@ -48,6 +48,97 @@ class BufferIndex():
         self._cumlen = 0
 
 
+class GroupIndex():
+    """
+    Overview:
+        Incremental index of the buffered records grouped by a meta key (e.g. ``env`` or ``episode``). Each group \
+        keeps its records in the storage order, so that a sequence window is a list slice. The names of the groups \
+        which have at least ``min_len`` records are kept in pools (one for each queried ``min_len``, e.g. \
+        ``unroll_len``), which are updated on push and eviction, so that sampling groups doesn't scan the storage.
+    """
+
+    def __init__(self, key: str, storage: Iterable[BufferedData] = ()):
+        self.key = key
+        # group name -> [records, head offset], the records before head offset have been evicted
+        self._groups = {}
+        # min_len -> (group names, group name -> position in names)
+        self._pools = {}
+        for buffered in storage:
+            self.append(buffered)
+
+    def group_key(self, buffered: BufferedData) -> Any:
+        return buffered.meta[self.key] if self.key in buffered.meta else None
+
+    def count(self, group: Any) -> int:
+        records, head = self._groups[group]
+        return len(records) - head
+
+    def records(self, group: Any, start: int = 0, stop: Optional[int] = None) -> List[BufferedData]:
+        """
+        Overview:
+            Return the records ``[start, stop)`` of the group, the cost is proportional to the slice length.
+        """
+        records, head = self._groups[group]
+        stop = len(records) if stop is None else head + stop
+        return records[head + start:stop]
+
+    def group_names(self, min_len: int = 1) -> List[Any]:
+        """
+        Overview:
+            Return the names of the groups which have at least ``min_len`` records. The pool of ``min_len`` is \
+            built at the first query and then updated incrementally. The returned list must not be modified.
+        """
+        if min_len not in self._pools:
+            self._pools[min_len] = ([], {})
+            for group in self._groups:
+                if self.count(group) >= min_len:
+                    self._pool_add(min_len, group)
+        return self._pools[min_len][0]
+
+    def _pool_add(self, min_len: int, group: Any) -> None:
+        names, position = self._pools[min_len]
+        position[group] = len(names)
+        names.append(group)
+
+    def _pool_remove(self, min_len: int, group: Any) -> None:
+        names, position = self._pools[min_len]
+        i = position.pop(group)
+        last = names.pop()
+        if i < len(names):
+            names[i] = last
+            position[last] = i
+
+    def append(self, buffered: BufferedData) -> None:
+        group = self.group_key(buffered)
+        if group not in self._groups:
+            self._groups[group] = [[], 0]
+        self._groups[group][0].append(buffered)
+        count = self.count(group)
+        for min_len in self._pools:
+            if count == min_len:
+                self._pool_add(min_len, group)
+
+    def popleft(self, buffered: BufferedData) -> None:
+        """
+        Overview:
+            Remove the evicted record, which must be the oldest record in the storage (and in its group).
+        """
+        group = self.group_key(buffered)
+        count = self.count(group)
+        for min_len in self._pools:
+            if count == min_len:
+                self._pool_remove(min_len, group)
+        if count == 1:
+            del self._groups[group]
+            return
+        item = self._groups[group]
+        item[1] += 1
+        if item[1] * 2 > len(item[0]):
+            # amortized O(1) compaction
+            del item[0][:item[1]]
+            item[1] = 0
+
+
 class DequeBuffer(Buffer):
     """
     Overview:
@@ -68,6 +159,8 @@ class DequeBuffer(Buffer):
         self.sliced = sliced
         # Meta index is a dict which uses deque as values
         self.meta_index = {}
+        # Group index is a dict which uses GroupIndex as values, it is built at the first group sampling
+        self.group_index = {}
 
     @apply_middleware("push")
     def push(self, data: Any, meta: Optional[dict] = None) -> BufferedData:
@@ -185,6 +278,10 @@ class DequeBuffer(Buffer):
         if data is not None:
             item.data = data
         if meta is not None:
+            for key in list(self.group_index.keys()):
+                if self.group_index[key].group_key(item) != (meta[key] if key in meta else None):
+                    # the record changes its group, rebuild the group index at the next sampling
+                    del self.group_index[key]
             item.meta = meta
             for key in self.meta_index:
                 self.meta_index[key][i] = meta[key] if key in meta else None
@@ -212,6 +309,7 @@ class DequeBuffer(Buffer):
         remain_indices = [item.index for item in self.storage]
         key_value_pairs = zip(remain_indices, range(len(indices)))
         self.indices = BufferIndex(self.storage.maxlen, key_value_pairs)
+        self.group_index = {}
 
     def save_data(self, file_name: str):
         if not os.path.exists(os.path.dirname(file_name)):
@@ -228,6 +326,7 @@ class DequeBuffer(Buffer):
 
     def load_data(self, file_name: str):
         self.storage, self.indices, self.meta_index = hickle.load(file_name)
+        self.group_index = {}
 
     def count(self) -> int:
         """
@@ -252,13 +351,20 @@ class DequeBuffer(Buffer):
         self.storage.clear()
         self.indices.clear()
         self.meta_index = {}
+        self.group_index = {}
 
     def _push(self, data: Any, meta: Optional[dict] = None) -> BufferedData:
         index = uuid.uuid1().hex
         if meta is None:
             meta = {}
         buffered = BufferedData(data=data, index=index, meta=meta)
+        if len(self.group_index) > 0 and len(self.storage) == self.storage.maxlen:
+            # the oldest record will be evicted by deque
+            for group_index in self.group_index.values():
+                group_index.popleft(self.storage[0])
         self.storage.append(buffered)
+        for group_index in self.group_index.values():
+            group_index.append(buffered)
         self.indices.append(index)
         # Add meta index
         for key in self.meta_index:
@@ -310,9 +416,11 @@ class DequeBuffer(Buffer):
         Overview:
             Sampling by `group` instead of records, the result will be a collection
             of lists with a length of `size`, but the length of each list may be different from other lists.
+            When sampling from the whole storage, the incremental ``GroupIndex`` is used, so the cost is
+            proportional to the sampled records rather than the buffer size.
         """
-        if storage is None:
-            storage = self.storage
+        if storage is None or storage is self.storage:
+            return self._sample_by_group_index(size, groupby, replace, unroll_len, sliced)
         if groupby not in self.meta_index:
             self._create_index(groupby)
 
@@ -370,6 +478,54 @@ class DequeBuffer(Buffer):
 
         return final_sampled_data
 
+    def _sample_by_group_index(
+            self,
+            size: int,
+            groupby: str,
+            replace: bool,
+            unroll_len: Optional[int],
+            sliced: bool,
+    ) -> List[List[BufferedData]]:
+        if groupby not in self.group_index:
+            self.group_index[groupby] = GroupIndex(groupby, self.storage)
+        group_index = self.group_index[groupby]
+
+        if unroll_len and unroll_len > 1:
+            group_names = group_index.group_names(unroll_len)
+            if len(group_names) == 0:
+                return []
+        else:
+            group_names = group_index.group_names()
+
+        if replace:
+            sampled_groups = random.choices(group_names, k=size)
+        else:
+            try:
+                sampled_groups = random.sample(group_names, k=size)
+            except ValueError:
+                raise ValueError("There are less than {} groups in buffer({} groups)".format(size, len(group_names)))
+
+        final_sampled_data = []
+        for group in sampled_groups:
+            count = group_index.count(group)
+            # Filter records by unroll_len, the same as the slicing in ``_sample_by_group``
+            if unroll_len:
+                if sliced:
+                    start_indice = random.choice(range(max(1, count))) // unroll_len
+                    if start_indice == (count - 1) // unroll_len:
+                        seq_data = group_index.records(group, max(0, count - unroll_len), count)
+                    else:
+                        seq_data = group_index.records(
+                            group, start_indice * unroll_len, start_indice * unroll_len + unroll_len
+                        )
+                else:
+                    start_indice = random.choice(range(max(1, count - unroll_len)))
+                    seq_data = group_index.records(group, start_indice, min(count, start_indice + unroll_len))
+            else:
+                seq_data = group_index.records(group)
+            final_sampled_data.append(seq_data)
+        return final_sampled_data
+
     def _create_index(self, meta_key: str):
         self.meta_index[meta_key] = deque(maxlen=self.storage.maxlen)
         for data in self.storage:
@@ -382,5 +538,6 @@ class DequeBuffer(Buffer):
         buffer = type(self)(size=self.storage.maxlen)
         buffer.storage = self.storage
         buffer.meta_index = self.meta_index
+        buffer.group_index = self.group_index
         buffer.indices = self.indices
         return buffer
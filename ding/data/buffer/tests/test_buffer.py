@@ -7,6 +7,7 @@ import tempfile
 from typing import Callable
 from ding.data.buffer import DequeBuffer
 from ding.data.buffer.buffer import BufferedData
+from ding.data.buffer.deque_buffer import GroupIndex
 from torch.utils.data import DataLoader
 
 
@@ -350,3 +351,41 @@ def test_slice_unroll_len_in_group():
         assert isinstance(result, BufferedData), "Not continuous"
         # Ensure data after sliced start from correct index
         assert grouped_data[0].data in start_index
+
+
+@pytest.mark.unittest
+def test_group_index():
+    buffer = DequeBuffer(size=50)
+    for i in range(30):
+        buffer.push(i, {"env": i % 3})
+    sampled_data = buffer.sample(3, groupby="env", unroll_len=5)
+    assert len(sampled_data) == 3
+    group_index = buffer.group_index["env"]
+    # Push new data and evict the old ones, the group index is updated incrementally
+    for i in range(30, 200):
+        buffer.push(i, {"env": i % 7 if i < 150 else 100 + (i // 10)})
+        sampled_data = buffer.sample(1, groupby="env", unroll_len=5, replace=True)
+        for grouped_data in sampled_data:
+            assert len(grouped_data) == 5
+            assert len(set(map(lambda sample: sample.meta["env"], grouped_data))) == 1
+            assert all(a.data < b.data for a, b in zip(grouped_data[:-1], grouped_data[1:]))
+    assert buffer.group_index["env"] is group_index
+    rebuilt = GroupIndex("env", buffer.storage)
+    for min_len in [1, 5]:
+        assert sorted(group_index.group_names(min_len)) == sorted(rebuilt.group_names(min_len))
+    for group in rebuilt.group_names():
+        assert group_index.records(group) == rebuilt.records(group)
+        assert [item.data for item in group_index.records(group)] == \
+            [item.data for item in buffer.storage if item.meta["env"] == group]
+    # Groups with less than unroll_len records are filtered
+    assert sorted(group_index.group_names(10)) == [115, 116, 117, 118, 119]
+    assert len(group_index.group_names(11)) == 0
+
+    # Update meta without changing the group keeps the index, otherwise the index is rebuilt
+    first = buffer.storage[0]
+    buffer.update(first.index, meta={"env": first.meta["env"], "priority": 1.})
+    assert buffer.group_index["env"] is group_index
+    buffer.update(first.index, meta={"env": -1})
+    assert "env" not in buffer.group_index
+    sampled_data = buffer.sample(1, groupby="env", unroll_len=1, replace=True)
+    assert sorted(buffer.group_index["env"].group_names()) == [-1, 115, 116, 117, 118, 119]
@@ -95,7 +95,7 @@ def create_img_buffer(
     img_buffer_cfg.update(create_cfg.imagination_buffer)
     buffer_cls = get_buffer_cls(img_buffer_cfg)
     cfg.world_model.other.imagination_buffer.update(deep_merge_dicts(buffer_cls.default_config(), img_buffer_cfg))
-    if img_buffer_cfg.type == 'elastic':
+    if img_buffer_cfg.type in ['elastic', 'model_rollout']:
         img_buffer_cfg.set_buffer_size = world_model.buffer_size_scheduler
     img_buffer = create_buffer(cfg.world_model.other.imagination_buffer, tb_logger=tb_logger, exp_name=cfg.exp_name)
     return img_buffer
@@ -1,5 +1,25 @@
-from .env import *
-from .env_wrappers import *
-from .env_manager import *
-from .env_manager.ding_env_manager import setup_ding_env_manager
-from . import gym_env
+from ding.utils import ENV_MANAGER_REGISTRY, ENV_WRAPPER_REGISTRY
+from ding.utils.lazy_import_helper import lazy_import_attrs
+
+# Envs, env wrappers and env managers are imported lazily (PEP 562), the registry entries are resolved on the first
+# ``ENV_MANAGER_REGISTRY.get`` or ``ENV_WRAPPER_REGISTRY.get``.
+_submod_attrs = {
+    '.env': [
+        'BaseEnv', 'get_vec_env_setting', 'BaseEnvTimestep', 'get_env_cls', 'create_model_env', 'BaseVectorEnv',
+        'DingEnvWrapper', 'get_default_wrappers', 'check_space_dtype', 'check_array_space', 'check_reset', 'check_step',
+        'check_different_memory', 'check_obs_deepcopy', 'check_all', 'demonstrate_correct_procedure'
+    ],
+    '.env_manager': [
+        'BaseEnvManager', 'BaseEnvManagerV2', 'create_env_manager', 'get_env_manager_cls', 'AsyncSubprocessEnvManager',
+        'SyncSubprocessEnvManager', 'SubprocessEnvManagerV2', 'GymVectorEnvManager', 'VectorEnvManagerV2',
+        'EnvSupervisor'
+    ],
+    '.env_manager.ding_env_manager': ['setup_ding_env_manager'],
+    '.gym_env': [],
+}
+
+__getattr__, __dir__, __all__, _import_all = lazy_import_attrs(
+    __name__, _submod_attrs, star_submodules=['.env_wrappers']
+)
+ENV_MANAGER_REGISTRY.register_lazy_loader(_import_all)
+ENV_WRAPPER_REGISTRY.register_lazy_loader(_import_all)
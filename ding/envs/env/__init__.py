@@ -1,4 +1,5 @@
 from .base_env import BaseEnv, get_vec_env_setting, BaseEnvTimestep, get_env_cls, create_model_env
+from .base_vector_env import BaseVectorEnv
 from .ding_env_wrapper import DingEnvWrapper
 from .default_wrapper import get_default_wrappers
 from .env_implementation_check import check_space_dtype, check_array_space, check_reset, check_step, \
@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+import gym
+import numpy as np
+
+from .base_env import BaseEnvTimestep
+
+
+class BaseVectorEnv(ABC):
+    """
+    Overview:
+        Basic class of the batched environment, which simulates ``env_num`` instances of an environment with numpy \
+        arrays in one call, instead of stepping each instance respectively. It is designed for the environments \
+        without external engine (e.g. ``BitFlipEnv`` ), and used by ``VectorEnvManagerV2`` . The env which has a \
+        batched implementation provides it by the ``create_vector_env(env_num)`` method.
+    Interface:
+        ``__init__``, ``reset``, ``step``, ``seed``, ``close``
+    Property:
+        ``env_num``, ``observation_space``, ``action_space``, ``reward_space``
+    """
+
+    def __init__(self, env_num: int) -> None:
+        """
+        Overview:
+            Initialize the batched environment.
+        Arguments:
+            - env_num (:obj:`int`): The number of environment instances.
+        """
+        self._env_num = env_num
+        self._seed = None
+        self._dynamic_seed = True
+        self._rng = np.random.RandomState()
+
+    @property
+    def env_num(self) -> int:
+        return self._env_num
+
+    @abstractmethod
+    def reset(self, env_id: np.ndarray) -> np.ndarray:
+        """
+        Overview:
+            Reset the specified environment instances.
+        Arguments:
+            - env_id (:obj:`np.ndarray`): The ids of instances to be reset, shape :math:`(n, )` .
+        Returns:
+            - obs (:obj:`np.ndarray`): The stacked initial observations, shape :math:`(n, *)` .
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def step(self, env_id: np.ndarray, action: np.ndarray) -> BaseEnvTimestep:
+        """
+        Overview:
+            Run one timestep of the specified environment instances.
+        Arguments:
+            - env_id (:obj:`np.ndarray`): The ids of instances to be stepped, shape :math:`(n, )` .
+            - action (:obj:`np.ndarray`): The stacked actions of these instances, shape :math:`(n, *)` .
+        Returns:
+            - timestep (:obj:`BaseEnvTimestep`): The stacked timestep, in which ``obs`` , ``reward`` and ``done`` \
+                are arrays whose first dim is :math:`n` , and ``info`` is the list of info dict of each instance.
+        """
+        raise NotImplementedError
+
+    def seed(self, seed: List[int], dynamic_seed: Optional[bool] = True) -> None:
+        """
+        Overview:
+            Set the random seeds of all the instances.
+        Arguments:
+            - seed (:obj:`List[int]`): The seed of each instance.
+            - dynamic_seed (:obj:`Optional[bool]`): Whether to use different random states in different episodes. \
+                If False, each episode of an instance starts from the random state created by its own seed.
+        """
+        assert len(seed) == self._env_num, "len(seed) {:d} != env_num {:d}".format(len(seed), self._env_num)
+        self._seed = list(seed)
+        self._dynamic_seed = True if dynamic_seed is None else dynamic_seed
+        self._rng = np.random.RandomState(self._seed[0])
+
+    def close(self) -> None:
+        pass
+
+    def _sample(self, env_id: np.ndarray, sample_fn: Callable[[np.random.RandomState, int], np.ndarray]) -> np.ndarray:
+        """
+        Overview:
+            Sample the random initial states of the instances with ``sample_fn(rng, n)`` , which returns the \
+            stacked samples of ``n`` instances. The samples are drawn at once from the shared random state, unless \
+            ``dynamic_seed`` is False, in which case each instance uses the random state created by its own seed.
+        """
+        if self._seed is not None and not self._dynamic_seed:
+            return np.concatenate([sample_fn(np.random.RandomState(self._seed[i]), 1) for i in env_id], axis=0)
+        return sample_fn(self._rng, len(env_id))
+
+    @property
+    def observation_space(self) -> gym.spaces.Space:
+        return self._observation_space
+
+    @property
+    def action_space(self) -> gym.spaces.Space:
+        return self._action_space
+
+    @property
+    def reward_space(self) -> gym.spaces.Space:
+        return self._reward_space
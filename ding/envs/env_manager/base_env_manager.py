@@ -10,8 +10,9 @@ import enum
 import time
 import treetensor.numpy as tnp
 from ding.utils import ENV_MANAGER_REGISTRY, import_module, one_time_warning, make_key_as_identifier, WatchDog, \
-    remove_illegal_item
+    remove_illegal_item, deep_merge_dicts
 from ding.envs import BaseEnv, BaseEnvTimestep
+from .env_normalizer import EnvNormalizerMixin
 
 global space_log_flag
 space_log_flag = True
@@ -567,7 +568,7 @@ class BaseEnvManager(object):
 
 
 @ENV_MANAGER_REGISTRY.register('base_v2')
-class BaseEnvManagerV2(BaseEnvManager):
+class BaseEnvManagerV2(EnvNormalizerMixin, BaseEnvManager):
     """
     Overview:
         The basic class of env manager to manage multiple vectorized environments. BaseEnvManager define all the
@@ -583,12 +584,15 @@ class BaseEnvManagerV2(BaseEnvManager):
         (`system en link <../03_system/index.html>`_).
 
     Interfaces:
-        reset, step, seed, close, enable_save_replay, launch, default_config, reward_shaping, enable_save_figure
+        reset, step, seed, close, enable_save_replay, launch, default_config, reward_shaping, enable_save_figure, \
+        state_dict, load_state_dict
     Properties:
         env_num, env_ref, ready_obs, ready_obs_id, ready_imgs, done, closed, method_name_list, observation_space, \
-        action_space, reward_space
+        action_space, reward_space, normalizer
     """
 
+    config = deep_merge_dicts(BaseEnvManager.config, EnvNormalizerMixin.normalizer_config)
+
     @property
     def ready_obs(self) -> tnp.array:
         """
@@ -609,7 +613,10 @@ class BaseEnvManagerV2(BaseEnvManager):
         obs = [self._ready_obs[i] for i in active_env]
         if isinstance(obs[0], dict):  # transform each element to treenumpy array
             obs = [tnp.array(o) for o in obs]
-        return tnp.stack(obs)
+        obs = tnp.stack(obs)
+        if self._normalizer is not None:
+            obs = self._normalizer.normalize_obs(obs)
+        return obs
 
     def step(self, actions: List[tnp.ndarray]) -> List[tnp.ndarray]:
         """
@@ -633,6 +640,8 @@ class BaseEnvManagerV2(BaseEnvManager):
         """
         actions = {env_id: a for env_id, a in zip(self.ready_obs_id, actions)}
         timesteps = super().step(actions)
+        if self._normalizer is not None:
+            timesteps = self._normalizer.normalize_timesteps(timesteps)
         new_data = []
         for env_id, timestep in timesteps.items():
             obs, reward, done, info = timestep
@@ -0,0 +1,295 @@
+from typing import Any, Callable, Dict, List, Optional
+from easydict import EasyDict
+import numpy as np
+import torch
+
+from ding.envs.env import BaseEnvTimestep
+from ding.envs.env_wrappers.env_wrappers import RunningMeanStd
+
+
+class VecEnvNormalizer(object):
+    """
+    Overview:
+        Normalize the observation and reward of all the sub-environments in an env manager with one shared \
+        ``RunningMeanStd`` statistics. Unlike ``ObsNormWrapper`` and ``RewardNormWrapper`` , which keep their own \
+        statistics inside each env (subprocess) and update them one observation at a time, this normalizer updates \
+        the statistics once per env manager step from the whole batch of ready data (parallel batch merge of \
+        mean/var in ``RunningMeanStd.update``), and normalizes the batch with vectorized numpy operations.
+    Interfaces:
+        ``__init__``, ``update_obs``, ``normalize_obs``, ``update_and_normalize_reward``, ``normalize_timesteps``, \
+        ``reset``, ``state_dict``, ``load_state_dict``
+    Properties:
+        - obs_rms (:obj:`Optional[RunningMeanStd]`): The shared running statistics of observation.
+        - reward_rms (:obj:`Optional[RunningMeanStd]`): The shared running statistics of discounted return.
+        - update (:obj:`bool`): Whether to update the statistics with the new data.
+    """
+
+    def __init__(
+            self,
+            env_num: int,
+            obs_shape: Optional[tuple] = None,
+            obs_norm: bool = True,
+            reward_norm: bool = False,
+            reward_discount: float = 0.99,
+            clip_range: float = 3.,
+            warmup_count: int = 30,
+            update: bool = True,
+    ) -> None:
+        """
+        Overview:
+            Initialize the normalizer.
+        Arguments:
+            - env_num (:obj:`int`): The number of sub-environments.
+            - obs_shape (:obj:`Optional[tuple]`): The shape of a single observation.
+            - obs_norm (:obj:`bool`): Whether to normalize observation.
+            - reward_norm (:obj:`bool`): Whether to normalize reward by the running std of discounted return.
+            - reward_discount (:obj:`float`): The discount factor of return used in reward normalization.
+            - clip_range (:obj:`float`): The normalized observation is clipped into ``[-clip_range, clip_range]`` .
+            - warmup_count (:obj:`int`): The data is not normalized until more than ``warmup_count`` samples \
+                have been used to update the statistics, the same as the env wrappers.
+            - update (:obj:`bool`): Whether to update the statistics, set it to False for evaluation env manager, \
+                which usually loads the statistics from collector env manager with ``load_state_dict`` .
+        """
+        self._env_num = env_num
+        self._obs_norm = obs_norm
+        self._reward_norm = reward_norm
+        self._reward_discount = reward_discount
+        self._clip_range = clip_range
+        self._warmup_count = warmup_count
+        self._update = update
+        self.obs_rms = RunningMeanStd(shape=tuple(obs_shape)) if obs_norm else None
+        self.reward_rms = RunningMeanStd(shape=(1, )) if reward_norm else None
+        self._return = np.zeros((env_num, 1), dtype=np.float64)
+
+    @property
+    def update(self) -> bool:
+        return self._update
+
+    @update.setter
+    def update(self, _update: bool) -> None:
+        self._update = _update
+
+    def update_obs(self, obs: np.ndarray) -> None:
+        """
+        Overview:
+            Update the observation statistics with a batch of observations.
+        Arguments:
+            - obs (:obj:`np.ndarray`): The stacked observations, the shape is ``(B, *obs_shape)`` .
+        """
+        if self._obs_norm and self._update and len(obs) > 0:
+            self.obs_rms.update(obs)
+
+    def normalize_obs(self, obs: np.ndarray) -> np.ndarray:
+        """
+        Overview:
+            Normalize a batch of observations with the current statistics and clip the result.
+        Arguments:
+            - obs (:obj:`np.ndarray`): The stacked observations, the shape is ``(B, *obs_shape)`` .
+        Returns:
+            - normalized_obs (:obj:`np.ndarray`): The normalized observations with the same dtype of input.
+        """
+        if not self._obs_norm or self.obs_rms._count <= self._warmup_count:
+            return obs
+        normalized_obs = (obs - self.obs_rms.mean) / self.obs_rms.std
+        return np.clip(normalized_obs, -self._clip_range, self._clip_range).astype(obs.dtype)
+
+    def update_and_normalize_reward(self, env_id: List[int], reward: np.ndarray, done: np.ndarray) -> np.ndarray:
+        """
+        Overview:
+            Accumulate the discounted return of the given envs, update the return statistics with the whole batch, \
+            and scale the reward by the running std of return. The return of done envs is cleared.
+        Arguments:
+            - env_id (:obj:`List[int]`): The env ids of the batch.
+            - reward (:obj:`np.ndarray`): The stacked rewards, the shape is ``(B, 1)`` .
+            - done (:obj:`np.ndarray`): The stacked done flags, the shape is ``(B, )`` .
+        Returns:
+            - normalized_reward (:obj:`np.ndarray`): The normalized rewards with the same shape and dtype of input.
+        """
+        if not self._reward_norm or len(env_id) == 0:
+            return reward
+        env_id = np.asarray(env_id)
+        ret = self._return[env_id] * self._reward_discount + reward.reshape(len(env_id), 1)
+        if self._update:
+            self.reward_rms.update(ret)
+        self._return[env_id] = np.where(np.asarray(done).reshape(-1, 1), 0., ret)
+        if self.reward_rms._count <= self._warmup_count:
+            return reward
+        return (reward / self.reward_rms.std).astype(reward.dtype)
+
+    def normalize_timesteps(self, timesteps: Dict[int, BaseEnvTimestep]) -> Dict[int, BaseEnvTimestep]:
+        """
+        Overview:
+            Update the statistics with a batch of timesteps returned by env manager ``step`` and normalize their \
+            observations and rewards in one vectorized pass.
+        Arguments:
+            - timesteps (:obj:`Dict[int, BaseEnvTimestep]`): The timesteps, key is env_id.
+        Returns:
+            - timesteps (:obj:`Dict[int, BaseEnvTimestep]`): The normalized timesteps.
+        """
+        if len(timesteps) == 0:
+            return timesteps
+        env_id = list(timesteps.keys())
+        values = list(timesteps.values())
+        if self._obs_norm:
+            obs = np.stack([t.obs for t in values])
+            self.update_obs(obs)
+            obs = self.normalize_obs(obs)
+            values = [t._replace(obs=o) for t, o in zip(values, obs)]
+        if self._reward_norm:
+            reward = np.stack([np.asarray(t.reward).reshape(1) for t in values])
+            done = np.array([t.done for t in values])
+            reward = self.update_and_normalize_reward(env_id, reward, done)
+            values = [
+                t._replace(reward=r.reshape(np.shape(t.reward)).astype(np.asarray(t.reward).dtype))
+                for t, r in zip(values, reward)
+            ]
+        return {i: t for i, t in zip(env_id, values)}
+
+    def reset(self, env_id: Optional[List[int]] = None) -> None:
+        """
+        Overview:
+            Clear the accumulated discounted return of the given envs (all the envs if ``env_id`` is None).
+        Arguments:
+            - env_id (:obj:`Optional[List[int]]`): The env ids to be reset.
+        """
+        if env_id is None:
+            self._return[:] = 0.
+        else:
+            self._return[np.asarray(env_id)] = 0.
+
+    def state_dict(self) -> Dict[str, Any]:
+        """
+        Overview:
+            Return the statistics, which can be saved in the checkpoint together with the policy state_dict. The \
+            mean and var are saved as tensors, so that the checkpoint can be loaded by ``torch.load`` with \
+            ``weights_only=True`` .
+        Returns:
+            - state_dict (:obj:`Dict[str, Any]`): The statistics of observation and reward.
+        """
+        state_dict = {}
+        for name, rms in [('obs', self.obs_rms), ('reward', self.reward_rms)]:
+            if rms is not None:
+                state_dict[name] = {
+                    'mean': torch.from_numpy(rms._mean.copy()),
+                    'var': torch.from_numpy(rms._var.copy()),
+                    'count': float(rms._count)
+                }
+        return state_dict
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        """
+        Overview:
+            Load the statistics from the ``state_dict`` returned by ``state_dict`` method.
+        Arguments:
+            - state_dict (:obj:`Dict[str, Any]`): The statistics of observation and reward.
+        """
+        for name, rms in [('obs', self.obs_rms), ('reward', self.reward_rms)]:
+            if rms is not None and name in state_dict:
+                rms._mean = np.array(state_dict[name]['mean'], dtype=np.float64)
+                rms._var = np.array(state_dict[name]['var'], dtype=np.float64)
+                rms._count = state_dict[name]['count']
+
+
+def create_env_normalizer(cfg: dict, env_num: int, observation_space: Any) -> Optional[VecEnvNormalizer]:
+    """
+    Overview:
+        Create the ``VecEnvNormalizer`` according to env manager config, return None if neither ``obs_norm`` \
+        nor ``reward_norm`` is enabled.
+    Arguments:
+        - cfg (:obj:`dict`): The env manager config.
+        - env_num (:obj:`int`): The number of sub-environments.
+        - observation_space (:obj:`gym.spaces.Space`): The observation space of sub-environment.
+    Returns:
+        - normalizer (:obj:`Optional[VecEnvNormalizer]`): The created normalizer.
+    """
+    obs_norm, reward_norm = cfg.get('obs_norm', False), cfg.get('reward_norm', False)
+    if not (obs_norm or reward_norm):
+        return None
+    obs_shape = getattr(observation_space, 'shape', None)
+    if obs_norm:
+        assert obs_shape is not None, "obs_norm only supports array observation, but got: {}".format(observation_space)
+    return VecEnvNormalizer(
+        env_num,
+        obs_shape=obs_shape,
+        obs_norm=obs_norm,
+        reward_norm=reward_norm,
+        reward_discount=cfg.get('reward_norm_discount', 0.99),
+        clip_range=cfg.get('obs_norm_clip_range', 3.),
+        update=cfg.get('norm_update', True),
+    )
+
+
+class EnvNormalizerMixin(object):
+    """
+    Overview:
+        The mixin of ``V2`` env managers, which adds the optional centralized ``VecEnvNormalizer`` created from \
+        the ``normalizer_config`` in env manager config. The env manager normalizes its ``ready_obs`` and the \
+        returned timesteps of ``step`` with ``self._normalizer`` if it is not None.
+    Interfaces:
+        ``__init__``, ``reset``, ``state_dict``, ``load_state_dict``
+    Properties:
+        - normalizer (:obj:`Optional[VecEnvNormalizer]`): The normalizer, None if normalization is disabled.
+    """
+
+    normalizer_config = dict(
+        # (bool) Whether to normalize observation with the running statistics shared by all the sub-environments.
+        obs_norm=False,
+        # (float) The normalized observation is clipped into [-obs_norm_clip_range, obs_norm_clip_range].
+        obs_norm_clip_range=3.,
+        # (bool) Whether to normalize reward with the running std of discounted return shared by all the envs.
+        reward_norm=False,
+        # (float) The discount factor of return in reward normalization.
+        reward_norm_discount=0.99,
+        # (bool) Whether to update the normalization statistics, usually False for evaluation env manager.
+        norm_update=True,
+    )
+
+    def __init__(self, env_fn: List[Callable], cfg: EasyDict = EasyDict({})) -> None:
+        """
+        Overview:
+            Initialize the env manager, and the optional centralized normalizer of observation and reward, \
+            which updates the shared statistics from the whole batch of timesteps in each ``step`` .
+        Arguments:
+            - env_fn (:obj:`List[Callable]`): A list of functions to create ``env_num`` sub-environments.
+            - cfg (:obj:`EasyDict`): Final merged config.
+        """
+        super().__init__(env_fn, cfg)
+        self._normalizer = create_env_normalizer(self._cfg, self._env_num, self._observation_space)
+
+    def reset(self, reset_param: Optional[Dict] = None) -> None:
+        """
+        Overview:
+            Reset the sub-environments and clear their accumulated returns in normalizer.
+        Arguments:
+            - reset_param (:obj:`Optional[Dict]`): A dict of reset parameters for each environment, key is the \
+                env_id, value is the corresponding reset parameter, defaults to None.
+        """
+        super().reset(reset_param)
+        if self._normalizer is not None:
+            self._normalizer.reset(None if reset_param is None else list(reset_param.keys()))
+
+    def state_dict(self) -> Dict[str, Any]:
+        """
+        Overview:
+            Return the normalization statistics of env manager. ``CkptSaver`` saves it in the checkpoint under the \
+            key ``env_manager`` together with the policy state_dict when the collector env manager is passed to it.
+        Returns:
+            - state_dict (:obj:`Dict[str, Any]`): The state_dict, empty if normalization is disabled.
+        """
+        return {} if self._normalizer is None else {'normalizer': self._normalizer.state_dict()}
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        """
+        Overview:
+            Load the normalization statistics, e.g. ``ckpt['env_manager']`` when resuming the collector env \
+            manager from the checkpoint saved by ``CkptSaver`` , or the statistics of collector env manager, which \
+            ``interaction_evaluator`` loads into the evaluator env manager before each evaluation.
+        Arguments:
+            - state_dict (:obj:`Dict[str, Any]`): The state_dict returned by ``state_dict`` .
+        """
+        if self._normalizer is not None and 'normalizer' in state_dict:
+            self._normalizer.load_state_dict(state_dict['normalizer'])
+
+    @property
+    def normalizer(self) -> Optional[VecEnvNormalizer]:
+        return self._normalizer
@@ -18,8 +18,9 @@ from ding.data import ShmBufferContainer, ShmBuffer
 
 from ding.envs.env import BaseEnvTimestep
 from ding.utils import PropagatingThread, LockContextType, LockContext, ENV_MANAGER_REGISTRY, make_key_as_identifier, \
-    remove_illegal_item, CloudPickleWrapper
+    remove_illegal_item, CloudPickleWrapper, deep_merge_dicts
 from .base_env_manager import BaseEnvManager, EnvState, timeout_wrapper
+from .env_normalizer import EnvNormalizerMixin
 
 
 def is_abnormal_timestep(timestep: namedtuple) -> bool:
@@ -776,12 +777,16 @@ class SyncSubprocessEnvManager(AsyncSubprocessEnvManager):
 
 
 @ENV_MANAGER_REGISTRY.register('subprocess_v2')
-class SubprocessEnvManagerV2(SyncSubprocessEnvManager):
+class SubprocessEnvManagerV2(EnvNormalizerMixin, SyncSubprocessEnvManager):
     """
     Overview:
-        SyncSubprocessEnvManager for new task pipeline and interfaces coupled with treetensor.
+        SyncSubprocessEnvManager for new task pipeline and interfaces coupled with treetensor. The optional \
+        centralized normalizer updates the shared statistics of observation and reward from the whole batch of \
+        timesteps in the main process, rather than keeping separate statistics in each env subprocess.
     """
 
+    config = deep_merge_dicts(SyncSubprocessEnvManager.config, EnvNormalizerMixin.normalizer_config)
+
     @property
     def ready_obs(self) -> tnp.array:
         """
@@ -803,7 +808,10 @@ class SubprocessEnvManagerV2(SyncSubprocessEnvManager):
                 )
             time.sleep(0.001)
             sleep_count += 1
-        return tnp.stack([tnp.array(self._ready_obs[i]) for i in self.ready_env])
+        obs = tnp.stack([tnp.array(self._ready_obs[i]) for i in self.ready_env])
+        if self._normalizer is not None:
+            obs = self._normalizer.normalize_obs(obs)
+        return obs
 
     def step(self, actions: Union[List[tnp.ndarray], tnp.ndarray]) -> List[tnp.ndarray]:
         """
@@ -823,6 +831,8 @@ class SubprocessEnvManagerV2(SyncSubprocessEnvManager):
             split_action = actions
         actions = {env_id: a for env_id, a in zip(self.ready_obs_id, split_action)}
         timesteps = super().step(actions)
+        if self._normalizer is not None:
+            timesteps = self._normalizer.normalize_timesteps(timesteps)
         new_data = []
         for env_id, timestep in timesteps.items():
             obs, reward, done, info = timestep
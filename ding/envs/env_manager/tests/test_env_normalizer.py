@@ -0,0 +1,100 @@
+import pytest
+import numpy as np
+import gym
+
+from ding.utils import deep_merge_dicts
+from ding.envs.env.base_env import BaseEnvTimestep
+from ding.envs.env_manager.env_normalizer import VecEnvNormalizer, create_env_normalizer
+from ..base_env_manager import BaseEnvManagerV2
+from ..subprocess_env_manager import SubprocessEnvManagerV2
+
+
+@pytest.mark.unittest
+class TestVecEnvNormalizer:
+
+    def test_batch_statistics(self):
+        normalizer = VecEnvNormalizer(4, obs_shape=(3, ), obs_norm=True, warmup_count=0)
+        data = [np.random.randn(4, 3) * 2 + 1 for _ in range(50)]
+        for d in data:
+            normalizer.update_obs(d)
+        data = np.concatenate(data)
+        assert np.allclose(normalizer.obs_rms.mean, data.mean(0), atol=1e-3)
+        assert np.allclose(normalizer.obs_rms._var, data.var(0), atol=1e-2)
+        obs = normalizer.normalize_obs(data[:4].astype(np.float32))
+        assert obs.shape == (4, 3) and obs.dtype == np.float32
+        assert np.all(np.abs(obs) <= 3.)
+
+    def test_timesteps(self):
+        normalizer = VecEnvNormalizer(2, obs_shape=(3, ), obs_norm=True, reward_norm=True, warmup_count=0)
+        for i in range(10):
+            timesteps = {
+                env_id: BaseEnvTimestep(
+                    np.random.randn(3).astype(np.float32), np.array([1.], dtype=np.float32), i % 5 == 4, {}
+                )
+                for env_id in range(2)
+            }
+            timesteps = normalizer.normalize_timesteps(timesteps)
+            assert set(timesteps.keys()) == {0, 1}
+            assert timesteps[0].obs.shape == (3, ) and timesteps[0].reward.shape == (1, )
+            assert timesteps[0].reward.dtype == np.float32
+        # the return is cleared after done
+        assert np.all(normalizer._return == 0.)
+
+        state_dict = normalizer.state_dict()
+        new_normalizer = VecEnvNormalizer(2, obs_shape=(3, ), obs_norm=True, reward_norm=True, update=False)
+        new_normalizer.load_state_dict(state_dict)
+        assert np.allclose(new_normalizer.obs_rms.mean, normalizer.obs_rms.mean)
+        assert new_normalizer.reward_rms._count == normalizer.reward_rms._count
+        new_normalizer.update_obs(np.random.randn(2, 3))
+        assert new_normalizer.obs_rms._count == normalizer.obs_rms._count
+
+    def test_create(self):
+        space = gym.spaces.Box(low=-1, high=1, shape=(3, ))
+        assert create_env_normalizer({}, 2, space) is None
+        assert isinstance(create_env_normalizer({'obs_norm': True}, 2, space), VecEnvNormalizer)
+
+
+@pytest.mark.unittest
+def test_env_manager_normalizer(setup_fast_base_manager_cfg):
+    env_fn = setup_fast_base_manager_cfg.pop('env_fn')
+    setup_fast_base_manager_cfg.obs_norm = True
+    setup_fast_base_manager_cfg.reward_norm = True
+    env_manager = BaseEnvManagerV2(env_fn, setup_fast_base_manager_cfg)
+    env_manager.seed([314 for _ in range(env_manager.env_num)])
+    env_manager.launch()
+    while not env_manager.done:
+        obs = env_manager.ready_obs
+        assert obs.shape == (len(env_manager.ready_obs_id), 3)
+        action = [np.random.randn(1) for _ in env_manager.ready_obs_id]
+        timesteps = env_manager.step(action)
+        assert all([t.obs.shape == (3, ) for t in timesteps])
+    state_dict = env_manager.state_dict()
+    assert state_dict['normalizer']['obs']['count'] > 1
+    env_manager.close()
+
+    setup_fast_base_manager_cfg.norm_update = False
+    eval_env_manager = BaseEnvManagerV2(env_fn, setup_fast_base_manager_cfg)
+    assert not eval_env_manager.normalizer.update
+    eval_env_manager.load_state_dict(state_dict)
+    assert np.allclose(eval_env_manager.normalizer.obs_rms.mean, env_manager.normalizer.obs_rms.mean)
+    assert eval_env_manager.normalizer.reward_rms._count == env_manager.normalizer.reward_rms._count
+
+
+@pytest.mark.unittest
+def test_subprocess_env_manager_normalizer(setup_sync_manager_cfg):
+    env_fn = setup_sync_manager_cfg.pop('env_fn')
+    for fn in env_fn:
+        fn.keywords['cfg']['scale'] = 0.01
+    cfg = deep_merge_dicts(SubprocessEnvManagerV2.default_config(), setup_sync_manager_cfg)
+    cfg.obs_norm = True
+    env_manager = SubprocessEnvManagerV2(env_fn, cfg)
+    env_manager.seed([314 for _ in range(env_manager.env_num)])
+    env_manager.launch()
+    for _ in range(3):
+        obs = env_manager.ready_obs
+        assert obs.shape == (len(env_manager.ready_obs_id), 3)
+        env_manager.step([np.random.randn(1) for _ in env_manager.ready_obs_id])
+    state_dict = env_manager.state_dict()
+    assert state_dict['normalizer']['obs']['count'] > 1 and 'reward' not in state_dict['normalizer']
+    assert env_manager.normalizer.update
+    env_manager.close()
@@ -0,0 +1,95 @@
+import time
+import pytest
+import numpy as np
+from easydict import EasyDict
+
+from ding.envs import BaseEnvManagerV2
+from ..base_env_manager import EnvState
+from ..vector_env_manager import VectorEnvManagerV2
+from dizoo.bitflip.envs import BitFlipEnv
+
+
+def get_manager(manager_cls, env_num, n_bits=4, **kwargs):
+    env_cfg = EasyDict(n_bits=n_bits)
+    manager_cfg = manager_cls.default_config()
+    manager_cfg.update(kwargs)
+    return manager_cls([lambda: BitFlipEnv(env_cfg) for _ in range(env_num)], manager_cfg)
+
+
+@pytest.mark.unittest
+class TestVectorEnvManagerV2:
+
+    def test_naive(self):
+        env_num, n_bits = 8, 4
+        env_manager = get_manager(VectorEnvManagerV2, env_num, n_bits, episode_num=3)
+        env_manager.seed(314)
+        assert env_manager._closed
+        env_manager.launch()
+        assert not env_manager._closed
+        assert env_manager.ready_obs_id == list(range(env_num))
+        assert env_manager.ready_obs.shape == (env_num, 2 * n_bits)
+        episode_return = {i: [] for i in range(env_num)}
+        while not env_manager.done:
+            obs = env_manager.ready_obs
+            env_id = env_manager.ready_obs_id
+            assert obs.shape == (len(env_id), 2 * n_bits)
+            # flip the first different bit, so every episode is successful
+            action = [np.array([np.nonzero(o[:n_bits] != o[n_bits:])[0][0]]) for o in obs]
+            timesteps = env_manager.step(action)
+            assert [t.env_id for t in timesteps] == env_id
+            for t in timesteps:
+                assert t.obs.shape == (2 * n_bits, ) and t.reward.shape == (1, )
+                if t.done:
+                    episode_return[t.env_id].append(t.info.eval_episode_return)
+        assert all([r == [1., 1., 1.] for r in episode_return.values()])
+        assert (env_manager._env_episode_count == 3).all()
+        env_manager.close()
+        assert env_manager._closed
+        assert (env_manager._env_states == EnvState.VOID).all()
+
+    def test_reset(self):
+        env_manager = get_manager(VectorEnvManagerV2, 4, auto_reset=False)
+        env_manager.seed(0, dynamic_seed=False)
+        env_manager.launch()
+        obs = env_manager.ready_obs.copy()
+        while len(env_manager.ready_obs_id) > 0:
+            env_manager.step([np.array([0]) for _ in env_manager.ready_obs_id])
+        assert (env_manager._env_states == EnvState.NEED_RESET).all()
+        # the same initial observations without dynamic seed
+        env_manager.seed(0, dynamic_seed=False)
+        env_manager.reset({1: {}, 3: {}})
+        assert env_manager.ready_obs_id == [1, 3]
+        assert (env_manager.ready_obs == obs[[1, 3]]).all()
+        env_manager.close()
+
+
+@pytest.mark.benchmark
+def test_vector_env_manager_benchmark():
+    env_num, n_bits, step_num = 64, 16, 100
+
+    def run(env_manager):
+        env_manager.seed(0)
+        env_manager.launch()
+        start = time.time()
+        for _ in range(step_num):
+            env_manager.step([np.random.randint(0, n_bits, size=(1, )) for _ in env_manager.ready_obs_id])
+        duration = time.time() - start
+        env_manager.close()
+        return duration
+
+    t_base = run(get_manager(BaseEnvManagerV2, env_num, n_bits))
+    t_vector = run(get_manager(VectorEnvManagerV2, env_num, n_bits))
+    vector_env = BitFlipEnv(EasyDict(n_bits=n_bits)).create_vector_env(env_num)
+    env_id = np.arange(env_num)
+    vector_env.reset(env_id)
+    start = time.time()
+    for _ in range(step_num):
+        done = vector_env.step(env_id, np.random.randint(0, n_bits, size=(env_num, ))).done
+        vector_env.reset(env_id[done])
+    t_raw = time.time() - start
+    print(
+        'env steps per second, BaseEnvManagerV2: {:.0f}, VectorEnvManagerV2: {:.0f}, BitFlipVectorEnv: {:.0f}'.format(
+            env_num * step_num / t_base, env_num * step_num / t_vector, env_num * step_num / t_raw
+        )
+    )
+    assert t_vector < t_base
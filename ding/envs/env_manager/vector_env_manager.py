@@ -0,0 +1,170 @@
+from typing import Any, Callable, Dict, List, Optional, Union
+from easydict import EasyDict
+from ditk import logging
+import numpy as np
+import treetensor.numpy as tnp
+
+from ding.envs import BaseEnvTimestep
+from ding.utils import ENV_MANAGER_REGISTRY, make_key_as_identifier, remove_illegal_item
+from .base_env_manager import BaseEnvManagerV2, EnvState
+
+
+@ENV_MANAGER_REGISTRY.register('vector_v2')
+class VectorEnvManagerV2(BaseEnvManagerV2):
+    """
+    Overview:
+        The env manager for the environments with the batched implementation ``BaseVectorEnv`` , which is created \
+        by the ``create_vector_env(env_num)`` method of the env made by ``env_fn`` . All the sub-environments are \
+        stepped and reset in one call of the batched env, so there is neither the python loop over \
+        sub-environments nor the inter-process communication in ``SubprocessEnvManagerV2`` . The interfaces and \
+        the returned data are the same as ``BaseEnvManagerV2`` .
+    Interfaces:
+        reset, step, seed, close, launch, default_config, state_dict, load_state_dict
+    Properties:
+        env_num, env_ref, ready_obs, ready_obs_id, done, closed, method_name_list, observation_space, \
+        action_space, reward_space
+    """
+
+    def __init__(
+            self,
+            env_fn: List[Callable],
+            cfg: EasyDict = EasyDict({}),
+    ) -> None:
+        """
+        Overview:
+            Initialize the env manager, only the reference env is created by ``env_fn[0]`` , and the batched env \
+            is created in ``launch`` .
+        Arguments:
+            - env_fn (:obj:`List[Callable]`): A list of functions to create ``env_num`` sub-environments, only \
+                the length of it and the first function are used.
+            - cfg (:obj:`EasyDict`): Final merged config.
+        """
+        super().__init__(env_fn, cfg)
+        assert hasattr(self._env_ref, 'create_vector_env'), \
+            "env {} doesn't have batched implementation".format(type(self._env_ref))
+        self._vector_env = None
+        self._env_states = np.full(self._env_num, EnvState.VOID, dtype=np.int64)
+
+    def _create_state(self) -> None:
+        self._vector_env = self._env_ref.create_vector_env(self._env_num)
+        assert self._vector_env.env_num == self._env_num
+        self._envs = []
+        self._env_episode_count = np.zeros(self._env_num, dtype=np.int64)
+        self._ready_obs = None
+        self._env_states = np.full(self._env_num, EnvState.INIT, dtype=np.int64)
+        self._closed = False
+
+    def _reset_envs(self, env_id: np.ndarray) -> None:
+        if len(env_id) == 0:
+            return
+        self._env_states[env_id] = EnvState.RESET
+        obs = self._vector_env.reset(env_id)
+        if self._ready_obs is None:
+            self._ready_obs = np.zeros((self._env_num, ) + obs.shape[1:], dtype=obs.dtype)
+        self._ready_obs[env_id] = obs
+        self._env_states[env_id] = EnvState.RUN
+
+    def reset(self, reset_param: Optional[Dict] = None) -> None:
+        """
+        Overview:
+            Reset the sub-environments, the batched env doesn't support reset parameters, so each value of \
+            ``reset_param`` must be empty.
+        Arguments:
+            - reset_param (:obj:`Optional[Dict]`): A dict of reset parameters for each environment, key is the \
+                env_id, value is the corresponding reset parameter, defaults to None.
+        """
+        self._check_closed()
+        if reset_param is None:
+            env_id = np.arange(self._env_num)
+        else:
+            assert all(not p for p in reset_param.values()), "batched env doesn't support reset parameters"
+            env_id = np.array(sorted(reset_param.keys()), dtype=np.int64)
+        seed = list(self._env_seed.values()) if isinstance(self._env_seed, dict) else list(self._env_seed)
+        if any(s is not None for s in seed):
+            assert all(s is not None for s in seed), "please indicate all the seed of each env"
+            self._vector_env.seed(seed, self._env_dynamic_seed)
+            self._env_seed = {i: None for i in range(self._env_num)}  # seed only use once
+        self._reset_envs(env_id)
+        if self._normalizer is not None:
+            self._normalizer.reset(None if reset_param is None else env_id.tolist())
+
+    @property
+    def ready_obs_id(self) -> List[int]:
+        return np.nonzero(self._env_states == EnvState.RUN)[0].tolist()
+
+    @property
+    def ready_obs(self) -> tnp.array:
+        """
+        Overview:
+            Get the stacked observations of the running sub-environments.
+        Return:
+            - ready_obs (:obj:`tnp.array`): A stacked observation data.
+        """
+        obs = self._ready_obs[self._env_states == EnvState.RUN]
+        if self._normalizer is not None:
+            obs = self._normalizer.normalize_obs(obs)
+        return obs
+
+    @property
+    def done(self) -> bool:
+        return bool((self._env_states == EnvState.DONE).all())
+
+    def env_state_done(self, env_id: int) -> bool:
+        return self._env_states[env_id] == EnvState.DONE
+
+    def step(self, actions: Union[List[tnp.ndarray], np.ndarray]) -> List[tnp.ndarray]:
+        """
+        Overview:
+            Step all the running sub-environments with the batched env. The done sub-environments are reset \
+            together by default.
+        Arguments:
+            - actions (:obj:`Union[List[tnp.ndarray], np.ndarray]`): The actions of the running sub-environments, \
+                in the order of ``ready_obs_id`` .
+        Returns:
+            - timesteps (:obj:`List[tnp.ndarray]`): A list of timestep, the same as ``BaseEnvManagerV2`` .
+        """
+        self._check_closed()
+        env_id = np.nonzero(self._env_states == EnvState.RUN)[0]
+        actions = np.asarray(actions) if isinstance(actions, np.ndarray) else np.stack(actions)
+        assert len(actions) == len(env_id), "{} != {}".format(len(actions), len(env_id))
+        obs, reward, done, info = self._vector_env.step(env_id, actions)
+        done = np.asarray(done, dtype=bool)
+
+        not_done = env_id[~done]
+        self._ready_obs[not_done] = obs[~done]
+        done_id = env_id[done]
+        self._env_episode_count[done_id] += 1
+        finished = self._env_episode_count[done_id] >= self._episode_num
+        self._env_states[done_id[finished]] = EnvState.DONE
+        if self._auto_reset:
+            self._reset_envs(done_id[~finished])
+        else:
+            self._env_states[done_id[~finished]] = EnvState.NEED_RESET
+
+        if self._normalizer is not None:
+            timesteps = {i: BaseEnvTimestep(obs[k], reward[k], done[k], info[k]) for k, i in enumerate(env_id.tolist())}
+            timesteps = self._normalizer.normalize_timesteps(timesteps)
+            obs = np.stack([t.obs for t in timesteps.values()])
+            reward = np.stack([t.reward for t in timesteps.values()])
+        # creating one tree of the whole batch and indexing it is much faster than creating a tree for each timestep
+        batch = tnp.array({'obs': obs, 'reward': reward, 'done': done, 'env_id': env_id})
+        new_data = []
+        for k in range(len(env_id)):
+            timestep = batch[k]
+            timestep.info = tnp.array(remove_illegal_item(make_key_as_identifier(info[k])))
+            new_data.append(timestep)
+        return new_data
+
+    def enable_save_replay(self, replay_path: Union[List[str], str]) -> None:
+        logging.warning("{} doesn't support saving replay".format(type(self).__name__))
+
+    def close(self) -> None:
+        """
+        Overview:
+            Close the env manager and the batched env.
+        """
+        if self._closed:
+            return
+        self._vector_env.close()
+        self._env_states[:] = EnvState.VOID
+        self._closed = True
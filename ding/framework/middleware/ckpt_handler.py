@@ -1,10 +1,11 @@
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 from easydict import EasyDict
 import os
 import numpy as np
 
-from ding.utils import save_file
+from ding.utils import save_file, AsyncCheckpointWriter
 from ding.policy import Policy
+from ding.envs import BaseEnvManager
 from ding.framework import task
 
 if TYPE_CHECKING:
@@ -22,7 +23,17 @@ class CkptSaver:
             return task.void()
         return super(CkptSaver, cls).__new__(cls)
 
-    def __init__(self, policy: Policy, save_dir: str, train_freq: Optional[int] = None, save_finish: bool = True):
+    def __init__(
+        self,
+        policy: Policy,
+        save_dir: str,
+        train_freq: Optional[int] = None,
+        save_finish: bool = True,
+        async_save: bool = False,
+        max_to_keep: Optional[int] = None,
+        shard_num: int = 1,
+        env: Optional[BaseEnvManager] = None
+    ):
         """
         Overview:
             Initialize the `CkptSaver`.
@@ -31,8 +42,18 @@ class CkptSaver:
             - save_dir (:obj:`str`): The directory path to save ckpt.
             - train_freq (:obj:`int`): Number of training iterations between each saving checkpoint data.
             - save_finish (:obj:`bool`): Whether save final ckpt when ``task.finish = True``.
+            - async_save (:obj:`bool`): Whether to write ckpt in a background thread, then training only pauses \
+                for the in-memory snapshot of ckpt. Refer to ``AsyncCheckpointWriter`` for details.
+            - max_to_keep (:obj:`Optional[int]`): The number of the latest iteration ckpt to keep in async mode, \
+                None means keeping all.
+            - shard_num (:obj:`int`): The number of shard files of each ckpt written in parallel in async mode, \
+                the sharded ckpt should be loaded by ``ding.utils.load_checkpoint`` .
+            - env (:obj:`Optional[BaseEnvManager]`): The collector env manager whose ``state_dict`` (e.g. the \
+                statistics of ``obs_norm`` and ``reward_norm`` ) is saved under the key ``env_manager`` of ckpt, \
+                which can be restored by ``env.load_state_dict(ckpt['env_manager'])`` when resuming.
         """
         self.policy = policy
+        self.env = env
         self.train_freq = train_freq
         if str(os.path.basename(os.path.normpath(save_dir))) != "ckpt":
             self.prefix = '{}/ckpt'.format(os.path.normpath(save_dir))
@@ -43,6 +64,19 @@ class CkptSaver:
         self.last_save_iter = 0
         self.max_eval_value = -np.inf
         self.save_finish = save_finish
+        self._writer = AsyncCheckpointWriter(max_to_keep, shard_num) if async_save else None
+
+    def _state_dict(self) -> Dict[str, Any]:
+        state_dict = self.policy.learn_mode.state_dict()
+        if self.env is not None:
+            state_dict = {**state_dict, 'env_manager': self.env.state_dict()}
+        return state_dict
+
+    def _save(self, path: str, rotate: bool = False) -> None:
+        if self._writer is None:
+            save_file(path, self._state_dict())
+        else:
+            self._writer.save(path, self._state_dict(), rotate=rotate)
 
     def __call__(self, ctx: Union["OnlineRLContext", "OfflineRLContext"]) -> None:
         """
@@ -59,16 +93,16 @@ class CkptSaver:
         # train enough iteration
         if self.train_freq:
             if ctx.train_iter == 0 or ctx.train_iter - self.last_save_iter >= self.train_freq:
-                save_file(
-                    "{}/iteration_{}.pth.tar".format(self.prefix, ctx.train_iter), self.policy.learn_mode.state_dict()
-                )
+                self._save("{}/iteration_{}.pth.tar".format(self.prefix, ctx.train_iter), rotate=True)
                 self.last_save_iter = ctx.train_iter
 
         # best episode return so far
         if ctx.eval_value is not None and ctx.eval_value > self.max_eval_value:
-            save_file("{}/eval.pth.tar".format(self.prefix), self.policy.learn_mode.state_dict())
+            self._save("{}/eval.pth.tar".format(self.prefix))
             self.max_eval_value = ctx.eval_value
 
         # finish
         if task.finish and self.save_finish:
-            save_file("{}/final.pth.tar".format(self.prefix), self.policy.learn_mode.state_dict())
+            self._save("{}/final.pth.tar".format(self.prefix))
+            if self._writer is not None:
+                self._writer.wait()
@@ -273,6 +273,42 @@ def offline_data_fetcher(cfg: EasyDict, dataset: Dataset, collate_fn=lambda x: x
     return _fetch
 
 
+def offline_batch_fetcher(cfg: EasyDict, dataset: Dataset, seed: Optional[int] = None) -> Callable:
+    """
+    Overview:
+        The outer function builds an ``OfflineBatchSampler`` of the in-memory dataset (e.g. ``NaiveRLDataset``, \
+        ``D4RLDataset`` and ``HDF5Dataset``), which gathers each batch with one ``index_select`` per field into \
+        batched tensors (reusable pinned buffers for cuda). It is a faster replacement of ``offline_data_fetcher`` \
+        for the policies whose ``_forward_learn`` accepts the stacked batch, such as the policies using \
+        ``default_preprocess_learn`` (e.g. CQL, BCQ, EDAC and TD3BC).
+    Arguments:
+        - cfg (:obj:`EasyDict`): Config which should contain the following keys: `cfg.policy.learn.batch_size` \
+            and `cfg.policy.cuda`.
+        - dataset (:obj:`Dataset`): The in-memory dataset whose items are transition dicts.
+        - seed (:obj:`Optional[int]`): The seed of shuffle.
+    """
+    from ding.utils.data import OfflineBatchSampler
+    device = 'cuda:{}'.format(get_rank() % torch.cuda.device_count()) if cfg.policy.cuda else 'cpu'
+    sampler = OfflineBatchSampler(dataset, cfg.policy.learn.batch_size, device=device, seed=seed)
+
+    def _fetch(ctx: "OfflineRLContext"):
+        """
+        Overview:
+            Every time this function is called, a batch is sampled and assigned to ctx.train_data. \
+            The attribute `ctx.train_epoch` is incremented by 1 after each epoch of the dataset.
+        Input of ctx:
+            - train_epoch (:obj:`int`): Number of `train_epoch`.
+        Output of ctx:
+            - train_data (:obj:`Dict[str, Tensor]`): The fetched data batch.
+        """
+        epoch = sampler.epoch
+        ctx.train_data = sampler.sample()
+        ctx.train_epoch += sampler.epoch - epoch
+        ctx.trained_env_step += cfg.policy.learn.batch_size
+
+    return _fetch
+
+
 def offline_data_saver(data_path: str, data_type: str = 'hdf5') -> Callable:
     """
     Overview:
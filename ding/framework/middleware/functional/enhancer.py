@@ -48,7 +48,8 @@ def her_data_enhancer(cfg: EasyDict, buffer_: "Buffer", her_reward_model: "HerRe
     def _fetch_and_enhance(ctx: "OnlineRLContext"):
         """
         Output of ctx:
-            - train_data (:obj:`List[treetensor.torch.Tensor]`): The HER processed episodes.
+            - train_data (:obj:`Union[List[treetensor.torch.Tensor], Dict[str, torch.Tensor]]`): The HER processed \
+                episodes, which is a dict of batched tensors if ``her_reward_model.batch_relabel`` is True.
         """
         if her_reward_model.episode_size is None:
             size = cfg.policy.learn.batch_size
@@ -65,6 +66,9 @@ def her_data_enhancer(cfg: EasyDict, buffer_: "Buffer", her_reward_model: "HerRe
             ctx.train_data = None
             return
 
+        if her_reward_model.batch_relabel:
+            ctx.train_data = her_reward_model.estimate_batch(train_episode)
+            return
         her_episode = sum([her_reward_model.estimate(e) for e in train_episode], [])
         ctx.train_data = sum(her_episode, [])
 
@@ -211,7 +211,12 @@ class VectorEvalMonitor(object):
 
 
 def interaction_evaluator(
-        cfg: EasyDict, policy: Policy, env: BaseEnvManager, render: bool = False, **kwargs
+        cfg: EasyDict,
+        policy: Policy,
+        env: BaseEnvManager,
+        render: bool = False,
+        collector_env: Optional[BaseEnvManager] = None,
+        **kwargs
 ) -> Callable:
     """
     Overview:
@@ -221,12 +226,18 @@ def interaction_evaluator(
         - policy (:obj:`Policy`): The policy to be evaluated.
         - env (:obj:`BaseEnvManager`): The env for the evaluation.
         - render (:obj:`bool`): Whether to render env images and policy logits.
+        - collector_env (:obj:`Optional[BaseEnvManager]`): The collector env manager with observation/reward \
+            normalizer (i.e. ``obs_norm`` or ``reward_norm`` ). If given, its normalization statistics are loaded \
+            into ``env`` before each evaluation, and ``env`` doesn't update them with evaluation episodes.
         - kwargs: (:obj:`Any`): Other arguments for specific evaluation.
     """
     if task.router.is_active and not task.has_role(task.role.EVALUATOR):
         return task.void()
 
     env.seed(cfg.seed, dynamic_seed=False)
+    if collector_env is not None and getattr(env, 'normalizer', None) is not None:
+        # i.e. norm_update=False, the evaluation only uses the statistics of collector env
+        env.normalizer.update = False
 
     def _evaluate(ctx: Union["OnlineRLContext", "OfflineRLContext"]):
         """
@@ -254,6 +265,8 @@ def interaction_evaluator(
             env.launch()
         else:
             env.reset()
+        if collector_env is not None and getattr(env, 'normalizer', None) is not None:
+            env.load_state_dict(collector_env.state_dict())
         policy.reset()
         eval_monitor = VectorEvalMonitor(env.env_num, cfg.env.n_evaluator_episode)
 
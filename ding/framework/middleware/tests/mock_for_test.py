@@ -113,6 +113,7 @@ class MockHerRewardModel(Mock):
         super(MockHerRewardModel, self).__init__()
         self.episode_size = 8
         self.episode_element_size = 4
+        self.batch_relabel = False
 
     def estimate(self, episode: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         return [[episode[0] for _ in range(self.episode_element_size)]]
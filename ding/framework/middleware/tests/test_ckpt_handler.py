@@ -1,9 +1,11 @@
 import pytest
+import numpy as np
 
 from easydict import EasyDict
 from ding.framework import OnlineRLContext
 from ding.framework.middleware.ckpt_handler import CkptSaver
 
+import torch
 import torch.nn as nn
 import torch.optim as optim
 import os
@@ -12,6 +14,7 @@ import shutil
 from unittest.mock import Mock, patch
 from ding.framework import task
 from ding.policy.base_policy import Policy
+from ding.envs.env_manager.env_normalizer import VecEnvNormalizer
 
 
 class TheModelClass(nn.Module):
@@ -73,3 +76,48 @@ def test_ckpt_saver():
             ckpt_saver(ctx)
 
     shutil.rmtree(exp_name)
+
+
+@pytest.mark.unittest
+def test_ckpt_saver_async():
+    exp_name = 'test_ckpt_saver_async_exp'
+    ctx = OnlineRLContext()
+    model = nn.Linear(4, 2)
+    policy = MockPolicy(model)
+    with task.start():
+        ckpt_saver = CkptSaver(policy, exp_name, train_freq=1, async_save=True, max_to_keep=2)
+        for i in range(1, 5):
+            ctx.train_iter = i
+            ctx.eval_value = i
+            ckpt_saver(ctx)
+        task.finish = True
+        ckpt_saver(ctx)
+    prefix = '{}/ckpt'.format(exp_name)
+    assert sorted(os.listdir(prefix)) == ['eval.pth.tar', 'final.pth.tar', 'iteration_3.pth.tar', 'iteration_4.pth.tar']
+    state_dict = torch.load('{}/final.pth.tar'.format(prefix))
+    assert torch.equal(state_dict['weight'], model.weight)
+    shutil.rmtree(exp_name)
+
+
+@pytest.mark.unittest
+def test_ckpt_saver_env_manager():
+    exp_name = 'test_ckpt_saver_env_manager_exp'
+    ctx = OnlineRLContext()
+    model = nn.Linear(4, 2)
+    policy = MockPolicy(model)
+    normalizer = VecEnvNormalizer(2, obs_shape=(3, ), obs_norm=True, reward_norm=True)
+    normalizer.update_obs(np.random.randn(8, 3))
+    env = Mock()
+    env.state_dict = lambda: {'normalizer': normalizer.state_dict()}
+    with task.start():
+        ckpt_saver = CkptSaver(policy, exp_name, save_finish=True, env=env)
+        task.finish = True
+        ckpt_saver(ctx)
+    # the normalizer statistics can be restored from the ckpt loaded with ``weights_only=True``
+    state_dict = torch.load('{}/ckpt/final.pth.tar'.format(exp_name), weights_only=True)
+    assert torch.equal(state_dict['weight'], model.weight)
+    new_normalizer = VecEnvNormalizer(2, obs_shape=(3, ), obs_norm=True, reward_norm=True)
+    new_normalizer.load_state_dict(state_dict['env_manager']['normalizer'])
+    assert np.allclose(new_normalizer.obs_rms.mean, normalizer.obs_rms.mean)
+    assert new_normalizer.obs_rms._count == normalizer.obs_rms._count
+    shutil.rmtree(exp_name)
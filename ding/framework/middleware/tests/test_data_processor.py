@@ -5,7 +5,8 @@ from ding.data.buffer import DequeBuffer
 
 from ding.framework import Context, OnlineRLContext, OfflineRLContext
 from ding.framework.middleware.functional.data_processor import \
-    data_pusher, offpolicy_data_fetcher, offline_data_fetcher, offline_data_saver, sqil_data_pusher, buffer_saver
+    data_pusher, offpolicy_data_fetcher, offline_data_fetcher, offline_data_saver, sqil_data_pusher, buffer_saver, \
+    offline_batch_fetcher
 
 from ding.data.buffer.middleware import PriorityExperienceReplay
 
@@ -166,6 +167,35 @@ def test_offline_data_fetcher():
             break
 
 
+@pytest.mark.unittest
+def test_offline_batch_fetcher():
+    cfg = EasyDict({'policy': {'cuda': False, 'learn': {'batch_size': 5}}})
+    dataset_size = 10
+    data_list = [{'obs': torch.full((3, ), float(i)), 'reward': torch.tensor([float(i)])} for i in range(dataset_size)]
+
+    class MyDataset(Dataset):
+
+        def __getitem__(self, index):
+            return data_list[index]
+
+        def __len__(self):
+            return dataset_size
+
+    ctx = OfflineRLContext()
+    ctx.train_epoch = 0
+    fetch = offline_batch_fetcher(cfg, MyDataset(), seed=0)
+    for epoch in range(3):
+        data_tmp = []
+        for _ in range(2):
+            fetch(ctx)
+            assert ctx.train_epoch == epoch
+            assert ctx.train_data['obs'].shape == (5, 3) and ctx.train_data['reward'].shape == (5, 1)
+            assert (ctx.train_data['obs'][:, 0] == ctx.train_data['reward'][:, 0]).all()
+            data_tmp.extend(ctx.train_data['reward'][:, 0].tolist())
+        assert sorted(data_tmp) == list(range(dataset_size))
+    assert ctx.trained_env_step == 30
+
+
 @pytest.mark.unittest
 def test_offline_data_saver():
     transition = {}
@@ -5,6 +5,8 @@ from ding.data.buffer import DequeBuffer
 from typing import Any
 import numpy as np
 import copy
+from easydict import EasyDict
+from ding.reward_model import HerRewardModel
 from ding.framework.middleware.functional.enhancer import reward_estimator, her_data_enhancer
 from unittest.mock import Mock, patch
 from ding.framework.middleware.tests import MockHerRewardModel, CONFIG
@@ -63,3 +65,14 @@ def test_her_data_enhancer():
         her_data_enhancer(cfg=cfg, buffer_=buffer, her_reward_model=MockHerRewardModel())(ctx)
         assert len(ctx.train_data) == cfg.policy.learn.batch_size * mock_her_reward_model.episode_element_size
         assert len(ctx.train_data[0]) == 6
+
+    # batched relabeling
+    her_cfg = EasyDict(her_strategy='future', episode_size=8, sample_per_episode=4, batch_relabel=True)
+    her_reward_model = HerRewardModel(her_cfg)
+    buffer = DequeBuffer(her_reward_model.episode_size)
+    for d in train_data:
+        buffer.push(d)
+    her_data_enhancer(cfg=cfg, buffer_=buffer, her_reward_model=her_reward_model)(ctx)
+    assert isinstance(ctx.train_data, dict) and len(ctx.train_data) == 6
+    assert ctx.train_data['obs'].shape == (8 * 4, 10)
+    assert ctx.train_data['reward'].shape == (8 * 4, 1)
@@ -1,9 +1,11 @@
 import pytest
+import numpy as np
 import torch
 import copy
 from unittest.mock import patch
 from ding.framework import OnlineRLContext, task
 from ding.framework.middleware import interaction_evaluator
+from ding.envs.env_manager.env_normalizer import VecEnvNormalizer
 from ding.framework.middleware.tests import MockPolicy, MockEnv, CONFIG
 
 
@@ -25,3 +27,35 @@ def test_interaction_evaluator():
                 # so when interaction_evaluator runs the first time, reward is [[1, 2, 3], [2, 3]] and the avg = 2.2
                 # the second time, reward is [[4, 5, 6], [5, 6]] . . .
                 assert ctx.eval_value == 2.2 + i // 10 * 3.0
+
+
+class MockNormEnv(MockEnv):
+
+    def __init__(self) -> None:
+        super(MockNormEnv, self).__init__()
+        self.normalizer = VecEnvNormalizer(self.env_num, obs_shape=self.obs_dim, obs_norm=True)
+
+    def state_dict(self) -> dict:
+        return {'normalizer': self.normalizer.state_dict()}
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        self.normalizer.load_state_dict(state_dict['normalizer'])
+
+
+@pytest.mark.unittest
+def test_interaction_evaluator_normalizer():
+    cfg = copy.deepcopy(CONFIG)
+    ctx = OnlineRLContext()
+    with patch("ding.policy.Policy", MockPolicy), task.start():
+        policy = MockPolicy()
+        collector_env, env = MockNormEnv(), MockNormEnv()
+        evaluator = interaction_evaluator(cfg, policy, env, collector_env=collector_env)
+        # the evaluator env doesn't update the statistics with evaluation episodes
+        assert collector_env.normalizer.update and not env.normalizer.update
+        for i in range(2):
+            collector_env.normalizer.update_obs(np.random.randn(8, *env.obs_dim))
+            ctx.train_iter += 10
+            evaluator(ctx)
+            assert ctx.last_eval_iter == ctx.train_iter
+            assert np.allclose(env.normalizer.obs_rms.mean, collector_env.normalizer.obs_rms.mean)
+            assert env.normalizer.obs_rms._count == collector_env.normalizer.obs_rms._count
@@ -2,9 +2,14 @@
 # In forward mode
 # Wrapper in wrapper
 
+import json
+import shutil
+import time
 import pytest
+import torch
 from ding.framework import task
-from ding.framework.wrapper import StepTimer
+from ding.framework.wrapper import StepTimer, StepProfiler, estimate_bytes
+from ding.utils import DistributedWriter
 
 
 @pytest.mark.unittest
@@ -50,3 +55,55 @@ def test_step_timer():
         assert len(records) == 3
     for records in step_timer2.records.values():
         assert len(records) == 3
+
+
+@pytest.mark.unittest
+def test_step_profiler():
+
+    def step1(_):
+        time.sleep(0.01)
+
+    def step2(ctx):
+        time.sleep(0.002)
+        yield
+        task.emit('data', torch.zeros(10, 4))
+        time.sleep(0.001)
+
+    def step3(_):
+        with profiler.record('block', nbytes=8):
+            sum(range(1000))
+
+    trace_path = './test_step_profiler/trace.json'
+    profiler = StepProfiler(trace_path=trace_path)
+    with task.start():
+        profiler.profile_events()
+        task.use_wrapper(profiler)
+        task.use(step1)
+        task.use(step2)
+        task.use(step3)
+        task.run(3)
+        profiler.close()
+        assert 'emit' not in task.__dict__
+
+    summary = profiler.summary()
+    assert set(summary.keys()) == {'step1', 'step2', 'step2.backward', 'step3', 'block', 'event.data'}
+    for s in summary.values():
+        assert s['count'] == 3
+    assert summary['step1']['wall_ms_mean'] >= 10 and summary['step1']['cpu_ms_mean'] < 10
+    assert summary['step1']['wall_ms_p50'] <= summary['step1']['wall_ms_max']
+    assert summary['event.data']['bytes'] == 3 * 160
+    assert summary['block']['bytes'] == 3 * 8
+    assert 'step1' in profiler.table()
+
+    profiler.dump_chrome_trace()
+    with open(trace_path) as f:
+        events = json.load(f)['traceEvents']
+    assert len(events) == 18
+    assert {e['name'] for e in events} == set(summary.keys())
+
+    writer = DistributedWriter('./test_step_profiler/log')
+    profiler.export_tensorboard(writer, step=3)
+    writer.close()
+    shutil.rmtree('./test_step_profiler')
+
+    assert estimate_bytes({'a': [torch.zeros(4)] * 2000, 'b': b'123'}, max_items=100) == 2000 * 16 + 3
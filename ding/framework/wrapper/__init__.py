@@ -1 +1,2 @@
 from .step_timer import StepTimer
+from .step_profiler import StepProfiler, estimate_bytes
@@ -0,0 +1,353 @@
+from collections import deque, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from types import GeneratorType
+from typing import Any, Callable, Dict, Optional
+import json
+import math
+import os
+import threading
+import time
+import numpy as np
+import torch
+from tabulate import tabulate
+from ding.framework import task
+from ding.utils import DistributedWriter
+
+
+def estimate_bytes(data: Any, max_items: int = 1024) -> int:
+    """
+    Overview:
+        Estimate the bytes of tensors, arrays and bytes in data (e.g. the payload of an event) without \
+        serialization. Only the first ``max_items`` items of each container are visited and the rest are \
+        extrapolated, so that the overhead is bounded for long lists of transitions.
+    Arguments:
+        - data (:obj:`Any`): The data.
+        - max_items (:obj:`int`): The max number of visited items of each container.
+    Returns:
+        - nbytes (:obj:`int`): The estimated bytes.
+    """
+    if isinstance(data, torch.Tensor):
+        return data.numel() * data.element_size()
+    elif isinstance(data, np.ndarray):
+        return data.nbytes
+    elif isinstance(data, (bytes, bytearray, memoryview)):
+        return len(data)
+    elif isinstance(data, dict):
+        items = data.values()
+    elif isinstance(data, (list, tuple)):
+        items = data
+    else:
+        return 0
+    total, n = 0, 0
+    for item in items:
+        if n >= max_items:
+            return int(total * len(data) / n)
+        total += estimate_bytes(item, max_items)
+        n += 1
+    return total
+
+
+class _StepStat:
+    # The histogram of wall time uses log2 buckets of microsecond, the bucket i contains [2^(i-1), 2^i) us and the
+    # bucket 0 contains [0, 1) us, so recording is O(1) and the memory is fixed.
+    bucket_num = 32
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.wall_time = 0.
+        self.cpu_time = 0.
+        self.max_wall_time = 0.
+        self.nbytes = 0
+        self.histogram = [0 for _ in range(self.bucket_num)]
+
+    def add(self, wall_time: float, cpu_time: float = 0., nbytes: int = 0) -> None:
+        self.count += 1
+        self.wall_time += wall_time
+        self.cpu_time += cpu_time
+        self.max_wall_time = max(self.max_wall_time, wall_time)
+        self.nbytes += nbytes
+        us = wall_time * 1e6
+        bucket = math.frexp(us)[1] if us >= 1 else 0
+        self.histogram[min(bucket, self.bucket_num - 1)] += 1
+
+    def percentile(self, q: float) -> float:
+        # the upper bound (in seconds) of the bucket which contains the q-th percentile
+        threshold, cumsum = q / 100. * self.count, 0
+        for i, c in enumerate(self.histogram):
+            cumsum += c
+            if c > 0 and cumsum >= threshold:
+                return min(2 ** i * 1e-6, self.max_wall_time)
+        return self.max_wall_time
+
+
+class StepProfiler:
+    """
+    Overview:
+        The per-middleware profiler of task pipeline, which is used as a wrapper of task, i.e. \
+        ``task.use_wrapper(StepProfiler())`` . For each middleware, the wall time and CPU time (of the executing \
+        thread) of both the forward part (before ``yield`` ) and the backward part are recorded, together with the \
+        call count and a log-scale histogram of wall time. The events emitted by task (e.g. the context and model \
+        exchanged between nodes) can also be counted with their estimated bytes by ``profile_events`` , and any \
+        code block can be recorded by ``record`` . The statistics can be exported to TensorBoard by \
+        ``DistributedWriter`` , and the timeline can be dumped as a Chrome trace JSON file (open it in \
+        ``chrome://tracing`` or https://ui.perfetto.dev).
+    Interfaces:
+        ``__init__``, ``__call__``, ``record``, ``record_event``, ``profile_events``, ``summary``, ``table``, \
+        ``export_tensorboard``, ``dump_chrome_trace``, ``close``
+    Properties:
+        - stats (:obj:`Dict[str, _StepStat]`): The statistics of each middleware, code block and event.
+    """
+
+    def __init__(
+            self,
+            export_per_step: Optional[int] = None,
+            trace_path: Optional[str] = None,
+            max_trace_events: int = 100000,
+            tb_prefix: str = 'profiler'
+    ) -> None:
+        """
+        Overview:
+            Initialize the profiler.
+        Arguments:
+            - export_per_step (:obj:`Optional[int]`): Export the statistics to TensorBoard every N steps (by the \
+                root ``DistributedWriter`` ) and dump the Chrome trace file if ``trace_path`` is set, None means \
+                exporting manually.
+            - trace_path (:obj:`Optional[str]`): The path of Chrome trace JSON file, None means no trace events \
+                are recorded.
+            - max_trace_events (:obj:`int`): The max number of the latest trace events kept in memory.
+            - tb_prefix (:obj:`str`): The prefix of TensorBoard tags.
+        """
+        self._export_per_step = export_per_step
+        self._trace_path = trace_path
+        self._tb_prefix = tb_prefix
+        self._stats = defaultdict(_StepStat)
+        self._trace_events = deque(maxlen=max_trace_events) if trace_path is not None else None
+        self._lock = Lock()
+        self._start_time = time.perf_counter()
+        self._last_export_step = None
+        self._emit_task = None
+
+    @property
+    def stats(self) -> Dict[str, _StepStat]:
+        return self._stats
+
+    def _add(
+            self,
+            name: str,
+            start: float,
+            wall_time: float,
+            cpu_time: float = 0.,
+            nbytes: int = 0,
+            phase: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            self._stats[name].add(wall_time, cpu_time, nbytes)
+            if self._trace_events is not None:
+                event = {
+                    'name': name,
+                    'cat': phase or 'block',
+                    'ph': 'i' if phase == 'event' else 'X',
+                    'ts': (start - self._start_time) * 1e6,
+                    'dur': wall_time * 1e6,
+                    'pid': task.router.node_id or 0,
+                    'tid': threading.get_ident(),
+                    'args': {
+                        'cpu_ms': cpu_time * 1e3
+                    },
+                }
+                if nbytes:
+                    event['args']['bytes'] = nbytes
+                self._trace_events.append(event)
+
+    def __call__(self, fn: Callable) -> Callable:
+        step_name = getattr(fn, "__name__", type(fn).__name__)
+
+        @wraps(fn)
+        def executor(ctx):
+            start, cpu_start = time.perf_counter(), time.thread_time()
+            g = fn(ctx)
+            if isinstance(g, GeneratorType):
+                try:
+                    next(g)
+                    finished = False
+                except StopIteration:
+                    finished = True
+                self._add(
+                    step_name, start, time.perf_counter() - start, time.thread_time() - cpu_start, phase='forward'
+                )
+                if not finished:
+                    yield
+                    start, cpu_start = time.perf_counter(), time.thread_time()
+                    try:
+                        next(g)
+                    except StopIteration:
+                        pass
+                    self._add(
+                        step_name + '.backward',
+                        start,
+                        time.perf_counter() - start,
+                        time.thread_time() - cpu_start,
+                        phase='backward'
+                    )
+            else:
+                self._add(
+                    step_name, start, time.perf_counter() - start, time.thread_time() - cpu_start, phase='forward'
+                )
+            self._try_export(ctx)
+
+        return executor
+
+    def _try_export(self, ctx: Any) -> None:
+        if self._export_per_step is None:
+            return
+        step = getattr(ctx, 'total_step', 0)
+        if step % self._export_per_step != 0 or step == self._last_export_step:
+            return
+        self._last_export_step = step
+        self.export_tensorboard(step=step)
+        if self._trace_path is not None:
+            self.dump_chrome_trace()
+
+    @contextmanager
+    def record(self, name: str, nbytes: int = 0) -> None:
+        """
+        Overview:
+            Record the wall time and CPU time of a code block, e.g. ``ContextExchanger.merge`` .
+        Arguments:
+            - name (:obj:`str`): The name of code block.
+            - nbytes (:obj:`int`): The bytes moved in the code block.
+        Examples:
+            >>> with profiler.record('merge'):
+            >>>     ctx = merge(ctx)
+        """
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self._add(name, start, time.perf_counter() - start, time.thread_time() - cpu_start, nbytes)
+
+    def record_event(self, name: str, nbytes: int = 0) -> None:
+        """
+        Overview:
+            Record an instant event, such as the data sent to or received from other nodes.
+        Arguments:
+            - name (:obj:`str`): The name of event.
+            - nbytes (:obj:`int`): The bytes of event payload.
+        """
+        self._add(name, time.perf_counter(), 0., 0., nbytes, phase='event')
+
+    def profile_events(self, task_: Optional['Task'] = None) -> None:  # noqa
+        """
+        Overview:
+            Count the events emitted by task (named by ``event.{name}`` ) and their estimated payload bytes (refer \
+            to ``estimate_bytes`` ), until ``close`` is called.
+        Arguments:
+            - task_ (:obj:`Optional[Task]`): The task, default to the global task.
+        """
+        task_ = task_ or task
+        if self._emit_task is not None:
+            return
+        emit = task_.emit
+
+        @wraps(emit)
+        def _emit(event: str, *args, **kwargs):
+            self.record_event('event.' + event, estimate_bytes(args) + estimate_bytes(kwargs))
+            return emit(event, *args, **kwargs)
+
+        # shadow the bound method by the instance attribute
+        task_.emit = _emit
+        self._emit_task = task_
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Overview:
+            Get the statistics of each middleware, code block and event.
+        Returns:
+            - summary (:obj:`Dict[str, Dict[str, float]]`): The statistics, including ``count`` , ``wall_ms`` \
+                (total), ``wall_ms_mean`` , ``cpu_ms_mean`` , ``wall_ms_p50`` , ``wall_ms_p90`` , \
+                ``wall_ms_p99`` , ``wall_ms_max`` , ``bytes`` (total) and ``wall_ratio`` (the ratio to the total \
+                recorded wall time).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        total = sum(s.wall_time for s in stats.values()) or 1.
+        summary = {}
+        for name, s in stats.items():
+            summary[name] = {
+                'count': s.count,
+                'wall_ms': s.wall_time * 1e3,
+                'wall_ms_mean': s.wall_time / max(s.count, 1) * 1e3,
+                'cpu_ms_mean': s.cpu_time / max(s.count, 1) * 1e3,
+                'wall_ms_p50': s.percentile(50) * 1e3,
+                'wall_ms_p90': s.percentile(90) * 1e3,
+                'wall_ms_p99': s.percentile(99) * 1e3,
+                'wall_ms_max': s.max_wall_time * 1e3,
+                'bytes': s.nbytes,
+                'wall_ratio': s.wall_time / total,
+            }
+        return summary
+
+    def table(self) -> str:
+        """
+        Overview:
+            Get the summary as a table string, sorted by the total wall time.
+        """
+        summary = sorted(self.summary().items(), key=lambda x: x[1]['wall_ms'], reverse=True)
+        headers = ['Name', 'Count', 'Wall(ms)', 'Ratio', 'Mean(ms)', 'CPU Mean(ms)', 'P99(ms)', 'Bytes']
+        data = [
+            [
+                name, s['count'], '{:.2f}'.format(s['wall_ms']), '{:.1%}'.format(s['wall_ratio']),
+                '{:.3f}'.format(s['wall_ms_mean']), '{:.3f}'.format(s['cpu_ms_mean']),
+                '{:.3f}'.format(s['wall_ms_p99']), s['bytes']
+            ] for name, s in summary
+        ]
+        return tabulate(data, headers=headers, tablefmt='pipe')
+
+    def export_tensorboard(self, writer: Optional[DistributedWriter] = None, step: int = 0) -> None:
+        """
+        Overview:
+            Write the statistics to TensorBoard, the tags are ``{prefix}/{name}/{statistics}`` .
+        Arguments:
+            - writer (:obj:`Optional[DistributedWriter]`): The writer, default to the root ``DistributedWriter`` \
+                instance. If there is no writer, nothing is written.
+            - step (:obj:`int`): The global step.
+        """
+        writer = writer or DistributedWriter.get_instance()
+        if writer is None:
+            return
+        for name, s in self.summary().items():
+            for k in ['count', 'wall_ms_mean', 'cpu_ms_mean', 'wall_ms_p99', 'wall_ratio', 'bytes']:
+                writer.add_scalar('{}/{}/{}'.format(self._tb_prefix, name, k), s[k], step)
+
+    def dump_chrome_trace(self, path: Optional[str] = None) -> None:
+        """
+        Overview:
+            Dump the recorded trace events to a Chrome trace JSON file.
+        Arguments:
+            - path (:obj:`Optional[str]`): The file path, default to ``trace_path`` .
+        """
+        path = path or self._trace_path
+        assert path is not None and self._trace_events is not None, 'trace_path should be set to record trace events'
+        with self._lock:
+            events = list(self._trace_events)
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        """
+        Overview:
+            Stop profiling the events of task.
+        """
+        if self._emit_task is not None:
+            try:
+                del self._emit_task.emit
+            except AttributeError:
+                pass
+            self._emit_task = None
@@ -3,4 +3,5 @@ from .one_vs_one_league import OneVsOneLeague
 from .player import Player, ActivePlayer, HistoricalPlayer, create_player
 from .starcraft_player import MainPlayer, MainExploiter, LeagueExploiter
 from .shared_payoff import create_payoff
-from .metric import get_elo, get_elo_array, LeagueMetricEnv
+from .matchmaking import MatchmakingService
+from .metric import get_elo, get_elo_array, LeagueMetricEnv, LeagueRatingEngine
@@ -1,4 +1,4 @@
-from typing import Union, Dict
+from typing import Union, Dict, List, Optional
 import uuid
 import copy
 import os
@@ -9,9 +9,10 @@ from tabulate import tabulate
 
 from ding.league.player import ActivePlayer, HistoricalPlayer, create_player
 from ding.league.shared_payoff import create_payoff
+from ding.league.matchmaking import MatchmakingService
 from ding.utils import import_module, read_file, save_file, LockContext, LockContextType, LEAGUE_REGISTRY, \
     deep_merge_dicts
-from .metric import LeagueMetricEnv
+from .metric import LeagueMetricEnv, LeagueRatingEngine
 
 
 class BaseLeague:
@@ -19,7 +20,7 @@ class BaseLeague:
     Overview:
         League, proposed by Google Deepmind AlphaStar. Can manage multiple players in one league.
     Interface:
-        get_job_info, judge_snapshot, update_active_player, finish_job, save_checkpoint
+        get_job_info, get_job_info_batch, judge_snapshot, update_active_player, finish_job, save_checkpoint
 
     .. note::
         In ``__init__`` method, league would also initialized players as well(in ``_init_players`` method).
@@ -57,6 +58,13 @@ class BaseLeague:
             decay=0.99,
             min_win_rate_games=8,
         ),
+        # "use_matchmaking" means whether to select the collect opponents from the opponent distributions cached by
+        # ``MatchmakingService``, which are rebuilt only when the payoff of the player changes.
+        use_matchmaking=False,
+        # "use_rating_engine" means whether to rate the eval games in batch with ``LeagueRatingEngine`` instead of
+        # ``metric_env.rate_1vs1`` on every finished job, which is faster for the leagues with many historical players.
+        # The ratings of players are synchronized when snapshotted, and ``player_rank`` is read from the engine.
+        use_rating_engine=False,
         metric=dict(
             mu=0,
             sigma=25 / 3,
@@ -87,7 +95,14 @@ class BaseLeague:
         metric_cfg = self.cfg.metric
         self.metric_env = LeagueMetricEnv(metric_cfg.mu, metric_cfg.sigma, metric_cfg.tau, metric_cfg.draw_probability)
         self._active_players_lock = LockContext(lock_type=LockContextType.THREAD_LOCK)
+        self.matchmaking = MatchmakingService(self.payoff) if self.cfg.get('use_matchmaking', False) else None
         self._init_players()
+        self.rating_engine = None
+        if self.cfg.get('use_rating_engine', False):
+            # the same as ``metric_env.rate_1vs1`` , the games are rated in the global TrueSkill environment
+            self.rating_engine = LeagueRatingEngine(elo_init=self.metric_env.elo_init)
+            for p in self.active_players + self.historical_players:
+                self.rating_engine.add_player(p.player_id, p.rating)
 
     def _init_players(self) -> None:
         """
@@ -147,6 +162,8 @@ class BaseLeague:
         ReturnsKeys:
             - necessary: ``launch_player`` (the active player)
         """
+        if self.matchmaking is not None:
+            return self.get_job_info_batch(player_id, 1, eval_flag)[0]
         if player_id is None:
             player_id = self.active_players_ids[0]
         with self._active_players_lock:
@@ -156,14 +173,40 @@ class BaseLeague:
             assert 'launch_player' in job_info.keys() and job_info['launch_player'] == player.player_id
         return job_info
 
+    def get_job_info_batch(self, player_id: str = None, job_num: int = 1, eval_flag: bool = False) -> List[dict]:
+        """
+        Overview:
+            Get info dicts of a batch of jobs which are to be launched to an active player. If ``use_matchmaking`` \
+            is True, the opponents are sampled together by ``MatchmakingService`` without holding the league lock.
+        Arguments:
+            - player_id (:obj:`str`): The active player's id.
+            - job_num (:obj:`int`): The number of jobs.
+            - eval_flag (:obj:`bool`): Whether these are evaluation jobs.
+        Returns:
+            - job_infos (:obj:`List[dict]`): Job infos, each is the same as the result of ``get_job_info`` .
+        """
+        if player_id is None:
+            player_id = self.active_players_ids[0]
+        with self._active_players_lock:
+            idx = self.active_players_ids.index(player_id)
+            player = self.active_players[idx]
+            if self.matchmaking is None:
+                return [self._get_job_info(player, eval_flag) for _ in range(job_num)]
+        jobs = self.matchmaking.get_jobs(player, job_num, eval_flag)
+        job_infos = [self._get_job_info(player, eval_flag, job) for job in jobs]
+        assert all([job_info['launch_player'] == player.player_id for job_info in job_infos])
+        return job_infos
+
     @abstractmethod
-    def _get_job_info(self, player: ActivePlayer, eval_flag: bool = False) -> dict:
+    def _get_job_info(self, player: ActivePlayer, eval_flag: bool = False, job: Optional[dict] = None) -> dict:
         """
         Overview:
             Real `get_job` method. Called by ``_launch_job``.
         Arguments:
             - player (:obj:`ActivePlayer`): The active player to be launched a job.
             - eval_flag (:obj:`bool`): Whether this is an evaluation job.
+            - job (:obj:`Optional[dict]`): The job selected by the matchmaking service, if None, the job should \
+                be got by ``player.get_job`` .
         Returns:
             - job_info (:obj:`dict`): Job info. Should include keys ['lauch_player'].
         """
@@ -185,10 +228,14 @@ class BaseLeague:
             player = self.active_players[idx]
             if force or player.is_trained_enough():
                 # Snapshot
+                if self.rating_engine is not None:
+                    player.rating = self.rating_engine.get_rating(player.player_id)
                 hp = player.snapshot(self.metric_env)
                 self.save_checkpoint(player.checkpoint_path, hp.checkpoint_path)
                 self.historical_players.append(hp)
                 self.payoff.add_player(hp)
+                if self.rating_engine is not None:
+                    self.rating_engine.add_player(hp.player_id, hp.rating)
                 # Mutate
                 self._mutate_player(player)
                 return True
@@ -244,6 +291,10 @@ class BaseLeague:
         self.payoff.update(job_info)
         if 'eval_flag' in job_info and job_info['eval_flag']:
             home_id, away_id = job_info['player_id']
+            if self.rating_engine is not None:
+                # rated lazily in batch by the engine
+                self.rating_engine.push(home_id, away_id, job_info['result'])
+                return
             home_player, away_player = self.get_player_by_id(home_id), self.get_player_by_id(away_id)
             job_info_result = job_info['result']
             if isinstance(job_info_result[0], list):
@@ -272,9 +323,12 @@ class BaseLeague:
 
     def player_rank(self, string: bool = False) -> Union[str, Dict[str, float]]:
         rank = {}
-        for p in self.active_players + self.historical_players:
-            name = p.player_id
-            rank[name] = p.rating.exposure
+        if self.rating_engine is not None:
+            rank = dict(self.rating_engine.top_k(len(self.rating_engine)))
+        else:
+            for p in self.active_players + self.historical_players:
+                name = p.player_id
+                rank[name] = p.rating.exposure
         if string:
             headers = ["Player ID", "Rank (TrueSkill)"]
             data = []
@@ -0,0 +1,109 @@
+from collections import namedtuple
+from typing import List, Optional
+
+import numpy as np
+
+from .player import Player, ActivePlayer
+from .shared_payoff import BattleSharedPayoff
+
+OpponentSnapshot = namedtuple('OpponentSnapshot', ['version', 'outcomes', 'cum_probs'])
+
+
+class MatchmakingService:
+    """
+    Overview:
+        Matchmaking service which selects the collect opponents for the active players in batches. The opponent \
+        distribution of each active player (see ``ActivePlayer.get_opponent_distribution``) is calculated once \
+        and cached as an immutable snapshot, which is invalidated only when a player is added to the payoff or the \
+        payoff of this active player is updated. So the payoff lock is only acquired when rebuilding a snapshot, \
+        and the jobs are sampled from the snapshot without any lock, instead of querying the payoff and calling \
+        ``np.random.choice`` in the branches for each job.
+    Interface:
+        __init__, get_jobs, sample_opponents, get_snapshot, invalidate
+
+    .. note::
+        The opponent distribution of an active player should only depend on the payoff between this player and \
+        the others, which is true for all the players in ``ding.league`` .
+    """
+
+    def __init__(self, payoff: BattleSharedPayoff) -> None:
+        """
+        Overview:
+            Initialize the matchmaking service.
+        Arguments:
+            - payoff (:obj:`BattleSharedPayoff`): The payoff shared by all the players.
+        """
+        self._payoff = payoff
+        self._snapshots = {}
+
+    def get_snapshot(self, player: ActivePlayer) -> OpponentSnapshot:
+        """
+        Overview:
+            Get the snapshot of the opponent distribution of the player, rebuild it if the payoff has changed.
+        Arguments:
+            - player (:obj:`ActivePlayer`): The active player.
+        Returns:
+            - snapshot (:obj:`OpponentSnapshot`): The snapshot, including the payoff version when it is built, the \
+                outcomes (players or names of branches which can't be enumerated) and their cumulative probabilities.
+        """
+        version = self._payoff.get_version(player.player_id)
+        snapshot = self._snapshots.get(player.player_id)
+        if snapshot is None or snapshot.version != version:
+            outcomes, probs = player.get_opponent_distribution()
+            cum_probs = np.cumsum(probs)
+            cum_probs /= cum_probs[-1]
+            cum_probs.flags.writeable = False
+            # the version is read before building, so the snapshot is rebuilt again if the payoff is updated
+            # meanwhile, and replacing the item of dict is atomic, the readers always get a complete snapshot
+            snapshot = OpponentSnapshot(version, tuple(outcomes), cum_probs)
+            self._snapshots[player.player_id] = snapshot
+        return snapshot
+
+    def invalidate(self, player_id: Optional[str] = None) -> None:
+        """
+        Overview:
+            Drop the cached snapshot of one player, or all the players if ``player_id`` is None. It is only needed \
+            when the opponent distribution is changed by something other than the payoff.
+        Arguments:
+            - player_id (:obj:`Optional[str]`): The id of the active player.
+        """
+        if player_id is None:
+            self._snapshots = {}
+        else:
+            self._snapshots.pop(player_id, None)
+
+    def sample_opponents(self, player: ActivePlayer, num: int = 1) -> List[Player]:
+        """
+        Overview:
+            Sample a batch of collect opponents for the player from its snapshot.
+        Arguments:
+            - player (:obj:`ActivePlayer`): The active player.
+            - num (:obj:`int`): The number of opponents.
+        Returns:
+            - opponents (:obj:`List[Player]`): The selected opponents.
+        """
+        snapshot = self.get_snapshot(player)
+        indices = np.searchsorted(snapshot.cum_probs, np.random.uniform(size=num), side='right')
+        indices = np.minimum(indices, len(snapshot.outcomes) - 1)
+        opponents = []
+        for idx in indices:
+            opponent = snapshot.outcomes[idx]
+            if isinstance(opponent, str):
+                opponent = getattr(player, '_{}_branch'.format(opponent))()
+            opponents.append(opponent)
+        return opponents
+
+    def get_jobs(self, player: ActivePlayer, job_num: int = 1, eval_flag: bool = False) -> List[dict]:
+        """
+        Overview:
+            Get a batch of jobs of the player, each job is the same as the result of ``ActivePlayer.get_job`` .
+        Arguments:
+            - player (:obj:`ActivePlayer`): The active player.
+            - job_num (:obj:`int`): The number of jobs.
+            - eval_flag (:obj:`bool`): Whether to select opponents for evaluator tasks.
+        Returns:
+            - jobs (:obj:`List[dict]`): The jobs, each contains key ['opponent'].
+        """
+        if eval_flag:
+            return [player.get_job(eval_flag=True) for _ in range(job_num)]
+        return [{'opponent': opponent} for opponent in self.sample_opponents(player, job_num)]
@@ -1,7 +1,7 @@
-from typing import Tuple, Union, List
+from typing import Tuple, Union, List, Dict, Optional, Sequence
 import math
 import numpy as np
-from trueskill import TrueSkill, Rating, rate_1vs1
+from trueskill import TrueSkill, Rating, rate_1vs1, calc_draw_margin, global_env
 
 
 class EloCalculator(object):
@@ -214,5 +214,356 @@ class LeagueMetricEnv(TrueSkill):
         return team1
 
 
+def _erfc(x: np.ndarray) -> np.ndarray:
+    # the same approximation of complementary error function as the default backend of ``trueskill``
+    z = np.abs(x)
+    t = 1. / (1. + z / 2.)
+    poly = 0.17087277
+    for coef in [-0.82215223, 1.48851587, -1.13520398, 0.27886807, -0.18628806, 0.09678418, 0.37409196, 1.00002368]:
+        poly = coef + t * poly
+    r = t * np.exp(-z * z - 1.26551223 + t * poly)
+    return np.where(x < 0, 2. - r, r)
+
+
+def _cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * _erfc(-x / math.sqrt(2))
+
+
+def _pdf(x: np.ndarray) -> np.ndarray:
+    return 1 / math.sqrt(2 * math.pi) * np.exp(-x ** 2 / 2)
+
+
+class LeagueRatingEngine(object):
+    """
+    Overview:
+        Array-backed TrueSkill and Elo rating engine for the leagues with thousands of players (e.g. historical \
+        snapshots). The ratings are stored in numpy arrays indexed by player, the finished games are pushed into a \
+        queue and applied in batch by ``flush`` . The games in the queue are grouped into rounds in which each player \
+        plays at most once, and each round is rated with vectorized operations, so the result is the same as rating \
+        the games one by one in order (e.g. ``LeagueMetricEnv.rate_1vs1`` with the same TrueSkill parameters).
+    Interfaces:
+        ``__init__``, ``add_player``, ``push``, ``push_batch``, ``flush``, ``get_rating``, ``top_k``, ``__len__``, \
+        ``__contains__``.
+    Properties:
+        - player_ids (:obj:`List[str]`): The ids of all the players, in the order of adding.
+        - mu (:obj:`np.ndarray`): The TrueSkill mean of all the players.
+        - sigma (:obj:`np.ndarray`): The TrueSkill standard deviation of all the players.
+        - elo (:obj:`np.ndarray`): The Elo rating of all the players.
+        - exposure (:obj:`np.ndarray`): The conservative TrueSkill rating (i.e. ``PlayerRating.exposure`` ) of \
+            all the players.
+        - game_count (:obj:`np.ndarray`): The number of rated games of all the players.
+        - pending_count (:obj:`int`): The number of games in the queue.
+    """
+
+    result_map = {
+        'wins': 1,
+        'draws': 0,
+        'losses': -1,
+        1: 1,
+        0: 0,
+        -1: -1,
+    }
+
+    def __init__(
+            self,
+            env: Optional[TrueSkill] = None,
+            elo_init: int = 1200,
+            elo_k_factor: int = 32,
+            elo_beta: int = 200,
+            flush_size: Optional[int] = None,
+            capacity: int = 1024
+    ) -> None:
+        """
+        Overview:
+            Initialize the empty rating arrays.
+        Arguments:
+            - env (:obj:`Optional[TrueSkill]`): The TrueSkill environment, whose ``mu`` and ``sigma`` are the \
+                default rating of new players, and ``beta`` , ``tau`` and ``draw_probability`` are used to rate \
+                games. If None, use the global environment of ``trueskill`` , which is also used by \
+                ``LeagueMetricEnv.rate_1vs1`` .
+            - elo_init (:obj:`int`): The default Elo rating of new players. If ``env`` is a ``LeagueMetricEnv`` , \
+                its ``elo_init`` is used instead.
+            - elo_k_factor (:obj:`int`): The K-factor of Elo, the same as ``EloCalculator.get_new_rating`` .
+            - elo_beta (:obj:`int`): The beta of Elo, the same as ``EloCalculator.get_new_rating`` .
+            - flush_size (:obj:`Optional[int]`): If not None, ``flush`` automatically once the number of the games \
+                in queue reaches it.
+            - capacity (:obj:`int`): The initial size of the rating arrays, which grow automatically.
+        """
+        self._env = global_env() if env is None else env
+        assert not callable(self._env.draw_probability), 'dynamic draw probability is not supported'
+        self._elo_init = getattr(self._env, 'elo_init', elo_init)
+        self._elo_k_factor = elo_k_factor
+        self._elo_beta = elo_beta
+        self._flush_size = flush_size
+        self._draw_margin = calc_draw_margin(self._env.draw_probability, 2, self._env)
+
+        capacity = max(capacity, 1)
+        self._mu = np.zeros(capacity, dtype=np.float64)
+        self._sigma = np.zeros(capacity, dtype=np.float64)
+        self._elo = np.zeros(capacity, dtype=np.int64)
+        self._game_count = np.zeros(capacity, dtype=np.int64)
+        self._player_ids = []
+        self._player_index = {}
+        # each item of queue is a tuple of (home, away, result) index arrays
+        self._queue = []
+        self._pending_count = 0
+
+    def __len__(self) -> int:
+        return len(self._player_ids)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._player_index
+
+    def _grow(self, size: int) -> None:
+        if size <= len(self._mu):
+            return
+        capacity = max(size, 2 * len(self._mu))
+        for name in ['_mu', '_sigma', '_elo', '_game_count']:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add_player(self, player_id: str, rating: Optional[PlayerRating] = None) -> int:
+        """
+        Overview:
+            Add a new player (e.g. a new snapshot) with the initial rating.
+        Arguments:
+            - player_id (:obj:`str`): The id of player.
+            - rating (:obj:`Optional[PlayerRating]`): The initial rating, e.g. ``player.rating`` . If None, use the \
+                default rating of ``env`` . If ``rating.elo`` is None, use ``elo_init`` .
+        Returns:
+            - index (:obj:`int`): The index of player in the rating arrays.
+        """
+        assert player_id not in self._player_index, 'player {} already exists'.format(player_id)
+        index = len(self._player_ids)
+        self._grow(index + 1)
+        self._mu[index] = self._env.mu if rating is None else rating.mu
+        self._sigma[index] = self._env.sigma if rating is None else rating.sigma
+        elo = getattr(rating, 'elo', None)
+        self._elo[index] = self._elo_init if elo is None else elo
+        self._game_count[index] = 0
+        self._player_ids.append(player_id)
+        self._player_index[player_id] = index
+        return index
+
+    def _to_index(self, player_ids: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+        if isinstance(player_ids, np.ndarray) and player_ids.dtype.kind in 'iu':
+            return player_ids.astype(np.int64)
+        return np.array([self._player_index[p] for p in player_ids], dtype=np.int64)
+
+    def push(self, home_id: str, away_id: str, result: Union[int, str, List[str], List[List[str]]]) -> None:
+        """
+        Overview:
+            Push the result of finished games between two players into queue.
+        Arguments:
+            - home_id (:obj:`str`): The id of home player.
+            - away_id (:obj:`str`): The id of away player.
+            - result (:obj:`Union[int, str, List[str], List[List[str]]]`): The result of home player, which can be \
+                'wins', 'draws', 'losses' (or 1, 0, -1), or a list of them (e.g. ``job_info['result']`` ) for \
+                several games in order.
+        """
+        if not isinstance(result, (list, tuple)):
+            result = [result]
+        elif len(result) > 0 and isinstance(result[0], (list, tuple)):
+            result = sum(result, [])
+        n = len(result)
+        home, away = self._player_index[home_id], self._player_index[away_id]
+        self._enqueue(np.full(n, home), np.full(n, away), np.array([self.result_map[r] for r in result]))
+
+    def push_batch(
+            self, home_ids: Union[Sequence[str], np.ndarray], away_ids: Union[Sequence[str], np.ndarray],
+            results: Union[Sequence[Union[int, str]], np.ndarray]
+    ) -> None:
+        """
+        Overview:
+            Push the results of a batch of finished games into queue, in order.
+        Arguments:
+            - home_ids (:obj:`Union[Sequence[str], np.ndarray]`): The ids of home players, or their indices \
+                returned by ``add_player`` (an integer array).
+            - away_ids (:obj:`Union[Sequence[str], np.ndarray]`): The ids or indices of away players.
+            - results (:obj:`Union[Sequence[Union[int, str]], np.ndarray]`): The results of home players, 1 (or \
+                'wins') for win, 0 (or 'draws') for draw and -1 (or 'losses') for loss.
+        """
+        if isinstance(results, np.ndarray) and results.dtype.kind in 'iu':
+            results = results.astype(np.int64)
+        else:
+            results = np.array([self.result_map[r] for r in results], dtype=np.int64)
+        self._enqueue(self._to_index(home_ids), self._to_index(away_ids), results)
+
+    def _enqueue(self, home: np.ndarray, away: np.ndarray, result: np.ndarray) -> None:
+        assert len(home) == len(away) == len(result)
+        assert ((result >= -1) & (result <= 1)).all(), 'invalid result: {}'.format(result)
+        assert (home != away).all(), 'a player can not play with itself'
+        self._queue.append((home, away, result))
+        self._pending_count += len(result)
+        if self._flush_size is not None and self._pending_count >= self._flush_size:
+            self.flush()
+
+    @staticmethod
+    def _assign_rounds(home: np.ndarray, away: np.ndarray) -> np.ndarray:
+        # the round of a game is one more than the last round of its two players, so that the games of each player
+        # are in order and the games in the same round have no common player
+        last_round = {}
+        rounds = np.empty(len(home), dtype=np.int64)
+        for i, (h, a) in enumerate(zip(home.tolist(), away.tolist())):
+            r = max(last_round.get(h, -1), last_round.get(a, -1)) + 1
+            last_round[h] = last_round[a] = r
+            rounds[i] = r
+        return rounds
+
+    def flush(self) -> int:
+        """
+        Overview:
+            Rate all the games in queue.
+        Returns:
+            - count (:obj:`int`): The number of rated games.
+        """
+        if self._pending_count == 0:
+            return 0
+        home, away, result = [np.concatenate(x) for x in zip(*self._queue)]
+        self._queue, self._pending_count = [], 0
+        # the winner is the first player of each game (home player for draw)
+        drawn = result == 0
+        winner = np.where(result >= 0, home, away)
+        loser = np.where(result >= 0, away, home)
+        rounds = self._assign_rounds(winner, loser)
+        order = np.argsort(rounds, kind='stable')
+        bounds = np.searchsorted(rounds[order], np.arange(rounds.max() + 2))
+        for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            if end - start == 1:
+                i = order[start]
+                self._rate_single(winner[i].item(), loser[i].item(), drawn[i].item())
+            else:
+                index = order[start:end]
+                self._rate(winner[index], loser[index], drawn[index])
+        np.add.at(self._game_count, home, 1)
+        np.add.at(self._game_count, away, 1)
+        return len(result)
+
+    def _rate(self, winner: np.ndarray, loser: np.ndarray, drawn: np.ndarray) -> None:
+        # TrueSkill, refer to ``trueskill.rate_1vs1``
+        env = self._env
+        var_w = self._sigma[winner] ** 2 + env.tau ** 2
+        var_l = self._sigma[loser] ** 2 + env.tau ** 2
+        c2 = 2 * env.beta ** 2 + var_w + var_l
+        c = np.sqrt(c2)
+        diff = (self._mu[winner] - self._mu[loser]) / c
+        draw_margin = self._draw_margin / c
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # the non-draw version of V and W
+            x = diff - draw_margin
+            denom = _cdf(x)
+            v_win = np.where(denom > 0, _pdf(x) / denom, -x)
+            w_win = v_win * (v_win + x)
+            # the draw version of V and W
+            abs_diff = np.abs(diff)
+            a, b = draw_margin - abs_diff, -draw_margin - abs_diff
+            denom = _cdf(a) - _cdf(b)
+            v_draw = np.where(denom > 0, (_pdf(b) - _pdf(a)) / denom, a)
+            w_draw = v_draw ** 2 + (a * _pdf(a) - b * _pdf(b)) / denom
+            v_draw = v_draw * np.where(diff < 0, -1, 1)
+        v = np.where(drawn, v_draw, v_win)
+        w = np.where(drawn, w_draw, w_win)
+        if not ((w > 0) & (w < 1)).all():
+            raise FloatingPointError('invalid TrueSkill update, please check the parameters of env')
+        self._mu[winner] += var_w / c * v
+        self._mu[loser] -= var_l / c * v
+        self._sigma[winner] = np.sqrt(var_w * (1 - var_w / c2 * w))
+        self._sigma[loser] = np.sqrt(var_l * (1 - var_l / c2 * w))
+        # Elo, refer to ``EloCalculator.get_new_rating``
+        elo_w, elo_l = self._elo[winner], self._elo[loser]
+        score = np.where(drawn, 0.5, 1.)
+        expect_w = 1. / (1. + np.power(10, (elo_l - elo_w) / (2. * self._elo_beta)))
+        expect_l = 1. / (1. + np.power(10, (elo_w - elo_l) / (2. * self._elo_beta)))
+        self._elo[winner] = np.round(elo_w + self._elo_k_factor * (score - expect_w))
+        self._elo[loser] = np.round(elo_l + self._elo_k_factor * (1 - score - expect_l))
+
+    def _rate_single(self, winner: int, loser: int, drawn: bool) -> None:
+        # the scalar version of ``_rate`` , which is faster for the rounds with only one game, e.g. the games of the
+        # main player against many historical players
+        env = self._env
+        var_w = self._sigma[winner].item() ** 2 + env.tau ** 2
+        var_l = self._sigma[loser].item() ** 2 + env.tau ** 2
+        c2 = 2 * env.beta ** 2 + var_w + var_l
+        c = math.sqrt(c2)
+        diff = (self._mu[winner].item() - self._mu[loser].item()) / c
+        draw_margin = self._draw_margin / c
+        if drawn:
+            v, w = env.v_draw(diff, draw_margin), env.w_draw(diff, draw_margin)
+        else:
+            v, w = env.v_win(diff, draw_margin), env.w_win(diff, draw_margin)
+        self._mu[winner] += var_w / c * v
+        self._mu[loser] -= var_l / c * v
+        self._sigma[winner] = math.sqrt(var_w * (1 - var_w / c2 * w))
+        self._sigma[loser] = math.sqrt(var_l * (1 - var_l / c2 * w))
+        self._elo[winner], self._elo[loser] = EloCalculator.get_new_rating(
+            self._elo[winner].item(), self._elo[loser].item(), 0 if drawn else 1, self._elo_k_factor, self._elo_beta
+        )
+
+    def get_rating(self, player_id: str) -> PlayerRating:
+        """
+        Overview:
+            Get the rating of a player after rating all the games in queue.
+        Arguments:
+            - player_id (:obj:`str`): The id of player.
+        Returns:
+            - rating (:obj:`PlayerRating`): The rating of player, which can be assigned to ``player.rating`` .
+        """
+        self.flush()
+        index = self._player_index[player_id]
+        return PlayerRating(float(self._mu[index]), float(self._sigma[index]), int(self._elo[index]))
+
+    def top_k(self, k: int, key: str = 'exposure') -> List[Tuple[str, float]]:
+        """
+        Overview:
+            Get the leaderboard of the top k players after rating all the games in queue.
+        Arguments:
+            - k (:obj:`int`): The number of players.
+            - key (:obj:`str`): The sort key, which can be 'exposure', 'mu' or 'elo'.
+        Returns:
+            - leaderboard (:obj:`List[Tuple[str, float]]`): The (player_id, value) pairs in descending order.
+        """
+        assert key in ['exposure', 'mu', 'elo'], key
+        self.flush()
+        value = getattr(self, key)
+        k = min(k, len(value))
+        if k <= 0:
+            return []
+        index = np.argpartition(-value, k - 1)[:k]
+        index = index[np.argsort(-value[index], kind='stable')]
+        return [(self._player_ids[i], value[i].item()) for i in index]
+
+    @property
+    def player_ids(self) -> List[str]:
+        return self._player_ids
+
+    @property
+    def mu(self) -> np.ndarray:
+        return self._mu[:len(self._player_ids)]
+
+    @property
+    def sigma(self) -> np.ndarray:
+        return self._sigma[:len(self._player_ids)]
+
+    @property
+    def elo(self) -> np.ndarray:
+        return self._elo[:len(self._player_ids)]
+
+    @property
+    def exposure(self) -> np.ndarray:
+        # the same as ``global_env().expose`` , which is used by ``PlayerRating.exposure``
+        env = global_env()
+        return self.mu - env.mu / env.sigma * self.sigma
+
+    @property
+    def game_count(self) -> np.ndarray:
+        return self._game_count[:len(self._player_ids)]
+
+    @property
+    def pending_count(self) -> int:
+        return self._pending_count
+
+
 get_elo = EloCalculator.get_new_rating
 get_elo_array = EloCalculator.get_new_rating_array
@@ -53,6 +53,11 @@ class OneVsOneLeague(BaseLeague):
             decay=0.99,
             min_win_rate_games=8,
         ),
+        # "use_matchmaking" means whether to select the collect opponents from the opponent distributions cached by
+        # ``MatchmakingService``, which are rebuilt only when the payoff of the player changes.
+        use_matchmaking=False,
+        # "use_rating_engine" means whether to rate the eval games in batch with ``LeagueRatingEngine``.
+        use_rating_engine=False,
         metric=dict(
             mu=0,
             sigma=25 / 3,
@@ -63,15 +68,18 @@ class OneVsOneLeague(BaseLeague):
     )
 
     # override
-    def _get_job_info(self, player: ActivePlayer, eval_flag: bool = False) -> dict:
+    def _get_job_info(self, player: ActivePlayer, eval_flag: bool = False, job: Optional[dict] = None) -> dict:
         """
         Overview:
             Get player's job related info, called by ``_launch_job``.
         Arguments:
             - player (:obj:`ActivePlayer`): The active player that will be assigned a job.
+            - eval_flag (:obj:`bool`): Whether this is an evaluation job.
+            - job (:obj:`Optional[dict]`): The job selected by the matchmaking service, if None, call \
+                ``player.get_job`` to get it.
         """
         assert isinstance(player, ActivePlayer), player.__class__
-        player_job_info = EasyDict(player.get_job(eval_flag))
+        player_job_info = EasyDict(player.get_job(eval_flag) if job is None else job)
         if eval_flag:
             return {
                 'agent_num': 1,
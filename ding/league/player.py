@@ -1,11 +1,42 @@
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Dict, Tuple, Union
 from collections import namedtuple
+import threading
 import numpy as np
 from easydict import EasyDict
 
 from ding.utils import import_module, PLAYER_REGISTRY
 from .algorithm import pfsp
 
+# The state of enumerating the random choices of ``ActivePlayer._get_opponent`` in the current thread, which is set in
+# ``ActivePlayer._enumerate_branch``.
+_opponent_enumeration = threading.local()
+
+
+class _OpponentEnumerationState:
+    """
+    Overview:
+        The state of one run of a branch method in enumeration, which replays the given ``prefix`` of the choice \
+        indices, then always chooses the first possible one and records the other possible choices as new prefixes.
+    """
+
+    def __init__(self, prefix: List[int]) -> None:
+        self.prefix = prefix
+        self.choices = []
+        self.prob = 1.
+        self.new_prefixes = []
+
+    def choose(self, n: int, p: Optional[np.ndarray] = None) -> int:
+        p = np.full(n, 1. / n) if p is None else np.asarray(p)
+        if len(self.choices) < len(self.prefix):
+            idx = self.prefix[len(self.choices)]
+        else:
+            candidates = np.nonzero(p > 0)[0]
+            idx = candidates[0]
+            self.new_prefixes.extend([self.choices + [j] for j in candidates[1:]])
+        self.choices.append(idx)
+        self.prob *= p[idx]
+        return idx
+
 
 class Player:
     """
@@ -116,7 +147,7 @@ class ActivePlayer(Player):
     Overview:
         Active player can be updated, or snapshotted to a historical player in the league training.
     Interface:
-        __init__, is_trained_enough, snapshot, mutate, get_job
+        __init__, is_trained_enough, snapshot, mutate, get_job, get_opponent_distribution
     Property:
         race, payoff, checkpoint_path, player_id, total_agent_step
     """
@@ -250,6 +281,56 @@ class ActivePlayer(Player):
         opponent = getattr(self, branch_name)()
         return opponent
 
+    def get_opponent_distribution(self) -> Tuple[List[Union[Player, str]], np.ndarray]:
+        """
+        Overview:
+            Get the probability distribution of the opponent selected by ``_get_collect_opponent`` under the current \
+            payoff. The distribution of each branch is calculated by running the branch method with all the \
+            possible random choices of ``_get_opponent`` . If a branch can't be enumerated (e.g. it raises an error \
+            because there isn't any valid opponent yet), its name is put in the outcomes instead of the players, \
+            and the branch method should be called when it is selected.
+        Returns:
+            - outcomes (:obj:`List[Union[Player, str]]`): The possible opponents or the names of the branches \
+                which can't be enumerated.
+            - probs (:obj:`np.ndarray`): The probability of each outcome.
+        """
+        total_prob = sum([b.prob for b in self._branch_probs])
+        dist = {}
+        for branch in self._branch_probs:
+            if branch.prob <= 0:
+                continue
+            try:
+                branch_dist = self._enumerate_branch(branch.name)
+            except Exception:
+                branch_dist = {branch.name: 1.}
+            for k, v in branch_dist.items():
+                dist[k] = dist.get(k, 0.) + branch.prob / total_prob * v
+        return list(dist.keys()), np.array(list(dist.values()))
+
+    def _enumerate_branch(self, branch_name: str) -> Dict[Player, float]:
+        """
+        Overview:
+            Get the probability distribution of the opponent selected by a branch, by running the branch method \
+            with each path of random choices in ``_get_opponent`` in depth first order.
+        Arguments:
+            - branch_name (:obj:`str`): The name of the branch, e.g. ``pfsp`` for ``_pfsp_branch`` .
+        Returns:
+            - dist (:obj:`Dict[Player, float]`): The probability of each possible opponent.
+        """
+        branch_fn = getattr(self, '_{}_branch'.format(branch_name))
+        dist = {}
+        prefixes = [[]]
+        while len(prefixes) > 0:
+            state = _OpponentEnumerationState(prefixes.pop())
+            _opponent_enumeration.state = state
+            try:
+                opponent = branch_fn()
+            finally:
+                _opponent_enumeration.state = None
+            dist[opponent] = dist.get(opponent, 0.) + state.prob
+            prefixes.extend(state.new_prefixes)
+        return dist
+
     def _get_players(self, select_fn: Callable) -> List[Player]:
         """
         Overview:
@@ -272,6 +353,9 @@ class ActivePlayer(Player):
         Returns:
             - opponent_player (:obj:`Player`): a random chosen opponent player according to probability
         """
+        state = getattr(_opponent_enumeration, 'state', None)
+        if state is not None:
+            return players[state.choose(len(players), p)]
         idx = np.random.choice(len(players), p=p)
         return players[idx]
 
@@ -49,7 +49,7 @@ class BattleSharedPayoff:
         Payoff data structure to record historical match result, this payoff is shared among all the players.
         Use LockContext to ensure thread safe, since all players from all threads can access and modify it.
     Interface:
-        __getitem__, add_player, update, get_key
+        __getitem__, add_player, update, get_key, get_version
     Property:
         players
     """
@@ -76,6 +76,11 @@ class BattleSharedPayoff:
         self._min_win_rate_games = cfg.get('min_win_rate_games', 8)
         # Thread lock.
         self._lock = LockContext(lock_type=LockContextType.THREAD_LOCK)
+        # Versions to invalidate the cached opponent distributions (e.g. in ``MatchmakingService``).
+        # ``_players_version`` increases when a player is added, and ``_player_versions[player_id]`` increases
+        # when the payoff between this player and any other player changes.
+        self._players_version = 0
+        self._player_versions = defaultdict(int)
 
     def __repr__(self) -> str:
         headers = ["Home Player", "Away Player", "Wins", "Draws", "Losses", "Naive Win Rate"]
@@ -165,6 +170,7 @@ class BattleSharedPayoff:
         with self._lock:
             self._players.append(player)
             self._players_ids.append(player.player_id)
+            self._players_version += 1
 
     def update(self, job_info: dict) -> bool:
         """
@@ -218,8 +224,22 @@ class BattleSharedPayoff:
                         self._data[key]['games'] += 1
                         result = _win_loss_reverse(one_episode_result_per_env, reverse)
                         self._data[key][result] += 1
+            self._player_versions[home_id] += 1
+            self._player_versions[away_id] += 1
             return True
 
+    def get_version(self, player_id: str) -> Tuple[int, int]:
+        """
+        Overview:
+            Get the version of the payoff related to one player, which changes when a player is added or the \
+            payoff between this player and any other player is updated. It doesn't acquire the lock.
+        Arguments:
+            - player_id (:obj:`str`): Player id.
+        Returns:
+            - version (:obj:`Tuple[int, int]`): The version of the players list and the version of this player.
+        """
+        return self._players_version, self._player_versions.get(player_id, 0)
+
     def get_key(self, home: str, away: str) -> Tuple[str, bool]:
         """
         Overview:
@@ -1,7 +1,8 @@
+import time
 import numpy as np
 import pytest
 
-from ding.league import get_elo, get_elo_array, LeagueMetricEnv
+from ding.league import get_elo, get_elo_array, LeagueMetricEnv, LeagueRatingEngine
 
 
 @pytest.mark.unittest
@@ -55,3 +56,68 @@ def test_league_metric():
     new_r1 = env.rate_1vsC(r1, env.create_rating(elo_init=1800), result=['losses', 'losses'])
     assert new_r1.elo < 1611
     print('final rating is: ', new_r1)
+
+
+@pytest.mark.unittest
+def test_league_rating_engine():
+    env = LeagueMetricEnv()
+    engine = LeagueRatingEngine(env)
+    players = {'p{}'.format(i): env.create_rating(elo_init=1200 + 10 * i) for i in range(8)}
+    for k, v in players.items():
+        engine.add_player(k, v)
+    assert len(engine) == 8 and 'p0' in engine
+    rng = np.random.default_rng(0)
+    games = []
+    for _ in range(200):
+        home, away = rng.choice(8, 2, replace=False)
+        games.append(('p{}'.format(home), 'p{}'.format(away), ['wins', 'draws', 'losses'][rng.integers(3)]))
+    # the results of batched updates are the same as rating games one by one
+    for home, away, result in games:
+        players[home], players[away] = env.rate_1vs1(players[home], players[away], result=[result])
+    engine.push_batch([g[0] for g in games[:100]], [g[1] for g in games[:100]], [g[2] for g in games[:100]])
+    for home, away, result in games[100:]:
+        engine.push(home, away, result)
+    assert engine.pending_count == 200
+    assert engine.flush() == 200 and engine.pending_count == 0
+    for k, v in players.items():
+        rating = engine.get_rating(k)
+        assert pytest.approx(rating.mu, abs=1e-6) == v.mu
+        assert pytest.approx(rating.sigma, abs=1e-6) == v.sigma
+        assert rating.elo == v.elo
+    assert engine.game_count.sum() == 400
+
+    # leaderboard
+    leaderboard = engine.top_k(3)
+    expected = sorted(players.items(), key=lambda x: x[1].mu - 3 * x[1].sigma, reverse=True)[:3]
+    assert [name for name, _ in leaderboard] == [name for name, _ in expected]
+    assert engine.top_k(100, key='elo')[0][1] == max(v.elo for v in players.values())
+
+    # job_info result and auto flush
+    engine = LeagueRatingEngine(env, flush_size=4)
+    engine.add_player('a')
+    engine.add_player('b')
+    engine.push('a', 'b', [['wins', 'wins'], ['draws']])
+    assert engine.pending_count == 3
+    engine.push('b', 'a', 'losses')
+    assert engine.pending_count == 0
+    assert engine.elo[0] > engine.elo[1] and engine.mu[0] > engine.mu[1]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('main_player', [False, True])
+def test_league_rating_engine_benchmark(main_player):
+    # main_player: all the games are played by one main player against the others, i.e. each round has one game
+    player_num, game_num = 5000, 100000
+    engine = LeagueRatingEngine()
+    for i in range(player_num):
+        engine.add_player('p{}'.format(i))
+    home = np.zeros(game_num, dtype=np.int64) if main_player else np.random.randint(0, player_num, game_num)
+    away = (home + np.random.randint(1, player_num, game_num)) % player_num
+    result = np.random.randint(-1, 2, game_num)
+    start = time.time()
+    engine.push_batch(home, away, result)
+    engine.flush()
+    engine.top_k(10)
+    duration = time.time() - start
+    print('rate {} games in {:.3f}s ({:.0f} games/s)'.format(game_num, duration, game_num / duration))
+    assert game_num / duration > 10000
@@ -0,0 +1,140 @@
+import copy
+import shutil
+import time
+from collections import Counter
+
+import numpy as np
+import pytest
+import torch
+from easydict import EasyDict
+
+from ding.league import create_league, create_player, create_payoff, HistoricalPlayer, MatchmakingService
+from ding.league.metric import LeagueMetricEnv
+from ding.league.tests.league_test_default_config import league_test_config
+from ding.league.tests.test_one_vs_one_league import one_vs_one_league_default_config
+
+env = LeagueMetricEnv()
+
+
+def create_players(payoff, with_historical=True):
+    cfg = league_test_config.league
+    players = []
+    for category in ['zerg', 'terran']:
+        for player_type in ['main_player', 'main_exploiter', 'league_exploiter']:
+            name = '{}_{}'.format(player_type, category)
+            players.append(
+                create_player(
+                    cfg, player_type, cfg[player_type], category, payoff, 'ckpt_{}.pth'.format(name), name, 0,
+                    env.create_rating()
+                )
+            )
+    if with_historical:
+        for main_player in players[::3] + players[1::3]:
+            main_player.total_agent_step = 2000
+            players.append(main_player.snapshot(env))
+    for p in players:
+        payoff.add_player(p)
+    return players
+
+
+@pytest.mark.unittest
+class TestMatchmakingService:
+
+    def test_opponent_distribution(self):
+        np.random.seed(0)
+        payoff = create_payoff(EasyDict({'type': 'battle', 'decay': 0.99}))
+        players = create_players(payoff)
+        for _ in range(2000):
+            home, away = np.random.choice(players, 2)
+            payoff.update({'player_id': [home.player_id, away.player_id], 'result': [['wins']]})
+        N = 20000
+        for player in players:
+            if isinstance(player, HistoricalPlayer):
+                continue
+            outcomes, probs = player.get_opponent_distribution()
+            assert all([not isinstance(o, str) for o in outcomes])
+            assert abs(probs.sum() - 1) < 1e-6
+            count = Counter([player.get_job()['opponent'] for _ in range(N)])
+            assert set(count.keys()) <= set(outcomes)
+            for o, p in zip(outcomes, probs):
+                assert abs(count[o] / N - p) < 0.015, (player.player_id, o.player_id, count[o] / N, p)
+
+        # the branches without valid opponents are kept as their names
+        payoff = create_payoff(EasyDict({'type': 'battle', 'decay': 0.99}))
+        players = create_players(payoff, with_historical=False)
+        outcomes, probs = players[0].get_opponent_distribution()
+        assert 'pfsp' in outcomes and abs(probs[outcomes.index('pfsp')] - 0.5) < 1e-6
+        matchmaking = MatchmakingService(payoff)
+        with pytest.raises(AssertionError):
+            # the same as ``get_job``, there isn't any historical player for pfsp
+            matchmaking.sample_opponents(players[0], 100)
+
+    def test_snapshot_invalidation(self):
+        payoff = create_payoff(EasyDict({'type': 'battle', 'decay': 0.99}))
+        players = create_players(payoff)
+        main_zerg, main_terran, exploiter_zerg = players[0], players[3], players[1]
+        matchmaking = MatchmakingService(payoff)
+        snapshot = matchmaking.get_snapshot(main_zerg)
+        assert matchmaking.get_snapshot(main_zerg) is snapshot
+        assert not snapshot.cum_probs.flags.writeable
+        # the payoff between other players doesn't change the snapshot
+        payoff.update({'player_id': [main_terran.player_id, exploiter_zerg.player_id], 'result': [['wins']]})
+        assert matchmaking.get_snapshot(main_zerg) is snapshot
+        for _ in range(10):
+            payoff.update({'player_id': [main_zerg.player_id, main_terran.player_id], 'result': [['losses']]})
+        new_snapshot = matchmaking.get_snapshot(main_zerg)
+        assert new_snapshot is not snapshot
+        # a failed update doesn't change the payoff
+        assert not payoff.update({'player_id': [main_zerg.player_id, 'unknown'], 'result': [['wins']]})
+        assert matchmaking.get_snapshot(main_zerg) is new_snapshot
+        historical = main_zerg.snapshot(env)
+        payoff.add_player(historical)
+        assert historical in matchmaking.get_snapshot(main_zerg).outcomes
+        matchmaking.invalidate()
+        assert matchmaking.get_snapshot(main_zerg) is not new_snapshot
+
+        jobs = matchmaking.get_jobs(main_zerg, 100)
+        assert len(jobs) == 100 and all([j['opponent'] in players + [historical] for j in jobs])
+        assert matchmaking.get_jobs(main_zerg, 2, eval_flag=True) == [main_zerg.get_job(eval_flag=True)] * 2
+
+    def test_league(self):
+        cfg = copy.deepcopy(one_vs_one_league_default_config.league)
+        cfg.path_policy = 'test_league_matchmaking'
+        cfg.use_matchmaking = True
+        league = create_league(cfg)
+        player_id = league.active_players_ids[0]
+        torch.save({'model': 1}, league.active_players[0].checkpoint_path)
+        league.judge_snapshot(player_id, force=True)
+        job_infos = league.get_job_info_batch(player_id, 16)
+        assert len(job_infos) == 16
+        for job in job_infos + [league.get_job_info(player_id)]:
+            assert job['launch_player'] == player_id
+            assert job['player_id'][1] in [player_id, league.historical_players[0].player_id]
+            league.finish_job({'player_id': job['player_id'], 'result': [['wins', 'losses']]})
+        shutil.rmtree(cfg.path_policy, ignore_errors=True)
+
+
+@pytest.mark.benchmark
+def test_matchmaking_benchmark():
+    payoff = create_payoff(EasyDict({'type': 'battle', 'decay': 0.99}))
+    players = create_players(payoff)
+    for _ in range(5):
+        for main_player in players[:6:3]:
+            main_player.total_agent_step += 4000
+            payoff.add_player(main_player.snapshot(env))
+    player, job_num = players[0], 1000
+    start = time.time()
+    for _ in range(job_num):
+        player.get_job()
+    t_job = time.time() - start
+    matchmaking = MatchmakingService(payoff)
+    start = time.time()
+    for _ in range(job_num // 10):
+        matchmaking.get_jobs(player, 10)
+    t_matchmaking = time.time() - start
+    print(
+        'jobs per second with {} players, get_job: {:.0f}, MatchmakingService: {:.0f}'.format(
+            len(payoff.players), job_num / t_job, job_num / t_matchmaking
+        )
+    )
+    assert t_matchmaking < t_job
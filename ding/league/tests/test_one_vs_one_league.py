@@ -178,6 +178,41 @@ class TestOneVsOneLeague:
         print(league.player_rank(string=True))
         os.popen("rm -rf {}".format(cfg.path_policy))
 
+    def test_rating_engine(self):
+        leagues = []
+        for use_rating_engine in [False, True]:
+            cfg = copy.deepcopy(one_vs_one_league_default_config.league)
+            cfg.path_policy = 'test_rating_engine_{}'.format(use_rating_engine)
+            cfg.use_rating_engine = use_rating_engine
+            league = create_league(cfg)
+            torch.save(torch.tensor([1, 2, 3]), league.active_players[0].checkpoint_path)
+            league.judge_snapshot(league.active_players[0].player_id, force=True)
+            leagues.append(league)
+        assert leagues[0].rating_engine is None and len(leagues[1].rating_engine) == 2
+        player_id = [leagues[0].active_players[0].player_id, leagues[0].historical_players[0].player_id]
+        for _ in range(5):
+            job_info = {
+                'launch_player': player_id[0],
+                'player_id': player_id,
+                'episode_num': 2,
+                'env_num': 4,
+                'eval_flag': True,
+                'result': [[get_random_result() for __ in range(4)] for _ in range(2)]
+            }
+            for league in leagues:
+                league.finish_job(copy.deepcopy(job_info))
+        assert leagues[1].rating_engine.pending_count == 40
+        rank, engine_rank = leagues[0].player_rank(), leagues[1].player_rank()
+        assert rank.keys() == engine_rank.keys()
+        assert all([abs(rank[k] - engine_rank[k]) < 1e-6 for k in rank])
+        # the rating of the active player is synchronized before the next snapshot
+        leagues[1].active_players[0].total_agent_step = 100
+        leagues[1].judge_snapshot(player_id[0], force=True)
+        assert abs(leagues[1].active_players[0].rating.exposure - rank[player_id[0]]) < 1e-6
+        assert len(leagues[1].rating_engine) == 3
+        for league in leagues:
+            os.popen("rm -rf {}".format(league.path_policy))
+
 
 if __name__ == '__main__':
     pytest.main(["-sv", os.path.basename(__file__)])
@@ -13,7 +13,7 @@ which is fixed in the following code
 """
 
 import math
-from typing import Union, Optional, Tuple
+from typing import Union, Optional, Tuple, List
 
 import torch
 import torch.nn as nn
@@ -102,6 +102,41 @@ class MaskedCausalAttention(nn.Module):
         out = self.proj_drop(self.proj_net(attention))
         return out
 
+    def forward_incremental(
+            self, x: torch.Tensor, past_key: torch.Tensor, past_value: torch.Tensor, attn_mask: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Overview:
+            Compute the attention of the new tokens only, whose keys and values are attended together with the \
+            cached keys and values of the previous tokens, so that the previous tokens are not recomputed.
+        Arguments:
+            - x (:obj:`torch.Tensor`): The new tokens, the shape is (B, T_new, C).
+            - past_key (:obj:`torch.Tensor`): The cached keys, the shape is (B, N, S, D).
+            - past_value (:obj:`torch.Tensor`): The cached values, the shape is (B, N, S, D).
+            - attn_mask (:obj:`torch.Tensor`): The bool mask of the visible keys for each new token, the shape is \
+                (B, 1, T_new, S + T_new).
+        Returns:
+            - out (:obj:`torch.Tensor`): Output tensor, the shape is the same as ``x`` .
+            - key (:obj:`torch.Tensor`): The keys of the new tokens, the shape is (B, N, T_new, D).
+            - value (:obj:`torch.Tensor`): The values of the new tokens, the shape is (B, N, T_new, D).
+        """
+        B, T, C = x.shape
+        N, D = self.n_heads, C // self.n_heads
+
+        q = self.q_net(x).view(B, T, N, D).transpose(1, 2)
+        k = self.k_net(x).view(B, T, N, D).transpose(1, 2)
+        v = self.v_net(x).view(B, T, N, D).transpose(1, 2)
+
+        # weights (B, N, T, S + T)
+        weights = q @ torch.cat([past_key, k], dim=2).transpose(2, 3) / math.sqrt(D)
+        weights = weights.masked_fill(~attn_mask, float('-inf'))
+        normalized_weights = F.softmax(weights, dim=-1)
+        attention = self.att_drop(normalized_weights @ torch.cat([past_value, v], dim=2))
+        attention = attention.transpose(1, 2).contiguous().view(B, T, N * D)
+
+        out = self.proj_drop(self.proj_net(attention))
+        return out, k, v
+
 
 class Block(nn.Module):
     """
@@ -156,13 +191,91 @@ class Block(nn.Module):
         # x = x + self.mlp(self.ln2(x))
         return x
 
+    def forward_incremental(
+            self, x: torch.Tensor, past_key: torch.Tensor, past_value: torch.Tensor, attn_mask: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Overview:
+            Forward computation of the new tokens with the cached keys and values of the previous tokens, \
+            refer to ``MaskedCausalAttention.forward_incremental`` for the arguments.
+        Returns:
+            - output (:obj:`torch.Tensor`): Output tensor, the shape is the same as ``x`` .
+            - key (:obj:`torch.Tensor`): The keys of the new tokens in this block.
+            - value (:obj:`torch.Tensor`): The values of the new tokens in this block.
+        """
+        attention, key, value = self.attention.forward_incremental(x, past_key, past_value, attn_mask)
+        x = self.ln1(x + attention)
+        x = self.ln2(x + self.mlp(x))
+        return x, key, value
+
+
+class DTKVCache(object):
+    """
+    Overview:
+        The per-env key/value cache of ``DecisionTransformer`` incremental inference. Each env owns a rolling window \
+        of ``context_len`` timesteps (3 tokens each: return-to-go, state and action) in every transformer block. \
+        The tokens of timestep ``t`` are stored in window slot ``t % context_len`` , so the oldest timestep is \
+        evicted in place when the window is full. Since the positional information of DT only comes from the \
+        timestep embedding added to the input tokens, the order of the slots does not matter to the attention, \
+        and only a validity mask is maintained.
+    Interfaces:
+        ``__init__``, ``reset``
+    """
+
+    def __init__(
+            self,
+            n_blocks: int,
+            batch_size: int,
+            n_heads: int,
+            head_dim: int,
+            context_len: int,
+            device: Union[str, torch.device] = 'cpu',
+            dtype: torch.dtype = torch.float32
+    ) -> None:
+        """
+        Overview:
+            Allocate the cache of all the envs.
+        Arguments:
+            - n_blocks (:obj:`int`): The number of transformer blocks.
+            - batch_size (:obj:`int`): The number of envs.
+            - n_heads (:obj:`int`): The number of attention heads.
+            - head_dim (:obj:`int`): The dimension of each attention head.
+            - context_len (:obj:`int`): The number of timesteps in the rolling window.
+            - device (:obj:`Union[str, torch.device]`): The device of the cache.
+            - dtype (:obj:`torch.dtype`): The dtype of the cached keys and values.
+        """
+        self.context_len = context_len
+        size = 3 * context_len
+        self.key = torch.zeros(n_blocks, batch_size, n_heads, size, head_dim, dtype=dtype, device=device)
+        self.value = torch.zeros_like(self.key)
+        # whether each token slot holds a token in the current window
+        self.valid = torch.zeros(batch_size, size, dtype=torch.bool, device=device)
+        # the number of timesteps of the current episode of each env
+        self.step = torch.zeros(batch_size, dtype=torch.long, device=device)
+
+    def reset(self, env_id: Optional[List[int]] = None) -> None:
+        """
+        Overview:
+            Clear the cache of the given envs (all the envs if ``env_id`` is None) for new episodes. The keys and \
+            values are not zeroed, they are just marked as invalid.
+        Arguments:
+            - env_id (:obj:`Optional[List[int]]`): The envs to be reset.
+        """
+        if env_id is None:
+            self.valid.zero_()
+            self.step.zero_()
+        else:
+            env_id = torch.as_tensor(env_id, dtype=torch.long, device=self.step.device)
+            self.valid[env_id] = False
+            self.step[env_id] = 0
+
 
 class DecisionTransformer(nn.Module):
     """
     Overview:
         The implementation of decision transformer.
     Interfaces:
-        ``__init__``, ``forward``, ``configure_optimizers``
+        ``__init__``, ``forward``, ``init_kv_cache``, ``forward_incremental``, ``configure_optimizers``
     """
 
     def __init__(
@@ -199,6 +312,9 @@ class DecisionTransformer(nn.Module):
         self.state_dim = state_dim
         self.act_dim = act_dim
         self.h_dim = h_dim
+        self.n_heads = n_heads
+        self.context_len = context_len
+        self.max_timestep = max_timestep
 
         # transformer blocks
         input_seq_len = 3 * context_len
@@ -349,6 +465,97 @@ class DecisionTransformer(nn.Module):
 
         return state_preds, action_preds, return_preds
 
+    def init_kv_cache(self, batch_size: int, device: Optional[Union[str, torch.device]] = None) -> DTKVCache:
+        """
+        Overview:
+            Create the key/value cache used by ``forward_incremental`` for ``batch_size`` envs.
+        Arguments:
+            - batch_size (:obj:`int`): The number of envs.
+            - device (:obj:`Optional[Union[str, torch.device]]`): The device of the cache, defaults to the device \
+                of the model.
+        Returns:
+            - cache (:obj:`DTKVCache`): The empty cache.
+        """
+        assert self.state_encoder is None, 'incremental inference only supports the model without state_encoder'
+        param = next(self.parameters())
+        return DTKVCache(
+            len(self.transformer),
+            batch_size,
+            self.n_heads,
+            self.h_dim // self.n_heads,
+            self.context_len,
+            device=param.device if device is None else device,
+            dtype=param.dtype
+        )
+
+    def forward_incremental(
+            self,
+            cache: DTKVCache,
+            env_id: torch.Tensor,
+            states: torch.Tensor,
+            prev_actions: torch.Tensor,
+            returns_to_go: torch.Tensor,
+    ) -> torch.Tensor:
+        """
+        Overview:
+            Predict the actions of the current timestep for a batch of envs with the cached history. Only the new \
+            tokens (the action of the last timestep, the current return-to-go and state) go through the transformer, \
+            so the cost of each step is O(context_len) rather than O(context_len^2) of ``forward`` . Before the \
+            window is full, the result is the same as ``forward`` on the whole history. After that, the oldest \
+            timestep is evicted from the cache, while the cached keys and values of the deeper blocks are kept as \
+            computed, i.e. the same as sliding window attention.
+        Arguments:
+            - cache (:obj:`DTKVCache`): The cache created by ``init_kv_cache`` , which is updated in place.
+            - env_id (:obj:`torch.Tensor`): The env ids (rows of the cache) of this batch, the shape is (B, ).
+            - states (:obj:`torch.Tensor`): The current states, the shape is (B, state_dim).
+            - prev_actions (:obj:`torch.Tensor`): The actions of the last timestep, the shape is (B, ) for \
+                discrete action and (B, act_dim) for continuous action. It is ignored for the first timestep.
+            - returns_to_go (:obj:`torch.Tensor`): The current return-to-go, the shape is (B, 1).
+        Returns:
+            - action_preds (:obj:`torch.Tensor`): The predicted actions, the shape is (B, act_dim).
+        Examples:
+            >>> cache = DT_model.init_kv_cache(batch_size=4)
+            >>> env_id = torch.arange(4)
+            >>> action_preds = DT_model.forward_incremental(cache, env_id, states, prev_actions, returns_to_go)
+        """
+        env_id = torch.as_tensor(env_id, dtype=torch.long, device=cache.step.device)
+        B, K = env_id.shape[0], cache.context_len
+        step = cache.step[env_id]
+        prev_step = (step - 1).clamp(min=0)
+        time_embeddings = self.embed_timestep(step.clamp(max=self.max_timestep - 1))
+        prev_time_embeddings = self.embed_timestep(prev_step.clamp(max=self.max_timestep - 1))
+
+        # new tokens (a_{t-1}, r_t, s_t)
+        action_embeddings = self.embed_action(prev_actions) + prev_time_embeddings
+        returns_embeddings = self.embed_rtg(returns_to_go) + time_embeddings
+        state_embeddings = self.embed_state(states) + time_embeddings
+        h = self.embed_ln(torch.stack([action_embeddings, returns_embeddings, state_embeddings], dim=1))
+
+        # token slots of the new tokens, the action of timestep t - 1 is always the 3rd token of its slot
+        slot, prev_slot = (step % K) * 3, (prev_step % K) * 3
+        position = torch.stack([prev_slot + 2, slot, slot + 1], dim=1)  # B x 3
+        ones = torch.ones_like(step, dtype=torch.bool)
+        new_valid = torch.stack([step > 0, ones, ones], dim=1)
+        # evict the tokens of timestep t - K, which share the slot with timestep t
+        valid = cache.valid[env_id]
+        valid.scatter_(1, (slot.unsqueeze(1) + torch.arange(3, device=slot.device)), False)
+        # each new token attends to the valid cached tokens and the previous valid new tokens (and itself)
+        causal = torch.tril(torch.ones(3, 3, dtype=torch.bool, device=h.device))
+        new_mask = causal & (new_valid.unsqueeze(1) | torch.eye(3, dtype=torch.bool, device=h.device))
+        attn_mask = torch.cat([valid.unsqueeze(1).expand(B, 3, valid.shape[1]), new_mask], dim=2).unsqueeze(1)
+
+        row = env_id.unsqueeze(1)
+        for i, block in enumerate(self.transformer):
+            key, value = cache.key[i], cache.value[i]
+            h, new_key, new_value = block.forward_incremental(h, key[env_id], value[env_id], attn_mask)
+            # (B, N, 3, D) -> (B, 3, N, D), the layout of advanced indexing result
+            key[row, :, position] = new_key.transpose(1, 2).to(key.dtype)
+            value[row, :, position] = new_value.transpose(1, 2).to(value.dtype)
+        valid[torch.arange(B, device=valid.device).unsqueeze(1), position] = new_valid
+        cache.valid[env_id] = valid
+        cache.step[env_id] = step + 1
+        return self.predict_action(h[:, 2])
+
     def configure_optimizers(
             self, weight_decay: float, learning_rate: float, betas: Tuple[float, float] = (0.9, 0.95)
     ) -> torch.optim.Optimizer:
@@ -128,7 +128,13 @@ class NGU(nn.Module):
                 head_hidden_size, action_shape, head_layer_num, activation=activation, norm_type=norm_type
             )
 
-    def forward(self, inputs: Dict, inference: bool = False, saved_state_timesteps: Optional[list] = None) -> Dict:
+    def forward(
+            self,
+            inputs: Dict,
+            inference: bool = False,
+            saved_state_timesteps: Optional[list] = None,
+            list_next_state: bool = True,
+    ) -> Dict:
         """
         Overview:
             Forward computation graph of NGU R2D2 network. Input observation, prev_action prev_reward_extrinsic \
@@ -142,6 +148,9 @@ class NGU(nn.Module):
             - saved_state_timesteps: (:obj:'Optional[list]'): When inference is False, \
                 we unroll the sequence transitions, then we would save rnn hidden states at timesteps \
                 that are listed in list saved_state_timesteps.
+            - list_next_state (:obj:`bool`): When inference is True, whether to return the next state of each \
+                sample in a list, or the batched state of all the samples, which is used by ``HiddenStateWrapper`` \
+                with ``tensor_state`` .
         Returns:
             - outputs (:obj:`Dict`):
                 Run ``MLP`` with ``DRQN`` setups and return the result prediction dictionary.
@@ -181,7 +190,7 @@ class NGU(nn.Module):
             x_a_r_beta = torch.cat(
                 [x, prev_action_onehot, prev_reward_extrinsic, beta_onehot], dim=-1
             )  # shape (1, H, 1+env_num+action_dim)
-            x, next_state = self.rnn(x_a_r_beta.to(torch.float32), prev_state)
+            x, next_state = self.rnn(x_a_r_beta.to(torch.float32), prev_state, list_next_state=list_next_state)
             # TODO(pu): x, next_state = self.rnn(x, prev_state)
             x = x.squeeze(0)
             x = self.head(x)
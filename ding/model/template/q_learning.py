@@ -940,7 +940,13 @@ class DRQN(nn.Module):
                 head_hidden_size, action_shape, head_layer_num, activation=activation, norm_type=norm_type
             )
 
-    def forward(self, inputs: Dict, inference: bool = False, saved_state_timesteps: Optional[list] = None) -> Dict:
+    def forward(
+            self,
+            inputs: Dict,
+            inference: bool = False,
+            saved_state_timesteps: Optional[list] = None,
+            list_next_state: bool = True,
+    ) -> Dict:
         """
         Overview:
             DRQN forward computation graph, input observation tensor to predict q_value.
@@ -950,6 +956,9 @@ class DRQN(nn.Module):
                 transition, otherwise, we unroll the eentire sequence transitions.
             - saved_state_timesteps: (:obj:'Optional[list]'): When inference is False, we unroll the sequence \
                 transitions, then we would use this list to indicate how to save and return hidden state.
+            - list_next_state (:obj:`bool`): When inference is True, whether to return the next state of each \
+                sample in a list, or the batched state of all the samples (e.g. {'h': (1, B, H), 'c': (1, B, H)} of \
+                LSTM), which is used by ``HiddenStateWrapper`` with ``tensor_state`` .
         ArgumentsKeys:
             - obs (:obj:`torch.Tensor`): The raw observation tensor.
             - prev_state (:obj:`list`): The previous rnn state tensor, whose structure depends on ``lstm_type``.
@@ -985,7 +994,7 @@ class DRQN(nn.Module):
                 a = x
             x = x.unsqueeze(0)  # for rnn input, put the seq_len of x as 1 instead of none.
             # prev_state: DataType: List[Tuple[torch.Tensor]]; Initially, it is a list of None
-            x, next_state = self.rnn(x, prev_state)
+            x, next_state = self.rnn(x, prev_state, list_next_state=list_next_state)
             x = x.squeeze(0)  # to delete the seq_len dim to match head network input
             if self.res_link:
                 x = x + a
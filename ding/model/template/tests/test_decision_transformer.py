@@ -1,3 +1,4 @@
+import timeit
 import pytest
 from itertools import product
 import torch
@@ -101,3 +102,89 @@ def test_decision_transformer(action_space, state_encoder):
                 DT_model.embed_state
             ]
         )
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize('action_space', action_space)
+def test_decision_transformer_incremental(action_space):
+    B, T, state_dim, act_dim, L = 3, 4, 3, 2, 10
+    continuous = action_space == 'continuous'
+    states = torch.randn([B, L, state_dim])
+    returns_to_go = torch.randn([B, L, 1])
+    if continuous:
+        actions = torch.randn([B, L, act_dim])
+    else:
+        actions = torch.randint(0, act_dim, [B, L])
+    for n_blocks in [1, 3]:
+        DT_model = DecisionTransformer(
+            state_dim=state_dim,
+            act_dim=act_dim,
+            n_blocks=n_blocks,
+            h_dim=8,
+            context_len=T,
+            n_heads=2,
+            drop_p=0.1,
+            continuous=continuous
+        ).eval()
+        cache = DT_model.init_kv_cache(B)
+        with torch.no_grad():
+            for t in range(L):
+                action_preds = DT_model.forward_incremental(
+                    cache, torch.arange(B), states[:, t], actions[:, max(t - 1, 0)], returns_to_go[:, t]
+                )
+                assert action_preds.shape == (B, act_dim)
+                # the same as full forward before the window is full, and always the same for one block model
+                if t < T or n_blocks == 1:
+                    start = max(0, t - T + 1)
+                    timesteps = torch.arange(start, t + 1).repeat(B, 1)
+                    _, full_action_preds, _ = DT_model.forward(
+                        timesteps, states[:, start:t + 1], actions[:, start:t + 1], returns_to_go[:, start:t + 1]
+                    )
+                    torch.testing.assert_close(action_preds, full_action_preds[:, -1])
+
+            # per-env cache: step env 1 alone after resetting it, the result is the same as a fresh cache
+            cache.reset([1])
+            fresh_cache = DT_model.init_kv_cache(1)
+            for t in range(3):
+                env_id = torch.tensor([1])
+                action_preds = DT_model.forward_incremental(
+                    cache, env_id, states[1:2, t], actions[1:2, max(t - 1, 0)], returns_to_go[1:2, t]
+                )
+                fresh_action_preds = DT_model.forward_incremental(
+                    fresh_cache, torch.tensor([0]), states[1:2, t], actions[1:2, max(t - 1, 0)], returns_to_go[1:2, t]
+                )
+                torch.testing.assert_close(action_preds, fresh_action_preds)
+            assert cache.step.tolist() == [L, 3, L]
+
+
+@pytest.mark.benchmark
+def test_decision_transformer_incremental_benchmark():
+    B, T, state_dim, act_dim, steps = 8, 30, 17, 6, 100
+    DT_model = DecisionTransformer(
+        state_dim=state_dim, act_dim=act_dim, n_blocks=3, h_dim=128, context_len=T, n_heads=1, drop_p=0.1
+    ).eval()
+    states = torch.randn([B, steps, state_dim])
+    returns_to_go = torch.randn([B, steps, 1])
+    actions = torch.randint(0, act_dim, [B, steps])
+    timesteps = torch.arange(steps).repeat(B, 1)
+
+    def full_window():
+        for t in range(steps):
+            window = slice(max(0, t - T + 1), t + 1)
+            DT_model.forward(timesteps[:, window], states[:, window], actions[:, window], returns_to_go[:, window])
+
+    def incremental():
+        cache = DT_model.init_kv_cache(B)
+        for t in range(steps):
+            DT_model.forward_incremental(
+                cache, torch.arange(B), states[:, t], actions[:, max(t - 1, 0)], returns_to_go[:, t]
+            )
+
+    with torch.no_grad():
+        full_time = min(timeit.repeat(full_window, number=1, repeat=3))
+        incremental_time = min(timeit.repeat(incremental, number=1, repeat=3))
+    print(
+        'DT eval per step, full window: {:.3f}ms, incremental: {:.3f}ms'.format(
+            full_time * 1000 / steps, incremental_time * 1000 / steps
+        )
+    )
@@ -1,4 +1,5 @@
 import pytest
+import time
 
 import torch
 import numpy as np
@@ -114,3 +115,83 @@ class TestMCMC:
         obs = torch.randn(B, O)
         action = self.opt.infer(obs, self.ebm)
         assert action.shape == (B, A)
+
+
+@pytest.mark.unittest
+def test_energy_of_dim():
+    obs = torch.randn(4, 16, O)
+    action = torch.randn(4, 16, A)
+    arebm = AutoregressiveEBM(O, A)
+    energy = arebm(obs, action)
+    for j in range(A):
+        assert torch.allclose(arebm.forward_dim(obs, action, j), energy[..., j])
+        assert torch.allclose(AutoRegressiveDFO._energy_of_dim(obs, action, j, arebm), energy[..., j])
+
+
+@pytest.mark.unittest
+def test_mcmc_early_stop():
+    obs = torch.randn(4, 16, O)
+    action = torch.rand(4, 16, A)
+    ebm = EBM(O, A)
+    ebm.requires_grad_(False)
+    de_dact, energy = MCMC._gradient_wrt_act(obs, action, ebm, return_energy=True)
+    assert torch.allclose(de_dact, MCMC._gradient_wrt_act(obs, action, ebm))
+    assert torch.allclose(energy, ebm(obs, action))
+    ebm.requires_grad_(True)
+
+    opt = MCMC(iters=10, early_stop_tol=float('inf'))
+    opt.set_action_bounds(np.stack([np.zeros(A), np.ones(A)], axis=0))
+    steps = []
+    update = opt._langevin_update
+    opt._langevin_update = lambda *args: steps.append(1) or update(*args)
+    new_action = opt._langevin_action_given_obs(obs, action, ebm)
+    # the first step is always run, then the energy change is always less than inf
+    assert new_action.shape == (4, 16, A) and len(steps) == 1
+    opt.early_stop_tol = None
+    steps.clear()
+    opt._langevin_action_given_obs(obs, action, ebm)
+    assert len(steps) == 10
+    assert all(p.requires_grad for p in ebm.parameters())
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('obs_shape, action_shape', [(11, 3), (60, 9)])  # hopper, kitchen
+def test_ibc_eval_latency(obs_shape, action_shape):
+    obs = torch.randn(5, obs_shape)
+    action_bounds = np.stack([-np.ones(action_shape), np.ones(action_shape)], axis=0)
+    arebm = AutoregressiveEBM(obs_shape, action_shape, hidden_size=128, hidden_layer_num=2)
+
+    class FullForwardEBM(torch.nn.Module):
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, obs, action):
+            return self.model(obs, action)
+
+    opt = AutoRegressiveDFO(inference_samples=1024)
+    opt.set_action_bounds(action_bounds)
+    start = time.time()
+    opt.infer(obs, FullForwardEBM(arebm))
+    t_full = time.time() - start
+    start = time.time()
+    opt.infer(obs, arebm)
+    t_dim = time.time() - start
+
+    ebm = EBM(obs_shape, action_shape, hidden_size=128, hidden_layer_num=2)
+    opt = MCMC(iters=50, inference_samples=512)
+    opt.set_action_bounds(action_bounds)
+    start = time.time()
+    opt.infer(obs, ebm)
+    t_mcmc = time.time() - start
+    opt.early_stop_tol = 1e-3
+    start = time.time()
+    opt.infer(obs, ebm)
+    t_mcmc_early_stop = time.time() - start
+    print(
+        'ardfo full forward: {:.4f}s, ardfo forward_dim: {:.4f}s, mcmc: {:.4f}s, mcmc early stop: {:.4f}s'.format(
+            t_full, t_dim, t_mcmc, t_mcmc_early_stop
+        )
+    )
+    assert t_dim < t_full
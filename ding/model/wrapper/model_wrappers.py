@@ -5,7 +5,7 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 from torch.distributions import Categorical, Independent, Normal
-from ding.torch_utils import get_tensor_data, zeros_like
+from ding.torch_utils import get_tensor_data, zeros_like, RingMemory, to_fp32
 from ding.rl_utils import create_noise_generator
 from ding.utils.data import default_collate
 
@@ -109,6 +109,7 @@ class HiddenStateWrapper(IModelWrapper):
             state_num: int,
             save_prev_state: bool = False,
             init_fn: Callable = lambda: None,
+            tensor_state: bool = False,
     ) -> None:
         """
         Overview:
@@ -121,10 +122,20 @@ class HiddenStateWrapper(IModelWrapper):
             - save_prev_state (:obj:`bool`): Whether to output the prev state in output.
             - init_fn (:obj:`Callable`): The function which is used to init every hidden state when init and reset, \
                 default return None for hidden states.
+            - tensor_state (:obj:`bool`): Whether to store the states of all the samples in contiguous tensors \
+                instead of a python dict of per-sample states. It only supports the dict states (e.g. ``h`` and \
+                ``c`` of LSTM) in inference (i.e. collect and eval), and the states are always zero-initialized.
 
         .. note::
             1. This helper must deal with an actual batch with some parts of samples, e.g: 6 samples of state_num 8.
             2. This helper must deal with the single sample state reset.
+            3. In ``tensor_state`` mode, each kind of state is stored in one (num_layers, state_num, hidden_size) \
+                tensor on the device of the model output. The states of a batch are gathered by ``index_select`` and \
+                passed to the model as the batched dict (e.g. {'h': (num_layers, B, hidden_size), ...}), which is \
+                supported by the RNN wrappers in ``ding.torch_utils.network.rnn`` . The next states are scattered \
+                back by ``index_copy_`` and reset by ``index_fill_`` . The model should return the batched next \
+                states (e.g. ``DRQN`` with ``list_next_state=False`` ), the list of per-sample states is also \
+                accepted but it is concatenated again at every step.
         """
         super().__init__(model)
         self._state_num = state_num
@@ -133,6 +144,10 @@ class HiddenStateWrapper(IModelWrapper):
         self._state = {i: init_fn() for i in range(state_num)}
         self._save_prev_state = save_prev_state
         self._init_fn = init_fn
+        self._tensor_state = tensor_state
+        # tensor-backed states, map state name to a (num_layers, state_num, hidden_size) tensor, allocated lazily
+        # when the first state is stored
+        self._state_tensor = None
 
     def forward(self, data, **kwargs):
         state_id = kwargs.pop('data_id', None)
@@ -144,10 +159,14 @@ class HiddenStateWrapper(IModelWrapper):
             self.after_forward(h, state_info, valid_id)  # this is to store the 'next hidden state' for each time step
         if self._save_prev_state:
             prev_state = get_tensor_data(data['prev_state'])
+            if isinstance(prev_state, dict):
+                # split the batched states of tensor_state mode for compatibility
+                prev_state = [{k: v[:, i:i + 1] for k, v in prev_state.items()} for i in range(len(state_info))]
             # for compatibility, because of the incompatibility between None and torch.Tensor
             for i in range(len(prev_state)):
                 if prev_state[i] is None:
-                    prev_state[i] = zeros_like(h[0])
+                    prev_state[i] = {k: zeros_like(v[:, :1]) for k, v in h.items()} if isinstance(h, dict) else \
+                        zeros_like(h[0])
             output['prev_state'] = prev_state
         return output
 
@@ -159,6 +178,8 @@ class HiddenStateWrapper(IModelWrapper):
             return self._model.reset(*args, **kwargs)
 
     def reset_state(self, state: Optional[list] = None, state_id: Optional[list] = None) -> None:
+        if self._tensor_state:
+            return self._reset_state_tensor(state, state_id)
         if state_id is None:  # train: init all states
             state_id = [i for i in range(self._state_num)]
         if state is None:  # collect: init state that are done
@@ -171,11 +192,21 @@ class HiddenStateWrapper(IModelWrapper):
         if state_id is None:
             state_id = [i for i in range(self._state_num)]
 
+        if self._tensor_state:
+            state_info = {idx: None for idx in state_id}
+            if self._state_tensor is None:
+                data['prev_state'] = [None for _ in state_id]
+            else:
+                index = self._state_index(state_id)
+                data['prev_state'] = {k: v.index_select(1, index) for k, v in self._state_tensor.items()}
+            return data, state_info
         state_info = {idx: self._state[idx] for idx in state_id}
         data['prev_state'] = list(state_info.values())
         return data, state_info
 
     def after_forward(self, h: Any, state_info: dict, valid_id: Optional[list] = None) -> None:
+        if self._tensor_state:
+            return self._after_forward_tensor(h, state_info, valid_id)
         assert len(h) == len(state_info), '{}/{}'.format(len(h), len(state_info))
         for i, idx in enumerate(state_info.keys()):
             if valid_id is None:
@@ -184,6 +215,59 @@ class HiddenStateWrapper(IModelWrapper):
                 if idx in valid_id:
                     self._state[idx] = h[i]
 
+    def _state_index(self, state_id: list) -> torch.Tensor:
+        device = next(iter(self._state_tensor.values())).device
+        return torch.as_tensor(list(state_id), dtype=torch.long, device=device)
+
+    def _batch_state(self, state: Union[list, dict]) -> Dict[str, torch.Tensor]:
+        # convert a list of per-sample dict states (None means zeros) to the batched dict state
+        if isinstance(state, dict):
+            return state
+        elem = next(s for s in state if s is not None)
+        assert isinstance(elem, dict), 'tensor_state only supports dict state, but got: {}'.format(type(elem))
+        zeros = {k: torch.zeros_like(v) for k, v in elem.items()}
+        return {k: torch.cat([zeros[k] if s is None else s[k] for s in state], dim=1) for k in zeros}
+
+    def _store_state_tensor(self, state: Dict[str, torch.Tensor], state_id: list) -> None:
+        if self._state_tensor is None:
+            self._state_tensor = {
+                k: torch.zeros(v.shape[0], self._state_num, *v.shape[2:], dtype=v.dtype, device=v.device)
+                for k, v in state.items()
+            }
+        index = self._state_index(state_id)
+        for k, v in self._state_tensor.items():
+            v.index_copy_(1, index, state[k].detach().to(v.device))
+
+    def _after_forward_tensor(self, h: Union[list, dict], state_info: dict, valid_id: Optional[list] = None) -> None:
+        state_id = list(state_info.keys())
+        if not isinstance(h, dict):
+            assert len(h) == len(state_id), '{}/{}'.format(len(h), len(state_id))
+        h = self._batch_state(h)
+        if valid_id is not None:
+            mask = [idx in valid_id for idx in state_id]
+            state_id = [idx for idx, m in zip(state_id, mask) if m]
+            if len(state_id) == 0:
+                return
+            mask = torch.as_tensor(mask, device=next(iter(h.values())).device)
+            h = {k: v[:, mask] for k, v in h.items()}
+        self._store_state_tensor(h, state_id)
+
+    def _reset_state_tensor(self, state: Optional[Union[list, dict]] = None, state_id: Optional[list] = None) -> None:
+        if state_id is None:
+            state_id = [i for i in range(self._state_num)]
+        if state is None:
+            # zero the states of the done samples in place
+            if self._state_tensor is not None:
+                index = self._state_index(state_id)
+                for v in self._state_tensor.values():
+                    v.index_fill_(1, index, 0.)
+            return
+        if not isinstance(state, dict):
+            assert len(state) == len(state_id), '{}/{}'.format(len(state), len(state_id))
+            if all([s is None for s in state]):
+                return self._reset_state_tensor(None, state_id)
+        self._store_state_tensor(self._batch_state(state), state_id)
+
 
 class TransformerInputWrapper(IModelWrapper):
 
@@ -336,6 +420,7 @@ class TransformerMemoryWrapper(IModelWrapper):
             self,
             model: Any,
             batch_size: int,
+            ring_buffer: bool = False,
     ) -> None:
         """
         Overview:
@@ -346,12 +431,30 @@ class TransformerMemoryWrapper(IModelWrapper):
         Arguments:
             - model (:obj:`Any`): Wrapped model class, should contain forward method.
             - batch_size (:obj:`int`): Memory batch size.
+            - ring_buffer (:obj:`bool`): Whether to keep the memory in a ``RingMemory`` owned by this wrapper, which \
+                is handed to the model without copy and updated in place at each forward, and whose batch entries \
+                can be reset in place.
         """
         super().__init__(model)
         # shape (layer_num, memory_len, bs, embedding_dim)
         self._model.reset_memory(batch_size=batch_size)
-        self.memory = self._model.get_memory()
-        self.mem_shape = self.memory.shape
+        memory = self._model.get_memory()
+        self.mem_shape = memory.shape
+        self._ring_memory = RingMemory(memory=torch.zeros(self.mem_shape)) if ring_buffer else None
+        self._memory = memory
+
+    @property
+    def memory(self) -> torch.Tensor:
+        if self._ring_memory is not None:
+            return self._ring_memory.get()
+        return self._memory
+
+    @memory.setter
+    def memory(self, memory: torch.Tensor) -> None:
+        if self._ring_memory is not None:
+            self._ring_memory.init(memory)
+        else:
+            self._memory = memory
 
     def forward(self, *args, **kwargs) -> Dict[str, torch.Tensor]:
         """
@@ -361,6 +464,9 @@ class TransformerMemoryWrapper(IModelWrapper):
         Returns:
             - Output of the forward method.
         """
+        if self._ring_memory is not None:
+            self._model.reset_memory(state=self._ring_memory)
+            return self._model.forward(*args, **kwargs)
         self._model.reset_memory(state=self.memory)
         out = self._model.forward(*args, **kwargs)
         self.memory = self._model.get_memory()
@@ -380,6 +486,9 @@ class TransformerMemoryWrapper(IModelWrapper):
         Overview:
             Reset specific batch of the memory, batch ids are specified in 'state_id'
         """
+        if self._ring_memory is not None:
+            self._ring_memory.reset_entry(state_id)
+            return
         for _id in state_id:
             self.memory[:, :, _id] = torch.zeros((self.mem_shape[-1]))
 
@@ -946,6 +1055,36 @@ class TargetNetworkWrapper(IModelWrapper):
             self._update_count = target_update_count
 
 
+class AutocastWrapper(IModelWrapper):
+    """
+    Overview:
+        Run the forward of the wrapped model in ``torch.autocast`` with the low precision dtype (e.g. bfloat16) for \
+        mixed precision training, and cast the low precision outputs back to float32, so that the loss functions \
+        (e.g. ``q_nstep_td_error`` and ``ppo_error``) are still computed in float32. The parameters of model are kept \
+        in float32 as the master weights updated by optimizer, and their gradients are also float32.
+    Interfaces:
+        ``__init__``, ``forward``.
+    """
+
+    def __init__(self, model: Any, dtype: torch.dtype = torch.bfloat16, device_type: str = 'cpu') -> None:
+        """
+        Overview:
+            Initialize the autocast wrapper.
+        Arguments:
+            - model (:obj:`Any`): The wrapped model.
+            - dtype (:obj:`torch.dtype`): The low precision dtype of autocast, torch.bfloat16 or torch.float16.
+            - device_type (:obj:`str`): The device type of autocast, 'cpu' or 'cuda'.
+        """
+        super().__init__(model)
+        self._dtype = dtype
+        self._device_type = device_type
+
+    def forward(self, *args, **kwargs) -> Any:
+        with torch.autocast(self._device_type, dtype=self._dtype):
+            output = self._model.forward(*args, **kwargs)
+        return to_fp32(output)
+
+
 class TeacherNetworkWrapper(IModelWrapper):
     """
     Overview:
@@ -978,6 +1117,7 @@ wrapper_name_map = {
     'transformer_memory': TransformerMemoryWrapper,
     # model wrapper
     'target': TargetNetworkWrapper,
+    'autocast': AutocastWrapper,
     'teacher': TeacherNetworkWrapper,
     'combination_argmax_sample': CombinationArgmaxSampleWrapper,
     'combination_multinomial_sample': CombinationMultinomialSampleWrapper,
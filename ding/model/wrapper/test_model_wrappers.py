@@ -190,8 +190,8 @@ class TempLSTM(torch.nn.Module):
         super(TempLSTM, self).__init__()
         self.model = get_lstm(lstm_type='pytorch', input_size=36, hidden_size=32, num_layers=2, norm_type=None)
 
-    def forward(self, data):
-        output, next_state = self.model(data['f'], data['prev_state'], list_next_state=True)
+    def forward(self, data, list_next_state=True):
+        output, next_state = self.model(data['f'], data['prev_state'], list_next_state=list_next_state)
         return {'output': output, 'next_state': next_state}
 
 
@@ -236,6 +236,35 @@ class TestModelWrappers:
         model.reset()
         assert all([isinstance(s, type(None)) for s in model._state.values()])
 
+    def test_hidden_state_wrapper_tensor_state(self):
+        model = TempLSTM()
+        state_num = 4
+        list_model = model_wrap(model, wrapper_name='hidden_state', state_num=state_num, save_prev_state=True)
+        tensor_model = model_wrap(
+            model, wrapper_name='hidden_state', state_num=state_num, save_prev_state=True, tensor_state=True
+        )
+        for data_id, reset_id in [(None, None), ([0, 1, 3], [1]), ([1, 2], None), ([0, 1, 2, 3], [0, 3]), (None, None)]:
+            data = {'f': torch.randn(2, state_num if data_id is None else len(data_id), 36)}
+            output = list_model.forward({'f': data['f']}, data_id=data_id)
+            # the batched next states are stored without splitting
+            tensor_output = tensor_model.forward({'f': data['f']}, data_id=data_id, list_next_state=False)
+            assert torch.equal(output['output'], tensor_output['output'])
+            assert len(tensor_output['prev_state']) == len(output['prev_state'])
+            for s, tensor_s in zip(output['prev_state'], tensor_output['prev_state']):
+                assert tensor_s['h'].shape == (2, 1, 32)
+                assert torch.equal(s['h'], tensor_s['h']) and torch.equal(s['c'], tensor_s['c'])
+            if reset_id is not None:
+                list_model.reset(data_id=reset_id)
+                tensor_model.reset(data_id=reset_id)
+        assert tensor_model._state_tensor['h'].shape == (2, state_num, 32)
+        assert torch.equal(tensor_model._state_tensor['c'][:, 2:3], list_model._state[2]['c'])
+        # set the states explicitly, and reset all the states
+        state = [{'h': torch.randn(2, 1, 32), 'c': torch.randn(2, 1, 32)} for _ in range(state_num)]
+        tensor_model.reset(data_id=None, state=state)
+        assert torch.equal(tensor_model._state_tensor['h'][:, 3:4], state[3]['h'])
+        tensor_model.reset()
+        assert tensor_model._state_tensor['h'].abs().sum() == 0
+
     def test_target_network_wrapper(self):
 
         model = TempMLP()
@@ -561,6 +590,25 @@ class TestModelWrappers:
         assert sum(new_memory2[:, :-16].flatten()) == 0
         assert torch.all(torch.eq(new_memory1[:, -8:], new_memory2[:, -16:-8]))
 
+    def test_transformer_memory_wrapper_ring_buffer(self):
+        seq_len, bs, obs_shape = 3, 8, 32
+        layer_num, memory_len, emb_dim = 3, 4, 4
+        model = GTrXL(input_dim=obs_shape, embedding_dim=emb_dim, memory_len=memory_len, layer_num=layer_num)
+        model1 = model_wrap(model, wrapper_name='transformer_memory', batch_size=bs)
+        model2 = model_wrap(model, wrapper_name='transformer_memory', batch_size=bs, ring_buffer=True)
+        for _ in range(3):
+            inputs = torch.randn((seq_len, bs, obs_shape))
+            out1 = model1.forward(inputs)
+            out2 = model2.forward(inputs)
+            torch.testing.assert_close(out1['logit'], out2['logit'])
+            torch.testing.assert_close(model1.memory, model2.memory)
+        model2.reset(data_id=[0, 5])
+        assert sum(model2.memory[:, :, 0].flatten()) == 0 and sum(model2.memory[:, :, 5].flatten()) == 0
+        assert sum(model2.memory[:, :, 1].flatten()) != 0
+        model2.show_memory_occupancy()
+        model2.reset()
+        assert sum(model2.memory.flatten()) == 0
+
     def test_combination_argmax_sample_wrapper(self):
         model = model_wrap(ActorMLP(), wrapper_name='combination_argmax_sample')
         data = {'obs': torch.randn(4, 3)}
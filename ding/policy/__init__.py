@@ -1,59 +1,59 @@
-from .base_policy import Policy, CommandModePolicy, create_policy, get_policy_cls
-from .common_utils import single_env_forward_wrapper, single_env_forward_wrapper_ttorch, default_preprocess_learn
-from .dqn import DQNSTDIMPolicy, DQNPolicy
-from .mdqn import MDQNPolicy
-from .iqn import IQNPolicy
-from .fqf import FQFPolicy
-from .qrdqn import QRDQNPolicy
-from .c51 import C51Policy
-from .rainbow import RainbowDQNPolicy
-from .ddpg import DDPGPolicy
-from .d4pg import D4PGPolicy
-from .td3 import TD3Policy
-from .td3_vae import TD3VAEPolicy
-from .td3_bc import TD3BCPolicy
-from .dt import DTPolicy
-
-from .pg import PGPolicy
-from .a2c import A2CPolicy
-from .ppo import PPOPolicy, PPOPGPolicy, PPOOffPolicy
-from .sac import SACPolicy, DiscreteSACPolicy, SQILSACPolicy
-from .cql import CQLPolicy, DiscreteCQLPolicy
-from .edac import EDACPolicy
-from .impala import IMPALAPolicy
-from .ngu import NGUPolicy
-from .r2d2 import R2D2Policy
-from .r2d2_gtrxl import R2D2GTrXLPolicy
-from .ppg import PPGPolicy, PPGOffPolicy
-from .sqn import SQNPolicy
-from .bdq import BDQPolicy
-
-from .qmix import QMIXPolicy
-from .wqmix import WQMIXPolicy
-from .coma import COMAPolicy
-from .collaq import CollaQPolicy
-from .atoc import ATOCPolicy
-from .acer import ACERPolicy
-from .qtran import QTRANPolicy
-
-from .il import ILPolicy
-
-from .r2d3 import R2D3Policy
-
-from .command_mode_policy_instance import *
-
-from .policy_factory import PolicyFactory, get_random_policy
-from .pdqn import PDQNPolicy
-
-from .bc import BehaviourCloningPolicy
-from .ibc import IBCPolicy
-
-from .pc import ProcedureCloningBFSPolicy
-
-from .bcq import BCQPolicy
-from .qgpo import QGPOPolicy
-
-# new-type policy
-from .ppof import PPOFPolicy
-from .prompt_pg import PromptPGPolicy
-from .happo import HAPPOPolicy
+from ding.utils import POLICY_REGISTRY
+from ding.utils.lazy_import_helper import lazy_import_attrs
+
+# Policies are imported lazily (PEP 562), the registry entries are resolved on the first ``POLICY_REGISTRY.get``.
+_submod_attrs = {
+    '.base_policy': ['Policy', 'CommandModePolicy', 'create_policy', 'get_policy_cls'],
+    '.common_utils': ['single_env_forward_wrapper', 'single_env_forward_wrapper_ttorch', 'default_preprocess_learn'],
+    '.dqn': ['DQNSTDIMPolicy', 'DQNPolicy'],
+    '.mdqn': ['MDQNPolicy'],
+    '.iqn': ['IQNPolicy'],
+    '.fqf': ['FQFPolicy'],
+    '.qrdqn': ['QRDQNPolicy'],
+    '.c51': ['C51Policy'],
+    '.rainbow': ['RainbowDQNPolicy'],
+    '.ddpg': ['DDPGPolicy'],
+    '.d4pg': ['D4PGPolicy'],
+    '.td3': ['TD3Policy'],
+    '.td3_vae': ['TD3VAEPolicy'],
+    '.td3_bc': ['TD3BCPolicy'],
+    '.dt': ['DTPolicy'],
+    '.pg': ['PGPolicy'],
+    '.a2c': ['A2CPolicy'],
+    '.ppo': ['PPOPolicy', 'PPOPGPolicy', 'PPOOffPolicy'],
+    '.sac': ['SACPolicy', 'DiscreteSACPolicy', 'SQILSACPolicy'],
+    '.cql': ['CQLPolicy', 'DiscreteCQLPolicy'],
+    '.edac': ['EDACPolicy'],
+    '.impala': ['IMPALAPolicy'],
+    '.ngu': ['NGUPolicy'],
+    '.r2d2': ['R2D2Policy'],
+    '.r2d2_gtrxl': ['R2D2GTrXLPolicy'],
+    '.ppg': ['PPGPolicy', 'PPGOffPolicy'],
+    '.sqn': ['SQNPolicy'],
+    '.bdq': ['BDQPolicy'],
+    '.qmix': ['QMIXPolicy'],
+    '.wqmix': ['WQMIXPolicy'],
+    '.coma': ['COMAPolicy'],
+    '.collaq': ['CollaQPolicy'],
+    '.atoc': ['ATOCPolicy'],
+    '.acer': ['ACERPolicy'],
+    '.qtran': ['QTRANPolicy'],
+    '.il': ['ILPolicy'],
+    '.r2d3': ['R2D3Policy'],
+    '.policy_factory': ['PolicyFactory', 'get_random_policy'],
+    '.pdqn': ['PDQNPolicy'],
+    '.bc': ['BehaviourCloningPolicy'],
+    '.ibc': ['IBCPolicy'],
+    '.pc': ['ProcedureCloningBFSPolicy'],
+    '.bcq': ['BCQPolicy'],
+    '.qgpo': ['QGPOPolicy'],
+    # new-type policy
+    '.ppof': ['PPOFPolicy'],
+    '.prompt_pg': ['PromptPGPolicy'],
+    '.happo': ['HAPPOPolicy'],
+}
+
+__getattr__, __dir__, __all__, _import_all = lazy_import_attrs(
+    __name__, _submod_attrs, star_submodules=['.command_mode_policy_instance']
+)
+POLICY_REGISTRY.register_lazy_loader(_import_all)
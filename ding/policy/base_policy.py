@@ -1,12 +1,14 @@
-from typing import Optional, List, Dict, Any, Tuple, Union
+from typing import Optional, List, Dict, Any, Tuple, Union, Callable
 from abc import ABC, abstractmethod
 from collections import namedtuple
 from easydict import EasyDict
 
 import copy
 import torch
+from ditk import logging
 
-from ding.model import create_model
+from ding.model import create_model, model_wrap, IModelWrapper
+from ding.torch_utils import compile_fn, compile_model, QuantizedActor, LossScaler, get_autocast_dtype
 from ding.utils import import_module, allreduce, broadcast, get_rank, allreduce_async, synchronize, deep_merge_dicts, \
     POLICY_REGISTRY
 
@@ -80,6 +82,9 @@ class Policy(ABC):
         ]
     )
     total_field = set(['learn', 'collect', 'eval'])
+    # Whether the ``_forward_learn`` defined in this class scales the loss with ``self._loss_scaler`` and supports
+    # ``cfg.learn.mixed_precision``, which isn't inherited by the subclasses overriding ``_forward_learn``.
+    _support_mixed_precision = False
     config = dict(
         # (bool) Whether the learning policy is the same as the collecting data policy (on-policy).
         on_policy=False,
@@ -91,6 +96,16 @@ class Policy(ABC):
         bp_update_sync=True,
         # (bool) Whether to enable infinite trajectory length in data collecting.
         traj_len_inf=False,
+        # (bool) Whether to compile the model forward and the loss functions of learn mode with ``torch.compile``.
+        # It falls back to eager mode if ``torch.compile`` is not available or fails on the model.
+        compile=False,
+        # (str) The backend of ``torch.compile``, ``inductor`` generates C++/OpenMP kernels on CPU and triton kernels
+        # on GPU, ``aot_eager`` only traces the graph without code generation.
+        compile_backend='inductor',
+        # (bool) Whether to use a quantized copy of the model in collect mode (dynamic int8 for Linear/LSTM and
+        # bfloat16 for conv layers), which speeds up the action selection of CPU collectors. The copy is rebuilt
+        # automatically when the weights of the model change. Only valid when cuda is False.
+        quantize_collect_model=False,
         # neural network model config
         model=dict(),
     )
@@ -124,6 +139,8 @@ class Policy(ABC):
         """
         self._cfg = cfg
         self._on_policy = self._cfg.on_policy
+        # the compiled versions of the functions passed to ``_compiled_fn``
+        self._compiled_fn_cache = {}
         if enable_field is None:
             self._enable_field = self.total_field
         else:
@@ -156,9 +173,21 @@ class Policy(ABC):
             self._rank = 0
             self._device = 'cpu'
 
+        if 'learn' in self._enable_field:
+            learn_cfg = self._cfg.get('learn', {})
+            if get_autocast_dtype(learn_cfg.get('mixed_precision', None)) is not None and \
+                    not self._is_mixed_precision_supported():
+                raise NotImplementedError("{} doesn't support mixed precision training".format(type(self).__name__))
+            self._loss_scaler = LossScaler.from_config(
+                learn_cfg.get('mixed_precision', None), learn_cfg.get('loss_scale', None)
+            )
         # call the initialization method of different modes, such as ``_init_learn``, ``_init_collect``, ``_init_eval``
         for field in self._enable_field:
             getattr(self, '_init_' + field)()
+        if 'learn' in self._enable_field and get_autocast_dtype(learn_cfg.get('mixed_precision', None)) is not None:
+            self._autocast_learn_model()
+        if 'collect' in self._enable_field and self._cfg.get('quantize_collect_model', False):
+            self._quantize_collect_model()
 
     def _init_multi_gpu_setting(self, model: torch.nn.Module, bp_update_sync: bool) -> None:
         """
@@ -209,6 +238,10 @@ class Policy(ABC):
                 add distinct wrappers and plugins to the model, which is used to train, collect and evaluate.
         Raises:
             - RuntimeError: If the input model is not None and is not an instance of ``torch.nn.Module``.
+
+        .. note::
+            If ``cfg.compile`` is True, the ``forward`` of the model is compiled by ``torch.compile`` in place, \
+            refer to ``ding.torch_utils.compile_model`` for details.
         """
         if model is None:
             model_cfg = cfg.model
@@ -216,12 +249,84 @@ class Policy(ABC):
                 m_type, import_names = self.default_model()
                 model_cfg.type = m_type
                 model_cfg.import_names = import_names
-            return create_model(model_cfg)
-        else:
-            if isinstance(model, torch.nn.Module):
-                return model
-            else:
-                raise RuntimeError("invalid model: {}".format(type(model)))
+            model = create_model(model_cfg)
+        elif not isinstance(model, torch.nn.Module):
+            raise RuntimeError("invalid model: {}".format(type(model)))
+        if cfg.get('compile', False):
+            model = compile_model(model, backend=cfg.get('compile_backend', 'inductor'))
+        return model
+
+    def _compiled_fn(self, fn: Callable) -> Callable:
+        """
+        Overview:
+            Return the compiled version of ``fn`` (usually a loss function in ``ding.rl_utils``) if ``cfg.compile`` \
+            is True, otherwise return ``fn`` itself. The compiled function is cached in policy.
+        Arguments:
+            - fn (:obj:`Callable`): The function to be compiled.
+        Returns:
+            - compiled_fn (:obj:`Callable`): The compiled function with the same signature.
+        Examples:
+            >>> loss, td_error_per_sample = self._compiled_fn(q_nstep_td_error)(data_n, self._gamma)
+        """
+        if not self._cfg.get('compile', False):
+            return fn
+        if fn not in self._compiled_fn_cache:
+            self._compiled_fn_cache[fn] = compile_fn(fn, backend=self._cfg.get('compile_backend', 'inductor'))
+        return self._compiled_fn_cache[fn]
+
+    def _quantize_collect_model(self) -> None:
+        """
+        Overview:
+            Replace the model wrapped by ``self._collect_model`` with its quantized copy ``QuantizedActor`` , the \
+            wrappers (e.g. ``eps_greedy_sample``) are kept. The ``state_dict`` and ``load_state_dict`` of collect \
+            mode still act on the fp32 model, and the quantized copy is rebuilt when the fp32 weights change, e.g. \
+            after the update of learner, ``policy.collect_mode.load_state_dict`` or ``ModelExchanger`` . \
+            Refer to ``ding.torch_utils.QuantizedActor`` for details.
+        """
+        if self._cuda:
+            logging.warning('quantize_collect_model only supports CPU collect model, use the fp32 model instead')
+            return
+        collect_model = getattr(self, '_collect_model', None)
+        if collect_model is None:
+            logging.warning('{} has no collect model to quantize'.format(type(self).__name__))
+            return
+        if not isinstance(collect_model, IModelWrapper):
+            self._collect_model = QuantizedActor(collect_model)
+            return
+        while isinstance(collect_model._model, IModelWrapper):
+            collect_model = collect_model._model
+        collect_model._model = QuantizedActor(collect_model._model)
+
+    @classmethod
+    def _is_mixed_precision_supported(cls: type) -> bool:
+        """
+        Overview:
+            Whether this policy supports ``cfg.learn.mixed_precision``, which is decided by the class defining the \
+            ``_forward_learn`` of this policy.
+        Returns:
+            - supported (:obj:`bool`): Whether mixed precision training is supported.
+        """
+        for base_cls in cls.__mro__:
+            if '_forward_learn' in base_cls.__dict__:
+                return base_cls.__dict__.get('_support_mixed_precision', False)
+        return False
+
+    def _autocast_learn_model(self) -> None:
+        """
+        Overview:
+            Wrap ``self._learn_model`` and ``self._target_model`` (if exists) with ``AutocastWrapper`` for mixed \
+            precision training, whose forward runs in ``torch.autocast`` with the dtype of \
+            ``cfg.learn.mixed_precision`` and returns float32 outputs, while the weights are kept in float32. The \
+            policies which support mixed precision scale the loss with ``self._loss_scaler`` before backward, and \
+            step the optimizers with ``self._loss_scaler.step`` . Refer to ``ding.torch_utils.LossScaler`` for details.
+        """
+        dtype = get_autocast_dtype(self._cfg.learn.mixed_precision)
+        device_type = 'cuda' if self._cuda else 'cpu'
+        for name in ['_learn_model', '_target_model']:
+            model = getattr(self, name, None)
+            if model is None:
+                continue
+            setattr(self, name, model_wrap(model, wrapper_name='autocast', dtype=dtype, device_type=device_type))
 
     @property
     def cfg(self) -> EasyDict:
@@ -1,4 +1,4 @@
-from typing import List, Any, Dict, Callable
+from typing import List, Any, Dict, Callable, Union
 import torch
 import numpy as np
 import treetensor.torch as ttorch
@@ -7,7 +7,7 @@ from ding.torch_utils import to_tensor, to_ndarray, unsqueeze, squeeze
 
 
 def default_preprocess_learn(
-        data: List[Any],
+        data: Union[List[Any], Dict[str, torch.Tensor]],
         use_priority_IS_weight: bool = False,
         use_priority: bool = False,
         use_nstep: bool = False,
@@ -18,7 +18,8 @@ def default_preprocess_learn(
         Default data pre-processing in policy's ``_forward_learn`` method, including stacking batch data, preprocess \
         ignore done, nstep and priority IS weight.
     Arguments:
-        - data (:obj:`List[Any]`): The list of a training batch samples, each sample is a dict of PyTorch Tensor.
+        - data (:obj:`Union[List[Any], Dict[str, torch.Tensor]]`): The list of a training batch samples, each \
+            sample is a dict of PyTorch Tensor, or the batch which has been stacked into a dict of batched tensors.
         - use_priority_IS_weight (:obj:`bool`): Whether to use priority IS weight correction, if True, this function \
             will set the weight of each sample to the priority IS weight.
         - use_priority (:obj:`bool`): Whether to use priority, if True, this function will set the priority IS weight.
@@ -29,11 +30,17 @@ def default_preprocess_learn(
             the following model forward and loss computation.
     """
     # data preprocess
-    elem = data[0]
-    if isinstance(elem['action'], (np.ndarray, torch.Tensor)) and elem['action'].dtype in [np.int64, torch.int64]:
-        data = default_collate(data, cat_1dim=True)  # for discrete action
+    if isinstance(data, dict):
+        # the batch has been stacked (e.g. sampled by ``OfflineBatchSampler``), only apply the ``cat_1dim`` rule
+        data = dict(data)
+        if data['action'].dtype == torch.int64:
+            data = {k: v.squeeze(1) if v.dim() == 2 and v.shape[1] == 1 else v for k, v in data.items()}
     else:
-        data = default_collate(data, cat_1dim=False)  # for continuous action
+        elem = data[0]
+        if isinstance(elem['action'], (np.ndarray, torch.Tensor)) and elem['action'].dtype in [np.int64, torch.int64]:
+            data = default_collate(data, cat_1dim=True)  # for discrete action
+        else:
+            data = default_collate(data, cat_1dim=False)  # for continuous action
     if 'value' in data and data['value'].dim() == 2 and data['value'].shape[1] == 1:
         data['value'] = data['value'].squeeze(-1)
     if 'adv' in data and data['adv'].dim() == 2 and data['adv'].shape[1] == 1:
@@ -82,6 +82,7 @@ class DQNPolicy(Policy):
         == ===================== ======== ============== ======================================= =======================
     """
 
+    _support_mixed_precision = True
     config = dict(
         # (str) RL policy register name (refer to function "POLICY_REGISTRY").
         type='dqn',
@@ -126,6 +127,13 @@ class DQNPolicy(Policy):
             # Temporal Difference (TD) error, using the formula `gamma * (1 - done) * next_v + reward`,
             # even when the episode surpasses the predefined step limit.
             ignore_done=False,
+            # (str) The dtype of mixed precision training, ['bf16', 'fp16'] or None (float32 training). The forward
+            # of model runs in ``torch.autocast`` with this dtype, while the weights and the td error are in float32.
+            # 'bf16' is recommended on the CPUs with AMX/AVX512-BF16 instructions and Ampere+ GPUs.
+            mixed_precision=None,
+            # (float or str) The loss scale of mixed precision training. None means dynamic loss scaling for 'fp16'
+            # and no loss scaling for others, 'dynamic' or a number means the dynamic or static loss scaling.
+            loss_scale=None,
         ),
         # collect_mode config
         collect=dict(
@@ -273,14 +281,16 @@ class DQNPolicy(Policy):
             q_value, target_q_value, data['action'], target_q_action, data['reward'], data['done'], data['weight']
         )
         value_gamma = data.get('value_gamma')
-        loss, td_error_per_sample = q_nstep_td_error(data_n, self._gamma, nstep=self._nstep, value_gamma=value_gamma)
+        loss, td_error_per_sample = self._compiled_fn(q_nstep_td_error)(
+            data_n, self._gamma, nstep=self._nstep, value_gamma=value_gamma
+        )
 
         # Update network parameters
         self._optimizer.zero_grad()
-        loss.backward()
+        self._loss_scaler.scale(loss).backward()
         if self._cfg.multi_gpu:
             self.sync_gradients(self._learn_model)
-        self._optimizer.step()
+        self._loss_scaler.step(self._optimizer)
 
         # Postprocessing operations, such as updating target model, return logged values and priority.
         self._target_model.update(self._learn_model.state_dict())
@@ -315,6 +325,7 @@ class DQNPolicy(Policy):
             'model': self._learn_model.state_dict(),
             'target_model': self._target_model.state_dict(),
             'optimizer': self._optimizer.state_dict(),
+            'loss_scaler': self._loss_scaler.state_dict(),
         }
 
     def _load_state_dict_learn(self, state_dict: Dict[str, Any]) -> None:
@@ -332,6 +343,9 @@ class DQNPolicy(Policy):
         self._learn_model.load_state_dict(state_dict['model'])
         self._target_model.load_state_dict(state_dict['target_model'])
         self._optimizer.load_state_dict(state_dict['optimizer'])
+        # the checkpoints saved before mixed precision training don't contain the loss scaler
+        if 'loss_scaler' in state_dict:
+            self._loss_scaler.load_state_dict(state_dict['loss_scaler'])
 
     def _init_collect(self) -> None:
         """
@@ -35,6 +35,11 @@ class DTPolicy(Policy):
         warmup_steps=10000,  # steps for learning rate warmup
         context_len=20,  # length of transformer input
         learning_rate=1e-4,
+        # (bool) Whether to use the cached incremental inference in evaluation, in which each step only forwards the
+        # new tokens with the per-env key/value cache instead of the whole context window. It is only supported in the
+        # envs with vector observation (i.e. ``state_mean`` is in config). After ``context_len`` steps, the cached keys
+        # and values are the same as sliding window attention rather than recomputing the whole window.
+        eval_kv_cache=False,
     )
 
     def default_model(self) -> Tuple[str, List[str]]:
@@ -237,6 +242,10 @@ class DTPolicy(Policy):
         self.rewards_to_go = torch.zeros(
             (self.eval_batch_size, self.max_eval_ep_len, 1), dtype=torch.float32, device=self._device
         )
+        self._eval_kv_cache = None
+        if self._cfg.get('eval_kv_cache', False):
+            assert not self._atari_env, 'eval_kv_cache is not supported in atari env'
+            self._eval_kv_cache = self._eval_model.init_kv_cache(self.eval_batch_size, device=self._device)
 
     def _forward_eval(self, data: Dict[int, Any]) -> Dict[int, Any]:
         """
@@ -259,6 +268,8 @@ class DTPolicy(Policy):
         data_id = list(data.keys())
 
         self._eval_model.eval()
+        if self._eval_kv_cache is not None:
+            return self._forward_eval_incremental(data)
         with torch.no_grad():
             if self._atari_env:
                 states = torch.zeros(
@@ -340,6 +351,46 @@ class DTPolicy(Policy):
         output = default_decollate(output)
         return {i: d for i, d in zip(data_id, output)}
 
+    def _forward_eval_incremental(self, data: Dict[int, Any]) -> Dict[int, Any]:
+        """
+        Overview:
+            The eval forward with the per-env key/value cache, only the action of the last step, the current \
+            return-to-go and observation of the envs in ``data`` are forwarded through the transformer.
+        Arguments:
+            - data (:obj:`Dict[int, Any]`): The input data used for policy forward, the same as ``_forward_eval`` .
+        Returns:
+            - output (:obj:`Dict[int, Any]`): The output data of policy forward, including at least the action.
+        """
+        data_id = list(data.keys())
+        env_id = torch.as_tensor(data_id, dtype=torch.long, device=self._device)
+        with torch.no_grad():
+            for i in data_id:
+                self.states[i, self.t[i]] = (data[i]['obs'].to(self._device) - self.state_mean) / self.state_std
+                self.running_rtg[i] = self.running_rtg[i] - (data[i]['reward'] / self.rtg_scale).to(self._device)
+                self.rewards_to_go[i, self.t[i]] = self.running_rtg[i]
+            t = torch.as_tensor([self.t[i] for i in data_id], dtype=torch.long, device=self._device)
+            states = self.states[env_id, t]
+            rewards_to_go = self.rewards_to_go[env_id, t]
+            prev_actions = self.actions[env_id, (t - 1).clamp(min=0)]
+            if not self._cfg.model.continuous:
+                prev_actions = prev_actions.squeeze(-1)
+            logits = self._eval_model.forward_incremental(
+                self._eval_kv_cache, env_id, states, prev_actions, rewards_to_go
+            )
+            if not self._cfg.model.continuous:
+                act = torch.argmax(logits, axis=1).unsqueeze(1)
+            else:
+                act = logits
+            self.actions[env_id, t] = act.to(self.actions.dtype)
+            for i in data_id:
+                self.t[i] += 1
+
+        if self._cuda:
+            act = to_device(act, 'cpu')
+        output = {'action': act}
+        output = default_decollate(output)
+        return {i: d for i, d in zip(data_id, output)}
+
     def _reset_eval(self, data_id: Optional[List[int]] = None) -> None:
         """
         Overview:
@@ -352,6 +403,8 @@ class DTPolicy(Policy):
                 specified by ``data_id``.
         """
         # clean data
+        if self._eval_kv_cache is not None:
+            self._eval_kv_cache.reset(data_id)
         if data_id is None:
             self.t = [0 for _ in range(self.eval_batch_size)]
             self.timesteps = torch.arange(
@@ -259,9 +259,9 @@ class IMPALAPolicy(Policy):
         data = vtrace_data(target_logit, behaviour_logit, actions, values, rewards, weights)
         g, l, r, c, rg = self._gamma, self._lambda, self._rho_clip_ratio, self._c_clip_ratio, self._rho_pg_clip_ratio
         if self._action_space == 'continuous':
-            vtrace_loss = vtrace_error_continuous_action(data, g, l, r, c, rg)
+            vtrace_loss = self._compiled_fn(vtrace_error_continuous_action)(data, g, l, r, c, rg)
         elif self._action_space == 'discrete':
-            vtrace_loss = vtrace_error_discrete_action(data, g, l, r, c, rg)
+            vtrace_loss = self._compiled_fn(vtrace_error_discrete_action)(data, g, l, r, c, rg)
 
         wv, we = self._value_weight, self._entropy_weight
         total_loss = vtrace_loss.policy_loss + wv * vtrace_loss.value_loss - we * vtrace_loss.entropy_loss
@@ -410,7 +410,11 @@ class NGUPolicy(Policy):
         self._sequence_len = self._cfg.learn_unroll_len + self._cfg.burnin_step
         self._unroll_len = self._sequence_len
         self._collect_model = model_wrap(
-            self._model, wrapper_name='hidden_state', state_num=self._cfg.collect.env_num, save_prev_state=True
+            self._model,
+            wrapper_name='hidden_state',
+            state_num=self._cfg.collect.env_num,
+            save_prev_state=True,
+            tensor_state=True
         )
         self._collect_model = model_wrap(self._collect_model, wrapper_name='eps_greedy_sample')
         self._collect_model.reset()
@@ -469,7 +473,9 @@ class NGUPolicy(Policy):
         }
         self._collect_model.eval()
         with torch.no_grad():
-            output = self._collect_model.forward(data, data_id=data_id, eps=self.eps, inference=True)
+            output = self._collect_model.forward(
+                data, data_id=data_id, eps=self.eps, inference=True, list_next_state=False
+            )
         if self._cuda:
             output = to_device(output, 'cpu')
         output = default_decollate(output)
@@ -535,7 +541,9 @@ class NGUPolicy(Policy):
             Evaluate mode init method. Called by ``self.__init__``.
             Init eval model with argmax strategy.
         """
-        self._eval_model = model_wrap(self._model, wrapper_name='hidden_state', state_num=self._cfg.eval.env_num)
+        self._eval_model = model_wrap(
+            self._model, wrapper_name='hidden_state', state_num=self._cfg.eval.env_num, tensor_state=True
+        )
         self._eval_model = model_wrap(self._eval_model, wrapper_name='argmax_sample')
         self._eval_model.reset()
         # NOTE: for NGU policy eval phase
@@ -582,7 +590,7 @@ class NGUPolicy(Policy):
 
         self._eval_model.eval()
         with torch.no_grad():
-            output = self._eval_model.forward(data, data_id=data_id, inference=True)
+            output = self._eval_model.forward(data, data_id=data_id, inference=True, list_next_state=False)
         if self._cuda:
             output = to_device(output, 'cpu')
         output = default_decollate(output)
@@ -21,6 +21,7 @@ class PPOPolicy(Policy):
     Overview:
         Policy class of on-policy version PPO algorithm. Paper link: https://arxiv.org/abs/1707.06347.
     """
+    _support_mixed_precision = True
     config = dict(
         # (str) RL policy register name (refer to function "POLICY_REGISTRY").
         type='ppo',
@@ -71,6 +72,12 @@ class PPOPolicy(Policy):
             grad_clip_value=0.5,
             # (bool) Whether ignore done (usually for max step termination env).
             ignore_done=False,
+            # (str) The dtype of mixed precision training, ['bf16', 'fp16'] or None (float32 training). Only the
+            # forward of model runs in low precision, the gradients are unscaled before the grad clip of optimizer.
+            mixed_precision=None,
+            # (float or str) The loss scale of mixed precision training, None means dynamic loss scaling for 'fp16'
+            # and no loss scaling for 'bf16'.
+            loss_scale=None,
         ),
         # collect_mode config
         collect=dict(
@@ -276,26 +283,27 @@ class PPOPolicy(Policy):
                         output['logit'], batch['logit'], batch['action'], output['value'], batch['value'], adv,
                         batch['return'], batch['weight']
                     )
-                    ppo_loss, ppo_info = ppo_error_continuous(ppo_batch, self._clip_ratio)
+                    ppo_loss, ppo_info = self._compiled_fn(ppo_error_continuous)(ppo_batch, self._clip_ratio)
                 elif self._action_space == 'discrete':
                     ppo_batch = ppo_data(
                         output['logit'], batch['logit'], batch['action'], output['value'], batch['value'], adv,
                         batch['return'], batch['weight']
                     )
-                    ppo_loss, ppo_info = ppo_error(ppo_batch, self._clip_ratio)
+                    ppo_loss, ppo_info = self._compiled_fn(ppo_error)(ppo_batch, self._clip_ratio)
                 elif self._action_space == 'hybrid':
                     # discrete part (discrete policy loss and entropy loss)
                     ppo_discrete_batch = ppo_policy_data(
                         output['logit']['action_type'], batch['logit']['action_type'], batch['action']['action_type'],
                         adv, batch['weight']
                     )
-                    ppo_discrete_loss, ppo_discrete_info = ppo_policy_error(ppo_discrete_batch, self._clip_ratio)
+                    policy_error_fn = self._compiled_fn(ppo_policy_error)
+                    ppo_discrete_loss, ppo_discrete_info = policy_error_fn(ppo_discrete_batch, self._clip_ratio)
                     # continuous part (continuous policy loss and entropy loss, value loss)
                     ppo_continuous_batch = ppo_data(
                         output['logit']['action_args'], batch['logit']['action_args'], batch['action']['action_args'],
                         output['value'], batch['value'], adv, batch['return'], batch['weight']
                     )
-                    ppo_continuous_loss, ppo_continuous_info = ppo_error_continuous(
+                    ppo_continuous_loss, ppo_continuous_info = self._compiled_fn(ppo_error_continuous)(
                         ppo_continuous_batch, self._clip_ratio
                     )
                     # sum discrete and continuous loss
@@ -311,8 +319,8 @@ class PPOPolicy(Policy):
                 total_loss = ppo_loss.policy_loss + wv * ppo_loss.value_loss - we * ppo_loss.entropy_loss
 
                 self._optimizer.zero_grad()
-                total_loss.backward()
-                self._optimizer.step()
+                self._loss_scaler.scale(total_loss).backward()
+                self._loss_scaler.step(self._optimizer)
 
                 return_info = {
                     'cur_lr': self._optimizer.defaults['lr'],
@@ -338,6 +346,37 @@ class PPOPolicy(Policy):
                 return_infos.append(return_info)
         return return_infos
 
+    def _state_dict_learn(self) -> Dict[str, Any]:
+        """
+        Overview:
+            Return the state_dict of learn mode, usually including model, optimizer and loss scaler.
+        Returns:
+            - state_dict (:obj:`Dict[str, Any]`): The dict of current policy learn state, for saving and restoring.
+        """
+        return {
+            'model': self._learn_model.state_dict(),
+            'optimizer': self._optimizer.state_dict(),
+            'loss_scaler': self._loss_scaler.state_dict(),
+        }
+
+    def _load_state_dict_learn(self, state_dict: Dict[str, Any]) -> None:
+        """
+        Overview:
+            Load the state_dict variable into policy learn mode.
+        Arguments:
+            - state_dict (:obj:`Dict[str, Any]`): The dict of policy learn state saved before.
+
+        .. tip::
+            If you want to only load some parts of model, you can simply set the ``strict`` argument in \
+            load_state_dict to ``False``, or refer to ``ding.torch_utils.checkpoint_helper`` for more \
+            complicated operation.
+        """
+        self._learn_model.load_state_dict(state_dict['model'])
+        self._optimizer.load_state_dict(state_dict['optimizer'])
+        # the checkpoints saved before mixed precision training don't contain the loss scaler
+        if 'loss_scaler' in state_dict:
+            self._loss_scaler.load_state_dict(state_dict['loss_scaler'])
+
     def _init_collect(self) -> None:
         """
         Overview:
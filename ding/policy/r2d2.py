@@ -463,7 +463,11 @@ class R2D2Policy(Policy):
         # for r2d2, this hidden_state wrapper is to add the 'prev hidden state' for each transition.
         # Note that collect env forms a batch and the key is added for the batch simultaneously.
         self._collect_model = model_wrap(
-            self._model, wrapper_name='hidden_state', state_num=self._cfg.collect.env_num, save_prev_state=True
+            self._model,
+            wrapper_name='hidden_state',
+            state_num=self._cfg.collect.env_num,
+            save_prev_state=True,
+            tensor_state=True
         )
         self._collect_model = model_wrap(self._collect_model, wrapper_name='eps_greedy_sample')
         self._collect_model.reset()
@@ -506,7 +510,7 @@ class R2D2Policy(Policy):
         with torch.no_grad():
             # in collect phase, inference=True means that each time we only pass one timestep data,
             # so the we can get the hidden state of rnn: <prev_state> at each timestep.
-            output = self._collect_model.forward(data, data_id=data_id, eps=eps, inference=True)
+            output = self._collect_model.forward(data, data_id=data_id, eps=eps, inference=True, list_next_state=False)
         if self._cuda:
             output = to_device(output, 'cpu')
         output = default_decollate(output)
@@ -581,7 +585,9 @@ class R2D2Policy(Policy):
             If you want to set some spacial member variables in ``_init_eval`` method, you'd better name them \
             with prefix ``_eval_`` to avoid conflict with other modes, such as ``self._eval_attr1``.
         """
-        self._eval_model = model_wrap(self._model, wrapper_name='hidden_state', state_num=self._cfg.eval.env_num)
+        self._eval_model = model_wrap(
+            self._model, wrapper_name='hidden_state', state_num=self._cfg.eval.env_num, tensor_state=True
+        )
         self._eval_model = model_wrap(self._eval_model, wrapper_name='argmax_sample')
         self._eval_model.reset()
 
@@ -619,7 +625,7 @@ class R2D2Policy(Policy):
         data = {'obs': data}
         self._eval_model.eval()
         with torch.no_grad():
-            output = self._eval_model.forward(data, data_id=data_id, inference=True)
+            output = self._eval_model.forward(data, data_id=data_id, inference=True, list_next_state=False)
         if self._cuda:
             output = to_device(output, 'cpu')
         output = default_decollate(output)
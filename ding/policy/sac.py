@@ -593,6 +593,7 @@ class SACPolicy(Policy):
            == ====================  ========    =============  ================================= =======================
     """
 
+    _support_mixed_precision = True
     config = dict(
         # (str) RL policy register name (refer to function "POLICY_REGISTRY").
         type='sac',
@@ -658,6 +659,12 @@ class SACPolicy(Policy):
             ignore_done=False,
             # (float) Weight uniform initialization max range in the last output layer.
             init_w=3e-3,
+            # (str) The dtype of mixed precision training, ['bf16', 'fp16'] or None (float32 training). The forward
+            # of learn and target model runs in low precision, while the td error and policy loss are in float32.
+            mixed_precision=None,
+            # (float or str) The loss scale of mixed precision training, shared by all the optimizers. None means
+            # dynamic loss scaling for 'fp16' and no loss scaling for 'bf16'.
+            loss_scale=None,
         ),
         # collect_mode config
         collect=dict(
@@ -845,21 +852,22 @@ class SACPolicy(Policy):
         # 3. compute q loss
         if self._twin_critic:
             q_data0 = v_1step_td_data(q_value[0], target_q_value, reward, done, data['weight'])
-            loss_dict['critic_loss'], td_error_per_sample0 = v_1step_td_error(q_data0, self._gamma)
+            td_error_fn = self._compiled_fn(v_1step_td_error)
+            loss_dict['critic_loss'], td_error_per_sample0 = td_error_fn(q_data0, self._gamma)
             q_data1 = v_1step_td_data(q_value[1], target_q_value, reward, done, data['weight'])
-            loss_dict['twin_critic_loss'], td_error_per_sample1 = v_1step_td_error(q_data1, self._gamma)
+            loss_dict['twin_critic_loss'], td_error_per_sample1 = td_error_fn(q_data1, self._gamma)
             td_error_per_sample = (td_error_per_sample0 + td_error_per_sample1) / 2
         else:
             q_data = v_1step_td_data(q_value, target_q_value, reward, done, data['weight'])
-            loss_dict['critic_loss'], td_error_per_sample = v_1step_td_error(q_data, self._gamma)
+            loss_dict['critic_loss'], td_error_per_sample = self._compiled_fn(v_1step_td_error)(q_data, self._gamma)
 
         # 4. update q network
         self._optimizer_q.zero_grad()
         if self._twin_critic:
-            (loss_dict['critic_loss'] + loss_dict['twin_critic_loss']).backward()
+            self._loss_scaler.scale(loss_dict['critic_loss'] + loss_dict['twin_critic_loss']).backward()
         else:
-            loss_dict['critic_loss'].backward()
-        self._optimizer_q.step()
+            self._loss_scaler.scale(loss_dict['critic_loss']).backward()
+        self._loss_scaler.step(self._optimizer_q)
 
         # 5. evaluate to get action distribution
         (mu, sigma) = self._learn_model.forward(data['obs'], mode='compute_actor')['logit']
@@ -883,8 +891,8 @@ class SACPolicy(Policy):
 
         # 7. update policy network
         self._optimizer_policy.zero_grad()
-        loss_dict['policy_loss'].backward()
-        self._optimizer_policy.step()
+        self._loss_scaler.scale(loss_dict['policy_loss']).backward()
+        self._loss_scaler.step(self._optimizer_policy)
 
         # 8. compute alpha loss
         if self._auto_alpha:
@@ -932,6 +940,7 @@ class SACPolicy(Policy):
             'target_model': self._target_model.state_dict(),
             'optimizer_q': self._optimizer_q.state_dict(),
             'optimizer_policy': self._optimizer_policy.state_dict(),
+            'loss_scaler': self._loss_scaler.state_dict(),
         }
         if self._auto_alpha:
             ret.update({'optimizer_alpha': self._alpha_optim.state_dict()})
@@ -955,6 +964,9 @@ class SACPolicy(Policy):
         self._optimizer_policy.load_state_dict(state_dict['optimizer_policy'])
         if self._auto_alpha:
             self._alpha_optim.load_state_dict(state_dict['optimizer_alpha'])
+        # the checkpoints saved before mixed precision training don't contain the loss scaler
+        if 'loss_scaler' in state_dict:
+            self._loss_scaler.load_state_dict(state_dict['loss_scaler'])
 
     def _init_collect(self) -> None:
         """
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional, Callable, Tuple
+from typing import List, Dict, Any, Optional, Callable, Tuple, Union
 import copy
 import numpy as np
 import torch
@@ -20,6 +20,10 @@ class HerRewardModel:
         and may have high variance. As a result, we **recommend** that you only use some transitions in
         the complete episode by specifying ``episode_size`` and ``sample_per_episode`` in config.
         Therefore, in one iteration, ``batch_size`` would be ``episode_size`` * ``sample_per_episode``.
+
+    .. note::
+        - batch_relabel (:obj:`bool`): Whether ``her_data_enhancer`` uses the vectorized ``estimate_batch`` rather \
+            than ``estimate`` , default set to False. The relabeled data is a dict of batched tensors then.
     """
 
     def __init__(
@@ -35,6 +39,7 @@ class HerRewardModel:
         self._her_replay_k = cfg.get('her_replay_k', 1)
         self._episode_size = cfg.get('episode_size', None)
         self._sample_per_episode = cfg.get('sample_per_episode', None)
+        self._batch_relabel = cfg.get('batch_relabel', False)
 
     def estimate(
             self,
@@ -91,6 +96,119 @@ class HerRewardModel:
                 new_episodes[k].append(timestep)
         return new_episodes
 
+    @staticmethod
+    def stack_episodes(episodes: List[List[Dict[str, Any]]]) -> Tuple[Dict[str, torch.Tensor], torch.Tensor]:
+        """
+        Overview:
+            Stack the transitions of episodes into one tensor per key, which is the input of ``estimate_batch`` . \
+            The keys whose values are None are dropped.
+        Arguments:
+            - episodes (:obj:`List[List[Dict[str, Any]]]`): Episode list, each episode is a list of transitions.
+        Returns:
+            - data (:obj:`Dict[str, torch.Tensor]`): The concatenated transitions of all the episodes.
+            - episode_lengths (:obj:`torch.Tensor`): The length of each episode.
+        """
+        transitions = [t for episode in episodes for t in episode]
+        assert len(transitions) > 0, 'empty episodes'
+        keys = [k for k, v in transitions[0].items() if v is not None]
+        data = {k: torch.stack([torch.as_tensor(t[k]) for t in transitions]) for k in keys}
+        episode_lengths = torch.as_tensor([len(episode) for episode in episodes], dtype=torch.long)
+        return data, episode_lengths
+
+    def estimate_batch(
+            self,
+            episodes: Union[List[List[Dict[str, Any]]], Dict[str, torch.Tensor]],
+            merge_func: Optional[Callable] = None,
+            split_func: Optional[Callable] = None,
+            goal_reward_func: Optional[Callable] = None,
+            episode_lengths: Optional[torch.Tensor] = None,
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Overview:
+            The vectorized version of ``estimate`` for a batch of episodes. The transition indices and the goal \
+            indices of the whole batch are sampled at once with the same strategy as ``estimate`` , then the \
+            transitions are gathered and relabeled with one call of each function. Therefore, the functions are \
+            applied to the batched tensors (the first dim is the batch dim), rather than single transitions.
+        Arguments:
+            - episodes (:obj:`Union[List[List[Dict[str, Any]]], Dict[str, torch.Tensor]]`): Episode list, or the \
+                concatenated transitions of episodes (refer to ``stack_episodes`` ) with ``episode_lengths`` .
+            - merge_func (:obj:`Callable`): The batched merge function to use, default set to None. If None, \
+                then use ``__her_default_batch_merge_func``
+            - split_func (:obj:`Callable`): The batched split function to use, default set to None. If None, \
+                then use ``__her_default_batch_split_func``
+            - goal_reward_func (:obj:`Callable`): The batched goal_reward function to use, default set to None. If \
+                None, then use ``__her_default_batch_goal_reward_func``
+            - episode_lengths (:obj:`Optional[torch.Tensor]`): The length of each episode, only needed when \
+                ``episodes`` is the concatenated transitions.
+        Returns:
+            - new_data (:obj:`Dict[str, torch.Tensor]`): The processed transitions, whose batch size is \
+                ``her_replay_k`` * ``episode_num`` * ``sample_per_episode`` (or the total length of episodes if \
+                ``sample_per_episode`` is None).
+        """
+        if merge_func is None:
+            merge_func = HerRewardModel.__her_default_batch_merge_func
+        if split_func is None:
+            split_func = HerRewardModel.__her_default_batch_split_func
+        if goal_reward_func is None:
+            goal_reward_func = HerRewardModel.__her_default_batch_goal_reward_func
+        if episode_lengths is None:
+            data, episode_lengths = self.stack_episodes(episodes)
+        else:
+            data = episodes
+        episode_lengths = torch.as_tensor(episode_lengths, dtype=torch.long)
+        episode_starts = torch.cumsum(episode_lengths, dim=0) - episode_lengths
+        if self._sample_per_episode is None:
+            # Use complete episode
+            episode_id = torch.repeat_interleave(torch.arange(len(episode_lengths)), episode_lengths)
+            idx = torch.arange(len(episode_id)) - episode_starts[episode_id]
+        else:
+            # Use some transitions in one episode
+            episode_id = torch.arange(len(episode_lengths)).repeat_interleave(self._sample_per_episode)
+            idx = self._randint(0, episode_lengths[episode_id])
+        episode_id, idx = episode_id.repeat(self._her_replay_k), idx.repeat(self._her_replay_k)
+        length = episode_lengths[episode_id]
+        if self._her_strategy == 'final':
+            p_idx = length - 1
+        elif self._her_strategy == 'episode':
+            p_idx = self._randint(0, length)
+        elif self._her_strategy == 'future':
+            p_idx = self._randint(idx, length)
+        index = episode_starts[episode_id] + idx
+        p_index = episode_starts[episode_id] + p_idx
+
+        obs, _, _ = split_func(data['obs'][index])
+        next_obs, _, achieved_goal = split_func(data['next_obs'][index])
+        _, _, new_desired_goal = split_func(data['next_obs'][p_index])
+        new_data = {k: v[index] for k, v in data.items() if k not in ['obs', 'next_obs', 'reward']}
+        new_data['obs'] = merge_func(obs, new_desired_goal)
+        new_data['next_obs'] = merge_func(next_obs, new_desired_goal)
+        new_data['reward'] = goal_reward_func(achieved_goal, new_desired_goal).to(self._device)
+        return new_data
+
+    @staticmethod
+    def _randint(low: torch.Tensor, high: Union[int, torch.Tensor]) -> torch.Tensor:
+        # elementwise ``np.random.randint(low, high)`` with tensor bounds
+        high = torch.as_tensor(high)
+        rand = torch.rand(high.shape)
+        return torch.min(low + (rand * (high - low)).long(), high - 1)
+
+    @staticmethod
+    def __her_default_batch_merge_func(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+        # batched ``__her_default_merge_func``
+        return torch.cat([x, y], dim=-1)
+
+    @staticmethod
+    def __her_default_batch_split_func(x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        # batched ``__her_default_split_func``
+        obs, desired_goal = torch.chunk(x, 2, dim=-1)
+        achieved_goal = obs
+        return obs, desired_goal, achieved_goal
+
+    @staticmethod
+    def __her_default_batch_goal_reward_func(achieved_goal: torch.Tensor, desired_goal: torch.Tensor) -> torch.Tensor:
+        # batched ``__her_default_goal_reward_func`` , the reward shape is (B, 1)
+        return (achieved_goal == desired_goal).flatten(1).all(dim=1, keepdim=True).float()
+
     @staticmethod
     def __her_default_merge_func(x: Any, y: Any) -> Any:
         r"""
@@ -147,3 +265,7 @@ class HerRewardModel:
     @property
     def sample_per_episode(self) -> int:
         return self._sample_per_episode
+
+    @property
+    def batch_relabel(self) -> bool:
+        return self._batch_relabel
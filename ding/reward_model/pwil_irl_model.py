@@ -187,11 +187,8 @@ class PwilRewardModel(BaseRewardModel):
         # Automatically fill in length
         s1 = s1.view(M, -1)
         s2 = s2.view(N, -1)
-        # Automatically fill in & format the tensor size to be (MxNxn)
-        s1 = s1.unsqueeze(1).repeat(1, N, 1)
-        s2 = s2.unsqueeze(0).repeat(M, 1, 1)
-        # Return the distance tensor of size MxN
-        return ((s1 - s2) ** 2).mean(dim=-1)
+        # Broadcast to the tensor size (MxNxn) and return the distance tensor of size MxN
+        return ((s1.unsqueeze(1) - s2.unsqueeze(0)) ** 2).mean(dim=-1)
 
     def _get_action_distance(self, a1: list, a2: list) -> torch.Tensor:
         # TODO the metric of action distance maybe different from envs
@@ -211,9 +208,7 @@ class PwilRewardModel(BaseRewardModel):
         M, N = a1.shape[0], a2.shape[0]
         a1 = a1.view(M, -1)
         a2 = a2.view(N, -1)
-        a1 = a1.unsqueeze(1).repeat(1, N, 1)
-        a2 = a2.unsqueeze(0).repeat(M, 1, 1)
-        return ((a1 - a2) ** 2).mean(dim=-1)
+        return ((a1.unsqueeze(1) - a2.unsqueeze(0)) ** 2).mean(dim=-1)
 
     def _train(self, data: list):
         """
@@ -228,27 +223,31 @@ class PwilRewardModel(BaseRewardModel):
         s_distance_matrix = self._get_state_distance(batch_s, self.expert_s)
         a_distance_matrix = self._get_action_distance(batch_a, self.expert_a)
         distance_matrix = s_distance_matrix + a_distance_matrix
+        # The greedy coupling visits the experts of each transition from near to far, so all the rows are sorted at
+        # once (stable sort keeps the argmin tie-breaking), and each transition only walks the first few experts
+        # until its weight 1/T is transported, rather than searching the argmin among all the experts at each step.
+        sorted_distance, sorted_index = torch.sort(distance_matrix, dim=1, stable=True)
+        sorted_distance, sorted_index = sorted_distance.cpu().numpy(), sorted_index.cpu().numpy()
         w_e_list = [1 / len(self.expert_data)] * len(self.expert_data)
-        for i, item in enumerate(data):
-            s, a = item
+        costs = []
+        for i in range(len(data)):
             w_pi = 1 / self.T
             c = 0
-            expert_data_idx = torch.arange(len(self.expert_data)).tolist()
-            while w_pi > 0:
-                selected_dist = distance_matrix[i, expert_data_idx]
-                nearest_distance = selected_dist.min().item()
-                nearest_index_selected = selected_dist.argmin().item()
-                nearest_index = expert_data_idx[nearest_index_selected]
+            for nearest_distance, nearest_index in zip(sorted_distance[i], sorted_index[i]):
+                nearest_distance = float(nearest_distance)
                 if w_pi >= w_e_list[nearest_index]:
                     c = c + nearest_distance * w_e_list[nearest_index]
                     w_pi = w_pi - w_e_list[nearest_index]
-                    expert_data_idx.pop(nearest_index_selected)
                 else:
                     c = c + w_pi * nearest_distance
                     w_e_list[nearest_index] = w_e_list[nearest_index] - w_pi
                     w_pi = 0
-            reward = self.cfg.alpha * math.exp(self.reward_factor * c)
-            self.reward_table[(s, a)] = torch.FloatTensor([reward])
+                if w_pi <= 0:
+                    break
+            costs.append(c)
+        rewards = self.cfg.alpha * torch.exp(self.reward_factor * torch.as_tensor(costs, dtype=torch.float64))
+        for (s, a), reward in zip(data, rewards.float().unsqueeze(1)):
+            self.reward_table[(s, a)] = reward
 
     def clear_data(self) -> None:
         """
@@ -0,0 +1,93 @@
+import pytest
+import time
+import torch
+from easydict import EasyDict
+
+from ding.reward_model import HerRewardModel
+
+
+def get_episodes(episode_num, n_bits=5):
+    episodes = []
+    for i in range(episode_num):
+        length = 3 + i % 5
+        goal = torch.randint(0, 2, (n_bits, )).float()
+        states = torch.randint(0, 2, (length + 1, n_bits)).float()
+        episodes.append(
+            [
+                {
+                    'obs': torch.cat([states[t], goal]),
+                    'next_obs': torch.cat([states[t + 1], goal]),
+                    'action': torch.LongTensor([i * 100 + t]),
+                    'reward': torch.FloatTensor([0]),
+                    'done': t == length - 1,
+                } for t in range(length)
+            ]
+        )
+    return episodes
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize('her_strategy', ['final', 'future', 'episode'])
+@pytest.mark.parametrize('sample_per_episode', [None, 4])
+def test_her_estimate_batch(her_strategy, sample_per_episode):
+    cfg = EasyDict(her_strategy=her_strategy, her_replay_k=2, sample_per_episode=sample_per_episode)
+    model = HerRewardModel(cfg)
+    episodes = get_episodes(6)
+    data = model.estimate_batch(episodes)
+    if sample_per_episode is None:
+        batch_size = 2 * sum(len(e) for e in episodes)
+    else:
+        batch_size = 2 * 6 * sample_per_episode
+    assert data['obs'].shape == (batch_size, 10) and data['next_obs'].shape == (batch_size, 10)
+    assert data['reward'].shape == (batch_size, 1) and data['action'].shape == (batch_size, 1)
+    assert data['done'].shape == (batch_size, ) and data['done'].dtype == torch.bool
+
+    # each relabeled transition is an original transition (identified by action) with a goal achieved in the same
+    # episode
+    for i in range(batch_size):
+        episode_id, t = divmod(data['action'][i].item(), 100)
+        episode = episodes[episode_id]
+        goal = data['obs'][i, 5:]
+        assert torch.equal(data['obs'][i, :5], episode[t]['obs'][:5])
+        assert torch.equal(data['next_obs'][i, :5], episode[t]['next_obs'][:5])
+        assert torch.equal(data['next_obs'][i, 5:], goal)
+        if her_strategy == 'final':
+            goals = [episode[-1]['next_obs'][:5]]
+        elif her_strategy == 'future':
+            goals = [episode[p]['next_obs'][:5] for p in range(t, len(episode))]
+        else:
+            goals = [e['next_obs'][:5] for e in episode]
+        assert any(torch.equal(goal, g) for g in goals)
+        assert data['reward'][i].item() == float(torch.equal(data['next_obs'][i, :5], goal))
+
+
+@pytest.mark.unittest
+def test_her_estimate_batch_equivalence():
+    # the final strategy is deterministic, so the batched relabeling is the same as the original one
+    cfg = EasyDict(her_strategy='final', her_replay_k=1, sample_per_episode=None)
+    model = HerRewardModel(cfg)
+    episodes = get_episodes(4)
+    data = model.estimate_batch(episodes)
+    expected = sum([model.estimate(e)[0] for e in episodes], [])
+    for k in ['obs', 'next_obs', 'reward', 'action']:
+        assert torch.equal(data[k], torch.stack([e[k] for e in expected]))
+
+    # stacked episode tensors as input
+    stacked, lengths = model.stack_episodes(episodes)
+    data = model.estimate_batch(stacked, episode_lengths=lengths)
+    assert torch.equal(data['obs'], torch.stack([e['obs'] for e in expected]))
+
+
+@pytest.mark.benchmark
+def test_her_estimate_batch_benchmark():
+    cfg = EasyDict(her_strategy='future', her_replay_k=4, sample_per_episode=64)
+    model = HerRewardModel(cfg)
+    episodes = get_episodes(64, n_bits=20)
+    start = time.time()
+    sum([model.estimate(e) for e in episodes], [])
+    t_loop = time.time() - start
+    start = time.time()
+    model.estimate_batch(episodes)
+    t_batch = time.time() - start
+    print('estimate: {:.4f}s, estimate_batch: {:.4f}s'.format(t_loop, t_batch))
+    assert t_batch < t_loop
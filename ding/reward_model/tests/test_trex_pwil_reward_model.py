@@ -0,0 +1,128 @@
+import copy
+import os
+import pickle
+import random
+import shutil
+import pytest
+import numpy as np
+import torch
+from easydict import EasyDict
+
+from ding.reward_model.trex_reward_model import TrexModel, TrexRewardModel
+from ding.reward_model.pwil_irl_model import PwilRewardModel
+
+obs_dim = 4
+exp_name = './test_trex_reward_model_exp'
+pwil_expert_data_path = './test_pwil_expert_data.pkl'
+
+
+@pytest.fixture(scope='module')
+def trex_reward_model():
+    os.makedirs(exp_name, exist_ok=True)
+    # 3 bins (checkpoints) with 2 demonstrations each, the demonstrations have different lengths
+    episodes_data = [
+        [[np.random.randn(obs_dim).astype(np.float32) for _ in range(length)] for length in [30 + b, 40 + b]]
+        for b in range(3)
+    ]
+    with open(os.path.join(exp_name, 'episodes_data.pkl'), 'wb') as f:
+        pickle.dump(episodes_data, f)
+    with open(os.path.join(exp_name, 'learning_returns.pkl'), 'wb') as f:
+        pickle.dump([[float(b), float(b)] for b in range(3)], f)
+    cfg = EasyDict(
+        exp_name=exp_name,
+        policy=dict(model=dict(obs_shape=obs_dim)),
+        reward_model=dict(TrexRewardModel.config),
+    )
+    cfg.reward_model.update(dict(min_snippet_length=5, max_snippet_length=20, num_trajs=4, num_snippets=50))
+    yield TrexRewardModel(cfg, 'cpu', None)
+    shutil.rmtree(exp_name, ignore_errors=True)
+
+
+@pytest.mark.unittest
+class TestTrexRewardModel:
+
+    def test_create_training_data(self, trex_reward_model):
+        model = trex_reward_model
+        assert len(model.training_obs) == len(model.training_labels) == 54
+        # map each observation to (bin, position in demonstration)
+        position = {
+            id(o): (b, k)
+            for b, demos in enumerate(model.pre_expert_data) for d in demos for k, o in enumerate(d)
+        }
+        for n, ((traj_i, traj_j), label) in enumerate(zip(model.training_obs, model.training_labels)):
+            (bi, start_i), (bj, start_j) = position[id(traj_i[0])], position[id(traj_j[0])]
+            assert bi != bj and label == int(bi <= bj)
+            if n >= model.num_trajs:
+                # the snippets have the same length, and the snippet of the better bin doesn't start earlier
+                assert 3 <= len(traj_i) == len(traj_j) <= 10
+                assert start_i <= start_j if bi < bj else start_j <= start_i
+
+    def test_create_training_data_short_demo(self, trex_reward_model):
+        model = copy.copy(trex_reward_model)
+        model.training_obs, model.training_labels = [], []
+        # the snippets can't be longer than the shortest demonstration
+        model.pre_expert_data = [[d[:4] for d in demos] for demos in trex_reward_model.pre_expert_data]
+        with pytest.raises(ValueError):
+            model.create_training_data()
+
+    def test_forward_batch(self, trex_reward_model):
+        model = trex_reward_model
+        pairs = model.training_obs[:8]
+        obs, segment_ids = model._collate_pairs(pairs)
+        logits, abs_rewards = model.reward_model.forward_batch(obs, segment_ids, len(pairs))
+        assert logits.shape == (8, 2) and abs_rewards.shape == (8, )
+        for k, (traj_i, traj_j) in enumerate(pairs):
+            logit, abs_reward = model.reward_model(torch.as_tensor(np.array(traj_i)), torch.as_tensor(np.array(traj_j)))
+            assert torch.allclose(logits[k], logit, atol=1e-5)
+            assert torch.allclose(abs_rewards[k], abs_reward, atol=1e-5)
+
+    def test_train(self, trex_reward_model):
+        model = trex_reward_model
+        model.cfg.reward_model.update_per_collect = 1
+        model.cfg.reward_model.pair_batch_size = 16
+        model.train()
+        accuracy = model.calc_accuracy(model.reward_model, model.training_obs, model.training_labels)
+        assert 0. <= accuracy <= 1.
+        data = [{'obs': torch.randn(obs_dim), 'reward': torch.zeros(1)} for _ in range(5)]
+        assert len(model.estimate(data)) == 5
+
+
+@pytest.mark.unittest
+def test_pwil_greedy_coupling():
+    expert_data = [{'obs': torch.randn(obs_dim), 'action': torch.randint(0, 2, (1, ))} for _ in range(20)]
+    with open(pwil_expert_data_path, 'wb') as f:
+        pickle.dump(expert_data, f)
+    cfg = EasyDict(PwilRewardModel.config)
+    cfg.update(dict(expert_data_path=pwil_expert_data_path, s_size=obs_dim, a_size=1))
+    try:
+        model = PwilRewardModel(cfg, 'cpu', None)
+    finally:
+        os.remove(pwil_expert_data_path)
+    data = [
+        {
+            'obs': torch.randn(obs_dim),
+            'action': torch.randint(0, 2, (1, )),
+            'reward': torch.zeros(1)
+        } for _ in range(7)
+    ]
+    model.collect_data(data)
+    model.train()
+
+    # reference: search the nearest remaining expert step by step
+    distance = model._get_state_distance([d['obs'] for d in data], model.expert_s) + \
+        model._get_action_distance([d['action'] for d in data], model.expert_a)
+    w_e = [1 / len(model.expert_data)] * len(model.expert_data)
+    for i, item in enumerate(data):
+        w_pi, c, idx = 1 / model.T, 0, list(range(len(model.expert_data)))
+        while w_pi > 0:
+            j = idx[distance[i, idx].argmin().item()]
+            if w_pi >= w_e[j]:
+                c, w_pi = c + distance[i, j].item() * w_e[j], w_pi - w_e[j]
+                idx.remove(j)
+            else:
+                c, w_e[j], w_pi = c + w_pi * distance[i, j].item(), w_e[j] - w_pi, 0
+        expected = cfg.alpha * np.exp(model.reward_factor * c)
+        assert model.reward_table[(item['obs'], item['action'])].shape == (1, )
+        assert abs(model.reward_table[(item['obs'], item['action'])].item() - expected) < 1e-5
+    estimated = model.estimate(data)
+    assert all(e['reward'].item() > 0 for e in estimated)
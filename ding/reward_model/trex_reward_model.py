@@ -128,6 +128,18 @@ class TrexModel(nn.Module):
         cum_r_j, abs_r_j = self.cum_return(traj_j)
         return torch.cat((cum_r_i.unsqueeze(0), cum_r_j.unsqueeze(0)), 0), abs_r_i + abs_r_j
 
+    def forward_batch(self, obs: torch.Tensor, segment_ids: torch.Tensor,
+                      batch_size: int) -> Tuple[torch.Tensor, torch.Tensor]:
+        '''
+        compute the logits of a batch of trajectory pairs with one encoder forward, the observations of all the
+        trajectories are concatenated along the first dim, and ``segment_ids`` is ``2 * k`` (traj_i) or ``2 * k + 1``
+        (traj_j) for the observations of the k-th pair, return logits of shape (B, 2) and abs returns of shape (B, )
+        '''
+        r, abs_r = self.cum_return(obs, mode='batch')
+        cum_r = r.new_zeros(2 * batch_size).index_add(0, segment_ids, r.reshape(-1))
+        cum_abs_r = r.new_zeros(2 * batch_size).index_add(0, segment_ids, abs_r.reshape(-1))
+        return cum_r.view(batch_size, 2), cum_abs_r.view(batch_size, 2).sum(-1)
+
 
 @REWARD_MODEL_REGISTRY.register('trex')
 class TrexRewardModel(BaseRewardModel):
@@ -148,6 +160,8 @@ class TrexRewardModel(BaseRewardModel):
            | ``collect``                                 |                                             |
         5  | ``num_trajs``       int       0             | Number of downsampled full trajectories     |
         6  | ``num_snippets``    int       6000          | Number of short subtrajectories to sample   |
+        7  | ``pair_batch_``     int       1             | Number of trajectory pairs in a training    |
+           | ``size``                                    | batch                                       |
         == ====================  ======   =============  ============================================  =============
     """
     config = dict(
@@ -163,6 +177,9 @@ class TrexRewardModel(BaseRewardModel):
         num_trajs=0,
         # (int) Number of short subtrajectories to sample.
         num_snippets=6000,
+        # (int) Number of trajectory pairs in a training batch, which are forwarded together. The default 1 is the
+        # per-pair update of the original implementation, the bigger one trains faster with fewer updates.
+        pair_batch_size=1,
     )
 
     def __init__(self, config: EasyDict, device: str, tb_logger: 'SummaryWriter') -> None:  # noqa
@@ -235,59 +252,86 @@ class TrexRewardModel(BaseRewardModel):
         self._logger.info("max snippet length: {}".format(max_snippet_length))
 
         # collect training data
-        max_traj_length = 0
         num_bins = len(self.pre_expert_data)
         assert num_bins >= 2
+        # the demo lengths are flattened, demo ``t`` of bin ``b`` is at ``bin_offset[b] + t``
+        num_demos = np.array([len(demos) for demos in self.pre_expert_data])
+        bin_offset = np.concatenate([[0], np.cumsum(num_demos)[:-1]])
+        flat_lengths = np.array([len(d) for demos in self.pre_expert_data for d in demos])
+
+        def sample_pairs(n):
+            # pick two different random bins and a random demonstration in each of them
+            bi = np.random.randint(num_bins, size=n)
+            bj = (bi + np.random.randint(1, num_bins, size=n)) % num_bins
+            ti = (np.random.rand(n) * num_demos[bi]).astype(np.int64)
+            tj = (np.random.rand(n) * num_demos[bj]).astype(np.int64)
+            return bi, bj, ti, tj
+
+        def randint(low, high):
+            # vectorized ``np.random.randint(low, high)`` with array bounds, which also raises on empty ranges, e.g.
+            # the snippet is longer than the demonstration
+            if not (high > low).all():
+                raise ValueError('low >= high in random snippet start, check the snippet and demonstration lengths')
+            return low + (np.random.rand(len(low)) * (high - low)).astype(np.int64)
 
         # add full trajs (for use on Enduro)
         si = np.random.randint(6, size=num_trajs)
         sj = np.random.randint(6, size=num_trajs)
         step = np.random.randint(3, 7, size=num_trajs)
-        for n in range(num_trajs):
-            # pick two random demonstrations
-            bi, bj = np.random.choice(num_bins, size=(2, ), replace=False)
-            ti = np.random.choice(len(self.pre_expert_data[bi]))
-            tj = np.random.choice(len(self.pre_expert_data[bj]))
-            # create random partial trajs by finding random start frame and random skip frame
-            traj_i = self.pre_expert_data[bi][ti][si[n]::step[n]]  # slice(start,stop,step)
-            traj_j = self.pre_expert_data[bj][tj][sj[n]::step[n]]
-
-            label = int(bi <= bj)
-
-            self.training_obs.append((traj_i, traj_j))
-            self.training_labels.append(label)
-            max_traj_length = max(max_traj_length, len(traj_i), len(traj_j))
+        bi, bj, ti, tj = sample_pairs(num_trajs)
+        # create random partial trajs by finding random start frame and random skip frame
+        self.training_obs.extend(
+            [
+                (
+                    self.pre_expert_data[bi[n]][ti[n]][si[n]::step[n]],
+                    self.pre_expert_data[bj[n]][tj[n]][sj[n]::step[n]]
+                ) for n in range(num_trajs)
+            ]
+        )
+        self.training_labels.extend((bi <= bj).astype(int).tolist())
 
         # fixed size snippets with progress prior
         rand_length = np.random.randint(min_snippet_length, max_snippet_length, size=num_snippets)
-        for n in range(num_snippets):
-            # pick two random demonstrations
-            bi, bj = np.random.choice(num_bins, size=(2, ), replace=False)
-            ti = np.random.choice(len(self.pre_expert_data[bi]))
-            tj = np.random.choice(len(self.pre_expert_data[bj]))
-            # create random snippets
-            # find min length of both demos to ensure we can pick a demo no earlier
-            # than that chosen in worse preferred demo
-            min_length = min(len(self.pre_expert_data[bi][ti]), len(self.pre_expert_data[bj][tj]))
-            if bi < bj:  # pick tj snippet to be later than ti
-                ti_start = np.random.randint(min_length - rand_length[n] + 1)
-                # print(ti_start, len(demonstrations[tj]))
-                tj_start = np.random.randint(ti_start, len(self.pre_expert_data[bj][tj]) - rand_length[n] + 1)
-            else:  # ti is better so pick later snippet in ti
-                tj_start = np.random.randint(min_length - rand_length[n] + 1)
-                # print(tj_start, len(demonstrations[ti]))
-                ti_start = np.random.randint(tj_start, len(self.pre_expert_data[bi][ti]) - rand_length[n] + 1)
-            # skip everyother framestack to reduce size
-            traj_i = self.pre_expert_data[bi][ti][ti_start:ti_start + rand_length[n]:2]
-            traj_j = self.pre_expert_data[bj][tj][tj_start:tj_start + rand_length[n]:2]
-
-            max_traj_length = max(max_traj_length, len(traj_i), len(traj_j))
-            label = int(bi <= bj)
-            self.training_obs.append((traj_i, traj_j))
-            self.training_labels.append(label)
+        bi, bj, ti, tj = sample_pairs(num_snippets)
+        len_i, len_j = flat_lengths[bin_offset[bi] + ti], flat_lengths[bin_offset[bj] + tj]
+        # find min length of both demos to ensure we can pick a demo no earlier
+        # than that chosen in worse preferred demo
+        min_length = np.minimum(len_i, len_j)
+        worse_start = randint(np.zeros_like(min_length), min_length - rand_length + 1)
+        # if bi < bj, pick tj snippet to be later than ti, otherwise ti is better so pick later snippet in ti
+        ti_start = np.where(bi < bj, worse_start, randint(worse_start, len_i - rand_length + 1))
+        tj_start = np.where(bi < bj, randint(worse_start, len_j - rand_length + 1), worse_start)
+        # skip everyother framestack to reduce size
+        self.training_obs.extend(
+            [
+                (
+                    self.pre_expert_data[bi[n]][ti[n]][ti_start[n]:ti_start[n] + rand_length[n]:2],
+                    self.pre_expert_data[bj[n]][tj[n]][tj_start[n]:tj_start[n] + rand_length[n]:2]
+                ) for n in range(num_snippets)
+            ]
+        )
+        self.training_labels.extend((bi <= bj).astype(int).tolist())
+
+        max_traj_length = max([max(len(traj_i), len(traj_j)) for traj_i, traj_j in self.training_obs], default=0)
         self._logger.info(("maximum traj length: {}".format(max_traj_length)))
         return self.training_obs, self.training_labels
 
+    def _collate_pairs(self, pairs: List[Tuple[list, list]]) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Overview:
+            Concatenate the observations of a batch of trajectory pairs for ``TrexModel.forward_batch`` .
+        Arguments:
+            - pairs (:obj:`List[Tuple[list, list]]`): The trajectory pairs, each trajectory is a list of obs.
+        Returns:
+            - obs (:obj:`torch.Tensor`): The concatenated observations.
+            - segment_ids (:obj:`torch.Tensor`): The trajectory id of each observation.
+        """
+        trajs = [traj for pair in pairs for traj in pair]
+        obs = torch.from_numpy(np.concatenate([np.array(traj) for traj in trajs])).float().to(self.device)
+        lengths = torch.as_tensor([len(traj) for traj in trajs])
+        segment_ids = torch.repeat_interleave(torch.arange(len(trajs)), lengths).to(self.device)
+        return obs, segment_ids
+
     def _train(self):
         # check if gpu available
         device = self.device  # torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
@@ -297,26 +341,20 @@ class TrexRewardModel(BaseRewardModel):
         loss_criterion = nn.CrossEntropyLoss()
 
         cum_loss = 0.0
+        batch_size = self.cfg.reward_model.get('pair_batch_size', 1)
         training_data = list(zip(training_inputs, training_outputs))
         for epoch in range(self.cfg.reward_model.update_per_collect):  # todo
             np.random.shuffle(training_data)
             training_obs, training_labels = zip(*training_data)
-            for i in range(len(training_labels)):
-
-                # traj_i, traj_j has the same length, however, they change as i increases
-                traj_i, traj_j = training_obs[i]  # traj_i is a list of array generated by env.step
-                traj_i = np.array(traj_i)
-                traj_j = np.array(traj_j)
-                traj_i = torch.from_numpy(traj_i).float().to(device)
-                traj_j = torch.from_numpy(traj_j).float().to(device)
-
-                # training_labels[i] is a boolean integer: 0 or 1
-                labels = torch.tensor([training_labels[i]]).to(device)
+            for i, start in enumerate(range(0, len(training_labels), batch_size)):
+                # traj_i, traj_j in a pair have the same length, however, they change among pairs
+                obs, segment_ids = self._collate_pairs(training_obs[start:start + batch_size])
+                # training_labels are boolean integers: 0 or 1
+                labels = torch.as_tensor(training_labels[start:start + batch_size]).to(device)
 
                 # forward + backward + zero out gradient + optimize
-                outputs, abs_rewards = self.reward_model.forward(traj_i, traj_j)
-                outputs = outputs.unsqueeze(0)
-                loss = loss_criterion(outputs, labels) + self.l1_reg * abs_rewards
+                outputs, abs_rewards = self.reward_model.forward_batch(obs, segment_ids, len(labels))
+                loss = loss_criterion(outputs, labels) + self.l1_reg * abs_rewards.mean()
                 self.opt.zero_grad()
                 loss.backward()
                 self.opt.step()
@@ -369,24 +407,16 @@ class TrexRewardModel(BaseRewardModel):
             # different precision
         return sum(rewards_from_obs)  # rewards_from_obs is a list of floats
 
-    def calc_accuracy(self, reward_network, training_inputs, training_outputs):
-        device = self.device
-        loss_criterion = nn.CrossEntropyLoss()
+    def calc_accuracy(self, reward_network, training_inputs, training_outputs, batch_size: int = 256):
         num_correct = 0.
         with torch.no_grad():
-            for i in range(len(training_inputs)):
-                label = training_outputs[i]
-                traj_i, traj_j = training_inputs[i]
-                traj_i = np.array(traj_i)
-                traj_j = np.array(traj_j)
-                traj_i = torch.from_numpy(traj_i).float().to(device)
-                traj_j = torch.from_numpy(traj_j).float().to(device)
-
+            for start in range(0, len(training_inputs), batch_size):
+                obs, segment_ids = self._collate_pairs(training_inputs[start:start + batch_size])
+                labels = torch.as_tensor(training_outputs[start:start + batch_size]).to(self.device)
                 #forward to get logits
-                outputs, abs_return = reward_network.forward(traj_i, traj_j)
-                _, pred_label = torch.max(outputs, 0)
-                if pred_label.item() == label:
-                    num_correct += 1.
+                outputs, abs_return = reward_network.forward_batch(obs, segment_ids, len(labels))
+                pred_label = outputs.argmax(dim=1)
+                num_correct += (pred_label == labels).sum().item()
         return num_correct / len(training_inputs)
 
     def pred_data(self, data):
@@ -3,7 +3,7 @@ from .data_helper import to_device, to_tensor, to_ndarray, to_list, to_dtype, sa
     build_log_buffer, CudaFetcher, get_tensor_data, unsqueeze, squeeze, get_null_data, get_shape0, to_item, \
     zeros_like
 from .distribution import CategoricalPd, CategoricalPdPytorch
-from .metric import levenshtein_distance, hamming_distance
+from .metric import levenshtein_distance, levenshtein_distance_batch, hamming_distance
 from .network import *
 from .loss import *
 from .optimizer_helper import Adam, RMSprop, calculate_grad_norm, calculate_grad_norm_without_bias_two_norm
@@ -12,3 +12,6 @@ from .math_helper import cov
 from .dataparallel import DataParallel
 from .reshape_helper import fold_batch, unfold_batch, unsqueeze_repeat
 from .parameter import NonegativeParameter, TanhParameter
+from .backend_helper import compile_fn, compile_model
+from .quantize_helper import quantize_model, quantize_report, QuantizedActor
+from .amp_helper import get_autocast_dtype, to_fp32, LossScaler
@@ -0,0 +1,203 @@
+from typing import Any, Callable, Dict, Optional, Union
+import torch
+
+LOW_PRECISION_DTYPES = {
+    'bf16': torch.bfloat16,
+    'bfloat16': torch.bfloat16,
+    'fp16': torch.float16,
+    'float16': torch.float16,
+}
+
+
+def get_autocast_dtype(precision: Optional[str]) -> Optional[torch.dtype]:
+    """
+    Overview:
+        Get the low precision dtype of ``torch.autocast`` from the name of mixed precision mode.
+    Arguments:
+        - precision (:obj:`Optional[str]`): The name of mixed precision mode, support ['bf16', 'bfloat16', 'fp16', \
+            'float16'], None or 'fp32' means no mixed precision.
+    Returns:
+        - dtype (:obj:`Optional[torch.dtype]`): The low precision dtype, None means no mixed precision.
+    """
+    if precision is None or precision in ['fp32', 'float32']:
+        return None
+    if precision not in LOW_PRECISION_DTYPES:
+        raise KeyError("not support mixed precision: {}, valid values: {}".format(precision, LOW_PRECISION_DTYPES))
+    return LOW_PRECISION_DTYPES[precision]
+
+
+def to_fp32(data: Any) -> Any:
+    """
+    Overview:
+        Cast the low precision (bfloat16 and float16) floating point tensors in data to float32, other tensors \
+        (e.g. the int64 actions) and non-tensor items are kept unchanged. The cast is differentiable.
+    Arguments:
+        - data (:obj:`Any`): The data to be cast, which can be tensor or the nested dict/list/tuple of tensors.
+    Returns:
+        - data (:obj:`Any`): The cast data with the same structure.
+    """
+    if isinstance(data, torch.Tensor):
+        return data.float() if data.dtype in (torch.bfloat16, torch.float16) else data
+    elif isinstance(data, dict):
+        return type(data)({k: to_fp32(v) for k, v in data.items()})
+    elif isinstance(data, tuple) and hasattr(data, '_fields'):  # namedtuple
+        return type(data)(*[to_fp32(t) for t in data])
+    elif isinstance(data, (list, tuple)):
+        return type(data)([to_fp32(t) for t in data])
+    else:
+        return data
+
+
+class LossScaler:
+    """
+    Overview:
+        Loss scaler for mixed precision training, which works on both CPU and GPU and with any optimizer (including \
+        ``ding.torch_utils.Adam`` and ``RMSprop`` with grad clip and grad ignore). The loss is multiplied by \
+        ``loss_scale`` before backward to keep the small gradients of float16 activations from underflow, and the \
+        gradients are unscaled in ``step`` before ``optimizer.step`` , so that the grad clip and grad ignore of \
+        optimizer act on the real gradients. The step with inf/nan gradients is skipped. In dynamic mode, the scale \
+        is halved after a skipped step and doubled after ``growth_interval`` successful steps. bfloat16 has the same \
+        exponent range as float32, thus it usually doesn't need loss scaling.
+    Interfaces:
+        ``__init__``, ``scale``, ``unscale_``, ``step``, ``state_dict``, ``load_state_dict``
+    Properties:
+        ``enabled``, ``loss_scale``
+    """
+
+    def __init__(
+            self,
+            init_scale: float = 2. ** 16,
+            dynamic: bool = True,
+            enabled: bool = True,
+            growth_factor: float = 2.,
+            backoff_factor: float = 0.5,
+            growth_interval: int = 2000,
+    ) -> None:
+        """
+        Overview:
+            Initialize the loss scaler.
+        Arguments:
+            - init_scale (:obj:`float`): The initial loss scale.
+            - dynamic (:obj:`bool`): Whether to adjust the loss scale according to the inf/nan gradients.
+            - enabled (:obj:`bool`): Whether to enable the loss scaling, if False, ``scale`` returns the loss \
+                itself and ``step`` directly calls ``optimizer.step`` .
+            - growth_factor (:obj:`float`): The factor to multiply the scale after ``growth_interval`` steps.
+            - backoff_factor (:obj:`float`): The factor to multiply the scale after a skipped step.
+            - growth_interval (:obj:`int`): The number of consecutive successful steps to grow the scale.
+        """
+        assert init_scale > 0, init_scale
+        self._enabled = enabled
+        self._scale = float(init_scale)
+        self._dynamic = dynamic
+        self._growth_factor = growth_factor
+        self._backoff_factor = backoff_factor
+        self._growth_interval = growth_interval
+        self._growth_tracker = 0
+        # the optimizers whose gradients have been unscaled in the current step
+        self._unscaled = {}
+
+    @classmethod
+    def from_config(cls: type, precision: Optional[str], loss_scale: Union[None, str, float] = None) -> 'LossScaler':
+        """
+        Overview:
+            Create the loss scaler according to the mixed precision config.
+        Arguments:
+            - precision (:obj:`Optional[str]`): The name of mixed precision mode, refer to ``get_autocast_dtype``.
+            - loss_scale (:obj:`Union[None, str, float]`): None means dynamic loss scaling for float16 and no loss \
+                scaling for other modes, 'dynamic' means dynamic loss scaling, and a number means the static scale.
+        Returns:
+            - scaler (:obj:`LossScaler`): The created loss scaler.
+        """
+        if loss_scale is None:
+            return cls(enabled=get_autocast_dtype(precision) == torch.float16)
+        elif loss_scale == 'dynamic':
+            return cls()
+        else:
+            return cls(init_scale=float(loss_scale), dynamic=False)
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def loss_scale(self) -> float:
+        return self._scale if self._enabled else 1.
+
+    def scale(self, loss: torch.Tensor) -> torch.Tensor:
+        """
+        Overview:
+            Scale the loss before backward.
+        Arguments:
+            - loss (:obj:`torch.Tensor`): The loss tensor, e.g. the loss returned by ``q_nstep_td_error`` or the \
+                weighted sum of ``ppo_error`` .
+        Returns:
+            - scaled_loss (:obj:`torch.Tensor`): The scaled loss, whose ``backward`` produces scaled gradients.
+        Examples:
+            >>> scaler.scale(loss).backward()
+            >>> scaler.step(optimizer)
+        """
+        if not self._enabled:
+            return loss
+        return loss * self._scale
+
+    def unscale_(self, optimizer: torch.optim.Optimizer) -> bool:
+        """
+        Overview:
+            Unscale the gradients of the parameters of optimizer in place, it is called by ``step`` automatically, \
+            and can be called explicitly before the operations on the real gradients such as the grad norm \
+            monitor. Each optimizer is only unscaled once in a step.
+        Arguments:
+            - optimizer (:obj:`torch.optim.Optimizer`): The optimizer whose gradients are scaled.
+        Returns:
+            - found_inf (:obj:`bool`): Whether there are inf/nan values in the gradients.
+        """
+        if not self._enabled:
+            return False
+        if id(optimizer) in self._unscaled:
+            return self._unscaled[id(optimizer)]
+        grads = [p.grad for group in optimizer.param_groups for p in group['params'] if p.grad is not None]
+        found_inf = False
+        if len(grads) > 0:
+            inv_scale = 1. / self._scale
+            for g in grads:
+                g.mul_(inv_scale)
+            found_inf = not bool(torch.stack([torch.isfinite(g).all() for g in grads]).all())
+        self._unscaled[id(optimizer)] = found_inf
+        return found_inf
+
+    def step(self, optimizer: torch.optim.Optimizer, closure: Optional[Callable] = None) -> bool:
+        """
+        Overview:
+            Unscale the gradients and call ``optimizer.step`` if all the gradients are finite, then update the \
+            loss scale in dynamic mode.
+        Arguments:
+            - optimizer (:obj:`torch.optim.Optimizer`): The optimizer to step.
+            - closure (:obj:`Optional[Callable]`): The closure passed to ``optimizer.step`` .
+        Returns:
+            - stepped (:obj:`bool`): Whether the optimizer is stepped, False means the step is skipped because of \
+                the inf/nan gradients.
+        """
+        if not self._enabled:
+            optimizer.step(closure)
+            return True
+        found_inf = self.unscale_(optimizer)
+        del self._unscaled[id(optimizer)]
+        if not found_inf:
+            optimizer.step(closure)
+        if self._dynamic:
+            if found_inf:
+                self._scale *= self._backoff_factor
+                self._growth_tracker = 0
+            else:
+                self._growth_tracker += 1
+                if self._growth_tracker == self._growth_interval:
+                    self._scale *= self._growth_factor
+                    self._growth_tracker = 0
+        return not found_inf
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {'scale': self._scale, 'growth_tracker': self._growth_tracker}
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._scale = state_dict['scale']
+        self._growth_tracker = state_dict['growth_tracker']
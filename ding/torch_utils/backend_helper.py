@@ -1,3 +1,7 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+import copy
+import functools
+from ditk import logging
 import torch
 
 
@@ -10,3 +14,148 @@ def enable_tf32() -> None:
     """
     torch.backends.cuda.matmul.allow_tf32 = True  # allow tf32 on matmul
     torch.backends.cudnn.allow_tf32 = True  # allow tf32 on cudnn
+
+
+def _compile_errors() -> Tuple[type, ...]:
+    # the errors raised by dynamo and the compiler backends when the compilation fails, other errors raised in the
+    # compiled function (e.g. the shape mismatch of inputs) are the errors of user code and should not be suppressed
+    try:
+        import torch._dynamo.exc as dynamo_exc
+    except ImportError:
+        return ()
+    names = ['BackendCompilerFailed', 'InternalTorchDynamoError', 'Unsupported', 'InvalidBackend']
+    return tuple(getattr(dynamo_exc, name) for name in names if hasattr(dynamo_exc, name))
+
+
+def _compile_with_fallback(fn: Callable, name: str, backend: str, mode: Optional[str],
+                           dynamic: Optional[bool]) -> Optional[Callable]:
+    # return a callable that runs the compiled ``fn`` and falls back to the eager ``fn`` forever once the compilation
+    # fails, or None if ``torch.compile`` is not available in this environment
+    if not hasattr(torch, 'compile'):
+        logging.warning(
+            'torch.compile is not available in torch {}, {} runs in eager mode'.format(torch.__version__, name)
+        )
+        return None
+    try:
+        compiled_fn = torch.compile(fn, backend=backend, mode=mode, dynamic=dynamic)
+    except Exception as e:  # e.g. unsupported python version or unknown backend
+        logging.warning('torch.compile {} failed, fall back to eager mode: {}'.format(name, e))
+        return None
+    state = {'compiled': True}
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if state['compiled']:
+            try:
+                return compiled_fn(*args, **kwargs)
+            except _compile_errors() as e:
+                logging.warning('torch.compile {} failed, fall back to eager mode: {}'.format(name, e))
+                state['compiled'] = False
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def compile_fn(
+        fn: Callable,
+        backend: str = 'inductor',
+        mode: Optional[str] = None,
+        dynamic: Optional[bool] = None
+) -> Callable:
+    """
+    Overview:
+        Compile a function (e.g. the loss functions in ``ding.rl_utils``) with ``torch.compile`` , which fuses the \
+        many small ops into a few kernels. If ``torch.compile`` is not available, or the compilation fails, the \
+        eager function is used instead.
+    Arguments:
+        - fn (:obj:`Callable`): The function to be compiled.
+        - backend (:obj:`str`): The backend of ``torch.compile`` , ``inductor`` generates C++/OpenMP kernels on CPU \
+            and triton kernels on GPU, ``aot_eager`` only traces the graph without code generation.
+        - mode (:obj:`Optional[str]`): The mode of ``torch.compile`` , such as ``reduce-overhead`` .
+        - dynamic (:obj:`Optional[bool]`): Whether to use dynamic shape tracing, None means automatic detection.
+    Returns:
+        - compiled_fn (:obj:`Callable`): The compiled function with the same signature.
+    Examples:
+        >>> from ding.rl_utils import q_nstep_td_error
+        >>> q_nstep_td_error = compile_fn(q_nstep_td_error, backend='inductor')
+    """
+    compiled_fn = _compile_with_fallback(fn, getattr(fn, '__name__', str(fn)), backend, mode, dynamic)
+    return fn if compiled_fn is None else compiled_fn
+
+
+class _CompiledForward:
+    """
+    Overview:
+        The compiled ``forward`` bound to a model instance. It is re-bound to the copy when the model is deep \
+        copied (sharing the compiled function), and it is compiled again lazily after unpickling, because the \
+        compiled function can't be pickled.
+    """
+
+    def __init__(
+            self,
+            model: torch.nn.Module,
+            backend: str,
+            mode: Optional[str],
+            dynamic: Optional[bool],
+            compiled_fn: Optional[Callable] = None
+    ) -> None:
+        self._model = model
+        self._compile_kwargs = {'backend': backend, 'mode': mode, 'dynamic': dynamic}
+        if compiled_fn is None:
+            cls = type(model)
+            compiled_fn = _compile_with_fallback(cls.forward, cls.__name__, **self._compile_kwargs)
+        self.compiled_fn = compiled_fn
+
+    def __call__(self, *args, **kwargs) -> Any:
+        if self.compiled_fn is None:
+            cls = type(self._model)
+            compiled_fn = _compile_with_fallback(cls.forward, cls.__name__, **self._compile_kwargs)
+            self.compiled_fn = cls.forward if compiled_fn is None else compiled_fn
+        return self.compiled_fn(self._model, *args, **kwargs)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> '_CompiledForward':
+        model = copy.deepcopy(self._model, memo)
+        return _CompiledForward(model, compiled_fn=self.compiled_fn, **self._compile_kwargs)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['compiled_fn'] = None
+        return state
+
+
+def compile_model(
+        model: torch.nn.Module,
+        backend: str = 'inductor',
+        mode: Optional[str] = None,
+        dynamic: Optional[bool] = None
+) -> torch.nn.Module:
+    """
+    Overview:
+        Compile the ``forward`` method of model with ``torch.compile`` in place. Different from \
+        ``torch.compile(model)`` , the compiled model is still an instance of the original model class with the same \
+        ``state_dict`` keys, and the compiled ``forward`` is also used when it is called by the model wrappers (i.e. \
+        ``model.forward(...)`` rather than ``model(...)`` ) or after ``copy.deepcopy`` (e.g. the target model). \
+        The compiled model can be pickled, and it is compiled again after unpickling. If ``torch.compile`` is not \
+        available, or the compilation fails (e.g. unsupported ops in the model), the model falls back to the eager \
+        ``forward`` , while the errors of user code (e.g. the shape mismatch of inputs) are raised as they are.
+    Arguments:
+        - model (:obj:`torch.nn.Module`): The model to be compiled.
+        - backend (:obj:`str`): The backend of ``torch.compile`` , refer to ``compile_fn`` .
+        - mode (:obj:`Optional[str]`): The mode of ``torch.compile`` .
+        - dynamic (:obj:`Optional[bool]`): Whether to use dynamic shape tracing, None means automatic detection.
+    Returns:
+        - model (:obj:`torch.nn.Module`): The compiled model, which is the same object as the input model.
+    Examples:
+        >>> model = compile_model(DQN(obs_shape=4, action_shape=2), backend='inductor')
+        >>> output = model.forward(torch.randn(3, 4))
+    """
+    if getattr(model, '_ding_compiled', False):
+        return model
+    forward = _CompiledForward(model, backend, mode, dynamic)
+    if forward.compiled_fn is None:
+        return model
+    # Override ``forward`` in the instance ``__dict__`` , so that the class of model is kept (e.g. for pickle), and
+    # ``_CompiledForward`` is re-bound to the new model when the model is deep copied.
+    model.forward = forward
+    model._ding_compiled = True
+    return model
@@ -1,4 +1,6 @@
+import numpy as np
 import torch
+from functools import lru_cache
 from typing import Optional, Callable
 
 
@@ -59,6 +61,132 @@ def levenshtein_distance(
     return torch.FloatTensor([distance]).to(pred.device)
 
 
+def levenshtein_distance_batch(
+        pred: torch.LongTensor,
+        target: torch.LongTensor,
+        pred_lengths: Optional[torch.LongTensor] = None,
+        target_lengths: Optional[torch.LongTensor] = None,
+        pred_extra: Optional[torch.Tensor] = None,
+        target_extra: Optional[torch.Tensor] = None,
+        extra_fn: Optional[Callable] = None,
+        use_numba: bool = False,
+) -> torch.FloatTensor:
+    """
+    Overview:
+        Batch version of ``levenshtein_distance`` , which calculates the distances of B pairs of padded sequences \
+        at once and returns the same result as calling ``levenshtein_distance`` on each pair. The cells on the same \
+        anti-diagonal of the dynamic programming table only depend on the previous two anti-diagonals, so they are \
+        updated together for the whole batch, i.e. ``N1 + N2`` vectorized steps instead of ``N1 * N2`` scalar \
+        steps for each pair. If ``use_numba`` is True, the table is filled by a numba compiled kernel on CPU instead.
+    Arguments:
+        - pred (:obj:`torch.LongTensor`): The first padded sequences to calculate the distance.
+        - target (:obj:`torch.LongTensor`): The second padded sequences to calculate the distance.
+        - pred_lengths (:obj:`Optional[torch.LongTensor]`): The valid lengths of ``pred`` , None means no padding.
+        - target_lengths (:obj:`Optional[torch.LongTensor]`): The valid lengths of ``target`` , None means no \
+            padding.
+        - pred_extra (:obj:`Optional[torch.Tensor]`): Extra tensor to calculate the distance, only works when \
+            ``extra_fn`` is not ``None``.
+        - target_extra (:obj:`Optional[torch.Tensor]`): Extra tensor to calculate the distance, only works when \
+            ``extra_fn`` is not ``None``.
+        - extra_fn (:obj:`Optional[Callable]`): The distance function for ``pred_extra`` and ``target_extra`` , \
+            which is called once with broadcastable tensors of shape :math:`(B, N1, 1, *)` and \
+            :math:`(B, 1, N2, *)` and should return the distances of all the element pairs with shape \
+            :math:`(B, N1, N2)` . If set to ``None``, this distance will not be considered.
+        - use_numba (:obj:`bool`): Whether to use the numba kernel, it falls back to python if numba is not \
+            installed.
+    Returns:
+        - distance (:obj:`torch.FloatTensor`): The distances of each pair.
+    Shapes:
+        - pred (:obj:`torch.LongTensor`): :math:`(B, N1)`.
+        - target (:obj:`torch.LongTensor`): :math:`(B, N2)`.
+        - pred_lengths (:obj:`torch.LongTensor`): :math:`(B, )`.
+        - target_lengths (:obj:`torch.LongTensor`): :math:`(B, )`.
+        - pred_extra (:obj:`torch.Tensor`): :math:`(B, N1, *)`.
+        - target_extra (:obj:`torch.Tensor`): :math:`(B, N2, *)`.
+        - distance (:obj:`torch.FloatTensor`): :math:`(B, )`.
+    Examples:
+        >>> pred = torch.LongTensor([[1, 4, 6, 4, 1], [6, 4, 1, 0, 0]])
+        >>> target = torch.LongTensor([[1, 6, 4, 4, 1], [1, 4, 6, 4, 1]])
+        >>> levenshtein_distance_batch(pred, target, pred_lengths=torch.LongTensor([5, 3]))
+        tensor([2., 2.])
+    """
+    assert (isinstance(pred, torch.Tensor) and isinstance(target, torch.Tensor))
+    assert (pred.dtype == torch.long and target.dtype == torch.long), '{}\t{}'.format(pred.dtype, target.dtype)
+    assert (pred.device == target.device)
+    assert (pred.dim() == 2 and target.dim() == 2 and pred.shape[0] == target.shape[0])
+    assert (type(pred_extra) == type(target_extra))
+    if not extra_fn:
+        assert (pred_extra is None)
+    device = pred.device
+    (B, N1), N2 = pred.shape, target.shape[1]
+    pred_lengths = torch.full((B, ), N1, dtype=torch.long) if pred_lengths is None else pred_lengths.long().cpu()
+    target_lengths = torch.full((B, ), N2, dtype=torch.long) if target_lengths is None else target_lengths.long().cpu()
+    # the distance with an empty sequence is the length of the other one
+    distance = torch.max(pred_lengths, target_lengths).float()
+    if N1 == 0 or N2 == 0:
+        return distance.to(device)
+
+    # (B, N1, N2)
+    match = pred.unsqueeze(2) == target.unsqueeze(1)
+    if extra_fn:
+        extra = extra_fn(pred_extra.unsqueeze(2), target_extra.unsqueeze(1)).float()
+        # the first row and column are offset by the extra distance of the first elements, like the unbatched version
+        first_extra = torch.where(match[:, 0, 0], extra[:, 0, 0], torch.ones_like(extra[:, 0, 0]))
+    else:
+        extra = torch.zeros(match.shape, device=device)
+        first_extra = torch.zeros(B, device=device)
+
+    if use_numba:
+        dp_array = torch.from_numpy(
+            _get_levenshtein_kernel()(
+                match.cpu().numpy(),
+                extra.cpu().numpy().astype(np.float32),
+                first_extra.cpu().numpy().astype(np.float32),
+            )
+        )
+    else:
+        dp_array = torch.zeros(B, N1, N2, device=device)
+        dp_array[:, 0, :] = torch.arange(0, N2, device=device) + first_extra.unsqueeze(1)
+        dp_array[:, :, 0] = torch.arange(0, N1, device=device) + first_extra.unsqueeze(1)
+        # i + j == d on the d-th anti-diagonal, and the cells with i >= 1 and j >= 1 are updated together
+        for d in range(2, N1 + N2 - 1):
+            i = torch.arange(max(1, d - N2 + 1), min(N1 - 1, d - 1) + 1, device=device)
+            j = d - i
+            diag = dp_array[:, i - 1, j - 1]
+            edit = torch.min(torch.min(dp_array[:, i - 1, j], dp_array[:, i, j - 1]), diag) + 1
+            dp_array[:, i, j] = torch.where(match[:, i, j], diag + extra[:, i, j], edit)
+        dp_array = dp_array.cpu()
+
+    valid = (pred_lengths > 0) & (target_lengths > 0)
+    batch_idx = torch.arange(B)[valid]
+    distance[valid] = dp_array[batch_idx, pred_lengths[valid] - 1, target_lengths[valid] - 1]
+    return distance.to(device)
+
+
+def _levenshtein_kernel(match: np.ndarray, extra: np.ndarray, first_extra: np.ndarray) -> np.ndarray:
+    B, N1, N2 = match.shape
+    dp_array = np.zeros((B, N1, N2), dtype=np.float32)
+    for b in range(B):
+        for j in range(N2):
+            dp_array[b, 0, j] = j + first_extra[b]
+        for i in range(N1):
+            dp_array[b, i, 0] = i + first_extra[b]
+        for i in range(1, N1):
+            for j in range(1, N2):
+                if match[b, i, j]:
+                    dp_array[b, i, j] = dp_array[b, i - 1, j - 1] + extra[b, i, j]
+                else:
+                    dp_array[b, i, j] = min(dp_array[b, i - 1, j], dp_array[b, i, j - 1], dp_array[b, i - 1, j - 1]) + 1
+    return dp_array
+
+
+@lru_cache()
+def _get_levenshtein_kernel() -> Callable:
+    # compile the kernel only when it is used, so that importing this module doesn't check numba
+    from ding.utils.segment_tree import njit
+    return njit()(_levenshtein_kernel)
+
+
 def hamming_distance(pred: torch.LongTensor, target: torch.LongTensor, weight=1.) -> torch.LongTensor:
     """
     Overview:
@@ -9,7 +9,7 @@ from .transformer import Transformer, ScaledDotProductAttention
 from .scatter_connection import ScatterConnection
 from .resnet import resnet18, ResNet
 from .gumbel_softmax import GumbelSoftmax
-from .gtrxl import GTrXL, GRUGatingUnit
+from .gtrxl import GTrXL, GRUGatingUnit, Memory, RingMemory
 from .popart import PopArt
 #from .dreamer import Conv2dSame, DreamerLayerNorm, ActionHead, DenseHead
 from .merge import GatingType, SumMerge, VectorMerge
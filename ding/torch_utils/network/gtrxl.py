@@ -3,7 +3,7 @@ Overview:
     This file implements the core modules of GTrXL Transformer as described in
     "Stabilizing Transformer for Reinforcement Learning" (https://arxiv.org/abs/1910.06764).
 """
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 import warnings
 import numpy as np
 import torch
@@ -219,6 +219,95 @@ class Memory:
 
         self.memory = self.memory.to(device)
 
+    def reset_entry(self, batch_ids: List[int]) -> None:
+        """
+        Overview:
+            Reset the memory of the specified batch entries to zero in place, e.g. when some of the envs are done.
+        Arguments:
+            - batch_ids (:obj:`List[int]`): The indexes along the batch dimension to be reset.
+        """
+
+        self.memory[:, :, list(batch_ids)] = 0.
+
+
+class RingMemory(Memory):
+    """
+    Overview:
+        A ring buffer version of ``Memory``. ``Memory.update`` concatenates and stacks the whole memory at every \
+        step, while ``RingMemory`` preallocates a fixed buffer and only writes the new hidden states in place at \
+        a moving write pointer. Each slot is mirrored in a buffer of twice the memory length, so that the memory \
+        in chronological order is always the contiguous slice ``buffer[:, ptr:ptr + memory_len]``, which can be \
+        fed to the attention layers as a view without any copy.
+    Interfaces:
+        ``__init__``, ``init``, ``update``, ``get``, ``to``, ``reset_entry``
+
+    .. note::
+        The tensor returned by ``get`` is a view of the buffer, it will be overwritten by the following ``update``. \
+        Please clone it if you need to keep the content of a past memory.
+    """
+
+    def init(self, memory: Optional[torch.Tensor] = None) -> None:
+        """
+        Overview:
+            Initialize the ring buffer with an input memory tensor or with zeros given its dimensions.
+        Arguments:
+            - memory (:obj:`Optional[torch.Tensor]`): Input memory tensor with shape \
+                (layer_num + 1, memory_len, bs, embedding_dim), which is copied into the buffer.
+        """
+
+        if memory is not None:
+            layer_num_plus1, self.memory_len, self.bs, self.embedding_dim = memory.shape
+            self.layer_num = layer_num_plus1 - 1
+            self.memory = torch.cat([memory, memory], dim=1).detach()
+        else:
+            self.memory = torch.zeros(
+                self.layer_num + 1, 2 * self.memory_len, self.bs, self.embedding_dim, dtype=torch.float
+            )
+        # index of the oldest slot, i.e. the beginning of the chronological memory window
+        self._ptr = 0
+
+    def update(self, hidden_state: List[torch.Tensor]) -> torch.Tensor:
+        """
+        Overview:
+            Write a sequence of hidden states into the ring buffer, overwriting the oldest slots, and advance \
+            the write pointer. The result is the same as ``Memory.update`` .
+        Arguments:
+            - hidden_state: (:obj:`List[torch.Tensor]`): The hidden states to update the memory. \
+                Each tensor in the list has shape (cur_seq, bs, embedding_dim).
+        Returns:
+            - memory: (:obj:`torch.Tensor`): The view of the updated memory, with shape \
+                (layer_num + 1, memory_len, bs, embedding_dim).
+        """
+
+        if self.memory is None or hidden_state is None:
+            raise ValueError('Failed to update memory! Memory would be None')
+        sequence_len = hidden_state[0].shape[0]
+        if self.memory_len == 0 or sequence_len == 0:
+            return self.get()
+        with torch.no_grad():
+            # only the stack of the new hidden states is built, (layer_num + 1) x cur_seq x bs x embedding_dim
+            h = torch.stack([s[-self.memory_len:] for s in hidden_state], dim=0).to(self.memory.dtype)
+            if sequence_len >= self.memory_len:
+                self.memory[:, :self.memory_len] = h
+                self.memory[:, self.memory_len:] = h
+                self._ptr = 0
+            else:
+                index = (torch.arange(sequence_len, device=self.memory.device) + self._ptr) % self.memory_len
+                self.memory.index_copy_(1, torch.cat([index, index + self.memory_len]), torch.cat([h, h], dim=1))
+                self._ptr = (self._ptr + sequence_len) % self.memory_len
+        return self.get()
+
+    def get(self) -> torch.Tensor:
+        """
+        Overview:
+            Get the view of the current memory in chronological order.
+        Returns:
+            - memory: (:obj:`torch.Tensor`): The current memory, with shape \
+                (layer_num + 1, memory_len, bs, embedding_dim).
+        """
+
+        return self.memory[:, self._ptr:self._ptr + self.memory_len]
+
 
 class AttentionXL(torch.nn.Module):
     """
@@ -529,16 +618,20 @@ class GTrXL(nn.Module):
         # new one each time we call the forward method
         self.pos_embedding_dict = {}  # create a pos embedding for each different seq_len
 
-    def reset_memory(self, batch_size: Optional[int] = None, state: Optional[torch.Tensor] = None):
+    def reset_memory(self, batch_size: Optional[int] = None, state: Optional[Union[torch.Tensor, Memory]] = None):
         """
         Overview:
             Clear or set the memory of GTrXL.
         Arguments:
             - batch_size (:obj:`Optional[int]`): The batch size. Default is None.
-            - state (:obj:`Optional[torch.Tensor]`): The input memory with shape \
-                (layer_num, memory_len, bs, embedding_dim). Default is None.
+            - state (:obj:`Optional[Union[torch.Tensor, Memory]]`): The input memory with shape \
+                (layer_num, memory_len, bs, embedding_dim). If it is a ``Memory`` instance (e.g. ``RingMemory``), \
+                it is used directly without copy and updated in place by the following forward. Default is None.
         """
 
+        if isinstance(state, Memory):
+            self.memory = state
+            return
         self.memory = Memory(memory_len=self.memory_len, layer_num=self.layer_num, embedding_dim=self.embedding_dim)
         if batch_size is not None:
             self.memory = Memory(self.memory_len, batch_size, self.embedding_dim, self.layer_num)
@@ -630,6 +723,9 @@ class GTrXL(nn.Module):
             hidden_state.append(out.clone())
 
         out = self.dropout(out)
+        if return_mem and isinstance(self.memory, RingMemory):
+            # the ring buffer is overwritten in place, so keep a snapshot of the memory before the update
+            memory = memory.clone()
         self.memory.update(hidden_state)  # (layer_num+1) x memory_len x batch_size x embedding_dim
 
         if batch_first:
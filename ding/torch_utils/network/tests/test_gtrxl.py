@@ -1,7 +1,7 @@
 import pytest
 import torch
 
-from ding.torch_utils import GTrXL, GRUGatingUnit
+from ding.torch_utils import GTrXL, GRUGatingUnit, Memory, RingMemory
 
 
 @pytest.mark.unittest
@@ -92,6 +92,52 @@ class TestGTrXL:
         assert torch.all(torch.eq(memories[3][-1][4:], outs[2]))
         assert torch.all(torch.eq(memories[3][-1][:4], outs[1]))
 
+    def test_ring_memory(self):
+        layer_num, mem_len, bs, embedding_dim = 2, 6, 4, 8
+        init = torch.rand(layer_num + 1, mem_len, bs, embedding_dim)
+        memory = Memory(memory=init.clone())
+        ring_memory = RingMemory(memory=init.clone())
+        assert torch.equal(ring_memory.get(), memory.get())
+        for seq_len in [1, 4, 3, 6, 2, 9, 5]:
+            hidden_state = [torch.rand(seq_len, bs, embedding_dim) for _ in range(layer_num + 1)]
+            memory.update(hidden_state)
+            ring_memory.update(hidden_state)
+            assert ring_memory.get().shape == (layer_num + 1, mem_len, bs, embedding_dim)
+            assert torch.equal(ring_memory.get(), memory.get())
+        memory.reset_entry([0, 2])
+        ring_memory.reset_entry([0, 2])
+        assert torch.equal(ring_memory.get(), memory.get())
+        assert sum(ring_memory.get()[:, :, 2].flatten()) == 0
+        hidden_state = [torch.rand(2, bs, embedding_dim) for _ in range(layer_num + 1)]
+        memory.update(hidden_state)
+        ring_memory.update(hidden_state)
+        assert torch.equal(ring_memory.get(), memory.get())
+
+        # the same outputs as the default memory when plugged into GTrXL
+        dim_size, seq_len = 16, 3
+        model = GTrXL(
+            input_dim=dim_size,
+            head_dim=2,
+            embedding_dim=embedding_dim,
+            memory_len=mem_len,
+            head_num=2,
+            layer_num=layer_num,
+        )
+        memory = Memory(mem_len, bs, embedding_dim, layer_num)
+        ring_memory = RingMemory(mem_len, bs, embedding_dim, layer_num)
+        for i in range(4):
+            x = torch.rand(seq_len, bs, dim_size)
+            model.reset_memory(state=memory.get())
+            output = model(x)
+            memory = model.memory
+            model.reset_memory(state=ring_memory)
+            ring_output = model(x)
+            assert model.memory is ring_memory
+            torch.testing.assert_close(ring_output['logit'], output['logit'])
+            torch.testing.assert_close(ring_output['memory'], output['memory'])
+            torch.testing.assert_close(ring_memory.get(), memory.get())
+        ring_output['logit'].sum().backward()
+
     def test_gru(self):
         input_dim = 32
         gru = GRUGatingUnit(input_dim, 1.)
@@ -0,0 +1,237 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+import copy
+import itertools
+import time
+import warnings
+from ditk import logging
+import torch
+import torch.nn as nn
+
+try:
+    from torch.ao.quantization import quantize_dynamic
+except ImportError:
+    from torch.quantization import quantize_dynamic
+
+INT8_MODULES = (nn.Linear, nn.LSTM)
+BF16_MODULES = (nn.Conv1d, nn.Conv2d, nn.Conv3d)
+
+
+class BF16Module(nn.Module):
+    """
+    Overview:
+        Run the wrapped module (usually a conv layer) in bfloat16, the input is cast to bfloat16 and the output is \
+        cast back to the dtype of input, so that the module can be used as a drop-in replacement.
+    Interfaces:
+        ``__init__``, ``forward``
+    """
+
+    def __init__(self, module: nn.Module) -> None:
+        """
+        Overview:
+            Convert the parameters of ``module`` to bfloat16.
+        Arguments:
+            - module (:obj:`nn.Module`): The module to be wrapped.
+        """
+        super().__init__()
+        self.module = module.to(torch.bfloat16)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.module(x.to(torch.bfloat16)).to(x.dtype)
+
+
+def _convert_bf16(module: nn.Module, bf16_modules: Tuple[type, ...]) -> None:
+    for name, child in module.named_children():
+        if isinstance(child, bf16_modules):
+            setattr(module, name, BF16Module(child))
+        else:
+            _convert_bf16(child, bf16_modules)
+
+
+def quantize_model(
+        model: nn.Module,
+        int8_modules: Iterable[type] = INT8_MODULES,
+        bf16_modules: Iterable[type] = BF16_MODULES,
+) -> nn.Module:
+    """
+    Overview:
+        Build a quantized copy of model for CPU inference: the ``int8_modules`` (Linear and LSTM by default) are \
+        replaced with their dynamic int8 quantized versions (int8 weights, activations quantized on the fly), and \
+        the ``bf16_modules`` (conv layers by default) are run in bfloat16. The input model is not modified. If int8 \
+        quantization is not supported in this environment, only the bfloat16 conversion is applied.
+    Arguments:
+        - model (:obj:`nn.Module`): The fp32 model.
+        - int8_modules (:obj:`Iterable[type]`): The module types quantized to dynamic int8.
+        - bf16_modules (:obj:`Iterable[type]`): The module types converted to bfloat16.
+    Returns:
+        - quantized_model (:obj:`nn.Module`): The quantized copy of model.
+    Examples:
+        >>> model = DQN(obs_shape=[4, 84, 84], action_shape=6)
+        >>> quantized_model = quantize_model(model)
+        >>> output = quantized_model(torch.randn(3, 4, 84, 84))
+    """
+    quantized_model = copy.deepcopy(model)
+    for p in quantized_model.parameters():
+        p.grad = None
+    bf16_modules = tuple(bf16_modules)
+    if len(bf16_modules) > 0:
+        _convert_bf16(quantized_model, bf16_modules)
+    int8_modules = set(int8_modules)
+    if len(int8_modules) > 0:
+        try:
+            with warnings.catch_warnings():
+                # ``torch.ao.quantization`` is deprecated in favor of torchao in the latest torch
+                warnings.simplefilter('ignore', DeprecationWarning)
+                quantized_model = quantize_dynamic(quantized_model, int8_modules, dtype=torch.qint8, inplace=True)
+        except Exception as e:  # e.g. no quantized engine on this platform
+            logging.warning('dynamic int8 quantization failed, keep fp32 {}: {}'.format(int8_modules, e))
+    return quantized_model
+
+
+class QuantizedActor(nn.Module):
+    """
+    Overview:
+        The quantized actor copy of a fp32 model (usually the model shared with learner), which is used by \
+        collectors on CPU. The quantized copy (refer to ``quantize_model``) is rebuilt lazily at the next forward \
+        whenever the weights of the source model change, e.g. the in-place optimizer update of serial pipeline, \
+        ``policy.load_state_dict`` or ``ModelExchanger`` loading the weights from learner. The ``state_dict`` and \
+        ``load_state_dict`` methods act on the fp32 source model, so the checkpoints are the same as the fp32 model.
+    Interfaces:
+        ``__init__``, ``forward``, ``refresh``, ``state_dict``, ``load_state_dict``
+    Properties:
+        - source_model (:obj:`nn.Module`): The fp32 source model.
+    """
+
+    def __init__(
+            self,
+            model: nn.Module,
+            int8_modules: Iterable[type] = INT8_MODULES,
+            bf16_modules: Iterable[type] = BF16_MODULES,
+    ) -> None:
+        """
+        Overview:
+            Build the quantized copy of ``model`` .
+        Arguments:
+            - model (:obj:`nn.Module`): The fp32 source model, it is referenced rather than copied.
+            - int8_modules (:obj:`Iterable[type]`): The module types quantized to dynamic int8.
+            - bf16_modules (:obj:`Iterable[type]`): The module types converted to bfloat16.
+        """
+        super().__init__()
+        # bypass ``nn.Module.__setattr__`` so that the source model is not registered as a submodule
+        object.__setattr__(self, '_source_model', model)
+        self._int8_modules = tuple(int8_modules)
+        self._bf16_modules = tuple(bf16_modules)
+        self._weights_version = None
+        self.refresh()
+
+    @property
+    def source_model(self) -> nn.Module:
+        return self._source_model
+
+    def _get_weights_version(self) -> Tuple[Tuple[int, int], ...]:
+        # the version counter of a tensor is increased by every in-place modification (e.g. ``optimizer.step`` and
+        # ``load_state_dict``), and the data pointer changes if the tensor is replaced
+        return tuple(
+            (t.data_ptr(), t._version)
+            for t in itertools.chain(self._source_model.parameters(), self._source_model.buffers())
+        )
+
+    def refresh(self) -> None:
+        """
+        Overview:
+            Rebuild the quantized copy from the current weights of source model.
+        """
+        self.model = quantize_model(self._source_model, self._int8_modules, self._bf16_modules)
+        self.model.train(self.training)
+        self._weights_version = self._get_weights_version()
+
+    def _refresh_if_changed(self) -> None:
+        if self._get_weights_version() != self._weights_version:
+            self.refresh()
+
+    def forward(self, *args, **kwargs) -> Any:
+        self._refresh_if_changed()
+        return self.model(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            modules = self.__dict__.get('_modules', {})
+            if 'model' not in modules:
+                raise
+            # the methods and variables defined in model, such as ``compute_actor``
+            self._refresh_if_changed()
+            return getattr(modules['model'], name)
+
+    def state_dict(self, *args, **kwargs) -> Dict[str, Any]:
+        return self._source_model.state_dict(*args, **kwargs)
+
+    def load_state_dict(self, state_dict: Dict[str, Any], strict: bool = True) -> Any:
+        ret = self._source_model.load_state_dict(state_dict, strict=strict)
+        self.refresh()
+        return ret
+
+
+def _flatten_output(output: Any, prefix: str = 'output') -> Dict[str, torch.Tensor]:
+    if isinstance(output, torch.Tensor):
+        return {prefix: output}
+    elif isinstance(output, dict):
+        return {k: v for key, value in output.items() for k, v in _flatten_output(value, key).items()}
+    elif isinstance(output, (list, tuple)):
+        return {
+            k: v
+            for i, value in enumerate(output) for k, v in _flatten_output(value, '{}.{}'.format(prefix, i)).items()
+        }
+    return {}
+
+
+def _measure_latency(model: nn.Module, inputs: Any, n_repeat: int) -> Tuple[Any, float]:
+    output = model(inputs)
+    start = time.time()
+    for _ in range(n_repeat):
+        model(inputs)
+    return output, (time.time() - start) / n_repeat * 1000
+
+
+def quantize_report(
+        model: nn.Module,
+        quantized_model: nn.Module,
+        inputs: Any,
+        n_repeat: int = 100,
+        logit_key: Optional[str] = 'logit'
+) -> Dict[str, Any]:
+    """
+    Overview:
+        Compare the accuracy and latency of the quantized model with the fp32 model on the same inputs.
+    Arguments:
+        - model (:obj:`nn.Module`): The fp32 model.
+        - quantized_model (:obj:`nn.Module`): The quantized model, such as the one returned by ``quantize_model`` \
+            or a ``QuantizedActor`` .
+        - inputs (:obj:`Any`): The batched inputs of model forward.
+        - n_repeat (:obj:`int`): The number of forward calls to measure the latency.
+        - logit_key (:obj:`Optional[str]`): The output key of discrete action logit, if it is in the output, the \
+            agreement of argmax action is also reported.
+    Returns:
+        - report (:obj:`Dict[str, Any]`): The report, including ``fp32_latency_ms`` , ``quantized_latency_ms`` , \
+            ``speedup`` , ``max_abs_error`` (for each tensor in output) and ``action_agreement`` (if logit exists).
+    Examples:
+        >>> report = quantize_report(model, QuantizedActor(model), torch.randn(32, 4, 84, 84))
+    """
+    with torch.no_grad():
+        output, fp32_latency = _measure_latency(model, inputs, n_repeat)
+        quantized_output, quantized_latency = _measure_latency(quantized_model, inputs, n_repeat)
+    output, quantized_output = _flatten_output(output), _flatten_output(quantized_output)
+    report = {
+        'fp32_latency_ms': fp32_latency,
+        'quantized_latency_ms': quantized_latency,
+        'speedup': fp32_latency / max(quantized_latency, 1e-8),
+        'max_abs_error': {
+            k: (v.float() - quantized_output[k].float()).abs().max().item()
+            for k, v in output.items() if k in quantized_output and v.is_floating_point()
+        },
+    }
+    if logit_key is not None and logit_key in output:
+        action = output[logit_key].argmax(dim=-1)
+        quantized_action = quantized_output[logit_key].argmax(dim=-1)
+        report['action_agreement'] = (action == quantized_action).float().mean().item()
+    return report
@@ -0,0 +1,218 @@
+from collections import namedtuple
+from copy import deepcopy
+import timeit
+import pytest
+import torch
+
+from ding.model import DQN, model_wrap
+from ding.torch_utils import Adam
+from ding.torch_utils.amp_helper import get_autocast_dtype, to_fp32, LossScaler
+from ding.utils import deep_merge_dicts
+
+B, obs_dim, act_dim = 64, 16, 4
+
+
+def get_policy_data(policy_type, batch_size=B, seed=0):
+    g = torch.Generator().manual_seed(seed)
+    data = {
+        'obs': torch.randn(batch_size, obs_dim, generator=g),
+        'next_obs': torch.randn(batch_size, obs_dim, generator=g),
+        'done': torch.zeros(batch_size),
+    }
+    if policy_type == 'dqn':
+        data['action'] = torch.randint(0, act_dim, (batch_size, ), generator=g)
+        data['reward'] = torch.randn(batch_size, 1, generator=g)
+    elif policy_type == 'sac':
+        data['action'] = torch.rand(batch_size, act_dim, generator=g) * 2 - 1
+        data['reward'] = torch.randn(batch_size, generator=g)
+    elif policy_type == 'ppo':
+        data['action'] = torch.randint(0, act_dim, (batch_size, ), generator=g)
+        for k in ['value', 'adv', 'return', 'reward']:
+            data[k] = torch.randn(batch_size, generator=g)
+        data['logit'] = torch.randn(batch_size, act_dim, generator=g)
+    return [{k: v[i] for k, v in data.items()} for i in range(batch_size)]
+
+
+def get_policy(policy_type, mixed_precision=None, hidden_size=64, batch_size=B, **kwargs):
+    from ding.policy import DQNPolicy, SACPolicy, PPOPolicy
+    from ding.utils import deep_merge_dicts
+    policy_cls, model_cfg = {
+        'dqn': (
+            DQNPolicy,
+            dict(
+                obs_shape=obs_dim,
+                action_shape=act_dim,
+                encoder_hidden_size_list=[hidden_size, hidden_size],
+                head_hidden_size=hidden_size
+            )
+        ),
+        'sac': (
+            SACPolicy,
+            dict(
+                obs_shape=obs_dim,
+                action_shape=act_dim,
+                actor_head_hidden_size=hidden_size,
+                critic_head_hidden_size=hidden_size
+            )
+        ),
+        'ppo': (
+            PPOPolicy,
+            dict(
+                obs_shape=obs_dim,
+                action_shape=act_dim,
+                action_space='discrete',
+                encoder_hidden_size_list=[hidden_size, hidden_size],
+                actor_head_hidden_size=hidden_size,
+                critic_head_hidden_size=hidden_size
+            )
+        ),
+    }[policy_type]
+    learn_cfg = dict(mixed_precision=mixed_precision, **kwargs)
+    if policy_type == 'ppo':
+        learn_cfg.update(epoch_per_collect=1, batch_size=batch_size)
+    cfg = deep_merge_dicts(policy_cls.default_config(), dict(model=model_cfg, learn=learn_cfg))
+    torch.manual_seed(0)
+    return policy_cls(cfg, enable_field=['learn'])
+
+
+def get_total_loss(output):
+    output = output[-1] if isinstance(output, list) else output
+    return float(output['total_loss'])
+
+
+@pytest.mark.unittest
+class TestAmpHelper:
+
+    def test_get_autocast_dtype(self):
+        assert get_autocast_dtype(None) is None and get_autocast_dtype('fp32') is None
+        assert get_autocast_dtype('bf16') == get_autocast_dtype('bfloat16') == torch.bfloat16
+        assert get_autocast_dtype('fp16') == torch.float16
+        with pytest.raises(KeyError):
+            get_autocast_dtype('int8')
+
+    def test_to_fp32(self):
+        nt = namedtuple('nt', ['a', 'b'])
+        x = torch.randn(3, requires_grad=True)
+        data = {'logit': x.bfloat16(), 'action': torch.arange(3), 'other': [nt(x.half(), 1), 'str']}
+        data = to_fp32(data)
+        assert data['logit'].dtype == torch.float32 and data['action'].dtype == torch.int64
+        assert isinstance(data['other'][0], nt) and data['other'][0].a.dtype == torch.float32
+        assert data['other'][0].b == 1 and data['other'][1] == 'str'
+        data['logit'].sum().backward()
+        assert x.grad is not None and x.grad.dtype == torch.float32
+
+    def test_loss_scaler(self):
+        scaler = LossScaler(enabled=False)
+        loss = torch.ones(1, requires_grad=True)
+        assert scaler.scale(loss) is loss and scaler.loss_scale == 1.
+        assert not LossScaler.from_config('bf16').enabled and not LossScaler.from_config(None).enabled
+        assert LossScaler.from_config('fp16').enabled
+        static_scaler = LossScaler.from_config('bf16', 128)
+        assert static_scaler.enabled and static_scaler.loss_scale == 128.
+
+        # the grad clip of ding Adam acts on the unscaled gradients
+        model = torch.nn.Linear(4, 2)
+        scaled_model = deepcopy(model)
+        optimizer = Adam(model.parameters(), lr=0.1, grad_clip_type='clip_norm', clip_value=0.01)
+        scaled_optimizer = Adam(scaled_model.parameters(), lr=0.1, grad_clip_type='clip_norm', clip_value=0.01)
+        scaler = LossScaler(init_scale=1024., growth_interval=2)
+        x = torch.randn(8, 4)
+        for i in range(2):
+            optimizer.zero_grad()
+            model(x).pow(2).mean().backward()
+            optimizer.step()
+            scaled_optimizer.zero_grad()
+            scaler.scale(scaled_model(x).pow(2).mean()).backward()
+            assert scaler.step(scaled_optimizer)
+            torch.testing.assert_close(scaled_model.weight.grad, model.weight.grad)
+            torch.testing.assert_close(scaled_model.weight, model.weight)
+        assert scaler.loss_scale == 2048.
+
+        # the step with inf gradients is skipped, and the scale backs off
+        weight = scaled_model.weight.clone()
+        scaled_optimizer.zero_grad()
+        scaler.scale(scaled_model(x * float('inf')).sum()).backward()
+        assert scaler.unscale_(scaled_optimizer)
+        assert not scaler.step(scaled_optimizer)
+        assert (scaled_model.weight == weight).all()
+        assert scaler.loss_scale == 1024.
+        state_dict = scaler.state_dict()
+        new_scaler = LossScaler()
+        new_scaler.load_state_dict(state_dict)
+        assert new_scaler.loss_scale == 1024.
+
+    def test_autocast_wrapper(self):
+        model = DQN(obs_shape=obs_dim, action_shape=act_dim)
+        x = torch.randn(B, obs_dim)
+        logit = model(x)['logit']
+        wrapped_model = model_wrap(model, wrapper_name='autocast', dtype=torch.bfloat16, device_type='cpu')
+        wrapped_model = model_wrap(wrapped_model, wrapper_name='argmax_sample')
+        output = wrapped_model.forward(x)
+        assert output['logit'].dtype == torch.float32 and output['action'].dtype == torch.int64
+        assert (output['logit'] - logit).abs().max() < 0.1
+        output['logit'].sum().backward()
+        assert all([p.dtype == torch.float32 and p.grad.dtype == torch.float32 for p in model.parameters()])
+        assert wrapped_model.state_dict().keys() == model.state_dict().keys()
+
+    @pytest.mark.parametrize('policy_type', ['dqn', 'sac', 'ppo'])
+    def test_policy_mixed_precision(self, policy_type):
+        data = get_policy_data(policy_type)
+        loss = {}
+        for mixed_precision in [None, 'bf16', 'fp16']:
+            policy = get_policy(policy_type, mixed_precision)
+            assert policy._loss_scaler.enabled == (mixed_precision == 'fp16')
+            for _ in range(5):
+                output = policy.learn_mode.forward(data)
+            loss[mixed_precision] = get_total_loss(output)
+            assert all([p.dtype == torch.float32 for p in policy._model.parameters()])
+            if mixed_precision is not None:
+                assert 'AutocastWrapper' in policy._learn_model.info('forward')
+        for mixed_precision in ['bf16', 'fp16']:
+            assert abs(loss[mixed_precision] - loss[None]) < 0.05 * max(1., abs(loss[None])), loss
+
+    def test_policy_mixed_precision_unsupported(self):
+        from ding.policy import DQNPolicy, QRDQNPolicy
+        assert DQNPolicy._is_mixed_precision_supported()
+        # QRDQN overrides the ``_forward_learn`` of DQN without the loss scaler
+        assert not QRDQNPolicy._is_mixed_precision_supported()
+        cfg = deep_merge_dicts(
+            QRDQNPolicy.default_config(),
+            dict(model=dict(obs_shape=obs_dim, action_shape=act_dim), learn=dict(mixed_precision='bf16'))
+        )
+        with pytest.raises(NotImplementedError):
+            QRDQNPolicy(cfg, enable_field=['learn'])
+        # collect and eval modes don't use the mixed precision config
+        QRDQNPolicy(cfg, enable_field=['collect', 'eval'])
+
+    @pytest.mark.parametrize('policy_type', ['dqn', 'sac', 'ppo'])
+    def test_policy_loss_scaler_state_dict(self, policy_type):
+        policy = get_policy(policy_type, 'fp16')
+        policy._loss_scaler._growth_interval = 1
+        policy.learn_mode.forward(get_policy_data(policy_type))
+        assert policy._loss_scaler.loss_scale != 2. ** 16
+        state_dict = policy.learn_mode.state_dict()
+        assert state_dict['loss_scaler'] == policy._loss_scaler.state_dict()
+        new_policy = get_policy(policy_type, 'fp16')
+        new_policy.learn_mode.load_state_dict(state_dict)
+        assert new_policy._loss_scaler.loss_scale == policy._loss_scaler.loss_scale
+        # the checkpoint without loss scaler can still be loaded
+        state_dict.pop('loss_scaler')
+        get_policy(policy_type, 'fp16').learn_mode.load_state_dict(state_dict)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('policy_type', ['dqn', 'sac', 'ppo'])
+def test_mixed_precision_policy_benchmark(policy_type):
+    batch_size, hidden_size, train_iter, repeats = 256, 512, 50, 10
+    data = get_policy_data(policy_type, batch_size)
+    result = {}
+    for mixed_precision in [None, 'bf16']:
+        policy = get_policy(policy_type, mixed_precision, hidden_size, batch_size)
+        losses = [get_total_loss(policy.learn_mode.forward(data)) for _ in range(train_iter)]
+        duration = min(timeit.repeat(lambda: policy.learn_mode.forward(data), number=1, repeat=repeats))
+        result[mixed_precision] = (duration, losses[-1])
+    print(
+        '{} learn step, fp32: {:.3f}ms (loss {:.4f}), bf16: {:.3f}ms (loss {:.4f})'.format(
+            policy_type, result[None][0] * 1000, result[None][1], result['bf16'][0] * 1000, result['bf16'][1]
+        )
+    )
@@ -1,7 +1,12 @@
+from copy import deepcopy
+import logging
+import pickle
+import timeit
 import pytest
 import torch
 
-from ding.torch_utils.backend_helper import enable_tf32
+from ding.torch_utils.backend_helper import enable_tf32, compile_fn, compile_model
+from ding.rl_utils import q_nstep_td_data, q_nstep_td_error
 
 
 @pytest.mark.cudatest
@@ -19,3 +24,139 @@ class TestBackendHelper:
         net.zero_grad()
         y.backward()
         assert net.weight.grad is not None
+
+
+def _fail_backend(gm, example_inputs):
+    raise RuntimeError('unsupported op in compiled graph')
+
+
+@pytest.mark.unittest
+class TestCompile:
+
+    def test_compile_model(self):
+        model = torch.nn.Sequential(torch.nn.Linear(3, 8), torch.nn.ReLU(), torch.nn.Linear(8, 2))
+        keys = list(model.state_dict().keys())
+        x = torch.randn(4, 3)
+        eager_output = model.forward(x)
+        model = compile_model(model, backend='aot_eager')
+        assert isinstance(model, torch.nn.Sequential)
+        assert list(model.state_dict().keys()) == keys
+        assert model._ding_compiled
+        assert compile_model(model, backend='aot_eager') is model
+        torch.testing.assert_close(model.forward(x), eager_output)
+        # the deep copy (e.g. target model) uses the compiled forward with its own parameters
+        target_model = deepcopy(model)
+        with torch.no_grad():
+            for p in target_model.parameters():
+                p.zero_()
+        assert target_model.forward(x).abs().sum() == 0
+        torch.testing.assert_close(model.forward(x), eager_output)
+        model.forward(x).sum().backward()
+        assert model[0].weight.grad is not None
+
+    def test_compile_pickle(self):
+        from ding.model import DQN
+        model = compile_model(DQN(4, 2), backend='aot_eager')
+        x = torch.randn(3, 4)
+        output = model.forward(x)['logit']
+        new_model = pickle.loads(pickle.dumps(model))
+        assert type(new_model) is DQN and new_model._ding_compiled
+        torch.testing.assert_close(new_model.forward(x)['logit'], output)
+        assert new_model.forward._model is new_model
+        target_model = deepcopy(new_model)
+        assert target_model.forward._model is target_model
+        torch.testing.assert_close(target_model.forward(x)['logit'], output)
+
+    def test_compile_fallback(self):
+        x = torch.randn(4, 3)
+        model = torch.nn.Linear(3, 4)
+        eager_output = model.forward(x)
+        model = compile_model(model, backend=_fail_backend)
+        torch.testing.assert_close(model.forward(x), eager_output)
+        torch.testing.assert_close(model.forward(x), eager_output)
+        # unknown backend
+        model = compile_model(torch.nn.Linear(3, 4), backend='unknown_backend')
+        assert not getattr(model, '_ding_compiled', False)
+        assert model.forward(x).shape == (4, 4)
+        # the errors of user code are raised, and the model is still compiled
+        calls = []
+
+        def fn(x, y):
+            calls.append(1)
+            return x @ y
+
+        compiled_fn = compile_fn(fn, backend='aot_eager')
+        with pytest.raises(RuntimeError):
+            compiled_fn(torch.randn(2, 3), torch.randn(2, 3))
+        assert len(calls) <= 1
+        torch.testing.assert_close(compiled_fn(x, x.T), x @ x.T)
+
+    def test_compile_fn(self):
+        data = q_nstep_td_data(
+            torch.randn(4, 3), torch.randn(4, 3), torch.randint(0, 3, (4, )), torch.randint(0, 3, (4, )),
+            torch.randn(1, 4), torch.zeros(4), None
+        )
+        loss, td_error = q_nstep_td_error(data, 0.99, nstep=1)
+        compiled_loss, compiled_td_error = compile_fn(q_nstep_td_error, backend='aot_eager')(data, 0.99, nstep=1)
+        torch.testing.assert_close(compiled_loss, loss)
+        torch.testing.assert_close(compiled_td_error, td_error)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('policy_type', ['dqn', 'sac', 'ppo'])
+def test_compile_policy_benchmark(policy_type):
+    from ding.policy import DQNPolicy, SACPolicy, PPOPolicy
+    from ding.utils import deep_merge_dicts
+    B, obs_dim, act_dim, repeats = 64, 16, 4, 20
+    policy_cls, model_cfg, data_fn = {
+        'dqn': (
+            DQNPolicy, dict(obs_shape=obs_dim, action_shape=act_dim), lambda: {
+                'obs': torch.randn(B, obs_dim),
+                'next_obs': torch.randn(B, obs_dim),
+                'action': torch.randint(0, act_dim, (B, )),
+                'reward': torch.randn(B, 1),
+                'done': torch.zeros(B),
+            }
+        ),
+        'sac': (
+            SACPolicy, dict(obs_shape=obs_dim, action_shape=act_dim), lambda: {
+                'obs': torch.randn(B, obs_dim),
+                'next_obs': torch.randn(B, obs_dim),
+                'action': torch.randn(B, act_dim),
+                'reward': torch.randn(B),
+                'done': torch.zeros(B),
+            }
+        ),
+        'ppo': (
+            PPOPolicy, dict(obs_shape=obs_dim, action_shape=act_dim, action_space='discrete'), lambda: {
+                'obs': torch.randn(B, obs_dim),
+                'next_obs': torch.randn(B, obs_dim),
+                'action': torch.randint(0, act_dim, (B, )),
+                'logit': torch.randn(B, act_dim),
+                'value': torch.randn(B),
+                'adv': torch.randn(B),
+                'return': torch.randn(B),
+                'reward': torch.randn(B),
+                'done': torch.zeros(B),
+            }
+        ),
+    }[policy_type]
+    data = [{k: v[i] for k, v in data_fn().items()} for i in range(B)]
+    result, loss = {}, {}
+    for compile_flag in [False, True]:
+        cfg = deep_merge_dicts(policy_cls.default_config(), dict(compile=compile_flag, model=model_cfg))
+        if policy_type == 'ppo':
+            cfg.learn.epoch_per_collect = 1
+            cfg.learn.batch_size = B
+        torch.manual_seed(0)
+        policy = policy_cls(cfg, enable_field=['learn'])
+        output = policy.learn_mode.forward(data)  # warm up (compilation)
+        loss[compile_flag] = float((output[-1] if isinstance(output, list) else output)['total_loss'])
+        result[compile_flag] = min(timeit.repeat(lambda: policy.learn_mode.forward(data), number=1, repeat=repeats))
+    # the compiled learn step is numerically the same as the eager one
+    assert abs(loss[True] - loss[False]) < 1e-4 * max(1., abs(loss[False])), loss
+    logging.info(
+        '{} learn step, eager: {:.3f}ms, compiled: {:.3f}ms'.format(
+            policy_type, result[False] * 1000, result[True] * 1000
+        )
+    )
@@ -1,9 +1,10 @@
 import random
+import time
 
 import pytest
 import torch
 
-from ding.torch_utils.metric import levenshtein_distance, hamming_distance
+from ding.torch_utils.metric import levenshtein_distance, levenshtein_distance_batch, hamming_distance
 
 
 @pytest.mark.unittest
@@ -33,6 +34,47 @@ class TestMetric():
         distance = levenshtein_distance(pred, target4, pred, target4, extra_fn=lambda x, y: x + y)
         assert distance.item() == 14
 
+    @pytest.mark.parametrize('use_numba', [False, True])
+    def test_levenshtein_distance_batch(self, use_numba):
+        r'''
+        Overview:
+            Test the batch version of Levenshtein Distance is the same as the unbatched one
+        '''
+        B, N1, N2 = 16, 7, 5
+        pred = torch.randint(0, 3, (B, N1))
+        target = torch.randint(0, 3, (B, N2))
+        pred_lengths = torch.randint(0, N1 + 1, (B, ))
+        target_lengths = torch.randint(0, N2 + 1, (B, ))
+        pred_extra = torch.rand(B, N1)
+        target_extra = torch.rand(B, N2)
+        distance = levenshtein_distance_batch(pred, target, pred_lengths, target_lengths, use_numba=use_numba)
+        assert distance.shape == (B, )
+        extra_distance = levenshtein_distance_batch(
+            pred,
+            target,
+            pred_lengths,
+            target_lengths,
+            pred_extra,
+            target_extra,
+            extra_fn=lambda x, y: (x - y).abs(),
+            use_numba=use_numba
+        )
+        for i in range(B):
+            p, t = pred[i, :pred_lengths[i]], target[i, :target_lengths[i]]
+            assert distance[i].item() == levenshtein_distance(p, t).item()
+            expected = levenshtein_distance(
+                p,
+                t,
+                pred_extra[i, :pred_lengths[i]],
+                target_extra[i, :target_lengths[i]],
+                extra_fn=lambda x, y: (x - y).abs()
+            )
+            assert abs(extra_distance[i].item() - expected.item()) < 1e-5
+        # no padding
+        pred = torch.LongTensor([[1, 4, 6, 4, 1], [1, 4, 6, 4, 1]])
+        target = torch.LongTensor([[1, 6, 4, 4, 1], [1, 4, 6, 4, 1]])
+        assert levenshtein_distance_batch(pred, target, use_numba=use_numba).tolist() == [2, 0]
+
     def test_hamming_distance(self):
         r'''
         Overview:
@@ -52,3 +94,19 @@ class TestMetric():
             distance = hamming_distance(pred, target)
             diff = len(set(pred_idx).union(set(target_idx)) - set(pred_idx).intersection(set(target_idx)))
             assert (distance.item() == diff)
+
+
+@pytest.mark.benchmark
+def test_levenshtein_distance_batch_benchmark():
+    B, N = 32, 64
+    pred = torch.randint(0, 8, (B, N))
+    target = torch.randint(0, 8, (B, N))
+    start = time.time()
+    expected = torch.cat([levenshtein_distance(pred[i], target[i]) for i in range(B)])
+    t_loop = time.time() - start
+    start = time.time()
+    distance = levenshtein_distance_batch(pred, target)
+    t_batch = time.time() - start
+    print('levenshtein_distance: {:.4f}s, levenshtein_distance_batch: {:.4f}s'.format(t_loop, t_batch))
+    assert torch.equal(distance, expected)
+    assert t_batch < t_loop
@@ -0,0 +1,122 @@
+import pytest
+import torch
+import torch.nn as nn
+from easydict import EasyDict
+
+from ding.model import DQN, DRQN, model_wrap
+from ding.torch_utils.quantize_helper import quantize_model, quantize_report, QuantizedActor, BF16Module
+
+
+@pytest.mark.unittest
+class TestQuantize:
+
+    def test_quantize_model(self):
+        model = DQN(obs_shape=[4, 64, 64], action_shape=6)
+        quantized_model = quantize_model(model)
+        assert isinstance(quantized_model.encoder.main[0], BF16Module)
+        assert not any(isinstance(m, BF16Module) for m in model.modules())
+        # the fp32 model is not modified
+        assert all(type(m) is not nn.Linear or m.weight.dtype == torch.float32 for m in model.modules())
+        assert any('quantized' in type(m).__module__ for m in quantized_model.modules())
+        x = torch.randn(8, 4, 64, 64)
+        with torch.no_grad():
+            logit = model(x)['logit']
+            quantized_logit = quantized_model(x)['logit']
+        assert quantized_logit.shape == logit.shape and quantized_logit.dtype == torch.float32
+        assert (quantized_logit - logit).abs().max() < 0.1
+
+    def test_quantize_lstm(self):
+        model = DRQN(obs_shape=8, action_shape=3, lstm_type='pytorch')
+        quantized_model = quantize_model(model)
+        x = {'obs': torch.randn(5, 4, 8), 'prev_state': None}
+        with torch.no_grad():
+            logit = model(x, inference=False)['logit']
+            quantized_logit = quantized_model(x, inference=False)['logit']
+        assert (quantized_logit - logit).abs().max() < 0.1
+
+    def test_quantized_actor(self):
+        model = DQN(obs_shape=8, action_shape=3)
+        actor = QuantizedActor(model)
+        assert actor.state_dict().keys() == model.state_dict().keys()
+        x = torch.randn(4, 8)
+        with torch.no_grad():
+            assert (actor(x)['logit'] - model(x)['logit']).abs().max() < 0.1
+        quantized = actor.model
+
+        # no refresh without weights change
+        with torch.no_grad():
+            actor(x)
+        assert actor.model is quantized
+
+        # refresh after in-place optimizer update
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+        model(x)['logit'].sum().backward()
+        optimizer.step()
+        with torch.no_grad():
+            output = actor(x)['logit']
+            assert actor.model is not quantized
+            assert (output - model(x)['logit']).abs().max() < 0.1
+
+        # refresh after load_state_dict of the source model (e.g. ModelExchanger)
+        new_model = DQN(obs_shape=8, action_shape=3)
+        model.load_state_dict(new_model.state_dict())
+        with torch.no_grad():
+            assert (actor(x)['logit'] - new_model(x)['logit']).abs().max() < 0.1
+
+        # load_state_dict of actor loads the source model
+        new_model = DQN(obs_shape=8, action_shape=3)
+        actor.load_state_dict(new_model.state_dict())
+        assert all(torch.equal(v, model.state_dict()[k]) for k, v in new_model.state_dict().items())
+        with torch.no_grad():
+            assert (actor.model(x)['logit'] - new_model(x)['logit']).abs().max() < 0.1
+
+    def test_quantized_actor_wrapper(self):
+        model = DQN(obs_shape=8, action_shape=3)
+        wrapped = model_wrap(model_wrap(QuantizedActor(model), wrapper_name='eps_greedy_sample'), 'base')
+        wrapped.reset()
+        wrapped.eval()
+        output = wrapped.forward(torch.randn(4, 8), eps=0.)
+        assert output['action'].shape == (4, )
+        wrapped.load_state_dict(DQN(obs_shape=8, action_shape=3).state_dict())
+
+    def test_policy_quantize_collect_model(self):
+        from ding.policy import DQNPolicy
+        cfg = DQNPolicy.default_config()
+        cfg.model = EasyDict(obs_shape=8, action_shape=3)
+        cfg.quantize_collect_model = True
+        policy = DQNPolicy(cfg)
+        inner = policy._collect_model
+        while not isinstance(inner, nn.Module):
+            inner = inner._model
+        assert isinstance(inner, QuantizedActor) and inner.source_model is policy._model
+        assert policy._eval_model._model is not inner
+
+        obs = {i: torch.randn(8) for i in range(3)}
+        output = policy.collect_mode.forward(obs, eps=0.)
+        assert set(output.keys()) == set(obs.keys())
+        state_dict = policy.collect_mode.state_dict()
+        assert state_dict['model'].keys() == policy._model.state_dict().keys()
+        policy.collect_mode.load_state_dict(state_dict)
+
+    def test_quantize_report(self):
+        model = DQN(obs_shape=32, action_shape=6)
+        report = quantize_report(model, QuantizedActor(model), torch.randn(16, 32), n_repeat=2)
+        keys = {'fp32_latency_ms', 'quantized_latency_ms', 'speedup', 'max_abs_error', 'action_agreement'}
+        assert set(report.keys()) == keys
+        assert 'logit' in report['max_abs_error']
+        assert 0. <= report['action_agreement'] <= 1.
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    'model_fn, inputs', [
+        (lambda: DQN(obs_shape=64, action_shape=6, encoder_hidden_size_list=[512, 512, 256]), torch.randn(64, 64)),
+        (lambda: DQN(obs_shape=[4, 84, 84], action_shape=6), torch.randn(64, 4, 84, 84)),
+    ]
+)
+def test_quantize_report_benchmark(model_fn, inputs):
+    model = model_fn()
+    model.eval()
+    report = quantize_report(model, QuantizedActor(model), inputs, n_repeat=20)
+    print(report)
+    assert report['action_agreement'] > 0.8
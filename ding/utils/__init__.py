@@ -1,43 +1,62 @@
 import ding
-from .collection_helper import iter_mapping
-from .compression_helper import get_data_compressor, get_data_decompressor, CloudPickleWrapper
-from .default_helper import override, dicts_to_lists, lists_to_dicts, squeeze, default_get, error_wrapper, list_split, \
-    LimitedSpaceContainer, deep_merge_dicts, set_pkg_seed, flatten_dict, one_time_warning, split_data_generator, \
-    RunningMeanStd, make_key_as_identifier, remove_illegal_item
-from .design_helper import SingletonMetaclass
-from .dict_helper import convert_easy_dict_to_dict
-from .file_helper import read_file, save_file, remove_file
-from .import_helper import try_import_ceph, try_import_mc, try_import_link, import_module, try_import_redis, \
-    try_import_rediscluster
-from .k8s_helper import get_operator_server_kwargs, exist_operator_server, DEFAULT_K8S_COLLECTOR_PORT, \
-    DEFAULT_K8S_LEARNER_PORT, DEFAULT_K8S_AGGREGATOR_SLAVE_PORT, DEFAULT_K8S_COORDINATOR_PORT, pod_exec_command, \
-    K8sLauncher
-from .lock_helper import LockContext, LockContextType, get_file_lock, get_rw_file_lock
-from .log_helper import build_logger, pretty_print, LoggerFactory
-from .log_writer_helper import DistributedWriter
-from .orchestrator_launcher import OrchestratorLauncher
-from .profiler_helper import Profiler, register_profiler
-from .registry_factory import registries, POLICY_REGISTRY, ENV_REGISTRY, LEARNER_REGISTRY, COMM_LEARNER_REGISTRY, \
-    SERIAL_COLLECTOR_REGISTRY, PARALLEL_COLLECTOR_REGISTRY, COMM_COLLECTOR_REGISTRY, \
-    COMMANDER_REGISTRY, LEAGUE_REGISTRY, PLAYER_REGISTRY, MODEL_REGISTRY, ENV_MANAGER_REGISTRY, ENV_WRAPPER_REGISTRY, \
-    REWARD_MODEL_REGISTRY, BUFFER_REGISTRY, DATASET_REGISTRY, SERIAL_EVALUATOR_REGISTRY, MQ_REGISTRY, \
-    WORLD_MODEL_REGISTRY, STOCHASTIC_OPTIMIZER_REGISTRY
-from .scheduler_helper import Scheduler
-from .segment_tree import SumSegmentTree, MinSegmentTree, SegmentTree
-from .slurm_helper import find_free_port_slurm, node_to_host, node_to_partition
-from .system_helper import get_ip, get_pid, get_task_uid, PropagatingThread, find_free_port
-from .time_helper import build_time_helper, EasyTimer, WatchDog
-from .type_helper import SequenceType
-from .render_helper import render, fps, get_env_fps, render_env
-from .fast_copy import fastcopy
-from .bfs_helper import get_vi_sequence
-from .normalizer_helper import DatasetNormalizer
-from .memory_helper import SimpleMemoryProfiler
+from .lazy_import_helper import lazy_import_attrs
+
+# All the helpers are imported lazily (PEP 562), because many of them depend on heavy packages (torch,
+# tensorboardX, k8s, render tools, ...), which makes every ``ding`` launch, env subprocess and parallel worker slow.
+_submod_attrs = {
+    '.collection_helper': ['iter_mapping'],
+    '.compression_helper': ['get_data_compressor', 'get_data_decompressor', 'CloudPickleWrapper'],
+    '.default_helper': [
+        'override', 'dicts_to_lists', 'lists_to_dicts', 'squeeze', 'default_get', 'error_wrapper', 'list_split',
+        'LimitedSpaceContainer', 'deep_merge_dicts', 'set_pkg_seed', 'flatten_dict', 'one_time_warning',
+        'split_data_generator', 'RunningMeanStd', 'make_key_as_identifier', 'remove_illegal_item'
+    ],
+    '.design_helper': ['SingletonMetaclass'],
+    '.dict_helper': ['convert_easy_dict_to_dict'],
+    '.file_helper': ['read_file', 'save_file', 'remove_file'],
+    '.checkpoint_writer': ['AsyncCheckpointWriter', 'load_checkpoint'],
+    '.import_helper': [
+        'try_import_ceph', 'try_import_mc', 'try_import_link', 'import_module', 'try_import_redis',
+        'try_import_rediscluster'
+    ],
+    '.k8s_helper': [
+        'get_operator_server_kwargs', 'exist_operator_server', 'DEFAULT_K8S_COLLECTOR_PORT', 'DEFAULT_K8S_LEARNER_PORT',
+        'DEFAULT_K8S_AGGREGATOR_SLAVE_PORT', 'DEFAULT_K8S_COORDINATOR_PORT', 'pod_exec_command', 'K8sLauncher'
+    ],
+    '.lock_helper': ['LockContext', 'LockContextType', 'get_file_lock', 'get_rw_file_lock'],
+    '.log_helper': ['build_logger', 'pretty_print', 'LoggerFactory'],
+    '.log_writer_helper': ['DistributedWriter'],
+    '.orchestrator_launcher': ['OrchestratorLauncher'],
+    '.profiler_helper': ['Profiler', 'register_profiler'],
+    '.registry_factory': [
+        'registries', 'POLICY_REGISTRY', 'ENV_REGISTRY', 'LEARNER_REGISTRY', 'COMM_LEARNER_REGISTRY',
+        'SERIAL_COLLECTOR_REGISTRY', 'PARALLEL_COLLECTOR_REGISTRY', 'COMM_COLLECTOR_REGISTRY', 'COMMANDER_REGISTRY',
+        'LEAGUE_REGISTRY', 'PLAYER_REGISTRY', 'MODEL_REGISTRY', 'ENV_MANAGER_REGISTRY', 'ENV_WRAPPER_REGISTRY',
+        'REWARD_MODEL_REGISTRY', 'BUFFER_REGISTRY', 'DATASET_REGISTRY', 'SERIAL_EVALUATOR_REGISTRY', 'MQ_REGISTRY',
+        'WORLD_MODEL_REGISTRY', 'STOCHASTIC_OPTIMIZER_REGISTRY'
+    ],
+    '.scheduler_helper': ['Scheduler'],
+    '.segment_tree': ['SumSegmentTree', 'MinSegmentTree', 'SegmentTree'],
+    '.slurm_helper': ['find_free_port_slurm', 'node_to_host', 'node_to_partition'],
+    '.system_helper': ['get_ip', 'get_pid', 'get_task_uid', 'PropagatingThread', 'find_free_port'],
+    '.time_helper': ['build_time_helper', 'EasyTimer', 'WatchDog'],
+    '.type_helper': ['SequenceType'],
+    '.render_helper': ['render', 'fps', 'get_env_fps', 'render_env'],
+    '.fast_copy': ['fastcopy'],
+    '.bfs_helper': ['get_vi_sequence', 'get_vi_map', 'get_vi_sequence_from_map'],
+    '.normalizer_helper': ['DatasetNormalizer'],
+    '.memory_helper': ['SimpleMemoryProfiler'],
+}
 
 if ding.enable_linklink:  # False as default
-    from .linklink_dist_helper import get_rank, get_world_size, dist_mode, dist_init, dist_finalize, \
-        allreduce, broadcast, DistContext, allreduce_async, synchronize
+    _submod_attrs['.linklink_dist_helper'] = [
+        'get_rank', 'get_world_size', 'dist_mode', 'dist_init', 'dist_finalize', 'allreduce', 'broadcast',
+        'DistContext', 'allreduce_async', 'synchronize'
+    ]
 else:
-    from .pytorch_ddp_dist_helper import get_rank, get_world_size, dist_mode, dist_init, dist_finalize, \
-        allreduce, broadcast, DDPContext, allreduce_async, synchronize, reduce_data, broadcast_object_list, \
-        to_ddp_config, allreduce_data
+    _submod_attrs['.pytorch_ddp_dist_helper'] = [
+        'get_rank', 'get_world_size', 'dist_mode', 'dist_init', 'dist_finalize', 'allreduce', 'broadcast', 'DDPContext',
+        'allreduce_async', 'synchronize', 'reduce_data', 'broadcast_object_list', 'to_ddp_config', 'allreduce_data'
+    ]
+
+__getattr__, __dir__, __all__, _import_all = lazy_import_attrs(__name__, _submod_attrs)
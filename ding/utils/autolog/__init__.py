@@ -1,5 +1,5 @@
 from .base import TimeMode
-from .data import RangedData, TimeRangedData
+from .data import RangedData, TimeRangedData, RingRangedData, TimeRingRangedData
 from .model import LoggedModel
 from .time_ctl import BaseTime, NaturalTime, TickTime, TimeProxy
 from .value import LoggedValue
@@ -3,6 +3,7 @@ from typing import TypeVar, Union
 
 _LOGGED_VALUE__PROPERTY_NAME = '__property_name__'
 _LOGGED_MODEL__PROPERTIES = '__properties__'
+_LOGGED_MODEL__PROPERTY_TYPES = '__property_types__'
 _LOGGED_MODEL__PROPERTY_ATTR_PREFIX = '_property_'
 
 _TimeType = TypeVar('_TimeType', bound=Union[float, int])
@@ -4,6 +4,8 @@ from collections import deque
 from threading import Lock
 from typing import TypeVar, Iterable, List, Tuple, Union
 
+import numpy as np
+
 from .time_ctl import BaseTime
 
 _Tp = TypeVar('_Tp')
@@ -316,3 +318,232 @@ class TimeRangedData(RangedData):
         """
 
         return self.__time
+
+
+class RingRangedData(metaclass=ABCMeta):
+    """
+    Overview:
+        A fixed-capacity version of ``RangedData`` based on numpy ring buffers, which has the same ``current`` and \
+        ``history`` results as long as the number of items in the expire window doesn't exceed ``capacity`` (the \
+        oldest items are overwritten otherwise). The times and values are written twice into the buffers of length \
+        ``2 * (capacity + 1)`` , so that appending is O(1) without expiry checks, and the window is always a \
+        contiguous slice, on which ``window_values`` and the statistics are computed with numpy. The reads take \
+        no lock, they are safe with a single writer thread, for the counter is increased after the item is written \
+        and a spare slot is kept between the next written slot and the slots being read.
+    Interfaces:
+        ``__init__``, ``append``, ``extend``, ``current``, ``history``, ``window_values``, ``expire``, ``capacity``, \
+        ``__bool__``, ``_get_time``.
+    Properties:
+        - expire (:obj:`float`): The expire time.
+        - capacity (:obj:`int`): The max number of items stored.
+    """
+
+    def __init__(self, expire: float, capacity: int, dtype: type = np.float64):
+        """
+        Overview:
+            Initialize the RingRangedData object.
+        Arguments:
+            - expire (:obj:`float`): The expire time of the data.
+            - capacity (:obj:`int`): The max number of items stored, it should be larger than the number of items \
+                appended in the expire time.
+            - dtype (:obj:`type`): The numpy dtype of the values, use ``object`` for the non-numeric values.
+        """
+        if isinstance(expire, (int, float)):
+            if expire <= 0:
+                raise ValueError("Expire should be greater than 0, but {actual} found.".format(actual=repr(expire)))
+        else:
+            raise TypeError('Expire should be int or float, but {actual} found.'.format(actual=type(expire).__name__))
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("Capacity should be a positive int, but {actual} found.".format(actual=repr(capacity)))
+
+        self.__expire = expire
+        self.__capacity = capacity
+        self.__size = capacity + 1
+        self.__times = np.zeros(2 * self.__size, dtype=np.float64)
+        self.__values = np.zeros(2 * self.__size, dtype=dtype)
+        self.__count = 0
+        self.__write_lock = Lock()
+
+    def __snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Overview:
+            Get the copies of the times and values of the stored items in the ascending order of time.
+        """
+        count = self.__count
+        num = min(count, self.__capacity)
+        start = (count - num) % self.__size
+        return self.__times[start:start + num].copy(), self.__values[start:start + num].copy()
+
+    def __append(self, time_: float, data: _Tp):
+        """
+        Overview:
+            Append the data at the given time.
+        """
+        count = self.__count
+        if count > 0:
+            _last_time = self.__times[(count - 1) % self.__size]
+            if time_ < _last_time:
+                raise ValueError(
+                    "Time {time} invalid for descending from last time {last_time}".format(
+                        time=repr(time_), last_time=repr(_last_time)
+                    )
+                )
+        index = count % self.__size
+        self.__times[index] = self.__times[index + self.__size] = time_
+        self.__values[index] = self.__values[index + self.__size] = data
+        self.__count = count + 1
+
+    def __window(self) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Overview:
+            Get the current time, and the times and values of the items in the expire window, which starts with \
+            the latest expired item (if any) whose time is clipped to the start of the window.
+        """
+        _time = self._get_time()
+        times, values = self.__snapshot()
+        _limit_time = _time - self.__expire
+        first = int(np.searchsorted(times, _limit_time, side='left'))
+        if first > 0:
+            first -= 1
+            times[first] = max(times[first], _limit_time)
+        return _time, times[first:], values[first:]
+
+    def append(self, data: _Tp):
+        """
+        Overview:
+            Append the data.
+        """
+
+        with self.__write_lock:
+            self.__append(self._get_time(), data)
+            return self
+
+    def extend(self, iter_: Iterable[_Tp]):
+        """
+        Overview:
+            Extend the data.
+        """
+
+        with self.__write_lock:
+            _time = self._get_time()
+            for item in iter_:
+                self.__append(_time, item)
+            return self
+
+    def current(self) -> _Tp:
+        """
+        Overview:
+            Get the current data.
+        """
+
+        count = self.__count
+        if count == 0:
+            raise ValueError("This range is empty.")
+        index = (count - 1) % self.__size
+        return self.__values[index:index + 1].tolist()[0]
+
+    def history(self) -> List[Tuple[Union[int, float], _Tp]]:
+        """
+        Overview:
+            Get the history data, the same as ``RangedData.history`` .
+        """
+
+        _time, times, values = self.__window()
+        _result = list(zip(times.tolist(), values.tolist()))
+        if _result and times[-1] < _time:
+            _result.append((_time, _result[-1][1]))
+        return _result
+
+    def window_values(self) -> np.ndarray:
+        """
+        Overview:
+            Get the values of the time ranges in the expire window, i.e. the values of ``history`` except the last \
+            one, which are the values used by ``LoggedModel`` to calculate the statistics like average.
+        Returns:
+            - values (:obj:`np.ndarray`): The values of the time ranges, in the ascending order of time.
+        """
+
+        _time, times, values = self.__window()
+        if len(values) > 0 and times[-1] >= _time:
+            values = values[:-1]
+        return values
+
+    @property
+    def expire(self) -> float:
+        """
+        Overview:
+            Get the expire time.
+        """
+
+        return self.__expire
+
+    @property
+    def capacity(self) -> int:
+        """
+        Overview:
+            Get the max number of items stored.
+        """
+
+        return self.__capacity
+
+    def __bool__(self):
+        """
+        Overview:
+            Check whether the range is empty.
+        """
+
+        return self.__count > 0
+
+    @abstractmethod
+    def _get_time(self) -> float:
+        """
+        Overview:
+            Get the current time.
+        """
+
+        raise NotImplementedError
+
+
+class TimeRingRangedData(RingRangedData):
+    """
+    Overview:
+        The ``RingRangedData`` with a time object, the counterpart of ``TimeRangedData`` .
+    Interfaces:
+        ``__init__``, ``_get_time``, ``append``, ``extend``, ``current``, ``history``, ``window_values``, ``expire``, \
+        ``capacity``, ``__bool__``.
+    Properties:
+        - time (:obj:`BaseTime`): The time.
+        - expire (:obj:`float`): The expire time.
+        - capacity (:obj:`int`): The max number of items stored.
+    """
+
+    def __init__(self, time_: BaseTime, expire: float, capacity: int, dtype: type = np.float64):
+        """
+        Overview:
+            Initialize the TimeRingRangedData object.
+        Arguments:
+            - time_ (:obj:`BaseTime`): The time.
+            - expire (:obj:`float`): The expire time.
+            - capacity (:obj:`int`): The max number of items stored.
+            - dtype (:obj:`type`): The numpy dtype of the values.
+        """
+
+        RingRangedData.__init__(self, expire, capacity, dtype)
+        self.__time = time_
+
+    def _get_time(self) -> float:
+        """
+        Overview:
+            Get the current time.
+        """
+
+        return self.__time.time()
+
+    @property
+    def time(self):
+        """
+        Overview:
+            Get the time.
+        """
+
+        return self.__time
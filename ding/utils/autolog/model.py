@@ -1,9 +1,11 @@
 from abc import ABCMeta
-from typing import TypeVar, Union, List, Any
+from typing import TypeVar, Union, List, Any, Optional
+
+import numpy as np
 
 from .base import _LOGGED_MODEL__PROPERTIES, _LOGGED_MODEL__PROPERTY_ATTR_PREFIX, _TimeType, TimeMode, \
-    _LOGGED_VALUE__PROPERTY_NAME
-from .data import TimeRangedData
+    _LOGGED_VALUE__PROPERTY_NAME, _LOGGED_MODEL__PROPERTY_TYPES
+from .data import TimeRangedData, TimeRingRangedData
 from .time_ctl import BaseTime, TimeProxy
 from .value import LoggedValue
 
@@ -23,12 +25,15 @@ class _LoggedModelMeta(ABCMeta):
         super().__init__(name, bases, namespace)
 
         _properties = []
+        _property_types = {}
         for k, v in namespace.items():
             if isinstance(v, LoggedValue):
                 setattr(v, _LOGGED_VALUE__PROPERTY_NAME, k)
                 _properties.append(k)
+                _property_types[k] = v.type
 
         setattr(cls, _LOGGED_MODEL__PROPERTIES, _properties)
+        setattr(cls, _LOGGED_MODEL__PROPERTY_TYPES, _property_types)
 
 
 class LoggedModel(metaclass=_LoggedModelMeta):
@@ -81,28 +86,41 @@ class LoggedModel(metaclass=_LoggedModelMeta):
         >>>     print(ll.range_values['value'](TimeMode.ABSOLUTE))  # use absolute time
         >>>     print(ll.avg['value']())  # average value of last 10 secs
 
+        If ``capacity`` is given, the values are stored in the fixed-capacity numpy ring buffers \
+        (``TimeRingRangedData``), whose appending cost doesn't grow with the expire time, and the statistics can \
+        be calculated with numpy on ``window_values``:
+
+        >>>     ll = AvgList(TickTime(), expire=100, capacity=LoggedModel.tick_capacity(100))
+        >>>     print(ll.window_values('value').mean())
+        >>>     print(ll.window_stat('value', 'mean'))  # the same, but 0 for an empty window
+
     Interfaces:
         ``__init__``, ``time``, ``expire``, ``fixed_time``, ``current_time``, ``freeze``, ``unfreeze``, \
-        ``register_attribute_value``, ``__getattr__``, ``get_property_attribute``
+        ``register_attribute_value``, ``__getattr__``, ``get_property_attribute``, ``window_values``, \
+        ``window_stat``, ``tick_capacity``
 
     Property:
         - time (:obj:`BaseTime`): The time.
         - expire (:obj:`float`): The expire time.
+        - capacity (:obj:`Optional[int]`): The capacity of the ring buffers, None means unbounded lists.
     """
 
-    def __init__(self, time_: _TimeObjectType, expire: _TimeType):
+    def __init__(self, time_: _TimeObjectType, expire: _TimeType, capacity: Optional[int] = None):
         """
         Overview:
             Initialize the LoggedModel object using the given arguments.
         Arguments:
             - time_ (:obj:`BaseTime`): The time.
             - expire (:obj:`float`): The expire time.
+            - capacity (:obj:`Optional[int]`): If not None, store the values of each property in a ring buffer \
+                with this capacity, which should be larger than the number of values set in the expire time.
         """
 
         self.__time = time_
         self.__time_proxy = TimeProxy(self.__time, frozen=False)
         self.__init_time = self.__time_proxy.time()
         self.__expire = expire
+        self.__capacity = capacity
 
         self.__methods = {}
         self.__prop2attr = {}  # used to find registerd attributes list according to property name
@@ -119,7 +137,7 @@ class LoggedModel(metaclass=_LoggedModelMeta):
 
         return getattr(self, _LOGGED_MODEL__PROPERTIES)
 
-    def __get_property_ranged_data(self, name: str) -> TimeRangedData:
+    def __get_property_ranged_data(self, name: str) -> Union[TimeRangedData, TimeRingRangedData]:
         """
         Overview:
             Get ranged data of one property.
@@ -135,11 +153,15 @@ class LoggedModel(metaclass=_LoggedModelMeta):
             Initialize all properties.
         """
 
+        _property_types = getattr(self, _LOGGED_MODEL__PROPERTY_TYPES)
         for name in self.__properties:
-            setattr(
-                self, _LOGGED_MODEL__PROPERTY_ATTR_PREFIX + name,
-                TimeRangedData(self.__time_proxy, expire=self.__expire)
-            )
+            if self.__capacity is None:
+                _data = TimeRangedData(self.__time_proxy, expire=self.__expire)
+            else:
+                _type = _property_types[name]
+                _dtype = _type if _type in (int, float, bool) else object
+                _data = TimeRingRangedData(self.__time_proxy, self.__expire, self.__capacity, dtype=_dtype)
+            setattr(self, _LOGGED_MODEL__PROPERTY_ATTR_PREFIX + name, _data)
 
     def __get_range_values_func(self, name: str):
         """
@@ -199,6 +221,58 @@ class LoggedModel(metaclass=_LoggedModelMeta):
         """
         return self.__expire
 
+    @property
+    def capacity(self) -> Optional[int]:
+        """
+        Overview:
+            Get the capacity of the ring buffers
+
+        Returns:
+            int or None: capacity of the ring buffers, None if the values are stored in unbounded lists
+        """
+        return self.__capacity
+
+    def window_values(self, property_name: str) -> np.ndarray:
+        """
+        Overview:
+            Get the values of the time ranges of one property in the expire window, which are the same as the \
+            values of ``range_values``, but are read from the ring buffer without copying into python lists.
+        Arguments:
+            - property_name (:obj:`str`): name of property
+        Returns:
+            - values (:obj:`np.ndarray`): the values in the ascending order of time
+        """
+        if self.__capacity is None:
+            return np.array([_value for _, _value in self.range_values[property_name]()])
+        return self.__get_property_ranged_data(property_name).window_values()
+
+    def window_stat(self, property_name: str, stat: str) -> Union[float, int]:
+        """
+        Overview:
+            Reduce the values of one property in the expire window with a numpy statistic.
+        Arguments:
+            - property_name (:obj:`str`): name of property
+            - stat (:obj:`str`): name of the numpy reduction, such as ``mean``, ``max`` or ``min``
+        Returns:
+            - value (:obj:`Union[float, int]`): the statistic as a python scalar, 0 if the window is empty
+        """
+        _values = self.window_values(property_name)
+        return getattr(_values, stat)().item() if len(_values) != 0 else 0
+
+    @staticmethod
+    def tick_capacity(expire: _TimeType) -> int:
+        """
+        Overview:
+            Get the ring buffer capacity for the models whose values are set at most once per tick of a \
+            ``TickTime``. The expire window then holds at most ``expire + 1`` values, plus the value just \
+            before the window, which is kept as the start of the first time range.
+        Arguments:
+            - expire (:obj:`_TimeType`): The expire time in ticks.
+        Returns:
+            - capacity (:obj:`int`): The capacity to pass to ``__init__``.
+        """
+        return int(expire) + 2
+
     def fixed_time(self) -> Union[float, int]:
         """
         Overview:
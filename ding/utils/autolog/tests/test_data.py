@@ -1,6 +1,8 @@
+import time
+import numpy as np
 import pytest
 
-from ding.utils.autolog import TimeRangedData, NaturalTime, TickTime
+from ding.utils.autolog import TimeRangedData, TimeRingRangedData, NaturalTime, TickTime, LoggedModel, LoggedValue
 
 
 @pytest.mark.unittest
@@ -94,3 +96,97 @@ class TestAutologRangedData:
 
         data.time.step(10)
         assert data.history() == [(13, 7), (18, 7)]
+
+
+@pytest.mark.unittest
+class TestAutologRingRangedData:
+
+    def test_expire_and_capacity(self):
+        data = TimeRingRangedData(NaturalTime(), expire=5, capacity=8)
+        assert data.expire == 5 and data.capacity == 8
+
+        with pytest.raises(ValueError):
+            TimeRingRangedData(NaturalTime(), expire=-1, capacity=8)
+        with pytest.raises(TypeError):
+            TimeRingRangedData(NaturalTime(), expire='5', capacity=8)
+        with pytest.raises(ValueError):
+            TimeRingRangedData(NaturalTime(), expire=5, capacity=0)
+
+    def test_same_as_ranged_data(self):
+        np.random.seed(0)
+        time_ = TickTime()
+        data = TimeRangedData(time_, expire=5)
+        ring_data = TimeRingRangedData(time_, expire=5, capacity=1000, dtype=int)
+        assert not ring_data and ring_data.history() == [] and len(ring_data.window_values()) == 0
+        with pytest.raises(ValueError):
+            ring_data.current()
+        for _ in range(200):
+            op = np.random.randint(3)
+            if op == 0:
+                value = np.random.randint(100)
+                data.append(value)
+                ring_data.append(value)
+            elif op == 1:
+                values = np.random.randint(100, size=np.random.randint(1, 4)).tolist()
+                data.extend(values)
+                ring_data.extend(values)
+            else:
+                time_.step(np.random.randint(1, 4))
+            assert bool(ring_data) == bool(data)
+            assert ring_data.current() == data.current()
+            assert ring_data.history() == data.history()
+            history = data.history()
+            assert ring_data.window_values().tolist() == [v for _, v in history[:-1]]
+
+    def test_overflow(self):
+        data = TimeRingRangedData(TickTime(), expire=10, capacity=3)
+        data.extend([1, 2, 3, 4, 5])
+        assert data.current() == 5
+        assert data.history() == [(0, 3), (0, 4), (0, 5)]
+        data.time.step()
+        assert data.window_values().tolist() == [3, 4, 5]
+
+    def test_logged_model(self):
+
+        class _Model(LoggedModel):
+            value = LoggedValue(float)
+            count = LoggedValue(int)
+
+        time_ = TickTime()
+        model, ring_model = _Model(time_, expire=3), _Model(time_, expire=3, capacity=LoggedModel.tick_capacity(3))
+        assert model.capacity is None and ring_model.capacity == 5
+        assert ring_model.window_stat('value', 'mean') == 0
+        for i in range(10):
+            for m in [model, ring_model]:
+                m.value, m.count = i * 0.5, i
+            time_.step()
+            for name in ['value', 'count']:
+                assert ring_model.range_values[name]() == model.range_values[name]()
+                assert ring_model.window_values(name).tolist() == model.window_values(name).tolist()
+                for stat in ['mean', 'max', 'min']:
+                    assert ring_model.window_stat(name, stat) == model.window_stat(name, stat)
+        assert ring_model.window_values('count').dtype == np.int64
+        assert ring_model.count == 9 and isinstance(ring_model.count, int)
+
+
+@pytest.mark.benchmark
+def test_ring_ranged_data_benchmark():
+    step_num = 2000
+    for expire in [100, 10000]:
+        durations = []
+        for data in [TimeRangedData(TickTime(), expire), TimeRingRangedData(TickTime(), expire, expire + 2)]:
+            start = time.time()
+            for i in range(step_num):
+                data.append(float(i))
+                data.time.step()
+                if isinstance(data, TimeRingRangedData):
+                    data.window_values().mean()
+                else:
+                    values = [v for _, v in data.history()[:-1]]
+                    sum(values) / len(values)
+            durations.append((time.time() - start) / step_num)
+        print(
+            'expire {}, time per tick, TimeRangedData: {:.1f}us, TimeRingRangedData: {:.1f}us'.format(
+                expire, durations[0] * 1e6, durations[1] * 1e6
+            )
+        )
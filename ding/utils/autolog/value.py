@@ -14,6 +14,7 @@ class LoggedValue:
     Interfaces:
         ``__init__``, ``__get__``, ``__set__``
     Properties:
+        - type (:obj:`type`): The type of the value.
         - __property_name (:obj:`str`): The name of the property.
     """
 
@@ -27,6 +28,15 @@ class LoggedValue:
 
         self.__type = type_
 
+    @property
+    def type(self) -> Type[_ValueType]:
+        """
+        Overview:
+            Get the type of the value.
+        """
+
+        return self.__type
+
     @property
     def __property_name(self):
         """
@@ -3,6 +3,82 @@ import torch
 from gym import Env
 from typing import Tuple, List
 
+# The offset from the current point to the next point of each action in BFS, the agent takes the same action to move
+# from the next point back to the current point, e.g. action 0 (``x - 1``) in BFS means moving down (``x + 1``).
+_BFS_MOVES = np.array([[-1, 0], [0, -1], [1, 0], [0, 1]])
+
+
+def get_vi_map(wall: np.ndarray, target_location: Tuple[int, int], n_action: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Overview:
+        Run Broad-First-Search (BFS) from the target location on the whole maze, and get the distance and the \
+        optimal action of all the cells. Each BFS iteration expands the whole frontier at once with the shifted \
+        boolean grids instead of visiting the points one by one. The order of the points in the frontier is also \
+        tracked, so the chosen actions are the same as the point-by-point BFS in ``get_vi_sequence``.
+    Arguments:
+        - wall (:obj:`np.ndarray`): The boolean map of the walls.
+        - target_location (:obj:`Tuple[int, int]`): The target location.
+        - n_action (:obj:`int`): The number of actions, which is used as the action of the unreached cells.
+    Returns:
+        - dist (:obj:`np.ndarray`): The BFS distance to the target, -1 for the unreachable cells.
+        - action (:obj:`np.ndarray`): The optimal action of each cell, ``n_action`` for the target and the \
+            unreachable cells.
+    Shapes:
+        - wall (:obj:`np.ndarray`): :math:`(W, H)`.
+        - dist (:obj:`np.ndarray`): :math:`(W, H)`, the dtype is ``np.int32``.
+        - action (:obj:`np.ndarray`): :math:`(W, H)`, the dtype is ``np.int32``.
+    """
+    wall = np.asarray(wall, dtype=bool)
+    size_x, size_y = wall.shape
+    # the rank of each point in the current frontier, ``no_rank`` for the points out of frontier, padded by 1
+    no_rank = size_x * size_y
+    rank = np.full((size_x + 2, size_y + 2), no_rank, dtype=np.int64)
+    rank[target_location[0] + 1, target_location[1] + 1] = 0
+    visited = wall.copy()
+    visited[target_location] = True
+    dist = np.full((size_x, size_y), -1, dtype=np.int32)
+    dist[target_location] = 0
+    action = np.full((size_x, size_y), n_action, dtype=np.int32)
+
+    level = 0
+    while True:
+        # the point is expanded from the frontier point with the smallest rank, then the smallest action
+        key = np.full((size_x, size_y), 4 * no_rank, dtype=np.int64)
+        for a, (dx, dy) in enumerate(_BFS_MOVES):
+            parent_rank = rank[1 - dx:1 - dx + size_x, 1 - dy:1 - dy + size_y]
+            np.minimum(key, 4 * parent_rank + a, out=key)
+        new = (key < 4 * no_rank) & ~visited
+        if not new.any():
+            break
+        level += 1
+        dist[new] = level
+        action[new] = key[new] % 4
+        visited |= new
+        rank[:] = no_rank
+        new_key = key[new]
+        new_rank = np.empty(len(new_key), dtype=np.int64)
+        new_rank[np.argsort(new_key)] = np.arange(len(new_key))
+        rank[1:-1, 1:-1][new] = new_rank
+    return dist, action
+
+
+def get_vi_sequence_from_map(dist: np.ndarray, action: np.ndarray, n_level: int, n_action: int = 4) -> np.ndarray:
+    """
+    Overview:
+        Get the BFS map after each of the first ``n_level`` iterations from the result of ``get_vi_map``.
+    Arguments:
+        - dist (:obj:`np.ndarray`): The BFS distance map.
+        - action (:obj:`np.ndarray`): The optimal action map.
+        - n_level (:obj:`int`): The number of BFS iterations.
+        - n_action (:obj:`int`): The number of actions, which is used as the action of the unreached cells.
+    Returns:
+        - vi_sequence (:obj:`np.ndarray`): The BFS map after each iteration.
+    Shapes:
+        - vi_sequence (:obj:`np.ndarray`): :math:`(L, W, H)`, where ``L = n_level`` .
+    """
+    levels = np.arange(1, n_level + 1, dtype=np.int32)[:, None, None]
+    return np.where(dist[None] <= levels, action[None], np.int32(n_action)).astype(np.int32)
+
 
 def get_vi_sequence(env: Env, observation: np.ndarray) -> Tuple[np.ndarray, List]:
     """
@@ -19,52 +95,20 @@ def get_vi_sequence(env: Env, observation: np.ndarray) -> Tuple[np.ndarray, List
     xy = np.where(observation[Ellipsis, -1] == 1)
     start_x, start_y = xy[0][0], xy[1][0]
     target_location = env.target_location
-    nav_map = env.nav_map
-    current_points = [target_location]
-    chosen_actions = {target_location: 0}
-    visited_points = {target_location: True}
-    vi_sequence = []
-
-    vi_map = np.full((env.size, env.size), fill_value=env.n_action, dtype=np.int32)
-
-    found_start = False
-    while current_points and not found_start:
-        next_points = []
-        for point_x, point_y in current_points:
-            for (action, (next_point_x, next_point_y)) in [(0, (point_x - 1, point_y)), (1, (point_x, point_y - 1)),
-                                                           (2, (point_x + 1, point_y)), (3, (point_x, point_y + 1))]:
-
-                if (next_point_x, next_point_y) in visited_points:
-                    continue
-
-                if not (0 <= next_point_x < len(nav_map) and 0 <= next_point_y < len(nav_map[next_point_x])):
-                    continue
-
-                if nav_map[next_point_x][next_point_y] == 'x':
-                    continue
-
-                next_points.append((next_point_x, next_point_y))
-                visited_points[(next_point_x, next_point_y)] = True
-                chosen_actions[(next_point_x, next_point_y)] = action
-                vi_map[next_point_x, next_point_y] = action
+    wall = np.array([[c == 'x' for c in row] for row in env.nav_map])
+    dist, action = get_vi_map(wall, target_location, env.n_action)
 
-                if next_point_x == start_x and next_point_y == start_y:
-                    found_start = True
-        vi_sequence.append(vi_map.copy())
-        current_points = next_points
+    found_start = dist[start_x, start_y] > 0
+    # BFS stops at the iteration which finds the start point, or runs one more iteration which finds nothing
+    n_level = dist[start_x, start_y] if found_start else dist.max() + 1
+    vi_sequence = get_vi_sequence_from_map(dist, action, n_level, env.n_action)
     track_back = []
     if found_start:
         cur_x, cur_y = start_x, start_y
         while cur_x != target_location[0] or cur_y != target_location[1]:
             act = vi_sequence[-1][cur_x, cur_y]
             track_back.append((torch.FloatTensor(env.process_states([cur_x, cur_y], env.get_maze_map())), act))
-            if act == 0:
-                cur_x += 1
-            elif act == 1:
-                cur_y += 1
-            elif act == 2:
-                cur_x -= 1
-            elif act == 3:
-                cur_y -= 1
+            cur_x -= _BFS_MOVES[act][0]
+            cur_y -= _BFS_MOVES[act][1]
 
-    return np.array(vi_sequence), track_back
+    return vi_sequence, track_back
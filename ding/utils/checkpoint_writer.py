@@ -0,0 +1,247 @@
+from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+import copy
+import os
+from ditk import logging
+import torch
+
+from .file_helper import read_file, save_file
+
+SHARDS_KEY = '__ding_checkpoint_shards__'
+SHARD_REF_KEY = '__ding_shard_ref__'
+
+
+def _is_remote(path: str) -> bool:
+    return path.lower().startswith('s3')
+
+
+def _atomic_save(path: str, data: Any) -> None:
+    # write to a temporary file in the same directory and rename it, so that the checkpoint file is either the old
+    # one or the complete new one, even if the process is killed during writing
+    if _is_remote(path):
+        save_file(path, data)
+        return
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.exists(dirname):
+        os.makedirs(dirname, exist_ok=True)
+    tmp_path = '{}.tmp'.format(path)
+    try:
+        torch.save(data, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _shard_path(path: str, shard_id: int) -> str:
+    return '{}.shard{}'.format(path, shard_id)
+
+
+class AsyncCheckpointWriter(object):
+    """
+    Overview:
+        Save checkpoints in a background thread, so that the training thread only pauses for the in-memory \
+        snapshot of the checkpoint: the tensors are copied into reusable (pinned for cuda tensors) CPU buffers and \
+        the other objects are deep copied, then the snapshot is serialized and written to a temporary file, which is \
+        renamed to the target path atomically. Optionally, the tensors of each checkpoint can be split into several \
+        shard files written in parallel (loaded by ``load_checkpoint`` ), and only the latest ``max_to_keep`` \
+        rotating checkpoints (e.g. ``iteration_{}.pth.tar`` ) are kept.
+    Interfaces:
+        ``__init__``, ``save``, ``wait``, ``close``
+    Properties:
+        - pending (:obj:`bool`): Whether there is a checkpoint being written.
+    """
+
+    def __init__(self, max_to_keep: Optional[int] = None, shard_num: int = 1, pin_memory: bool = True) -> None:
+        """
+        Overview:
+            Initialize the background writer.
+        Arguments:
+            - max_to_keep (:obj:`Optional[int]`): The number of the latest rotating checkpoints to keep, the older \
+                ones are removed. None means keeping all the checkpoints.
+            - shard_num (:obj:`int`): The number of shard files of each checkpoint, 1 means a single file which can \
+                be loaded by ``torch.load`` directly.
+            - pin_memory (:obj:`bool`): Whether to use pinned memory as the snapshot buffers of cuda tensors, which \
+                makes the device to host copy faster.
+        """
+        assert max_to_keep is None or max_to_keep > 0, max_to_keep
+        assert shard_num >= 1, shard_num
+        self._max_to_keep = max_to_keep
+        self._shard_num = shard_num
+        self._pin_memory = pin_memory and torch.cuda.is_available()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ckpt_writer')
+        self._shard_executor = ThreadPoolExecutor(
+            max_workers=shard_num, thread_name_prefix='ckpt_shard_writer'
+        ) if shard_num > 1 else None
+        self._future: Optional[Future] = None
+        self._buffers: Dict[Tuple, torch.Tensor] = {}
+        self._kept_paths = deque()
+        self._closed = False
+
+    @property
+    def pending(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def _snapshot_tensor(self, tensor: torch.Tensor, key: Tuple) -> torch.Tensor:
+        tensor = tensor.detach()
+        if tensor.layout != torch.strided:
+            return tensor.cpu().clone()
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.shape != tensor.shape or buffer.dtype != tensor.dtype:
+            buffer = torch.empty(tensor.shape, dtype=tensor.dtype, pin_memory=self._pin_memory and tensor.is_cuda)
+            self._buffers[key] = buffer
+        buffer.copy_(tensor, non_blocking=buffer.is_pinned())
+        return buffer
+
+    def _snapshot(self, data: Any, key: Tuple = ()) -> Any:
+        if isinstance(data, torch.Tensor):
+            return self._snapshot_tensor(data, key)
+        elif isinstance(data, dict):
+            ret = {k: self._snapshot(v, key + (k, )) for k, v in data.items()}
+            if type(data) is not dict:
+                ret = type(data)(ret)
+            if hasattr(data, '_metadata'):
+                # the version info of ``nn.Module.state_dict``
+                ret._metadata = copy.deepcopy(data._metadata)
+            return ret
+        elif isinstance(data, (list, tuple)):
+            ret = [self._snapshot(v, key + (i, )) for i, v in enumerate(data)]
+            if hasattr(data, '_fields'):  # namedtuple
+                return type(data)(*ret)
+            return type(data)(ret)
+        else:
+            return copy.deepcopy(data)
+
+    def save(self, path: str, data: Any, rotate: bool = False) -> None:
+        """
+        Overview:
+            Take the snapshot of data and write it to path in the background. If the last checkpoint is still being \
+            written, wait for it first, because the snapshot buffers are reused.
+        Arguments:
+            - path (:obj:`str`): The path of checkpoint.
+            - data (:obj:`Any`): The checkpoint data, such as ``policy.learn_mode.state_dict()`` .
+            - rotate (:obj:`bool`): Whether the checkpoint is counted in ``max_to_keep`` .
+        """
+        assert not self._closed, 'the writer is closed'
+        self.wait()
+        snapshot = self._snapshot(data)
+        if self._pin_memory:
+            # wait for the asynchronous copies from device to pinned buffers
+            torch.cuda.synchronize()
+        self._future = self._executor.submit(self._write, path, snapshot, rotate)
+
+    def wait(self) -> None:
+        """
+        Overview:
+            Wait until the checkpoint being written is finished, the exception in writing is raised here.
+        """
+        if self._future is not None:
+            future, self._future = self._future, None
+            future.result()
+
+    def close(self) -> None:
+        """
+        Overview:
+            Wait for the pending checkpoint and shut down the background threads.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown()
+            if self._shard_executor is not None:
+                self._shard_executor.shutdown()
+            self._buffers.clear()
+
+    def _split_shards(self, data: Any, shards: List[List[torch.Tensor]], loads: List[int]) -> Any:
+        if isinstance(data, torch.Tensor):
+            # assign the tensor to the shard with the least bytes
+            shard_id = loads.index(min(loads))
+            loads[shard_id] += data.numel() * data.element_size()
+            shards[shard_id].append(data)
+            return {SHARD_REF_KEY: [shard_id, len(shards[shard_id]) - 1]}
+        elif isinstance(data, dict):
+            ret = {k: self._split_shards(v, shards, loads) for k, v in data.items()}
+            if type(data) is not dict:
+                ret = type(data)(ret)
+            if hasattr(data, '_metadata'):
+                ret._metadata = data._metadata
+            return ret
+        elif isinstance(data, (list, tuple)):
+            ret = [self._split_shards(v, shards, loads) for v in data]
+            return type(data)(*ret) if hasattr(data, '_fields') else type(data)(ret)
+        return data
+
+    def _write(self, path: str, snapshot: Any, rotate: bool) -> None:
+        if self._shard_num == 1:
+            _atomic_save(path, snapshot)
+        else:
+            shards, loads = [[] for _ in range(self._shard_num)], [0 for _ in range(self._shard_num)]
+            index = self._split_shards(snapshot, shards, loads)
+            futures = [
+                self._shard_executor.submit(_atomic_save, _shard_path(path, i), shard)
+                for i, shard in enumerate(shards)
+            ]
+            for f in futures:
+                f.result()
+            # the index file is written at last, so that a complete index file means complete shards
+            shard_names = [os.path.basename(_shard_path(path, i)) for i in range(self._shard_num)]
+            _atomic_save(path, {SHARDS_KEY: shard_names, 'data': index})
+        if rotate:
+            self._rotate(path)
+
+    def _rotate(self, path: str) -> None:
+        if path in self._kept_paths:
+            self._kept_paths.remove(path)
+        self._kept_paths.append(path)
+        if self._max_to_keep is None:
+            return
+        while len(self._kept_paths) > self._max_to_keep:
+            old_path = self._kept_paths.popleft()
+            for p in [old_path] + [_shard_path(old_path, i) for i in range(self._shard_num)]:
+                if not _is_remote(p) and os.path.exists(p):
+                    try:
+                        os.remove(p)
+                    except OSError as e:
+                        logging.warning('failed to remove old checkpoint {}: {}'.format(p, e))
+
+
+def _restore_shards(data: Any, shards: List[List[torch.Tensor]]) -> Any:
+    if isinstance(data, dict):
+        if len(data) == 1 and SHARD_REF_KEY in data:
+            shard_id, index = data[SHARD_REF_KEY]
+            return shards[shard_id][index]
+        ret = {k: _restore_shards(v, shards) for k, v in data.items()}
+        if type(data) is not dict:
+            ret = type(data)(ret)
+        if hasattr(data, '_metadata'):
+            ret._metadata = data._metadata
+        return ret
+    elif isinstance(data, (list, tuple)):
+        ret = [_restore_shards(v, shards) for v in data]
+        return type(data)(*ret) if hasattr(data, '_fields') else type(data)(ret)
+    return data
+
+
+def load_checkpoint(path: str) -> Any:
+    """
+    Overview:
+        Load the checkpoint saved by ``save_file`` or ``AsyncCheckpointWriter`` (including the sharded checkpoint, \
+        whose shard files are loaded in parallel).
+    Arguments:
+        - path (:obj:`str`): The path of checkpoint.
+    Returns:
+        - data (:obj:`Any`): The checkpoint data.
+    """
+    data = read_file(path)
+    if not (isinstance(data, dict) and SHARDS_KEY in data):
+        return data
+    dirname = os.path.dirname(path)
+    shard_paths = [os.path.join(dirname, name) for name in data[SHARDS_KEY]]
+    with ThreadPoolExecutor(max_workers=len(shard_paths)) as executor:
+        shards = list(executor.map(read_file, shard_paths))
+    return _restore_shards(data['data'], shards)
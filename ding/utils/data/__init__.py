@@ -2,3 +2,4 @@ from .collate_fn import diff_shape_collate, default_collate, default_decollate,
 from .dataloader import AsyncDataLoader
 from .dataset import NaiveRLDataset, D4RLDataset, HDF5Dataset, BCODataset, \
     create_dataset, hdf5_save, offline_data_save_type
+from .offline_sampler import OfflineBatchSampler
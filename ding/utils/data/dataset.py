@@ -6,6 +6,7 @@ from torch.utils.data import Dataset
 from dataclasses import dataclass
 
 import pickle
+import multiprocessing
 import easydict
 import torch
 import numpy as np
@@ -1032,70 +1033,62 @@ class PCDataset(Dataset):
         return self._data[0].shape[0]
 
 
-def load_bfs_datasets(train_seeds=1, test_seeds=5):
+def _load_bfs_data(seed: int, size: int = 16) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Overview:
+        Generate the BFS data of the optimal trajectory in the maze of one seed. Since BFS starts from the target \
+        location, the BFS sequence of each point on the trajectory is a prefix of the one of the start point.
+    Arguments:
+        - seed (:obj:`int`): The seed of the maze.
+        - size (:obj:`int`): The size of the maze.
+    Returns:
+        - observations (:obj:`np.ndarray`): The observations, shape :math:`(N, W, W, 3)` .
+        - bfs_input_maps (:obj:`np.ndarray`): The BFS maps before each iteration, shape :math:`(N, W, W)` .
+        - bfs_output_maps (:obj:`np.ndarray`): The BFS maps after each iteration, shape :math:`(N, W, W)` .
+    """
+    from dizoo.maze.envs import Maze
+
+    env = Maze(easydict.EasyDict({'size': size}))
+    env.seed(seed)
+    env.reset()
+
+    start_obs = env.process_states(env._get_obs(), env.get_maze_map())
+    bfs_sequence, track_back = get_vi_sequence(env, start_obs)  # [L, W, W]
+    env_observations = np.stack([track_back[i][0].numpy() for i in range(len(track_back))], axis=0)
+    # the BFS of the i-th point on the optimal trajectory stops at the iteration which finds it, i.e. ``L - i``
+    n_levels = np.arange(len(track_back), 0, -1)
+    init_map = np.full((1, env.size, env.size), env.n_action, dtype=np.int64)
+    bfs_input_sequence = np.concatenate([init_map, bfs_sequence[:-1]], axis=0)
+
+    observations = np.repeat(env_observations, n_levels, axis=0)
+    bfs_input_maps = np.concatenate([bfs_input_sequence[:n] for n in n_levels], axis=0)
+    bfs_output_maps = np.concatenate([bfs_sequence[:n] for n in n_levels], axis=0)
+    return observations, bfs_input_maps, bfs_output_maps
+
+
+def load_bfs_datasets(train_seeds=1, test_seeds=5, num_workers=0):
     """
     Overview:
         Load BFS datasets.
     Arguments:
         - train_seeds (:obj:`int`): The number of train seeds.
         - test_seeds (:obj:`int`): The number of test seeds.
+        - num_workers (:obj:`int`): The number of processes to generate the data of the seeds in parallel, \
+            0 means generating in the main process.
     """
 
-    from dizoo.maze.envs import Maze
+    seeds = list(range(train_seeds + test_seeds))
+    if num_workers > 0:
+        with multiprocessing.Pool(processes=num_workers) as pool:
+            all_data = pool.map(_load_bfs_data, seeds)
+    else:
+        all_data = [_load_bfs_data(seed) for seed in seeds]
 
-    def load_env(seed):
-        ccc = easydict.EasyDict({'size': 16})
-        e = Maze(ccc)
-        e.seed(seed)
-        e.reset()
-        return e
-
-    envs = [load_env(i) for i in range(train_seeds + test_seeds)]
-
-    observations_train = []
-    observations_test = []
-    bfs_input_maps_train = []
-    bfs_input_maps_test = []
-    bfs_output_maps_train = []
-    bfs_output_maps_test = []
-    for idx, env in enumerate(envs):
-        if idx < train_seeds:
-            observations = observations_train
-            bfs_input_maps = bfs_input_maps_train
-            bfs_output_maps = bfs_output_maps_train
-        else:
-            observations = observations_test
-            bfs_input_maps = bfs_input_maps_test
-            bfs_output_maps = bfs_output_maps_test
-
-        start_obs = env.process_states(env._get_obs(), env.get_maze_map())
-        _, track_back = get_vi_sequence(env, start_obs)
-        env_observations = torch.stack([track_back[i][0] for i in range(len(track_back))], dim=0)
-
-        for i in range(env_observations.shape[0]):
-            bfs_sequence, _ = get_vi_sequence(env, env_observations[i].numpy().astype(np.int32))  # [L, W, W]
-            bfs_input_map = env.n_action * np.ones([env.size, env.size], dtype=np.long)
-
-            for j in range(bfs_sequence.shape[0]):
-                bfs_input_maps.append(torch.from_numpy(bfs_input_map))
-                bfs_output_maps.append(torch.from_numpy(bfs_sequence[j]))
-                observations.append(env_observations[i])
-                bfs_input_map = bfs_sequence[j]
-
-    train_data = PCDataset(
-        (
-            torch.stack(observations_train, dim=0),
-            torch.stack(bfs_input_maps_train, dim=0),
-            torch.stack(bfs_output_maps_train, dim=0),
-        )
-    )
-    test_data = PCDataset(
-        (
-            torch.stack(observations_test, dim=0),
-            torch.stack(bfs_input_maps_test, dim=0),
-            torch.stack(bfs_output_maps_test, dim=0),
-        )
-    )
+    def stack_data(data_list):
+        return tuple(torch.from_numpy(np.concatenate(d, axis=0)) for d in zip(*data_list))
+
+    train_data = PCDataset(stack_data(all_data[:train_seeds]))
+    test_data = PCDataset(stack_data(all_data[train_seeds:]))
 
     return train_data, test_data
 
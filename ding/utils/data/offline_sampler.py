@@ -0,0 +1,113 @@
+from typing import Dict, Optional, Union
+import torch
+from torch.utils.data import Dataset
+
+
+def _build_columns(dataset: Dataset) -> Dict[str, torch.Tensor]:
+    data = getattr(dataset, '_data', None)
+    if isinstance(data, dict):
+        # columnar in-memory datasets, such as ``HDF5Dataset`` and ``BCODataset``
+        assert getattr(dataset, 'context_len', 0) == 0, 'sequence (context_len > 0) dataset is not supported'
+        return {k: torch.as_tensor(v) for k, v in data.items()}
+    # datasets of transition dicts, such as ``NaiveRLDataset`` and ``D4RLDataset``, are stacked once
+    items = data if isinstance(data, list) else [dataset[i] for i in range(len(dataset))]
+    assert len(items) > 0 and isinstance(items[0], dict), 'only the dataset of transition dicts is supported'
+    return {k: torch.stack([torch.as_tensor(item[k]) for item in items]) for k in items[0].keys()}
+
+
+class OfflineBatchSampler(object):
+    """
+    Overview:
+        Batch sampler of the in-memory offline RL datasets (e.g. ``NaiveRLDataset``, ``D4RLDataset`` and \
+        ``HDF5Dataset``). The dataset is converted once into a few contiguous tensors (one per field), then each \
+        batch is a random index batch gathered with one ``index_select`` per field, rather than fetching, \
+        collating and stacking ``batch_size`` transition dicts in python. The batch size is fixed and the order is \
+        reshuffled at every epoch (the last incomplete batch of epoch is dropped). For cuda device, the batch is \
+        gathered into reusable pinned buffers and copied to device asynchronously.
+    Interfaces:
+        ``__init__``, ``sample``, ``__len__``
+    Properties:
+        - epoch (:obj:`int`): The number of finished epochs.
+        - columns (:obj:`Dict[str, torch.Tensor]`): The fields of the whole dataset.
+    """
+
+    def __init__(
+            self,
+            dataset: Dataset,
+            batch_size: int,
+            device: Union[str, torch.device] = 'cpu',
+            seed: Optional[int] = None,
+    ) -> None:
+        """
+        Overview:
+            Convert the dataset into columns and initialize the buffers.
+        Arguments:
+            - dataset (:obj:`Dataset`): The in-memory dataset, whose items are transition dicts.
+            - batch_size (:obj:`int`): The batch size.
+            - device (:obj:`Union[str, torch.device]`): The device of the sampled batch.
+            - seed (:obj:`Optional[int]`): The seed of the random generator of shuffle.
+        """
+        self._columns = _build_columns(dataset)
+        self._size = len(next(iter(self._columns.values())))
+        assert all(len(v) == self._size for v in self._columns.values()), 'all the fields must have the same length'
+        assert 0 < batch_size <= self._size, 'invalid batch_size {} for dataset size {}'.format(batch_size, self._size)
+        self._batch_size = batch_size
+        self._device = torch.device(device)
+        self._generator = torch.Generator()
+        if seed is not None:
+            self._generator.manual_seed(seed)
+        self._epoch = 0
+        self._perm = torch.randperm(self._size, generator=self._generator)
+        self._pointer = 0
+        self._pin_memory = self._device.type == 'cuda' and torch.cuda.is_available()
+        if self._pin_memory:
+            self._buffers = {
+                k: torch.empty((batch_size, *v.shape[1:]), dtype=v.dtype).pin_memory()
+                for k, v in self._columns.items()
+            }
+            # the event of the last asynchronous copy from pinned buffers, which must finish before the next gather
+            self._copy_event = None
+
+    def __len__(self) -> int:
+        """
+        Overview:
+            Return the number of batches in an epoch.
+        """
+        return self._size // self._batch_size
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    @property
+    def columns(self) -> Dict[str, torch.Tensor]:
+        return self._columns
+
+    def _next_index(self) -> torch.Tensor:
+        if self._pointer + self._batch_size > self._size:
+            self._epoch += 1
+            self._perm = torch.randperm(self._size, generator=self._generator)
+            self._pointer = 0
+        index = self._perm[self._pointer:self._pointer + self._batch_size]
+        self._pointer += self._batch_size
+        return index
+
+    def sample(self) -> Dict[str, torch.Tensor]:
+        """
+        Overview:
+            Sample a batch, which is a dict of batched tensors whose first dim is ``batch_size`` .
+        Returns:
+            - batch (:obj:`Dict[str, torch.Tensor]`): The batched fields on ``device`` .
+        """
+        index = self._next_index()
+        if not self._pin_memory:
+            return {k: v.index_select(0, index).to(self._device) for k, v in self._columns.items()}
+        if self._copy_event is not None:
+            self._copy_event.synchronize()
+        batch = {}
+        for k, v in self._columns.items():
+            torch.index_select(v, 0, index, out=self._buffers[k])
+            batch[k] = self._buffers[k].to(self._device, non_blocking=True)
+        self._copy_event = torch.cuda.Event()
+        self._copy_event.record()
+        return batch
@@ -0,0 +1,75 @@
+import importlib
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def lazy_import_attrs(
+    package_name: str,
+    submod_attrs: Dict[str, Iterable[str]],
+    star_submodules: Iterable[str] = (),
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str], Callable[[], None]]:
+    """
+    Overview:
+        Build the `PEP 562 <https://peps.python.org/pep-0562/>`_ module hooks of a lazily imported package. \
+        Attributes are resolved from their submodule on first access and then cached in the package namespace, \
+        so ``import ding.utils`` or ``import ding.policy`` no longer pays for importing torch, tensorboardX, k8s \
+        helpers and every policy/model/wrapper definition up front.
+    Arguments:
+        - package_name (:obj:`str`): The ``__name__`` of the lazy package.
+        - submod_attrs (:obj:`Dict[str, Iterable[str]]`): Map from relative submodule name (e.g. ``.dqn``) to the \
+            names it exports, mirroring the original ``from .dqn import DQNPolicy`` lines.
+        - star_submodules (:obj:`Iterable[str]`): Relative submodules that were re-exported with ``import *``, \
+            they are searched (in order) for names missing from ``submod_attrs``.
+    Returns:
+        - getattr_fn (:obj:`Callable`): The module level ``__getattr__``.
+        - dir_fn (:obj:`Callable`): The module level ``__dir__``.
+        - all_names (:obj:`List[str]`): The explicitly known public names, used as ``__all__``.
+        - import_all_fn (:obj:`Callable`): Eagerly import every submodule, which restores the old import side \
+            effects (e.g. registry registration). It is used as the lazy loader of the related registries.
+    Examples:
+        >>> # in ding/policy/__init__.py
+        >>> __getattr__, __dir__, __all__, import_all = lazy_import_attrs(__name__, {'.dqn': ['DQNPolicy']})
+    """
+    attr_to_submod = {}
+    for submod, attrs in submod_attrs.items():
+        for attr in attrs:
+            attr_to_submod[attr] = submod
+    star_submodules = list(star_submodules)
+    all_names = sorted(attr_to_submod.keys())
+
+    def _package() -> ModuleType:
+        return importlib.import_module(package_name)
+
+    def _import_submodule(submod: str) -> ModuleType:
+        return importlib.import_module(submod, package_name)
+
+    def getattr_fn(name: str) -> Any:
+        package = _package()
+        if name in attr_to_submod:
+            value = getattr(_import_submodule(attr_to_submod[name]), name)
+            setattr(package, name, value)
+            return value
+        if not name.startswith('__'):
+            for submod in star_submodules:
+                module = _import_submodule(submod)
+                if hasattr(module, name):
+                    value = getattr(module, name)
+                    setattr(package, name, value)
+                    return value
+            # plain submodule access, such as ``ding.utils.data`` without importing it explicitly
+            full_name = '{}.{}'.format(package_name, name)
+            try:
+                return importlib.import_module(full_name)
+            except ModuleNotFoundError as e:
+                if e.name != full_name:
+                    raise
+        raise AttributeError("module '{}' has no attribute '{}'".format(package_name, name))
+
+    def dir_fn() -> List[str]:
+        return sorted(set(vars(_package()).keys()) | set(all_names))
+
+    def import_all_fn() -> None:
+        for submod in list(submod_attrs.keys()) + star_submodules:
+            _import_submodule(submod)
+
+    return getattr_fn, dir_fn, all_names, import_all_fn
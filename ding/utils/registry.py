@@ -14,7 +14,8 @@ class Registry(dict):
         A helper class for managing registering modules, it extends a dictionary
         and provides a register functions.
     Interfaces:
-        ``__init__``, ``register``, ``get``, ``build``, ``query``, ``query_details``
+        ``__init__``, ``register``, ``register_lazy_loader``, ``get``, ``build``, ``query``, ``query_details``, \
+        ``__contains__``, ``keys``
     Examples (creating):
         >>> some_registry = Registry({"default": default_module})
 
@@ -31,6 +32,11 @@ class Registry(dict):
 
     Examples (accessing):
         >>> f = some_registry["foo_module"]
+
+    Examples (lazy registering):
+        >>> # the loader is only called when a missing module name is accessed
+        >>> some_registry.register_lazy_loader(lambda: importlib.import_module("foo_package.foo_module"))
+        >>> f = some_registry.get("foo_module")
     """
 
     def __init__(self, *args, **kwargs) -> None:
@@ -46,6 +52,7 @@ class Registry(dict):
 
         super(Registry, self).__init__(*args, **kwargs)
         self.__trace__ = dict()
+        self._lazy_loaders = []
 
     def register(
             self,
@@ -88,6 +95,69 @@ class Registry(dict):
 
         return register_fn
 
+    def register_lazy_loader(self, loader: Callable[[], None]) -> None:
+        """
+        Overview:
+            Register a loader which fills this registry when it is called, such as importing all the submodules of \
+            a lazily imported package. Pending loaders are called (at most once each) on the first access to or \
+            membership check of a module name that is not registered yet, or on listing the module names, so that \
+            registry entries resolve on the first ``get`` (or ``in`` , ``keys``) rather than at package import time.
+        Arguments:
+            - loader (:obj:`Callable[[], None]`): The loader function without arguments.
+        """
+
+        self._lazy_loaders.append(loader)
+
+    def __missing__(self, module_name: str) -> Callable:
+        """
+        Overview:
+            Called by ``__getitem__`` when ``module_name`` is not registered, run the pending lazy loaders and \
+            retry, raise ``KeyError`` if it is still not found.
+        Arguments:
+            - module_name (:obj:`str`): The name of the module.
+        """
+
+        if self._load_until(module_name):
+            return dict.__getitem__(self, module_name)
+        raise KeyError(module_name)
+
+    def __contains__(self, module_name: str) -> bool:
+        """
+        Overview:
+            Whether ``module_name`` is registered, the pending lazy loaders are called if it is not found.
+        Arguments:
+            - module_name (:obj:`str`): The name of the module.
+        """
+
+        return dict.__contains__(self, module_name) or self._load_until(module_name)
+
+    def keys(self) -> Iterable:
+        """
+        Overview:
+            All registered module names, the pending lazy loaders are called first.
+        """
+
+        self._load_until(None)
+        return dict.keys(self)
+
+    def _load_until(self, module_name: Optional[str]) -> bool:
+        """
+        Overview:
+            Call the pending lazy loaders in order until ``module_name`` is registered, or call all of them if \
+            ``module_name`` is None.
+        Arguments:
+            - module_name (:obj:`Optional[str]`): The name of the module.
+        Returns:
+            - found (:obj:`bool`): Whether ``module_name`` is registered after loading.
+        """
+
+        while self._lazy_loaders:
+            loader = self._lazy_loaders.pop(0)
+            loader()
+            if module_name is not None and dict.__contains__(self, module_name):
+                return True
+        return module_name is not None and dict.__contains__(self, module_name)
+
     @staticmethod
     def _register_generic(module_dict: dict, module_name: str, module: Callable, force_overwrite: bool = False) -> None:
         """
@@ -101,7 +171,8 @@ class Registry(dict):
         """
 
         if not force_overwrite:
-            assert module_name not in module_dict, module_name
+            # don't trigger the lazy loaders of registry, which may be registering modules right now
+            assert not dict.__contains__(module_dict, module_name), module_name
         module_dict[module_name] = module
 
     def get(self, module_name: str) -> Callable:
@@ -146,7 +217,7 @@ class Registry(dict):
     def query(self) -> Iterable:
         """
         Overview:
-            all registered module names.
+            all registered module names, the pending lazy loaders are called first.
         """
 
         return self.keys()
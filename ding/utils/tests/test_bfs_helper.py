@@ -2,25 +2,71 @@ import easydict
 import numpy
 import pytest
 
-from ding.utils import get_vi_sequence
+from ding.utils import get_vi_sequence, get_vi_map
+from ding.utils.data.dataset import load_bfs_datasets
 from dizoo.maze.envs.maze_env import Maze
 
 
+def load_env(seed):
+    ccc = easydict.EasyDict({'size': 16})
+    e = Maze(ccc)
+    e.seed(seed)
+    e.reset()
+    return e
+
+
 @pytest.mark.unittest
 class TestBFSHelper:
 
     def test_bfs(self):
-
-        def load_env(seed):
-            ccc = easydict.EasyDict({'size': 16})
-            e = Maze(ccc)
-            e.seed(seed)
-            e.reset()
-            return e
-
         env = load_env(314)
         start_obs = env.process_states(env._get_obs(), env.get_maze_map())
         vi_sequence, track_back = get_vi_sequence(env, start_obs)
         assert vi_sequence.shape[1:] == (16, 16)
         assert track_back[0][0].shape == (16, 16, 3)
         assert isinstance(track_back[0][1], numpy.int32)
+        # BFS stops at the iteration which finds the start point
+        assert vi_sequence.shape[0] == len(track_back)
+
+    def test_vi_map(self):
+        wall = numpy.array([
+            [0, 0, 0, 0],
+            [0, 1, 1, 0],
+            [0, 0, 1, 0],
+            [1, 0, 1, 0],
+        ], dtype=bool)
+        dist, action = get_vi_map(wall, (0, 0))
+        assert dist.tolist() == [
+            [0, 1, 2, 3],
+            [1, -1, -1, 4],
+            [2, 3, -1, 5],
+            [-1, 4, -1, 6],
+        ]
+        # the action to move back to the target, 0: x + 1, 1: y + 1, 2: x - 1, 3: y - 1
+        assert action.tolist() == [
+            [4, 3, 3, 3],
+            [2, 4, 4, 2],
+            [2, 3, 4, 2],
+            [4, 2, 4, 2],
+        ]
+
+        env = load_env(0)
+        wall = numpy.array([[c == 'x' for c in row] for row in env.nav_map])
+        dist, action = get_vi_map(wall, env.target_location)
+        assert (dist[wall] == -1).all() and (action[wall] == 4).all()
+        # each cell is one step farther than the cell which the optimal action leads to
+        moves = numpy.array([[1, 0], [0, 1], [-1, 0], [0, -1]])
+        xs, ys = numpy.nonzero(dist > 0)
+        next_xy = numpy.stack([xs, ys], axis=-1) + moves[action[xs, ys]]
+        assert (dist[next_xy[:, 0], next_xy[:, 1]] == dist[xs, ys] - 1).all()
+
+    def test_load_bfs_datasets(self):
+        train_data, test_data = load_bfs_datasets(train_seeds=2, test_seeds=1)
+        data = train_data[0]
+        assert data['obs'].shape == (16, 16, 3)
+        assert data['bfs_in'].shape == data['bfs_out'].shape == (16, 16)
+        # the first BFS iteration of each point starts from the empty map
+        assert (data['bfs_in'] == 4).all()
+        parallel_train_data, parallel_test_data = load_bfs_datasets(train_seeds=2, test_seeds=1, num_workers=2)
+        for d1, d2 in zip(train_data._data + test_data._data, parallel_train_data._data + parallel_test_data._data):
+            assert (d1 == d2).all()
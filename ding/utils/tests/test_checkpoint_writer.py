@@ -0,0 +1,107 @@
+import os
+import shutil
+import time
+import pytest
+import torch
+import torch.nn as nn
+
+from ding.utils import AsyncCheckpointWriter, load_checkpoint, read_file
+
+
+def get_state_dict(model, optimizer, step):
+    return {'model': model.state_dict(), 'optimizer': optimizer.state_dict(), 'last_iter': step, 'name': 'test'}
+
+
+@pytest.mark.unittest
+class TestAsyncCheckpointWriter:
+
+    def test_save(self):
+        save_dir = './test_async_ckpt_writer'
+        model = nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 4))
+        optimizer = torch.optim.Adam(model.parameters())
+        model(torch.randn(3, 8)).sum().backward()
+        optimizer.step()
+        writer = AsyncCheckpointWriter(max_to_keep=2)
+        try:
+            for i in range(4):
+                path = os.path.join(save_dir, 'iteration_{}.pth.tar'.format(i))
+                expected = {k: v.clone() for k, v in model.state_dict().items()}
+                writer.save(path, get_state_dict(model, optimizer, i), rotate=True)
+                # the snapshot is not affected by the following in-place update
+                with torch.no_grad():
+                    for p in model.parameters():
+                        p.add_(1.)
+            writer.save(os.path.join(save_dir, 'final.pth.tar'), get_state_dict(model, optimizer, 4))
+            writer.wait()
+            assert not writer.pending
+            # only the latest 2 rotating checkpoints are kept, and no temporary file is left
+            assert sorted(os.listdir(save_dir)) == ['final.pth.tar', 'iteration_2.pth.tar', 'iteration_3.pth.tar']
+            data = read_file(os.path.join(save_dir, 'iteration_3.pth.tar'))
+            assert data['last_iter'] == 3 and data['name'] == 'test'
+            assert all(torch.equal(v, expected[k]) for k, v in data['model'].items())
+            assert data['optimizer']['param_groups'] == optimizer.state_dict()['param_groups']
+            model.load_state_dict(data['model'])
+        finally:
+            writer.close()
+            shutil.rmtree(save_dir, ignore_errors=True)
+
+    def test_shard(self):
+        save_dir = './test_async_ckpt_writer_shard'
+        model = nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 4))
+        optimizer = torch.optim.Adam(model.parameters())
+        model(torch.randn(3, 8)).sum().backward()
+        optimizer.step()
+        writer = AsyncCheckpointWriter(max_to_keep=1, shard_num=3)
+        try:
+            for i in range(2):
+                writer.save(
+                    os.path.join(save_dir, 'iteration_{}.pth.tar'.format(i)),
+                    get_state_dict(model, optimizer, i),
+                    rotate=True
+                )
+            writer.close()
+            shard_files = ['iteration_1.pth.tar.shard{}'.format(i) for i in range(3)]
+            assert sorted(os.listdir(save_dir)) == ['iteration_1.pth.tar'] + shard_files
+            data = load_checkpoint(os.path.join(save_dir, 'iteration_1.pth.tar'))
+            assert data['last_iter'] == 1
+            state_dict = model.state_dict()
+            assert all(torch.equal(v, state_dict[k]) for k, v in data['model'].items())
+            model.load_state_dict(data['model'])
+            optimizer.load_state_dict(data['optimizer'])
+        finally:
+            writer.close()
+            shutil.rmtree(save_dir, ignore_errors=True)
+
+    def test_error(self):
+        writer = AsyncCheckpointWriter()
+        # the background error is raised in the next call
+        writer.save('./test_async_ckpt_writer_error/a/b.pth.tar', {'x': lambda x: x})
+        with pytest.raises(Exception):
+            writer.wait()
+        writer.close()
+        shutil.rmtree('./test_async_ckpt_writer_error', ignore_errors=True)
+
+
+@pytest.mark.benchmark
+def test_async_checkpoint_writer_benchmark():
+    save_dir = './test_async_ckpt_writer_benchmark'
+    model = nn.Sequential(*[nn.Linear(1024, 1024) for _ in range(32)])
+    optimizer = torch.optim.Adam(model.parameters())
+    model(torch.randn(2, 1024)).sum().backward()
+    optimizer.step()
+    os.makedirs(save_dir, exist_ok=True)
+    try:
+        start = time.time()
+        torch.save(get_state_dict(model, optimizer, 0), os.path.join(save_dir, 'sync.pth.tar'))
+        sync_time = time.time() - start
+        writer = AsyncCheckpointWriter()
+        writer.save(os.path.join(save_dir, 'warmup.pth.tar'), get_state_dict(model, optimizer, 0))
+        writer.wait()
+        start = time.time()
+        writer.save(os.path.join(save_dir, 'async.pth.tar'), get_state_dict(model, optimizer, 0))
+        pause_time = time.time() - start
+        writer.close()
+        print('sync save: {:.3f}s, async save pause: {:.3f}s'.format(sync_time, pause_time))
+        assert pause_time < sync_time
+    finally:
+        shutil.rmtree(save_dir, ignore_errors=True)
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from ding.utils.lazy_import_helper import lazy_import_attrs
+
+# a cold ``import ding`` (including the lazy ``ding.utils``, ``ding.policy`` and ``ding.envs`` packages) should not
+# import any heavy dependency, the budget is loose enough for slow CI machines
+COLD_IMPORT_TIME_BUDGET = 2.0
+
+
+@pytest.mark.unittest
+def test_lazy_import_attrs():
+    getattr_fn, dir_fn, all_names, import_all_fn = lazy_import_attrs(
+        'ding.utils', {'.type_helper': ['SequenceType']}, star_submodules=['.design_helper']
+    )
+    assert all_names == ['SequenceType']
+    assert getattr_fn('SequenceType') is getattr(sys.modules['ding.utils.type_helper'], 'SequenceType')
+    assert getattr_fn('SingletonMetaclass') is getattr(sys.modules['ding.utils.design_helper'], 'SingletonMetaclass')
+    assert getattr_fn('slurm_helper') is sys.modules['ding.utils.slurm_helper']
+    assert 'SequenceType' in dir_fn()
+    with pytest.raises(AttributeError):
+        getattr_fn('not_exist_attr')
+    import_all_fn()
+
+
+@pytest.mark.unittest
+def test_lazy_registry():
+    from ding.policy import DQNPolicy
+    from ding.utils import POLICY_REGISTRY
+    assert POLICY_REGISTRY.get('dqn') is DQNPolicy
+    # registered in a policy module that is not accessed before
+    assert POLICY_REGISTRY.get('ppo').__name__ == 'PPOPolicy'
+    from ding.utils import ENV_MANAGER_REGISTRY
+    import ding.envs  # noqa
+    assert ENV_MANAGER_REGISTRY.get('base').__name__ == 'BaseEnvManager'
+
+
+@pytest.mark.unittest
+def test_cold_import_time():
+    code = 'import sys, ding, ding.utils, ding.policy, ding.envs; print("torch" in sys.modules)'
+    start = time.time()
+    output = subprocess.check_output([sys.executable, '-c', code])
+    duration = time.time() - start
+    print('cold import ding time: {:.3f}s'.format(duration))
+    assert output.decode().strip() == 'False'
+    assert duration < COLD_IMPORT_TIME_BUDGET, duration
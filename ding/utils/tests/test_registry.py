@@ -25,3 +25,34 @@ def test_registry():
 
     instance = TEST_REGISTRY.build('a')
     assert isinstance(instance, A2)
+
+
+@pytest.mark.unittest
+def test_registry_lazy_loader():
+    TEST_REGISTRY = Registry()
+    load_count = []
+
+    def loader():
+        load_count.append(1)
+
+        @TEST_REGISTRY.register('b')
+        class B:
+            pass
+
+    TEST_REGISTRY.register_lazy_loader(loader)
+    assert len(load_count) == 0
+    assert TEST_REGISTRY.get('b').__name__ == 'B'
+    assert isinstance(TEST_REGISTRY.build('b'), TEST_REGISTRY['b'])
+    assert len(load_count) == 1
+    with pytest.raises(KeyError):
+        TEST_REGISTRY.get('c')
+    assert len(load_count) == 1
+    assert list(TEST_REGISTRY.query()) == ['b']
+
+    # membership checks and key listing also call the pending loaders
+    for check in [lambda r: 'b' in r, lambda r: 'b' in r.keys()]:
+        TEST_REGISTRY, load_count = Registry(), []
+        TEST_REGISTRY.register_lazy_loader(loader)
+        assert check(TEST_REGISTRY)
+        assert 'c' not in TEST_REGISTRY
+        assert len(load_count) == 1
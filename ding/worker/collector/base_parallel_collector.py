@@ -227,15 +227,13 @@ class TickMonitor(LoggedModel):
     norm_env_time = LoggedValue(float)
 
     def __init__(self, time_: 'BaseTime', expire: Union[int, float]):  # noqa
-        LoggedModel.__init__(self, time_, expire)
+        LoggedModel.__init__(self, time_, expire, capacity=LoggedModel.tick_capacity(expire))
         self.__register()
 
     def __register(self):
 
         def __avg_func(prop_name: str) -> float:
-            records = self.range_values[prop_name]()
-            _list = [_value for (_begin_time, _end_time), _value in records]
-            return sum(_list) / len(_list) if len(_list) != 0 else 0
+            return self.window_stat(prop_name, 'mean')
 
         self.register_attribute_value('avg', 'policy_time', partial(__avg_func, prop_name='policy_time'))
         self.register_attribute_value('avg', 'env_time', partial(__avg_func, prop_name='env_time'))
@@ -7,7 +7,8 @@ from easydict import EasyDict
 import copy
 
 from ding.torch_utils import CountVar, auto_checkpoint, build_log_buffer
-from ding.utils import build_logger, EasyTimer, import_module, LEARNER_REGISTRY, get_rank, get_world_size
+from ding.utils import build_logger, EasyTimer, import_module, LEARNER_REGISTRY, get_rank, get_world_size, \
+    AsyncCheckpointWriter
 from ding.utils.autolog import LoggedValue, LoggedModel, TickTime
 from ding.utils.data import AsyncDataLoader
 from .learner_hook import build_learner_hook_by_cfg, add_learner_hook, merge_hooks, LearnerHook
@@ -22,7 +23,7 @@ class BaseLearner(object):
         train, call_hook, register_hook, save_checkpoint, start, setup_dataloader, close
     Property:
         learn_info, priority_info, last_iter, train_iter, rank, world_size, policy
-        monitor, log_buffer, logger, tb_logger, ckpt_name, exp_name, instance_name
+        monitor, log_buffer, logger, tb_logger, ckpt_name, exp_name, instance_name, checkpoint_writer
     """
 
     @classmethod
@@ -42,6 +43,14 @@ class BaseLearner(object):
             save_ckpt_after_iter=10000,
             save_ckpt_after_run=True,
         ),
+        # (bool) Whether to save checkpoints in a background thread, then training only pauses for the in-memory
+        # snapshot of checkpoint. Refer to ``AsyncCheckpointWriter`` for details.
+        async_ckpt=False,
+        # (int) The number of the latest iteration checkpoints to keep in async mode, None means keeping all.
+        max_ckpt_to_keep=None,
+        # (int) The number of shard files of each checkpoint written in parallel in async mode. The sharded
+        # checkpoint should be loaded by ``ding.utils.load_checkpoint``.
+        ckpt_shard_num=1,
     )
 
     _name = "BaseLearner"  # override this variable for sub-class learner
@@ -122,6 +131,13 @@ class BaseLearner(object):
         self._hooks = {'before_run': [], 'before_iter': [], 'after_iter': [], 'after_run': []}
         # Last iteration. Used to record current iter.
         self._last_iter = CountVar(init_val=0)
+        # Background checkpoint writer, only used in async checkpoint mode.
+        if self._cfg.get('async_ckpt', False) and self._rank == 0:
+            self._checkpoint_writer = AsyncCheckpointWriter(
+                self._cfg.get('max_ckpt_to_keep', None), self._cfg.get('ckpt_shard_num', 1)
+            )
+        else:
+            self._checkpoint_writer = None
 
         # Setup time wrapper and hook.
         self._setup_wrapper()
@@ -212,8 +228,12 @@ class BaseLearner(object):
         else:
             raise TypeError("not support type for log_vars: {}".format(type(log_vars)))
         if priority is not None:
-            replay_buffer_idx = [d.get('replay_buffer_idx', None) for d in data]
-            replay_unique_id = [d.get('replay_unique_id', None) for d in data]
+            if isinstance(data, dict):  # the batch has been stacked, e.g. the data sampled by ``sample_batch``
+                replay_buffer_idx = data.get('replay_buffer_idx', [None] * len(priority))
+                replay_unique_id = data.get('replay_unique_id', [None] * len(priority))
+            else:
+                replay_buffer_idx = [d.get('replay_buffer_idx', None) for d in data]
+                replay_unique_id = [d.get('replay_unique_id', None) for d in data]
             self.priority_info = {
                 'priority': priority,
                 'replay_buffer_idx': replay_buffer_idx,
@@ -310,6 +330,8 @@ class BaseLearner(object):
         self._end_flag = True
         if hasattr(self, '_dataloader'):
             self._dataloader.close()
+        if getattr(self, '_checkpoint_writer', None) is not None:
+            self._checkpoint_writer.close()
         if self._tb_logger:
             self._tb_logger.flush()
             self._tb_logger.close()
@@ -447,6 +469,10 @@ class BaseLearner(object):
     def priority_info(self, _priority_info: dict) -> None:
         self._priority_info = _priority_info
 
+    @property
+    def checkpoint_writer(self) -> Optional[AsyncCheckpointWriter]:
+        return self._checkpoint_writer
+
     @property
     def ckpt_name(self) -> str:
         return self._ckpt_name
@@ -493,19 +519,16 @@ class TickMonitor(LoggedModel):
     total_duration = LoggedValue(float)
 
     def __init__(self, time_: 'BaseTime', expire: Union[int, float]):  # noqa
-        LoggedModel.__init__(self, time_, expire)
+        LoggedModel.__init__(self, time_, expire, capacity=LoggedModel.tick_capacity(expire))
         self.__register()
 
     def __register(self):
 
         def __avg_func(prop_name: str) -> float:
-            records = self.range_values[prop_name]()
-            _list = [_value for (_begin_time, _end_time), _value in records]
-            return sum(_list) / len(_list) if len(_list) != 0 else 0
+            return self.window_stat(prop_name, 'mean')
 
         def __val_func(prop_name: str) -> float:
-            records = self.range_values[prop_name]()
-            return records[-1][1]
+            return self.window_values(prop_name)[-1].item()
 
         for k in getattr(self, '_LoggedModel__properties'):
             self.register_attribute_value('avg', k, partial(__avg_func, prop_name=k))
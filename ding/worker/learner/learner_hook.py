@@ -6,7 +6,7 @@ import torch
 from easydict import EasyDict
 
 import ding
-from ding.utils import allreduce, read_file, save_file, get_rank
+from ding.utils import allreduce, save_file, get_rank, load_checkpoint
 
 
 class Hook(ABC):
@@ -113,7 +113,7 @@ class LoadCkptHook(LearnerHook):
         path = self._load_path
         if path == '':  # not load
             return
-        state_dict = read_file(path)
+        state_dict = load_checkpoint(path)
         if 'last_iter' in state_dict:
             last_iter = state_dict.pop('last_iter')
             engine.last_iter.update(last_iter)
@@ -166,7 +166,12 @@ class SaveCkptHook(LearnerHook):
             path = os.path.join(dirname, ckpt_name)
             state_dict = engine.policy.state_dict()
             state_dict.update({'last_iter': engine.last_iter.val})
-            save_file(path, state_dict)
+            writer = getattr(engine, 'checkpoint_writer', None)
+            if writer is None:
+                save_file(path, state_dict)
+            else:
+                # only the iteration checkpoints are rotated, the named ones (e.g. ckpt_best.pth.tar) are kept
+                writer.save(path, state_dict, rotate=not engine.ckpt_name)
             engine.info('{} save ckpt in {}'.format(engine.instance_name, path))
 
 
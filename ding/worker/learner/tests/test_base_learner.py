@@ -1,5 +1,6 @@
 import os
 import time
+import shutil
 
 import pytest
 import torch
@@ -134,3 +135,19 @@ class TestBaseLearner:
         os.popen('rm -rf learner')
         os.popen('rm -rf log')
         learner.close()
+
+    def test_async_ckpt(self):
+        cfg = self._get_cfg('')
+        cfg.async_ckpt = True
+        cfg.max_ckpt_to_keep = 1
+        learner = FakeLearner(cfg, exp_name='exp_test_async_ckpt')
+        learner.policy = FakePolicy()
+        learner.setup_dataloader()
+        learner.start()
+        learner.save_checkpoint('ckpt_best.pth.tar')
+        learner.close()
+        dir_name = '{}/ckpt'.format(learner.exp_name)
+        # only the latest iteration ckpt is kept, the named ckpt is not rotated
+        assert sorted(os.listdir(dir_name)) == ['ckpt_best.pth.tar', 'iteration_10.pth.tar']
+        assert torch.load(dir_name + '/iteration_10.pth.tar', weights_only=False)['last_iter'] == 10
+        shutil.rmtree(learner.exp_name)
@@ -9,7 +9,8 @@ from ding.worker.replay_buffer import IBuffer
 from ding.utils import SumSegmentTree, MinSegmentTree, BUFFER_REGISTRY
 from ding.utils import LockContext, LockContextType, build_logger, get_rank
 from ding.utils.autolog import TickTime
-from .utils import UsedDataRemover, generate_id, SampledDataAttrMonitor, PeriodicThruputMonitor, ThruputController
+from .utils import UsedDataRemover, generate_id, SampledDataAttrMonitor, PeriodicThruputMonitor, ThruputController, \
+    copy_on_write_view, get_tensor_versions, copy_data, check_tensor_versions
 
 
 def to_positive_index(idx: Union[int, None], size: int) -> int:
@@ -55,6 +56,12 @@ class AdvancedReplayBuffer(IBuffer):
         enable_track_used_data=False,
         # Whether to deepcopy data when willing to insert and sample data. For security purpose.
         deepcopy=False,
+        # Whether to store and sample the copy-on-write views of data, a cheaper alternative of ``deepcopy``, refer to
+        # ``copy_data`` in ``ding/worker/replay_buffer/utils.py`` for details.
+        copy_on_write=False,
+        # Whether to check that the tensors of data are not modified in-place after pushed into buffer (for debug),
+        # refer to ``check_tensor_versions`` in ``ding/worker/replay_buffer/utils.py`` for details.
+        check_mutation=False,
         thruput_controller=dict(
             # Rate limit. The ratio of "Sample Count" to "Push Count" should be in [min, max] range.
             # If greater than max ratio, return `None` when calling ``sample```;
@@ -109,8 +116,13 @@ class AdvancedReplayBuffer(IBuffer):
         self._rank = get_rank()
         self._replay_buffer_size = self._cfg.replay_buffer_size
         self._deepcopy = self._cfg.deepcopy
+        self._copy_on_write = self._cfg.get('copy_on_write', False)
+        assert not (self._deepcopy and self._copy_on_write), "deepcopy and copy_on_write can't be used together"
+        self._check_mutation = self._cfg.get('check_mutation', False)
         # ``_data`` is a circular queue to store data (full data or meta data)
         self._data = [None for _ in range(self._replay_buffer_size)]
+        # The tensor versions of the data at each position when it is pushed, used to check in-place modification.
+        self._data_version = [None for _ in range(self._replay_buffer_size)]
         # Current valid data count, indicating how many elements in ``self._data`` is valid.
         self._valid_count = 0
         # How many pieces of data have been pushed into this buffer, should be no less than ``_valid_count``.
@@ -126,8 +138,11 @@ class AdvancedReplayBuffer(IBuffer):
         # filled with data head would always be 0, so ``head`` may be not equal to ``tail``;
         # Otherwise, they two should be the same. Head is used to optimize staleness check in ``_sample_check``.
         self._head = 0
-        # use_count is {position_idx: use_count}
-        self._use_count = {idx: 0 for idx in range(self._cfg.replay_buffer_size)}
+        # Use count and collect iter of the data at each position, which are kept in numpy arrays (like the priority
+        # weights in the leaves of segment trees) so that the attributes of a sampled batch can be calculated in one
+        # vectorized pass. ``nan`` collect iter means that the data does not have key "collect_iter".
+        self._use_count = np.zeros(self._replay_buffer_size, dtype=np.int64)
+        self._collect_iter = np.full(self._replay_buffer_size, np.nan)
         # Max priority till now. Is used to initizalize a data's priority if "priority" is not passed in with the data.
         self._max_priority = 1.0
         # A small positive number to avoid edge-case, e.g. "priority" == 0.
@@ -258,18 +273,6 @@ class AdvancedReplayBuffer(IBuffer):
         with self._lock:
             indices = self._get_indices(size, sample_range)
             result = self._sample_with_indices(indices, cur_learner_iter)
-            # Deepcopy ``result``'s same indice datas in case ``self._get_indices`` may get datas with
-            # the same indices, i.e. the same datas would be sampled afterwards.
-            # if self._deepcopy==True -> all data is different
-            # if len(indices) == len(set(indices)) -> no duplicate data
-            if not self._deepcopy and len(indices) != len(set(indices)):
-                for i, index in enumerate(indices):
-                    tmp = []
-                    for j in range(i + 1, size):
-                        if index == indices[j]:
-                            tmp.append(j)
-                    for j in tmp:
-                        result[j] = copy.deepcopy(result[j])
             self._monitor_update_of_sample(result, cur_learner_iter)
             return result
 
@@ -363,10 +366,7 @@ class AdvancedReplayBuffer(IBuffer):
             - cur_collector_envstep (:obj:`int`): Collector's current env step, used to draw tensorboard.
         """
         with self._lock:
-            if self._deepcopy:
-                data = copy.deepcopy(ori_data)
-            else:
-                data = ori_data
+            data = copy_data(ori_data, self._deepcopy, self._copy_on_write)
             try:
                 assert self._data_check(data)
             except AssertionError:
@@ -381,7 +381,10 @@ class AdvancedReplayBuffer(IBuffer):
             data['replay_unique_id'] = generate_id(self._instance_name, self._next_unique_id)
             data['replay_buffer_idx'] = self._tail
             self._set_weight(data)
+            self._set_collect_iter(data)
             self._data[self._tail] = data
+            if self._check_mutation:
+                self._data_version[self._tail] = get_tensor_versions(data)
             self._valid_count += 1
             if self._rank == 0:
                 self._periodic_thruput_monitor.valid_count = self._valid_count
@@ -399,10 +402,7 @@ class AdvancedReplayBuffer(IBuffer):
             - cur_collector_envstep (:obj:`int`): Collector's current env step, used to draw tensorboard.
         """
         with self._lock:
-            if self._deepcopy:
-                data = copy.deepcopy(ori_data)
-            else:
-                data = ori_data
+            data = copy_data(ori_data, self._deepcopy, self._copy_on_write)
             check_result = [self._data_check(d) for d in data]
             # Only keep data items that pass ``_data_check`.
             valid_data = [d for d, flag in zip(data, check_result) if flag]
@@ -419,6 +419,7 @@ class AdvancedReplayBuffer(IBuffer):
                     valid_data[i]['replay_unique_id'] = generate_id(self._instance_name, self._next_unique_id + i)
                     valid_data[i]['replay_buffer_idx'] = (self._tail + i) % self._replay_buffer_size
                     self._set_weight(valid_data[i])
+                    self._set_collect_iter(valid_data[i])
                     self._push_count += 1
                 self._data[self._tail:self._tail + length] = valid_data
             else:
@@ -436,6 +437,7 @@ class AdvancedReplayBuffer(IBuffer):
                         valid_data[i]['replay_unique_id'] = generate_id(self._instance_name, self._next_unique_id + i)
                         valid_data[i]['replay_buffer_idx'] = (self._tail + i) % self._replay_buffer_size
                         self._set_weight(valid_data[i])
+                        self._set_collect_iter(valid_data[i])
                         self._push_count += 1
                     self._data[data_start:data_start + L] = valid_data[valid_data_start:valid_data_start + L]
                     residual_num -= L
@@ -444,6 +446,9 @@ class AdvancedReplayBuffer(IBuffer):
                     else:
                         data_start = 0
                         valid_data_start += L
+            if self._check_mutation:
+                for d in valid_data:
+                    self._data_version[d['replay_buffer_idx']] = get_tensor_versions(d)
             self._valid_count += len(valid_data)
             if self._rank == 0:
                 self._periodic_thruput_monitor.valid_count = self._valid_count
@@ -518,6 +523,19 @@ class AdvancedReplayBuffer(IBuffer):
         self._sum_tree[idx] = weight
         self._min_tree[idx] = weight
 
+    def _set_collect_iter(self, data: Dict) -> None:
+        r"""
+        Overview:
+            Record the collect iter of the input data, which is used to calculate its staleness.
+        Arguments:
+            - data (:obj:`Dict`): The data which is inserted into the buffer.
+        """
+        collect_iter = data.get('collect_iter', None)
+        if isinstance(collect_iter, list):
+            # Timestep transition's collect_iter is a list
+            collect_iter = min(collect_iter)
+        self._collect_iter[data['replay_buffer_idx']] = np.nan if collect_iter is None else collect_iter
+
     def _data_check(self, d: Any) -> bool:
         r"""
         Overview:
@@ -586,42 +604,60 @@ class AdvancedReplayBuffer(IBuffer):
             self._sum_tree[idx] = self._sum_tree.neutral_element
             self._min_tree[idx] = self._min_tree.neutral_element
             self._use_count[idx] = 0
+            self._collect_iter[idx] = np.nan
 
     def _sample_with_indices(self, indices: List[int], cur_learner_iter: int) -> list:
         r"""
         Overview:
-            Sample data with ``indices``; Remove a data item if it is used for too many times.
+            Sample data with ``indices``; Remove a data item if it is used for too many times. The use count, \
+            staleness and IS weight of the whole batch are calculated in one vectorized pass.
         Arguments:
             - indices (:obj:`List[int]`): A list including all the sample indices.
             - cur_learner_iter (:obj:`int`): Learner's current iteration, used to calculate staleness.
         Returns:
             - data (:obj:`list`) Sampled data.
         """
-        # Calculate max weight for normalizing IS
+        indices = np.asarray(indices, dtype=np.int64)
+        # The k-th occurrence (starting from 0) of each index in ``indices``, which is used to count the use of
+        # the data sampled several times in this batch.
+        order = np.argsort(indices, kind='stable')
+        unique_indices, first, counts = np.unique(indices[order], return_index=True, return_counts=True)
+        occurrence = np.empty_like(indices)
+        occurrence[order] = np.arange(len(indices)) - np.repeat(first, counts)
+        use = self._use_count[indices] + occurrence + 1
+        self._use_count[unique_indices] += counts
+        # Calculate IS(importance sampling weight for gradient step), normalized by the max weight
         sum_tree_root = self._sum_tree.reduce()
         p_min = self._min_tree.reduce() / sum_tree_root
         max_weight = (self._valid_count * p_min) ** (-self._beta)
+        p_sample = self._sum_tree.value[indices + self._sum_tree.capacity] / sum_tree_root
+        weight = (self._valid_count * p_sample) ** (-self._beta) / max_weight
+        staleness = self._calculate_staleness_batch(indices, cur_learner_iter)
+
         data = []
-        for idx in indices:
+        # Store staleness, use and IS for monitor and outer use
+        for idx, k, u, s, w in zip(indices.tolist(), occurrence.tolist(), use.tolist(), staleness.tolist(),
+                                   weight.tolist()):
             assert self._data[idx] is not None
             assert self._data[idx]['replay_buffer_idx'] == idx, (self._data[idx]['replay_buffer_idx'], idx)
+            if self._check_mutation:
+                check_tensor_versions(self._data[idx], self._data_version[idx], idx)
             if self._deepcopy:
                 copy_data = copy.deepcopy(self._data[idx])
+            elif self._copy_on_write or k > 0:
+                # If the same data is sampled more than once, the later ones are copy-on-write views of it, so that
+                # the keys set on one sample do not overwrite the other ones.
+                copy_data = copy_on_write_view(self._data[idx], freeze=self._copy_on_write)
             else:
                 copy_data = self._data[idx]
-            # Store staleness, use and IS(importance sampling weight for gradient step) for monitor and outer use
-            self._use_count[idx] += 1
-            copy_data['staleness'] = self._calculate_staleness(idx, cur_learner_iter)
-            copy_data['use'] = self._use_count[idx]
-            p_sample = self._sum_tree[idx] / sum_tree_root
-            weight = (self._valid_count * p_sample) ** (-self._beta)
-            copy_data['IS'] = weight / max_weight
+            copy_data['staleness'] = s
+            copy_data['use'] = u
+            copy_data['IS'] = w
             data.append(copy_data)
         if self._max_use != float("inf"):
             # Remove datas whose "use count" is greater than ``max_use``
-            for idx in indices:
-                if self._use_count[idx] >= self._max_use:
-                    self._remove(idx, use_too_many_times=True)
+            for idx in unique_indices[self._use_count[unique_indices] >= self._max_use].tolist():
+                self._remove(idx, use_too_many_times=True)
         # Beta annealing
         if self._anneal_step != 0:
             self._beta = min(1.0, self._beta + self._beta_anneal_step)
@@ -711,15 +747,23 @@ class AdvancedReplayBuffer(IBuffer):
         if self._data[pos_index] is None:
             raise ValueError("Prioritized's data at index {} is None".format(pos_index))
         else:
-            # Calculate staleness, remove it if too stale
-            collect_iter = self._data[pos_index].get('collect_iter', cur_learner_iter + 1)
-            if isinstance(collect_iter, list):
-                # Timestep transition's collect_iter is a list
-                collect_iter = min(collect_iter)
-            # ``staleness`` might be -1, means invalid, e.g. collector does not report collecting model iter,
-            # or it is a demonstration buffer(which means data is not generated by collector) etc.
-            staleness = cur_learner_iter - collect_iter
-            return staleness
+            return self._calculate_staleness_batch(np.array([pos_index]), cur_learner_iter).item()
+
+    def _calculate_staleness_batch(self, indices: np.ndarray, cur_learner_iter: int) -> np.ndarray:
+        r"""
+        Overview:
+            Calculate the staleness of the data at ``indices`` from the recorded collect iters.
+        Arguments:
+            - indices (:obj:`np.ndarray`): The position indices of valid data.
+            - cur_learner_iter (:obj:`int`): Learner's current iteration, used to calculate staleness.
+        Returns:
+            - staleness (:obj:`np.ndarray`): The int64 staleness array, whose shape is the same as ``indices``.
+        """
+        collect_iter = self._collect_iter[indices]
+        # ``staleness`` might be -1, means invalid, e.g. collector does not report collecting model iter,
+        # or it is a demonstration buffer(which means data is not generated by collector) etc.
+        collect_iter = np.where(np.isnan(collect_iter), cur_learner_iter + 1, collect_iter)
+        return (cur_learner_iter - collect_iter).astype(np.int64)
 
     def count(self) -> int:
         """
@@ -749,6 +793,7 @@ class AdvancedReplayBuffer(IBuffer):
         return {
             'data': self._data,
             'use_count': self._use_count,
+            'collect_iter': self._collect_iter,
             'tail': self._tail,
             'max_priority': self._max_priority,
             'anneal_step': self._anneal_step,
@@ -777,6 +822,16 @@ class AdvancedReplayBuffer(IBuffer):
                     setattr(self, '_{}'.format(k), copy.deepcopy(v))
                 else:
                     setattr(self, '_{}'.format(k), v)
+            if isinstance(self._use_count, dict):
+                # The state dict of the older version, whose use count is a dict
+                self._use_count = np.array(
+                    [self._use_count.get(i, 0) for i in range(self._replay_buffer_size)], dtype=np.int64
+                )
+            if 'collect_iter' not in _state_dict:
+                self._collect_iter = np.full(self._replay_buffer_size, np.nan)
+                for data in self._data:
+                    if data is not None:
+                        self._set_collect_iter(data)
 
     @property
     def replay_buffer_size(self) -> int:
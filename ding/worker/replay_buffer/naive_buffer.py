@@ -1,5 +1,4 @@
 import os
-import copy
 from typing import Union, Any, Optional, List
 import numpy as np
 import math
@@ -8,7 +7,7 @@ from easydict import EasyDict
 
 from ding.worker.replay_buffer import IBuffer
 from ding.utils import LockContext, LockContextType, BUFFER_REGISTRY, build_logger
-from .utils import UsedDataRemover, PeriodicThruputMonitor
+from .utils import UsedDataRemover, PeriodicThruputMonitor, get_tensor_versions, copy_data, check_tensor_versions
 
 
 @BUFFER_REGISTRY.register('naive')
@@ -29,6 +28,12 @@ class NaiveReplayBuffer(IBuffer):
         type='naive',
         replay_buffer_size=10000,
         deepcopy=False,
+        # Whether to store and sample the copy-on-write views of data, a cheaper alternative of ``deepcopy``, refer to
+        # ``copy_data`` in ``ding/worker/replay_buffer/utils.py`` for details.
+        copy_on_write=False,
+        # Whether to check that the tensors of data are not modified in-place after pushed into buffer (for debug),
+        # refer to ``check_tensor_versions`` in ``ding/worker/replay_buffer/utils.py`` for details.
+        check_mutation=False,
         # default `False` for serial pipeline
         enable_track_used_data=False,
         periodic_thruput_seconds=60,
@@ -55,8 +60,13 @@ class NaiveReplayBuffer(IBuffer):
         self._cfg = cfg
         self._replay_buffer_size = self._cfg.replay_buffer_size
         self._deepcopy = self._cfg.deepcopy
+        self._copy_on_write = self._cfg.get('copy_on_write', False)
+        assert not (self._deepcopy and self._copy_on_write), "deepcopy and copy_on_write can't be used together"
+        self._check_mutation = self._cfg.get('check_mutation', False)
         # ``_data`` is a circular queue to store data (full data or meta data)
         self._data = [None for _ in range(self._replay_buffer_size)]
+        # The tensor versions of the data at each position when it is pushed, used to check in-place modification.
+        self._data_version = [None for _ in range(self._replay_buffer_size)]
         # Current valid data count, indicating how many elements in ``self._data`` is valid.
         self._valid_count = 0
         # How many pieces of data have been pushed into this buffer, should be no less than ``_valid_count``.
@@ -167,10 +177,7 @@ class NaiveReplayBuffer(IBuffer):
             - cur_collector_envstep (:obj:`int`): Not used in this method, but preserved for compatibility.
         """
         with self._lock:
-            if self._deepcopy:
-                data = copy.deepcopy(ori_data)
-            else:
-                data = ori_data
+            data = copy_data(ori_data, self._deepcopy, self._copy_on_write)
             self._push_count += 1
             if self._data[self._tail] is None:
                 self._valid_count += 1
@@ -178,6 +185,8 @@ class NaiveReplayBuffer(IBuffer):
             elif self._enable_track_used_data:
                 self._used_data_remover.add_used_data(self._data[self._tail])
             self._data[self._tail] = data
+            if self._check_mutation:
+                self._data_version[self._tail] = get_tensor_versions(data)
             self._tail = (self._tail + 1) % self._replay_buffer_size
 
     def _extend(self, ori_data: List[Any], cur_collector_envstep: int = -1) -> None:
@@ -190,10 +199,7 @@ class NaiveReplayBuffer(IBuffer):
             - cur_collector_envstep (:obj:`int`): Not used in this method, but preserved for compatibility.
         """
         with self._lock:
-            if self._deepcopy:
-                data = copy.deepcopy(ori_data)
-            else:
-                data = ori_data
+            data = copy_data(ori_data, self._deepcopy, self._copy_on_write)
             length = len(data)
             # When updating ``_data`` and ``_use_count``, should consider two cases regarding
             # the relationship between "tail + data length" and "replay buffer size" to check whether
@@ -229,6 +235,9 @@ class NaiveReplayBuffer(IBuffer):
                     else:
                         new_tail = 0
                         data_start += L
+            if self._check_mutation:
+                for i in range(length):
+                    self._data_version[(self._tail + i) % self._replay_buffer_size] = get_tensor_versions(data[i])
             # Update ``tail`` and ``next_unique_id`` after the whole list is pushed into buffer.
             self._tail = (self._tail + length) % self._replay_buffer_size
 
@@ -324,11 +333,9 @@ class NaiveReplayBuffer(IBuffer):
         data = []
         for idx in indices:
             assert self._data[idx] is not None, idx
-            if self._deepcopy:
-                copy_data = copy.deepcopy(self._data[idx])
-            else:
-                copy_data = self._data[idx]
-            data.append(copy_data)
+            if self._check_mutation:
+                check_tensor_versions(self._data[idx], self._data_version[idx], idx)
+            data.append(copy_data(self._data[idx], self._deepcopy, self._copy_on_write))
         return data
 
     def count(self) -> int:
@@ -396,6 +403,12 @@ class ElasticReplayBuffer(NaiveReplayBuffer):
         type='elastic',
         replay_buffer_size=10000,
         deepcopy=False,
+        # Whether to store and sample the copy-on-write views of data, a cheaper alternative of ``deepcopy``, refer to
+        # ``copy_data`` in ``ding/worker/replay_buffer/utils.py`` for details.
+        copy_on_write=False,
+        # Whether to check that the tensors of data are not modified in-place after pushed into buffer (for debug),
+        # refer to ``check_tensor_versions`` in ``ding/worker/replay_buffer/utils.py`` for details.
+        check_mutation=False,
         # default `False` for serial pipeline
         enable_track_used_data=False,
         periodic_thruput_seconds=60,
@@ -557,9 +570,8 @@ class SequenceReplayBuffer(NaiveReplayBuffer):
         data = []
         for idx in indices:
             assert self._data[idx] is not None, idx
-            if self._deepcopy:
-                copy_data = copy.deepcopy(self._data[idx:idx + sequence])
-            else:
-                copy_data = self._data[idx:idx + sequence]
-            data.append(copy_data)
+            for i in range(idx, min(idx + sequence, self._replay_buffer_size)):
+                if self._check_mutation:
+                    check_tensor_versions(self._data[i], self._data_version[i], i)
+            data.append(copy_data(self._data[idx:idx + sequence], self._deepcopy, self._copy_on_write))
         return data
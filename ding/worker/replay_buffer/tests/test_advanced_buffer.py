@@ -2,6 +2,7 @@ import copy
 from collections import defaultdict
 import numpy as np
 import pytest
+import torch
 from easydict import EasyDict
 import os
 import pickle
@@ -163,6 +164,63 @@ class TestAdvancedBuffer:
         batch = advanced_buffer.sample(10, 0, sample_range=slice(-20, -2))
         assert len(batch) == 10
 
+    def test_sample_with_indices(self):
+        buffer_cfg = deep_merge_dicts(
+            AdvancedReplayBuffer.default_config(), EasyDict(dict(replay_buffer_size=16, max_use=3))
+        )
+        advanced_buffer = AdvancedReplayBuffer(buffer_cfg, tb_logger=None, instance_name='test')
+        data = generate_data_list(16)
+        for i, d in enumerate(data):
+            if i % 3 == 1:
+                d['collect_iter'] = i
+            elif i % 3 == 2:
+                d['collect_iter'] = [i + 1, i]
+        advanced_buffer.push(data, 0)
+        indices = [3, 5, 3, 7, 3, 4]
+        sum_tree_root = advanced_buffer._sum_tree.reduce()
+        p_min = advanced_buffer._min_tree.reduce() / sum_tree_root
+        max_weight = (16 * p_min) ** (-advanced_buffer.beta)
+        expected_is = [
+            (16 * advanced_buffer._sum_tree[i] / sum_tree_root) ** (-advanced_buffer.beta) / max_weight for i in indices
+        ]
+        batch = advanced_buffer._sample_with_indices(indices, 10)
+        assert [b['replay_buffer_idx'] for b in batch] == indices
+        assert np.allclose([b['IS'] for b in batch], expected_is)
+        assert [b['staleness'] for b in batch] == [-1, 5, -1, 3, -1, 6]
+        # the use of each occurrence, and the data sampled for max use times is removed
+        assert [b['use'] for b in batch] == [1, 1, 2, 1, 3, 1]
+        assert advanced_buffer._data[3] is None and advanced_buffer.count() == 15
+        assert advanced_buffer._use_count[3] == 0 and advanced_buffer._use_count[5] == 1
+        # the duplicated samples are different dicts sharing the same values
+        assert batch[0] is not batch[2] and batch[0]['obs'] is batch[2]['obs']
+
+        state_dict = advanced_buffer.state_dict()
+        state_dict.pop('collect_iter')
+        state_dict['use_count'] = {i: int(v) for i, v in enumerate(state_dict['use_count'])}
+        new_buffer = AdvancedReplayBuffer(buffer_cfg, tb_logger=None, instance_name='test_new')
+        new_buffer.load_state_dict(state_dict, deepcopy=True)
+        assert new_buffer._use_count[5] == 1
+        assert new_buffer._calculate_staleness(5, 10) == 5
+
+    def test_copy_on_write(self):
+        buffer_cfg = deep_merge_dicts(
+            AdvancedReplayBuffer.default_config(),
+            EasyDict(dict(replay_buffer_size=8, copy_on_write=True, check_mutation=True))
+        )
+        advanced_buffer = AdvancedReplayBuffer(buffer_cfg, tb_logger=None, instance_name='test')
+        data = [{'obs': np.zeros(4), 'action': torch.zeros(2)} for _ in range(8)]
+        advanced_buffer.push(data, 0)
+        # the keys added by buffer are not set in the original data
+        assert all(['replay_unique_id' not in d for d in data])
+        batch = advanced_buffer.sample(8, 0)
+        assert all([b is not advanced_buffer._data[b['replay_buffer_idx']] for b in batch])
+        assert all(['IS' not in d for d in advanced_buffer._data])
+        with pytest.raises(ValueError):
+            batch[0]['obs'] += 1
+        batch[0]['action'].add_(1)
+        with pytest.raises(RuntimeError):
+            advanced_buffer.sample(8, 0)
+
     def test_head_tail(self):
         buffer_cfg = deep_merge_dicts(
             AdvancedReplayBuffer.default_config(), EasyDict(dict(replay_buffer_size=64, max_use=4))
@@ -1,5 +1,7 @@
 import pytest
 from easydict import EasyDict
+import numpy as np
+import torch
 import os
 import time
 import tempfile
@@ -81,6 +83,31 @@ class TestNaiveBuffer:
         naive_buffer.clear()
         assert naive_buffer.count() == 0
 
+    def test_copy_on_write(self):
+        buffer_cfg = deep_merge_dicts(
+            NaiveReplayBuffer.default_config(),
+            EasyDict(dict(replay_buffer_size=8, copy_on_write=True, check_mutation=True))
+        )
+        naive_buffer = NaiveReplayBuffer(buffer_cfg, instance_name='test')
+        data = [{'obs': np.zeros(4), 'action': torch.zeros(2), 'info': {'id': i}} for i in range(8)]
+        naive_buffer.push(data, 0)
+        batch = naive_buffer.sample(8, 0)
+        # the containers are copied and the values are shared
+        assert all([b is not d and b['info'] is not d['info'] for b, d in zip(batch, naive_buffer._data)])
+        assert all([np.shares_memory(b['obs'], data[b['info']['id']]['obs']) for b in batch])
+        batch[0]['info']['id'] = -1
+        batch[0].pop('action')
+        assert all([d['info']['id'] >= 0 and 'action' in d for d in naive_buffer._data])
+        # numpy arrays are read-only, and the in-place modification of tensors is detected in the next sample
+        with pytest.raises(ValueError):
+            batch[1]['obs'] += 1
+        batch[1]['action'] += 1
+        with pytest.raises(RuntimeError):
+            naive_buffer.sample(8, 0)
+
+        with pytest.raises(AssertionError):
+            NaiveReplayBuffer(deep_merge_dicts(buffer_cfg, EasyDict(deepcopy=True)), instance_name='test')
+
     @pytest.mark.used
     def test_track_used_data(self):
         buffer_cfg = deep_merge_dicts(
@@ -1,9 +1,12 @@
-from typing import Any
+from typing import Any, List, Optional
+import copy
 import time
 from queue import Queue
 from typing import Union, Tuple
 from threading import Thread
 from functools import partial
+import numpy as np
+import torch
 
 from ding.utils.autolog import LoggedValue, LoggedModel
 from ding.utils import LockContext, LockContextType, remove_file
@@ -21,6 +24,95 @@ def generate_id(name, data_id: int) -> str:
     return "{}_{}".format(name, str(data_id))
 
 
+def copy_on_write_view(data: Any, freeze: bool = False) -> Any:
+    """
+    Overview:
+        Build the copy-on-write view of data: the containers (dict, list and tuple) are copied while the other \
+        objects (e.g. arrays and tensors) are shared, so that setting or popping the keys of the view does not \
+        change the original data, and the cost is irrelevant to the size of arrays and tensors.
+    Arguments:
+        - data (:obj:`Any`): The original data.
+        - freeze (:obj:`bool`): Whether to replace the numpy arrays with their read-only views, then modifying \
+            them in-place raises an error rather than silently changing the shared data.
+    Returns:
+        - view (:obj:`Any`): The copy-on-write view of data.
+    """
+    if isinstance(data, dict):
+        view = copy.copy(data)
+        for k, v in data.items():
+            view[k] = copy_on_write_view(v, freeze)
+        return view
+    elif isinstance(data, list):
+        return [copy_on_write_view(v, freeze) for v in data]
+    elif isinstance(data, tuple):
+        view = [copy_on_write_view(v, freeze) for v in data]
+        return type(data)(*view) if hasattr(data, '_fields') else type(data)(view)
+    elif freeze and isinstance(data, np.ndarray) and data.flags.writeable:
+        view = data.view()
+        view.flags.writeable = False
+        return view
+    return data
+
+
+def get_tensor_versions(data: Any) -> List[int]:
+    """
+    Overview:
+        Get the version counters of all the tensors in data, which are increased by every in-place modification.
+    Arguments:
+        - data (:obj:`Any`): The data, such as a transition dict.
+    Returns:
+        - versions (:obj:`List[int]`): The versions of tensors in the traversal order.
+    """
+    if isinstance(data, torch.Tensor):
+        return [data._version]
+    elif isinstance(data, dict):
+        return [v for item in data.values() for v in get_tensor_versions(item)]
+    elif isinstance(data, (list, tuple)):
+        return [v for item in data for v in get_tensor_versions(item)]
+    return []
+
+
+def copy_data(data: Any, deepcopy: bool = False, copy_on_write: bool = False) -> Any:
+    """
+    Overview:
+        Copy the data which is pushed into or sampled from buffer according to the ``deepcopy`` and \
+        ``copy_on_write`` config of buffer. The copy-on-write view is a cheaper alternative of deepcopy: only the \
+        containers (dict, list and tuple) are copied, i.e. setting or popping the keys of sampled data does not \
+        change the data in buffer, and the numpy arrays are set read-only to forbid in-place modification.
+    Arguments:
+        - data (:obj:`Any`): The data to be copied.
+        - deepcopy (:obj:`bool`): Whether to deepcopy the data.
+        - copy_on_write (:obj:`bool`): Whether to build the copy-on-write view of the data.
+    Returns:
+        - copy_data (:obj:`Any`): The deep copy or copy-on-write view of data, or data itself.
+    """
+    if deepcopy:
+        return copy.deepcopy(data)
+    elif copy_on_write:
+        return copy_on_write_view(data, freeze=True)
+    else:
+        return data
+
+
+def check_tensor_versions(data: Any, versions: Optional[List[int]], idx: int) -> None:
+    """
+    Overview:
+        Check that the tensors of the data in buffer are not modified in-place after pushed into buffer (e.g. by \
+        the data preprocess of policy, which also changes the following samples of this data), by comparing their \
+        version counters with the ones recorded by ``get_tensor_versions`` when the data was pushed. It is useful \
+        for debugging in-place modification when ``deepcopy`` is False.
+    Arguments:
+        - data (:obj:`Any`): The data in buffer.
+        - versions (:obj:`Optional[List[int]]`): The recorded tensor versions, None means not recorded.
+        - idx (:obj:`int`): The position index of data in buffer, which is shown in the error message.
+    """
+    if data is not None and versions is not None and get_tensor_versions(data) != versions:
+        raise RuntimeError(
+            'The tensors of data at buffer index {} are modified in-place after pushed into buffer, please '
+            'copy them before modification or enable deepcopy in buffer config'.format(idx)
+        )
+
+
 class UsedDataRemover:
     """
     Overview:
@@ -92,25 +184,19 @@ class SampledDataAttrMonitor(LoggedModel):
     staleness_avg = LoggedValue(float)
 
     def __init__(self, time_: 'BaseTime', expire: Union[int, float]):  # noqa
-        LoggedModel.__init__(self, time_, expire)
+        LoggedModel.__init__(self, time_, expire, capacity=LoggedModel.tick_capacity(expire))
         self.__register()
 
     def __register(self):
 
         def __avg_func(prop_name: str) -> float:
-            records = self.range_values[prop_name]()
-            _list = [_value for (_begin_time, _end_time), _value in records]
-            return sum(_list) / len(_list) if len(_list) != 0 else 0
+            return self.window_stat(prop_name, 'mean')
 
         def __max_func(prop_name: str) -> Union[float, int]:
-            records = self.range_values[prop_name]()
-            _list = [_value for (_begin_time, _end_time), _value in records]
-            return max(_list) if len(_list) != 0 else 0
+            return self.window_stat(prop_name, 'max')
 
         def __min_func(prop_name: str) -> Union[float, int]:
-            records = self.range_values[prop_name]()
-            _list = [_value for (_begin_time, _end_time), _value in records]
-            return min(_list) if len(_list) != 0 else 0
+            return self.window_stat(prop_name, 'min')
 
         self.register_attribute_value('avg', 'use', partial(__avg_func, prop_name='use_avg'))
         self.register_attribute_value('max', 'use', partial(__max_func, prop_name='use_max'))
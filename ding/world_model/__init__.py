@@ -1,2 +1,3 @@
 from .base_world_model import WorldModel, DynaWorldModel, DreamWorldModel, HybridWorldModel, \
     get_world_model_cls, create_world_model
+from .model_rollout import ModelRolloutBuffer, ModelRolloutEngine
@@ -9,6 +9,7 @@ from easydict import EasyDict
 from ding.worker import IBuffer
 from ding.envs import BaseEnv
 from ding.utils import deep_merge_dicts
+from ding.utils.data import default_collate
 from ding.world_model.utils import get_rollout_length_scheduler
 
 from ding.utils import import_module, WORLD_MODEL_REGISTRY
@@ -176,7 +177,9 @@ class DynaWorldModel(WorldModel, ABC):
         r"""
         Overview:
             Sample from the combination of environment buffer and imagination buffer with\
-            certain ratio to generate batched data for policy training.
+            certain ratio to generate batched data for policy training. If img_buffer is a \
+            ``ModelRolloutBuffer`` , the data is a dict of batched tensors (with the fields of imagined \
+            transitions), otherwise it is a list of transition dicts.
 
         Arguments:
             - policy (:obj:`namedtuple`): policy in collect mode
@@ -186,11 +189,23 @@ class DynaWorldModel(WorldModel, ABC):
             - train_iter (:obj:`int`): the current number of policy training iterations
 
         Returns:
-            - data (:obj:`int`): the training data for policy training
+            - data (:obj:`Union[list, dict]`): the training data for policy training
         """
+        from ding.world_model.model_rollout import ModelRolloutBuffer
+
         env_batch_size = int(batch_size * self.real_ratio)
         img_batch_size = batch_size - env_batch_size
         env_data = env_buffer.sample(env_batch_size, train_iter)
+        if isinstance(img_buffer, ModelRolloutBuffer):
+            # keep the imagined data batched, only the few real transitions are stacked and concatenated to it
+            img_data = img_buffer.sample_batch(img_batch_size, train_iter)
+            if len(env_data) == 0:
+                return img_data
+            env_data = default_collate([{k: d[k] for k in img_data.keys()} for d in env_data])
+            return {
+                k: torch.cat([env_data[k].to(device=v.device, dtype=v.dtype).reshape(-1, *v.shape[1:]), v])
+                for k, v in img_data.items()
+            }
         img_data = img_buffer.sample(img_batch_size, train_iter)
         train_data = env_data + img_data
         return train_data
@@ -201,6 +216,9 @@ class DynaWorldModel(WorldModel, ABC):
         r"""
         Overview:
             Sample from the env_buffer, rollouts to generate new data, and push them into the img_buffer.
+            If img_buffer is a ``ModelRolloutBuffer`` , the batched ``ModelRolloutEngine`` is used, which \
+            skips ``policy.process_transition`` and ``policy.get_train_sample`` and only stores the fields \
+            ``obs`` , ``action`` , ``reward`` , ``next_obs`` and ``done`` , refer to ``ModelRolloutEngine`` .
 
         Arguments:
             - policy (:obj:`namedtuple`): policy in collect mode
@@ -212,6 +230,17 @@ class DynaWorldModel(WorldModel, ABC):
         from ding.torch_utils import to_tensor
         from ding.envs import BaseEnvTimestep
         from ding.worker.collector.base_serial_collector import to_tensor_transitions
+        from ding.world_model.model_rollout import ModelRolloutBuffer, ModelRolloutEngine, policy_actor_fn
+
+        if isinstance(img_buffer, ModelRolloutBuffer):
+            # batched rollout, the transitions are written into the preallocated buffer directly
+            data = env_buffer.sample(self.rollout_batch_size, train_iter, replace=True)
+            obs = torch.stack([to_tensor(d['obs'], dtype=torch.float32) for d in data])
+            if self._cuda:
+                obs = obs.cuda()
+            engine = ModelRolloutEngine(self, policy_actor_fn(policy))
+            engine.rollout(obs, self.rollout_length_scheduler(envstep), img_buffer, envstep)
+            return
 
         def step(obs, act):
             # This function has the same input and output format as env manager's step
@@ -183,16 +183,16 @@ class DDPPOWorldMode(HybridWorldModel, nn.Module):
             act = act.cuda()
         inputs = torch.cat([obs, act], dim=1)
         inputs = self.scaler.transform(inputs)
+        if not torch.is_grad_enabled() or not self.gradient_model:
+            # only forward the selected elite model of each sample, e.g. imagined rollouts
+            return self._step_elite(obs, inputs, batch_size)
         # predict
         ensemble_mean, ensemble_var = [], []
         for i in range(0, inputs.shape[0], batch_size):
             input = unsqueeze_repeat(inputs[i:i + batch_size], self.ensemble_size)
-            if not torch.is_grad_enabled() or not self.gradient_model:
-                b_mean, b_var = self.rollout_model(input, ret_log_var=False)
-            else:
-                # use gradient model to compute gradients during backward pass
-                output = Predict.apply(input)
-                b_mean, b_var = output.chunk(2, dim=2)
+            # use gradient model to compute gradients during backward pass
+            output = Predict.apply(input)
+            b_mean, b_var = output.chunk(2, dim=2)
             ensemble_mean.append(b_mean)
             ensemble_var.append(b_var)
         ensemble_mean = torch.cat(ensemble_mean, 1)
@@ -212,6 +212,27 @@ class DDPPOWorldMode(HybridWorldModel, nn.Module):
 
         return rewards, next_obs, self.env.termination_fn(next_obs)
 
+    def _step_elite(self, obs, inputs, batch_size=8192):
+        # sample one elite model for each sample and only run the selected model (grouped bmm) on it
+        model_idxes = torch.from_numpy(np.random.choice(self.elite_model_idxes, size=len(obs))).to(inputs.device)
+        mean, var = [], []
+        for i in range(0, inputs.shape[0], batch_size):
+            b_mean, b_var = self.rollout_model.forward_selected(
+                inputs[i:i + batch_size], model_idxes[i:i + batch_size], ret_log_var=False
+            )
+            mean.append(b_mean)
+            var.append(b_var)
+        mean = torch.cat(mean, 0)
+        mean[:, 1:] += obs
+        # sample from the predicted distribution
+        if self.deterministic_rollout:
+            sample = mean
+        else:
+            sample = mean + torch.randn_like(mean).to(mean) * torch.cat(var, 0).sqrt()
+        rewards, next_obs = sample[:, 0], sample[:, 1:]
+
+        return rewards, next_obs, self.env.termination_fn(next_obs)
+
     def eval(self, env_buffer, envstep, train_iter):
         data = env_buffer.sample(self.eval_freq, train_iter)
         data = default_collate(data)
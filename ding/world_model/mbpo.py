@@ -70,47 +70,53 @@ class MBPOWorldModel(HybridWorldModel, nn.Module):
             obs = obs.cuda()
             act = act.cuda()
         inputs = torch.cat([obs, act], dim=-1)
-        if keep_ensemble:
-            inputs, dim = fold_batch(inputs, 1)
-            inputs = self.scaler.transform(inputs)
-            inputs = unfold_batch(inputs, dim)
-        else:
+        if not keep_ensemble:
             inputs = self.scaler.transform(inputs)
+            # only forward the selected elite model of each sample
+            return self._step_elite(obs, inputs, batch_size)
+        inputs, dim = fold_batch(inputs, 1)
+        inputs = self.scaler.transform(inputs)
+        inputs = unfold_batch(inputs, dim)
         # predict
         ensemble_mean, ensemble_var = [], []
-        batch_dim = 0 if len(inputs.shape) == 2 else 1
-        for i in range(0, inputs.shape[batch_dim], batch_size):
-            if keep_ensemble:
-                # inputs: [E, B, D]
-                input = inputs[:, i:i + batch_size]
-            else:
-                # input:  [B, D]
-                input = unsqueeze_repeat(inputs[i:i + batch_size], self.ensemble_size)
+        for i in range(0, inputs.shape[1], batch_size):
+            # inputs: [E, B, D]
+            input = inputs[:, i:i + batch_size]
             b_mean, b_var = self.ensemble_model(input, ret_log_var=False)
             ensemble_mean.append(b_mean)
             ensemble_var.append(b_var)
         ensemble_mean = torch.cat(ensemble_mean, 1)
         ensemble_var = torch.cat(ensemble_var, 1)
-        if keep_ensemble:
-            ensemble_mean[:, :, 1:] += obs
-        else:
-            ensemble_mean[:, :, 1:] += obs.unsqueeze(0)
+        ensemble_mean[:, :, 1:] += obs
         ensemble_std = ensemble_var.sqrt()
         # sample from the predicted distribution
         if self.deterministic_rollout:
             ensemble_sample = ensemble_mean
         else:
             ensemble_sample = ensemble_mean + torch.randn_like(ensemble_mean).to(ensemble_mean) * ensemble_std
-        if keep_ensemble:
-            # [E, B, D]
-            rewards, next_obs = ensemble_sample[:, :, 0], ensemble_sample[:, :, 1:]
-            next_obs_flatten, dim = fold_batch(next_obs)
-            done = unfold_batch(self.env.termination_fn(next_obs_flatten), dim)
-            return rewards, next_obs, done
-        # sample from ensemble
+        # [E, B, D]
+        rewards, next_obs = ensemble_sample[:, :, 0], ensemble_sample[:, :, 1:]
+        next_obs_flatten, dim = fold_batch(next_obs)
+        done = unfold_batch(self.env.termination_fn(next_obs_flatten), dim)
+        return rewards, next_obs, done
+
+    def _step_elite(self, obs, inputs, batch_size=8192):
+        # sample one elite model for each sample and only run the selected model (grouped bmm) on it
         model_idxes = torch.from_numpy(np.random.choice(self.elite_model_idxes, size=len(obs))).to(inputs.device)
-        batch_idxes = torch.arange(len(obs)).to(inputs.device)
-        sample = ensemble_sample[model_idxes, batch_idxes]
+        mean, var = [], []
+        for i in range(0, inputs.shape[0], batch_size):
+            b_mean, b_var = self.ensemble_model.forward_selected(
+                inputs[i:i + batch_size], model_idxes[i:i + batch_size], ret_log_var=False
+            )
+            mean.append(b_mean)
+            var.append(b_var)
+        mean = torch.cat(mean, 0)
+        mean[:, 1:] += obs
+        # sample from the predicted distribution
+        if self.deterministic_rollout:
+            sample = mean
+        else:
+            sample = mean + torch.randn_like(mean).to(mean) * torch.cat(var, 0).sqrt()
         rewards, next_obs = sample[:, 0], sample[:, 1:]
 
         return rewards, next_obs, self.env.termination_fn(next_obs)
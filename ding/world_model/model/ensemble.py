@@ -1,3 +1,4 @@
+from typing import Optional, Tuple
 import numpy as np
 import torch
 import torch.nn as nn
@@ -42,9 +43,13 @@ class EnsembleFC(nn.Module):
         self.weight_decay = weight_decay
         self.bias = nn.Parameter(torch.zeros(ensemble_size, 1, out_features))
 
-    def forward(self, input: torch.Tensor) -> torch.Tensor:
-        assert input.shape[0] == self.ensemble_size and len(input.shape) == 3
-        return torch.bmm(input, self.weight) + self.bias  # w times x + b
+    def forward(self, input: torch.Tensor, member_idxes: Optional[torch.Tensor] = None) -> torch.Tensor:
+        if member_idxes is None:
+            assert input.shape[0] == self.ensemble_size and len(input.shape) == 3
+            return torch.bmm(input, self.weight) + self.bias  # w times x + b
+        # only forward the selected ensemble members, input: [len(member_idxes), N, in_features]
+        assert input.shape[0] == len(member_idxes) and len(input.shape) == 3
+        return torch.baddbmm(self.bias[member_idxes], input, self.weight[member_idxes])
 
     def extra_repr(self) -> str:
         return 'in_features={}, out_features={}, ensemble_size={}, weight_decay={}'.format(
@@ -99,12 +104,12 @@ class EnsembleModel(nn.Module):
 
         self.optimizer = torch.optim.Adam(self.parameters(), lr=learning_rate)
 
-    def forward(self, x: torch.Tensor, ret_log_var: bool = False):
-        x = self.swish(self.nn1(x))
-        x = self.swish(self.nn2(x))
-        x = self.swish(self.nn3(x))
-        x = self.swish(self.nn4(x))
-        x = self.nn5(x)
+    def forward(self, x: torch.Tensor, ret_log_var: bool = False, member_idxes: Optional[torch.Tensor] = None):
+        x = self.swish(self.nn1(x, member_idxes))
+        x = self.swish(self.nn2(x, member_idxes))
+        x = self.swish(self.nn3(x, member_idxes))
+        x = self.swish(self.nn4(x, member_idxes))
+        x = self.nn5(x, member_idxes)
 
         mean, logvar = x.chunk(2, dim=2)
         logvar = self.max_logvar - F.softplus(self.max_logvar - logvar)
@@ -115,6 +120,41 @@ class EnsembleModel(nn.Module):
         else:
             return mean, torch.exp(logvar)
 
+    def forward_selected(
+            self,
+            x: torch.Tensor,
+            model_idxes: torch.Tensor,
+            ret_log_var: bool = False,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Overview:
+            Forward each sample only through its selected ensemble member, rather than running the full ensemble \
+            on every sample and picking one output afterwards. Samples are grouped by member and padded into a \
+            ``[num_members, max_group_size, D]`` tensor, so that the whole batch is still computed by one ``bmm`` \
+            per layer.
+        Arguments:
+            - x (:obj:`torch.Tensor`): The input with shape ``[B, D]`` .
+            - model_idxes (:obj:`torch.Tensor`): The selected member index (long) of each sample, shape ``[B]`` .
+            - ret_log_var (:obj:`bool`): Whether to return log variance rather than variance.
+        Returns:
+            - mean (:obj:`torch.Tensor`): The predicted mean with shape ``[B, output_dim]`` .
+            - var (:obj:`torch.Tensor`): The predicted (log) variance with shape ``[B, output_dim]`` .
+        """
+        assert len(x.shape) == 2 and model_idxes.shape == (x.shape[0], )
+        sorted_idxes, order = model_idxes.sort()
+        members, counts = torch.unique_consecutive(sorted_idxes, return_counts=True)
+        group = torch.repeat_interleave(torch.arange(len(members), device=x.device), counts)
+        offsets = torch.cumsum(counts, 0) - counts
+        position = torch.arange(x.shape[0], device=x.device) - torch.repeat_interleave(offsets, counts)
+        grouped_x = x.new_zeros(len(members), int(counts.max()), x.shape[1])
+        grouped_x[group, position] = x[order]
+        grouped_mean, grouped_var = self.forward(grouped_x, ret_log_var=ret_log_var, member_idxes=members)
+        mean = grouped_mean.new_empty(x.shape[0], grouped_mean.shape[-1])
+        var = torch.empty_like(mean)
+        mean[order] = grouped_mean[group, position]
+        var[order] = grouped_var[group, position]
+        return mean, var
+
     def get_decay_loss(self):
         decay_loss = 0.
         for m in self.modules():
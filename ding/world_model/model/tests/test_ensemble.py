@@ -27,3 +27,17 @@ def test_EnsembleModel(state_size, action_size, reward_size):
     y = model(x)
     assert len(y) == 2
     assert y[0].shape == y[1].shape == (ensemble_size, B, state_size + reward_size)
+
+
+@pytest.mark.unittest
+def test_EnsembleModel_forward_selected():
+    state_size, action_size, reward_size, ensemble_size, B = 16, 4, 1, 7, 64
+    model = EnsembleModel(state_size, action_size, reward_size, ensemble_size)
+    x = torch.randn(B, state_size + action_size)
+    model_idxes = torch.randint(0, 3, size=(B, ))
+    mean, var = model.forward_selected(x, model_idxes)
+    assert mean.shape == var.shape == (B, state_size + reward_size)
+    # the same as running the full ensemble and picking the selected member
+    full_mean, full_var = model(x.unsqueeze(0).repeat(ensemble_size, 1, 1))
+    assert torch.allclose(mean, full_mean[model_idxes, torch.arange(B)], atol=1e-5)
+    assert torch.allclose(var, full_var[model_idxes, torch.arange(B)], atol=1e-5)
@@ -0,0 +1,296 @@
+from typing import Any, Callable, Dict, List, Optional, Union
+import numpy as np
+import torch
+from torch.distributions import Independent, Normal
+
+from ding.utils import BUFFER_REGISTRY
+from ding.worker.replay_buffer.base_buffer import IBuffer
+
+
+@BUFFER_REGISTRY.register('model_rollout')
+class ModelRolloutBuffer(IBuffer):
+    """
+    Overview:
+        Preallocated ring buffer for the imagined transitions of model-based RL (e.g. MBPO/DDPPO). The transitions \
+        are stored as a few contiguous tensors (``obs``, ``action``, ``reward``, ``next_obs``, ``done``), which can \
+        be written by ``ModelRolloutEngine`` in one batched copy per horizon step instead of building a python \
+        dict for each transition. Like ``ElasticReplayBuffer``, the sampling range can be restricted to the most \
+        recent ``set_buffer_size(envstep)`` transitions. The learner should use ``sample_batch`` to keep the \
+        sampled data batched (and on ``device``), ``sample`` is only kept for the compatibility with other buffers.
+    Interfaces:
+        default_config, push, push_batch, update, sample, clear, count, state_dict, load_state_dict
+    Property:
+        replay_buffer_size, push_count
+    """
+
+    config = dict(
+        type='model_rollout',
+        replay_buffer_size=10000,
+        # (str) The device of the preallocated tensors, usually the same as the world model.
+        device='cpu',
+    )
+
+    def __init__(
+            self,
+            cfg: 'EasyDict',  # noqa
+            tb_logger: Optional['SummaryWriter'] = None,  # noqa
+            exp_name: Optional[str] = 'default_experiment',
+            instance_name: Optional[str] = 'buffer',
+    ) -> None:
+        """
+        Overview:
+            Initialize the buffer, the tensors are allocated lazily at the first push, when the shapes are known.
+        Arguments:
+            - cfg (:obj:`dict`): Config dict.
+            - tb_logger (:obj:`Optional['SummaryWriter']`): Outer tb logger, not used but preserved for compatibility.
+            - exp_name (:obj:`Optional[str]`): Name of this experiment.
+            - instance_name (:obj:`Optional[str]`): Name of this instance.
+        """
+        self._cfg = cfg
+        self._exp_name = exp_name
+        self._instance_name = instance_name
+        self._replay_buffer_size = self._cfg.replay_buffer_size
+        self._device = self._cfg.get('device', 'cpu')
+        self._set_buffer_size = self._cfg.get('set_buffer_size', None)
+        self._current_buffer_size = self._replay_buffer_size if self._set_buffer_size is None \
+            else self._set_buffer_size(0)
+        self._data = None
+        self._tail = 0
+        self._valid_count = 0
+        self._push_count = 0
+
+    def start(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def _allocate(self, data: Dict[str, torch.Tensor]) -> None:
+        self._data = {
+            k: torch.zeros(self._replay_buffer_size, *v.shape[1:], dtype=v.dtype, device=self._device)
+            for k, v in data.items()
+        }
+
+    def push_batch(self, data: Dict[str, torch.Tensor], cur_collector_envstep: int = -1) -> None:
+        """
+        Overview:
+            Push a batch of transitions, each value is a tensor whose first dim is the batch dim. The data is \
+            copied into the preallocated tensors directly, overwriting the oldest data when the buffer is full.
+        Arguments:
+            - data (:obj:`Dict[str, torch.Tensor]`): The batched transitions, such as ``obs`` , ``action`` , \
+                ``reward`` , ``next_obs`` and ``done`` .
+            - cur_collector_envstep (:obj:`int`): Collector's current env step, not used.
+        """
+        if self._data is None:
+            self._allocate(data)
+        size = len(next(iter(data.values())))
+        if size == 0:
+            return
+        if size > self._replay_buffer_size:
+            data = {k: v[-self._replay_buffer_size:] for k, v in data.items()}
+            size = self._replay_buffer_size
+        index = (torch.arange(size, device=self._device) + self._tail) % self._replay_buffer_size
+        for k, v in data.items():
+            self._data[k].index_copy_(0, index, v.to(device=self._device, dtype=self._data[k].dtype))
+        self._tail = (self._tail + size) % self._replay_buffer_size
+        self._valid_count = min(self._valid_count + size, self._replay_buffer_size)
+        self._push_count += size
+
+    def push(self, data: Union[List[Any], Any], cur_collector_envstep: int) -> None:
+        """
+        Overview:
+            Push transition dicts into buffer, which is compatible with other buffers. Prefer ``push_batch`` for \
+            batched data.
+        Arguments:
+            - data (:obj:`Union[List[Any], Any]`): One transition dict, or a list of transition dicts.
+            - cur_collector_envstep (:obj:`int`): Collector's current env step, not used.
+        """
+        if isinstance(data, dict):
+            data = [data]
+        if len(data) == 0:
+            return
+        keys = self._data.keys() if self._data is not None else data[0].keys()
+        batch = {k: torch.stack([torch.as_tensor(d[k]) for d in data]) for k in keys}
+        self.push_batch(batch, cur_collector_envstep)
+
+    def update(self, envstep: int) -> None:
+        """
+        Overview:
+            Update the sampling range according to ``set_buffer_size`` , the same as ``ElasticReplayBuffer`` .
+        Arguments:
+            - envstep (:obj:`int`): The current env step.
+        """
+        if self._set_buffer_size is not None:
+            self._current_buffer_size = self._set_buffer_size(envstep)
+
+    def _get_indices(self, size: int, replace: bool = False) -> torch.Tensor:
+        valid_range = min(self._valid_count, self._current_buffer_size)
+        offset = np.random.choice(a=valid_range, size=size, replace=replace)
+        return torch.as_tensor((self._tail - 1 - offset) % self._replay_buffer_size, device=self._device)
+
+    def sample_batch(self, size: int, cur_learner_iter: int = -1, replace: bool = False) -> Optional[dict]:
+        """
+        Overview:
+            Sample a batch of transitions, gathered with one index per field.
+        Arguments:
+            - size (:obj:`int`): The number of the data that will be sampled.
+            - cur_learner_iter (:obj:`int`): Learner's current iteration, not used.
+            - replace (:obj:`bool`): Whether sample with replacement.
+        Returns:
+            - sampled_data (:obj:`Optional[dict]`): The batched data, None if there are not enough data.
+        """
+        valid_range = min(self._valid_count, self._current_buffer_size)
+        if valid_range == 0 or (valid_range < size and not replace):
+            return None
+        indices = self._get_indices(size, replace)
+        return {k: v[indices] for k, v in self._data.items()}
+
+    def sample(self, size: int, cur_learner_iter: int, replace: bool = False) -> Optional[list]:
+        """
+        Overview:
+            Sample a list of transition dicts, which is compatible with other buffers, e.g. it can be concatenated \
+            with the data sampled from the environment buffer.
+        Arguments:
+            - size (:obj:`int`): The number of the data that will be sampled.
+            - cur_learner_iter (:obj:`int`): Learner's current iteration, not used.
+            - replace (:obj:`bool`): Whether sample with replacement.
+        Returns:
+            - sampled_data (:obj:`Optional[list]`): A list of transition dicts with length ``size`` .
+        """
+        if size == 0:
+            return []
+        batch = self.sample_batch(size, cur_learner_iter, replace)
+        if batch is None:
+            return None
+        keys = list(batch.keys())
+        return [dict(zip(keys, values)) for values in zip(*[batch[k].cpu().unbind(0) for k in keys])]
+
+    def clear(self) -> None:
+        self._tail = 0
+        self._valid_count = 0
+
+    def count(self) -> int:
+        return self._valid_count
+
+    def save_data(self, file_name: str):
+        torch.save(self.state_dict(), file_name)
+
+    def load_data(self, file_name: str):
+        self.load_state_dict(torch.load(file_name))
+
+    def state_dict(self) -> dict:
+        return {
+            'data': self._data,
+            'tail': self._tail,
+            'valid_count': self._valid_count,
+            'push_count': self._push_count,
+        }
+
+    def load_state_dict(self, _state_dict: dict) -> None:
+        self._data = _state_dict['data']
+        self._tail = _state_dict['tail']
+        self._valid_count = _state_dict['valid_count']
+        self._push_count = _state_dict['push_count']
+
+    @property
+    def replay_buffer_size(self) -> int:
+        return self._replay_buffer_size
+
+    @property
+    def push_count(self) -> int:
+        return self._push_count
+
+
+def policy_actor_fn(policy: 'Policy.collect_function') -> Callable[[torch.Tensor], torch.Tensor]:  # noqa
+    """
+    Overview:
+        Adapt the collect model of policy to a batched actor function. The batched obs is fed to \
+        ``collect_model.forward(obs, mode='compute_actor')`` directly on its device, without the env-id keyed \
+        ``forward`` of collect mode. If the output contains ``action`` (e.g. the model is wrapped by a sample \
+        wrapper), it is used directly, otherwise the output ``logit`` is the ``(mu, sigma)`` of reparameterization \
+        policy, and the action is sampled and squashed by ``tanh`` , the same as the collect mode of ``SACPolicy`` .
+    Arguments:
+        - policy (:obj:`Policy.collect_function`): The policy in collect mode.
+    Returns:
+        - actor_fn (:obj:`Callable[[torch.Tensor], torch.Tensor]`): Map batched obs to batched action.
+    """
+    model = policy.get_attribute('collect_model')
+
+    def actor_fn(obs: torch.Tensor) -> torch.Tensor:
+        output = model.forward(obs, mode='compute_actor')
+        if 'action' in output:
+            return output['action']
+        mu, sigma = output['logit']
+        return torch.tanh(Independent(Normal(mu, sigma), 1).rsample())
+
+    return actor_fn
+
+
+class ModelRolloutEngine(object):
+    """
+    Overview:
+        Batched imagined rollouts of a world model. The rollout state stays on the world model device across the \
+        horizon (finished samples are compacted out), each horizon step calls the world model once for the whole \
+        batch, and the imagined transitions are written straight into a ``ModelRolloutBuffer`` .
+
+    .. note::
+        The transitions don't go through ``policy.process_transition`` and ``policy.get_train_sample`` , only the \
+        fields ``obs`` , ``action`` , ``reward`` , ``next_obs`` and ``done`` are stored, which are the same as the \
+        train samples of ``SACPolicy`` (1-step transitions). The other fields of policy transitions, such as the \
+        ``logit`` of ``collector_logit=True`` and ``collect_iter`` , are dropped, so the policies which need these \
+        fields or multi-step train samples should use the other imagination buffers.
+    Interfaces:
+        __init__, rollout
+    """
+
+    def __init__(self, world_model: 'WorldModel', actor_fn: Callable[[torch.Tensor], torch.Tensor]) -> None:  # noqa
+        """
+        Overview:
+            Initialize the engine.
+        Arguments:
+            - world_model (:obj:`WorldModel`): The world model, whose ``step(obs, act)`` returns the batched \
+                ``(reward, next_obs, done)`` .
+            - actor_fn (:obj:`Callable[[torch.Tensor], torch.Tensor]`): Map batched obs to batched action, such as \
+                the one returned by ``policy_actor_fn`` .
+        """
+        self._world_model = world_model
+        self._actor_fn = actor_fn
+
+    def rollout(
+            self,
+            obs: torch.Tensor,
+            horizon: int,
+            buffer: ModelRolloutBuffer,
+            cur_collector_envstep: int = -1,
+    ) -> int:
+        """
+        Overview:
+            Rollout from the start obs for at most ``horizon`` steps and push the transitions into buffer.
+        Arguments:
+            - obs (:obj:`torch.Tensor`): The batched start observations.
+            - horizon (:obj:`int`): The rollout length.
+            - buffer (:obj:`ModelRolloutBuffer`): The buffer to store the imagined transitions.
+            - cur_collector_envstep (:obj:`int`): Collector's current env step.
+        Returns:
+            - count (:obj:`int`): The number of generated transitions.
+        """
+        count = 0
+        with torch.no_grad():
+            for _ in range(horizon):
+                if len(obs) == 0:
+                    break
+                action = self._actor_fn(obs)
+                reward, next_obs, done = self._world_model.step(obs, action)
+                obs = obs.to(next_obs.device)
+                buffer.push_batch(
+                    {
+                        'obs': obs,
+                        'action': action,
+                        'reward': reward.reshape(-1, 1),
+                        'next_obs': next_obs,
+                        'done': done.reshape(-1).bool(),
+                    }, cur_collector_envstep
+                )
+                count += len(obs)
+                obs = next_obs[~done.reshape(-1).bool()]
+        return count
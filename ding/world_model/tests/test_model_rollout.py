@@ -0,0 +1,94 @@
+import shutil
+import pytest
+import torch
+from easydict import EasyDict
+
+from ding.world_model.mbpo import MBPOWorldModel
+from ding.world_model.model_rollout import ModelRolloutBuffer, ModelRolloutEngine, policy_actor_fn
+from ding.utils import deep_merge_dicts
+
+
+@pytest.mark.unittest
+class TestModelRolloutBuffer:
+
+    def test_push_sample(self):
+        buffer = ModelRolloutBuffer(deep_merge_dicts(ModelRolloutBuffer.default_config(), dict(replay_buffer_size=10)))
+        assert buffer.sample(4, 0) is None
+        buffer.push_batch({'obs': torch.arange(8).float().unsqueeze(1), 'done': torch.zeros(8).bool()})
+        assert buffer.count() == 8
+        buffer.push([{'obs': torch.ones(1) * i, 'done': torch.tensor(False)} for i in range(8, 12)], 0)
+        assert buffer.count() == 10 and buffer.push_count == 12
+        data = buffer.sample(10, 0)
+        assert len(data) == 10
+        # the oldest data is overwritten
+        assert sorted([d['obs'].item() for d in data]) == list(range(2, 12))
+        batch = buffer.sample_batch(4, 0, replace=True)
+        assert batch['obs'].shape == (4, 1) and batch['done'].dtype == torch.bool
+        state_dict = buffer.state_dict()
+        buffer.clear()
+        assert buffer.count() == 0
+        buffer.load_state_dict(state_dict)
+        assert buffer.count() == 10
+
+
+@pytest.mark.unittest
+def test_model_rollout_engine():
+    state_size, action_size, B, horizon = 8, 2, 32, 5
+    cfg = MBPOWorldModel.default_config()
+    cfg = deep_merge_dicts(cfg, dict(cuda=False, model=dict(state_size=state_size, action_size=action_size)))
+    fake_env = EasyDict(termination_fn=lambda obs: obs[:, 0] > 10)
+    world_model = MBPOWorldModel(cfg, fake_env, None)
+    world_model.elite_model_idxes = [0, 1, 2]
+    buffer = ModelRolloutBuffer(deep_merge_dicts(ModelRolloutBuffer.default_config(), dict(replay_buffer_size=1000)))
+    engine = ModelRolloutEngine(world_model, lambda obs: torch.tanh(obs[:, :action_size]))
+    count = engine.rollout(torch.randn(B, state_size), horizon, buffer)
+    assert count == buffer.count() <= B * horizon
+    data = buffer.sample_batch(16, 0)
+    assert data['obs'].shape == data['next_obs'].shape == (16, state_size)
+    assert data['action'].shape == (16, action_size)
+    assert data['reward'].shape == (16, 1)
+    assert data['done'].shape == (16, )
+
+
+@pytest.mark.unittest
+def test_fill_model_rollout_buffer():
+    from ding.policy import SACPolicy
+    from ding.model import ContinuousQAC
+    from ding.worker.replay_buffer import NaiveReplayBuffer
+
+    state_size, action_size = 4, 2
+    cfg = MBPOWorldModel.default_config()
+    cfg = deep_merge_dicts(cfg, dict(cuda=False, model=dict(state_size=state_size, action_size=action_size)))
+    cfg.other.rollout_batch_size = 64
+    fake_env = EasyDict(termination_fn=lambda obs: obs[:, 0] > 10)
+    world_model = MBPOWorldModel(cfg, fake_env, None)
+    world_model.elite_model_idxes = [0, 1]
+
+    policy_config = SACPolicy.default_config()
+    policy_config.model.update(dict(obs_shape=state_size, action_shape=action_size))
+    policy = SACPolicy(policy_config, model=ContinuousQAC(**policy_config.model))
+    env_buffer = NaiveReplayBuffer(NaiveReplayBuffer.default_config(), None, 'dyna_exp_name', 'env_buffer_for_test')
+    env_buffer.push(
+        [
+            {
+                'obs': torch.randn(state_size),
+                'next_obs': torch.randn(state_size),
+                'action': torch.randn(action_size),
+                'reward': torch.randn(1),
+                'done': False,
+            } for _ in range(20)
+        ], 0
+    )
+    img_buffer = ModelRolloutBuffer(ModelRolloutBuffer.default_config())
+
+    actor_fn = policy_actor_fn(policy.collect_mode)
+    action = actor_fn(torch.randn(8, state_size))
+    assert action.shape == (8, action_size) and action.abs().max() <= 1
+    world_model.fill_img_buffer(policy.collect_mode, env_buffer, img_buffer, 0, 0)
+    assert img_buffer.count() == 64
+    data = world_model.sample(env_buffer, img_buffer, 16, 0)
+    # the data keeps batched, and can be used by policy learn mode directly
+    assert isinstance(data, dict) and data['obs'].shape == (16, state_size) and data['reward'].shape == (16, 1)
+    output = policy.learn_mode.forward(data)
+    assert len(output['priority']) == 16
+    shutil.rmtree('dyna_exp_name', ignore_errors=True)
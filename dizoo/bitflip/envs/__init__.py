@@ -1 +1 @@
-from .bitflip_env import BitFlipEnv
+from .bitflip_env import BitFlipEnv, BitFlipVectorEnv
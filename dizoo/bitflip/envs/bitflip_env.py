@@ -4,7 +4,7 @@ import numpy as np
 import gym
 from typing import Any, Dict, Optional, Union, List
 
-from ding.envs import BaseEnv, BaseEnvTimestep
+from ding.envs import BaseEnv, BaseEnvTimestep, BaseVectorEnv
 from ding.utils import ENV_REGISTRY
 from ding.torch_utils import to_ndarray
 
@@ -75,6 +75,9 @@ class BitFlipEnv(BaseEnv):
         random_action = to_ndarray([random_action], dtype=np.int64)
         return random_action
 
+    def create_vector_env(self, env_num: int) -> 'BitFlipVectorEnv':
+        return BitFlipVectorEnv(self._cfg, env_num)
+
     @property
     def observation_space(self) -> gym.spaces.Space:
         return self._observation_space
@@ -89,3 +92,53 @@ class BitFlipEnv(BaseEnv):
 
     def __repr__(self) -> str:
         return "DI-engine BitFlip Env({})".format('bitflip')
+
+
+class BitFlipVectorEnv(BaseVectorEnv):
+    """
+    Overview:
+        Batched implementation of ``BitFlipEnv`` , the states and goals of all the instances are stored in the \
+        arrays of shape ``(N, n_bits)`` and updated together.
+    """
+
+    def __init__(self, cfg: dict, env_num: int) -> None:
+        super().__init__(env_num)
+        self._cfg = cfg
+        self._n_bits = cfg.n_bits
+        self._maxsize = self._n_bits
+        self._state = np.zeros((env_num, self._n_bits), dtype=np.float32)
+        self._goal = np.zeros((env_num, self._n_bits), dtype=np.float32)
+        self._curr_step = np.zeros(env_num, dtype=np.int64)
+        self._eval_episode_return = np.zeros(env_num, dtype=np.float32)
+        self._observation_space = gym.spaces.Box(low=0, high=1, shape=(2 * self._n_bits, ), dtype=np.float32)
+        self._action_space = gym.spaces.Discrete(self._n_bits)
+        self._reward_space = gym.spaces.Box(low=0.0, high=1.0, shape=(1, ), dtype=np.float32)
+
+    def _sample_state_goal(self, rng: np.random.RandomState, n: int) -> np.ndarray:
+        state_goal = rng.randint(0, 2, size=(n, 2, self._n_bits)).astype(np.float32)
+        same = (state_goal[:, 0] == state_goal[:, 1]).all(axis=-1)
+        while same.any():
+            state_goal[same, 1] = rng.randint(0, 2, size=(same.sum(), self._n_bits))
+            same = (state_goal[:, 0] == state_goal[:, 1]).all(axis=-1)
+        return state_goal
+
+    def reset(self, env_id: np.ndarray) -> np.ndarray:
+        state_goal = self._sample(env_id, self._sample_state_goal)
+        self._state[env_id], self._goal[env_id] = state_goal[:, 0], state_goal[:, 1]
+        self._curr_step[env_id] = 0
+        self._eval_episode_return[env_id] = 0
+        return np.concatenate([self._state[env_id], self._goal[env_id]], axis=1)
+
+    def step(self, env_id: np.ndarray, action: np.ndarray) -> BaseEnvTimestep:
+        action = np.asarray(action).reshape(-1)
+        self._state[env_id, action] = 1 - self._state[env_id, action]
+        state = self._state[env_id]
+        success = (state == self._goal[env_id]).all(axis=1)
+        rew = success.astype(np.float32)[:, None]
+        done = success | (self._curr_step[env_id] >= self._maxsize - 1)
+        self._eval_episode_return[env_id] += rew[:, 0]
+        self._curr_step[env_id] += 1
+        eval_episode_return = self._eval_episode_return[env_id]
+        info = [{'eval_episode_return': float(r)} if d else {} for d, r in zip(done, eval_episode_return)]
+        obs = np.concatenate([state, self._goal[env_id]], axis=1)
+        return BaseEnvTimestep(obs, rew, done, info)
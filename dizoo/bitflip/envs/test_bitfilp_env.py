@@ -22,3 +22,26 @@ def test_bitfilp_env():
         timestep = env.step(action)
         assert timestep.obs.shape == (2 * n_bits, )
         assert timestep.reward.shape == (1, )
+
+
+@pytest.mark.envtest
+def test_bitflip_vector_env():
+    n_bits, env_num = 6, 8
+    envs = [BitFlipEnv(EasyDict({'n_bits': n_bits})) for _ in range(env_num)]
+    vector_env = envs[0].create_vector_env(env_num)
+    vector_env.seed(list(range(env_num)))
+    env_id = np.arange(env_num)
+    obs = vector_env.reset(env_id)
+    assert obs.shape == (env_num, 2 * n_bits)
+    for i, env in enumerate(envs):
+        env.reset()
+        env._state, env._goal = obs[i, :n_bits].copy(), obs[i, n_bits:].copy()
+    for _ in range(n_bits):
+        action = np.random.randint(0, n_bits, size=(env_num, 1))
+        timestep = vector_env.step(env_id, action)
+        for i, env in enumerate(envs):
+            expected = env.step(action[i])
+            assert np.array_equal(timestep.obs[i], expected.obs)
+            assert timestep.reward[i] == expected.reward and timestep.done[i] == expected.done
+            assert timestep.info[i] == expected.info
+    assert timestep.done.all()
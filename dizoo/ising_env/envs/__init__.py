@@ -1 +1 @@
-from .ising_model_env import IsingModelEnv
+from .ising_model_env import IsingModelEnv, IsingModelVectorEnv
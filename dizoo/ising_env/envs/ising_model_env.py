@@ -7,7 +7,7 @@ from numpy import dtype
 import gym
 import matplotlib.pyplot as plt
 import imageio
-from ding.envs import BaseEnv, BaseEnvTimestep
+from ding.envs import BaseEnv, BaseEnvTimestep, BaseVectorEnv
 from ding.torch_utils import to_ndarray, to_list
 from ding.utils import ENV_REGISTRY
 from dizoo.ising_env.envs.ising_model.multiagent.environment import IsingMultiAgentEnv
@@ -150,6 +150,9 @@ class IsingModelEnv(BaseEnv):
         plt.close(fig)
         return image
 
+    def create_vector_env(self, env_num: int) -> 'IsingModelVectorEnv':
+        return IsingModelVectorEnv(self._cfg, env_num)
+
     @staticmethod
     def display_frames_as_gif(frames: list, output_path: str) -> None:
         imageio.mimsave(output_path, frames, duration=50)
@@ -172,3 +175,77 @@ class IsingModelEnv(BaseEnv):
 
     def __repr__(self) -> str:
         return "DI-engine Ising Model Env({})".format(self._cfg.env_id)
+
+
+class IsingModelVectorEnv(BaseVectorEnv):
+    """
+    Overview:
+        Batched implementation of ``IsingModelEnv`` . The spins of all the agents in all the instances are stored in \
+        an array of shape ``(N, agent_num)`` , and the neighbours of each agent are the fixed indices computed \
+        from the same spin masks as ``Ising.py`` , so that the observations, action probabilities and rewards of all \
+        the agents are computed by array indexing instead of the python loop over agents.
+    """
+
+    def __init__(self, cfg: dict, env_num: int) -> None:
+        super().__init__(env_num)
+        self._cfg = cfg
+        self._num_agents = cfg.num_agents
+        self._dim_spin = cfg.dim_spin
+        ising_model = ising_model_.load('Ising.py').Scenario()
+        world = ising_model.make_world(num_agents=self._num_agents, agent_view=1)
+        # (agent_num, neighbour_num), the neighbour indices of each agent in ascending order
+        self._neighbour = np.stack([np.nonzero(agent.spin_mask == 1)[0] for agent in world.agents])
+        self._spin = np.zeros((env_num, self._num_agents), dtype=np.int64)
+        self._pre_action = np.zeros((env_num, self._num_agents), dtype=np.int64)
+        self._eval_episode_return = np.zeros(env_num)
+        self._cur_step = np.zeros(env_num, dtype=np.int64)
+        self._action_space = gym.spaces.Discrete(self._dim_spin)
+        self._observation_space = gym.spaces.MultiBinary(4 * cfg.agent_view_sight)
+        self._reward_space = gym.spaces.Box(low=float("-inf"), high=float("inf"), shape=(1, ), dtype=np.float32)
+
+    def _calculate_action_prob(self, actions: np.ndarray) -> np.ndarray:
+        # the mean one-hot action of the neighbours of each agent, (n, agent_num, dim_spin)
+        return np.eye(self._dim_spin)[actions[:, self._neighbour]].mean(axis=-2)
+
+    def _get_obs(self, spin: np.ndarray, pre_action_prob: np.ndarray) -> np.ndarray:
+        return np.concatenate([spin[:, self._neighbour], pre_action_prob], axis=-1).astype(np.float32)
+
+    def reset(self, env_id: np.ndarray) -> np.ndarray:
+        self._spin[env_id] = self._sample(env_id, lambda rng, n: rng.randint(0, 2, size=(n, self._num_agents)))
+        self._pre_action[env_id] = 0
+        self._eval_episode_return[env_id] = 0
+        self._cur_step[env_id] = 0
+        spin = self._spin[env_id]
+        # consider the last global state as pre action prob
+        return self._get_obs(spin, self._calculate_action_prob(spin))
+
+    def step(self, env_id: np.ndarray, action: np.ndarray) -> BaseEnvTimestep:
+        action = np.asarray(action).reshape(len(env_id), self._num_agents)
+        pre_action = self._pre_action[env_id]
+        pre_action_prob = self._calculate_action_prob(pre_action)
+        self._pre_action[env_id] = action
+        spin = (action > 0).astype(np.int64)
+        self._spin[env_id] = spin
+        obs = self._get_obs(spin, pre_action_prob)
+        # turn the state into -1/1, and the reward of each agent is 0.5 * s_i * sum(s_j) over its neighbours
+        sign = 2 * spin - 1
+        rew = (0.5 * sign * sign[:, self._neighbour].sum(axis=-1))[..., np.newaxis]
+        ups = np.count_nonzero(spin, axis=1)
+        downs = self._num_agents - ups
+        order_param = np.abs(ups - downs) / (self._num_agents + 0.0)
+        done = order_param == 1.0
+        self._eval_episode_return[env_id] += rew.sum(axis=(1, 2))
+        self._cur_step[env_id] += 1
+        info = []
+        for k, i in enumerate(env_id):
+            info.append(
+                {
+                    "order_param": order_param[k],
+                    "ups": ups[k],
+                    "downs": downs[k],
+                    'pre_action': pre_action[k][:, np.newaxis]
+                }
+            )
+            if done[k]:
+                info[k]['eval_episode_return'] = self._eval_episode_return[i] / self._cur_step[i]
+        return BaseEnvTimestep(obs, rew, done, info)
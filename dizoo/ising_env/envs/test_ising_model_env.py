@@ -37,3 +37,26 @@ class TestIsingModelEnv:
                 assert timestep.reward[0] <= env.reward_space.high
         print(env.observation_space, env.action_space, env.reward_space)
         env.close()
+
+    def test_ising_vector_env(self):
+        env_num = 4
+        cfg = EasyDict({'num_agents': num_agents, 'dim_spin': 2, 'agent_view_sight': 1})
+        envs = [IsingModelEnv(cfg) for _ in range(env_num)]
+        vector_env = envs[0].create_vector_env(env_num)
+        env_id = np.arange(env_num)
+        obs = vector_env.reset(env_id)
+        assert obs.shape == (env_num, num_agents, 4 + 2)
+        for i, env in enumerate(envs):
+            env.reset()
+            # use the same initial spins as the unbatched env
+            vector_env._spin[i] = env._env.world.global_state.flatten()
+        for _ in range(5):
+            action = np.random.randint(0, 2, size=(env_num, num_agents, 1))
+            timestep = vector_env.step(env_id, action)
+            assert timestep.reward.shape == (env_num, num_agents, 1)
+            for i, env in enumerate(envs):
+                expected = env.step(action[i])
+                assert np.allclose(timestep.obs[i], expected.obs)
+                assert np.allclose(timestep.reward[i], expected.reward)
+                assert timestep.done[i] == expected.done
+                assert timestep.info[i]['order_param'] == expected.info['order_param']
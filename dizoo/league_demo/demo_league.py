@@ -1,5 +1,6 @@
 import os
 import shutil
+from typing import Optional
 from easydict import EasyDict
 from ding.league import BaseLeague, ActivePlayer
 
@@ -11,9 +12,9 @@ class DemoLeague(BaseLeague):
         self.reset_checkpoint_path = os.path.join(self.path_policy, 'reset_ckpt.pth')
 
     # override
-    def _get_job_info(self, player: ActivePlayer, eval_flag: bool = False) -> dict:
+    def _get_job_info(self, player: ActivePlayer, eval_flag: bool = False, job: Optional[dict] = None) -> dict:
         assert isinstance(player, ActivePlayer), player.__class__
-        player_job_info = EasyDict(player.get_job(eval_flag))
+        player_job_info = EasyDict(player.get_job(eval_flag) if job is None else job)
         return {
             'agent_num': 2,
             'launch_player': player.player_id,
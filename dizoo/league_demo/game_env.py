@@ -2,7 +2,18 @@ from typing import List
 import numpy as np
 import gym
 
-from ding.envs import BaseEnv, BaseEnvTimestep
+from ding.envs import BaseEnv, BaseEnvTimestep, BaseVectorEnv
+
+# PAYOFF[game_type][action of player 1][action of player 2] = (reward of player 1, reward of player 2)
+PAYOFF = {
+    'zero_sum': [[(3, -3), (-2, 2)], [(-2, 2), (1, -1)]],
+    'prisoner_dilemma': [[(-1, -1), (-20, 0)], [(0, -20), (-10, -10)]],
+}
+# RESULT[game_type][action of player 1][action of player 2] = (result of player 1, result of player 2)
+RESULT = {
+    'zero_sum': [[("wins", "losses"), ("losses", "wins")], [("losses", "wins"), ("wins", "losses")]],
+    'prisoner_dilemma': [[("draws", "draws"), ("losses", "wins")], [("wins", "losses"), ('draws', 'draws')]],
+}
 
 
 class GameEnv(BaseEnv):
@@ -26,36 +37,11 @@ class GameEnv(BaseEnv):
         return np.array([[0, 1], [1, 0]]).astype(np.float32)  # trivial observation
 
     def step(self, actions: List[int]) -> BaseEnvTimestep:
-        if self.game_type == 'zero_sum':
-            if actions == [0, 0]:
-                rewards = 3, -3
-                results = "wins", "losses"
-            elif actions == [0, 1]:
-                rewards = -2, 2
-                results = "losses", "wins"
-            elif actions == [1, 0]:
-                rewards = -2, 2
-                results = "losses", "wins"
-            elif actions == [1, 1]:
-                rewards = 1, -1
-                results = "wins", "losses"
-            else:
-                raise RuntimeError("invalid actions: {}".format(actions))
-        elif self.game_type == 'prisoner_dilemma':
-            if actions == [0, 0]:
-                rewards = -1, -1
-                results = "draws", "draws"
-            elif actions == [0, 1]:
-                rewards = -20, 0
-                results = "losses", "wins"
-            elif actions == [1, 0]:
-                rewards = 0, -20
-                results = "wins", "losses"
-            elif actions == [1, 1]:
-                rewards = -10, -10
-                results = 'draws', 'draws'
-            else:
-                raise RuntimeError("invalid actions: {}".format(actions))
+        if len(actions) != 2 or not all([a in [0, 1] for a in actions]):
+            raise RuntimeError("invalid actions: {}".format(actions))
+        a0, a1 = [int(np.asarray(a).item()) for a in actions]
+        rewards = PAYOFF[self.game_type][a0][a1]
+        results = RESULT[self.game_type][a0][a1]
         observations = np.array([[0, 1], [1, 0]]).astype(np.float32)
         rewards = np.array(rewards).astype(np.float32)
         rewards = rewards[..., np.newaxis]
@@ -89,3 +75,44 @@ class GameEnv(BaseEnv):
 
     def random_action(self) -> List[int]:
         return [np.random.randint(0, 2) for _ in range(2)]
+
+    def create_vector_env(self, env_num: int) -> 'GameVectorEnv':
+        return GameVectorEnv(self.game_type, env_num)
+
+
+class GameVectorEnv(BaseVectorEnv):
+    """
+    Overview:
+        Batched implementation of ``GameEnv`` , the rewards and results of all the instances are looked up from \
+        the same ``PAYOFF`` and ``RESULT`` tables as ``GameEnv`` indexed by the actions of two players.
+    """
+
+    def __init__(self, game_type: str = 'prisoner_dilemma', env_num: int = 1) -> None:
+        super().__init__(env_num)
+        assert game_type in ['zero_sum', 'prisoner_dilemma']
+        self.game_type = game_type
+        # (2, 2, 2, 1)
+        self._payoff = np.array(PAYOFF[game_type], dtype=np.float32)[..., np.newaxis]
+        self._result = RESULT[game_type]
+        self._observation_space = None
+        self._action_space = None
+        self._reward_space = None
+
+    def reset(self, env_id: np.ndarray) -> np.ndarray:
+        return np.tile(np.array([[0, 1], [1, 0]], dtype=np.float32), (len(env_id), 1, 1))
+
+    def step(self, env_id: np.ndarray, action: np.ndarray) -> BaseEnvTimestep:
+        action = np.asarray(action).reshape(len(env_id), 2)
+        if not np.isin(action, [0, 1]).all():
+            raise RuntimeError("invalid actions: {}".format(action))
+        observations = self.reset(env_id)
+        # (n, 2, 1)
+        rewards = self._payoff[action[:, 0], action[:, 1]]
+        infos = [
+            tuple({
+                'result': self._result[a0][a1][p],
+                'eval_episode_return': r[p]
+            } for p in range(2)) for (a0, a1), r in zip(action.tolist(), rewards)
+        ]
+        dones = np.ones(len(env_id), dtype=bool)
+        return BaseEnvTimestep(observations, rewards, dones, infos)
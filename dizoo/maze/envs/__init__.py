@@ -1 +1 @@
-from .maze_env import Maze
+from .maze_env import Maze, MazeVectorEnv
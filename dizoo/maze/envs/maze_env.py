@@ -6,7 +6,7 @@ import gym
 from gym import spaces
 from gym.utils import seeding
 
-from ding.envs import BaseEnvTimestep
+from ding.envs import BaseEnvTimestep, BaseVectorEnv
 from ding.utils import ENV_REGISTRY
 
 
@@ -34,6 +34,7 @@ class Maze(gym.Env):
         self,
         cfg,
     ):
+        self._cfg = cfg
         self._size = cfg.size
         self._init_flag = False
         self._random_start = True
@@ -245,6 +246,9 @@ class Maze(gym.Env):
             multiplier += self._num_maze_keys
         return multiplier * tabular_obs + action
 
+    def create_vector_env(self, env_num: int) -> 'MazeVectorEnv':
+        return MazeVectorEnv(self._cfg, env_num)
+
     @staticmethod
     def create_collector_env_cfg(cfg: dict) -> List[dict]:
         collector_env_num = cfg.pop('collector_env_num')
@@ -346,6 +350,67 @@ class Maze(gym.Env):
         return BaseEnvTimestep(self.process_states(self._get_obs(), self.get_maze_map()), reward, done, info)
 
 
+class MazeVectorEnv(BaseVectorEnv):
+    """
+    Overview:
+        Batched implementation of ``Maze`` , the walls, targets and agent locations of all the instances are stored \
+        in arrays and the moves are applied together. The maze of each instance is generated by ``Maze`` with the \
+        seed of this instance, so it is the same as the unbatched env with the same seed.
+    """
+    # the location change of action 0, 1, 2, 3
+    moves = np.array([[1, 0], [0, 1], [-1, 0], [0, -1]])
+
+    def __init__(self, cfg: dict, env_num: int) -> None:
+        super().__init__(env_num)
+        self._cfg = cfg
+        self._size = cfg.size
+        self._generator = Maze(cfg)
+        self._wall = np.zeros((env_num, self._size, self._size), dtype=np.int64)
+        self._start = np.zeros((env_num, 2), dtype=np.int64)
+        self._target = np.zeros((env_num, 2), dtype=np.int64)
+        self._loc = np.zeros((env_num, 2), dtype=np.int64)
+        self._step = np.zeros(env_num, dtype=np.int64)
+        # the generated maze of each instance with fixed seed is cached, because it is the same in every episode
+        self._maze_seed = [None for _ in range(env_num)]
+        self._observation_space = spaces.Box(low=0.0, high=np.inf, shape=(16, 16, 3))
+        self._action_space = spaces.Discrete(4)
+        self._reward_space = spaces.Box(low=0, high=1, shape=(1, ), dtype=np.float32)
+
+    def reset(self, env_id: np.ndarray) -> np.ndarray:
+        for i in env_id:
+            seed = None if self._seed is None else self._seed[i]
+            if seed is None or self._maze_seed[i] != seed:
+                maze = self._generator.generate_maze(self._size, seed, 'tunnel')
+                self._wall[i] = maze == Maze.KEY_WALL
+                self._start[i] = np.argwhere(maze == Maze.KEY_START)[0]
+                self._target[i] = np.argwhere(maze == Maze.KEY_TARGET)[0]
+                self._maze_seed[i] = seed
+        self._loc[env_id] = self._start[env_id]
+        self._step[env_id] = 0
+        return self._get_obs(env_id)
+
+    def _get_obs(self, env_id: np.ndarray) -> np.ndarray:
+        n = np.arange(len(env_id))
+        obs = np.zeros((len(env_id), self._size, self._size, 3), dtype=np.int64)
+        obs[..., 0] = self._wall[env_id]
+        obs[n, self._target[env_id, 0], self._target[env_id, 1], 1] = 1
+        obs[n, self._loc[env_id, 0], self._loc[env_id, 1], 2] = 1
+        return obs
+
+    def step(self, env_id: np.ndarray, action: np.ndarray) -> BaseEnvTimestep:
+        action = np.asarray(action).reshape(-1)
+        loc = np.clip(self._loc[env_id] + self.moves[action], 0, self._size - 1)
+        blocked = self._wall[env_id, loc[:, 0], loc[:, 1]] == 1
+        loc[blocked] = self._loc[env_id][blocked]
+        self._loc[env_id] = loc
+        self._step[env_id] += 1
+        arrive = (loc == self._target[env_id]).all(axis=1)
+        reward = arrive.astype(np.int64)
+        done = arrive | (self._step[env_id] > 100)
+        info = [{'final_eval_reward': r, 'eval_episode_return': r} if d else {} for d, r in zip(done, reward.tolist())]
+        return BaseEnvTimestep(self._get_obs(env_id), reward, done, info)
+
+
 def get_value_map(env):
     """Returns [W, W, A] one-hot VI actions."""
     target_location = env.target_location
@@ -26,3 +26,28 @@ class TestMazeEnv:
             if timestep.done:
                 env.reset()
         env.close()
+
+    def test_maze_vector_env(self):
+        env_num = 4
+        envs = [Maze(EasyDict({'size': 16})) for _ in range(env_num)]
+        for i, env in enumerate(envs):
+            env.seed(314 + i)
+        vector_env = envs[0].create_vector_env(env_num)
+        vector_env.seed([314 + i for i in range(env_num)])
+        env_id = np.arange(env_num)
+        obs = vector_env.reset(env_id)
+        assert obs.shape == (env_num, 16, 16, 3)
+        for i, env in enumerate(envs):
+            assert np.array_equal(env.reset(), obs[i])
+        for _ in range(250):
+            action = np.random.randint(0, 4, size=(env_num, ))
+            timestep = vector_env.step(env_id, action)
+            for i, env in enumerate(envs):
+                expected = env.step(action[i:i + 1])
+                assert np.array_equal(timestep.obs[i], expected.obs)
+                assert timestep.reward[i] == expected.reward and timestep.done[i] == expected.done
+                assert timestep.info[i] == expected.info
+            done_id = env_id[timestep.done]
+            obs = vector_env.reset(done_id)
+            for k, i in enumerate(done_id):
+                assert np.array_equal(envs[i].reset(), obs[k])
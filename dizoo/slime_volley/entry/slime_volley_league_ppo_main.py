@@ -4,6 +4,7 @@ import numpy as np
 import copy
 import shutil
 import torch
+from typing import Optional
 from tensorboardX import SummaryWriter
 from functools import partial
 from easydict import EasyDict
@@ -21,9 +22,9 @@ from dizoo.slime_volley.config.slime_volley_league_ppo_config import main_config
 
 class MyLeague(BaseLeague):
     # override
-    def _get_job_info(self, player: ActivePlayer, eval_flag: bool = False) -> dict:
+    def _get_job_info(self, player: ActivePlayer, eval_flag: bool = False, job: Optional[dict] = None) -> dict:
         assert isinstance(player, ActivePlayer), player.__class__
-        player_job_info = EasyDict(player.get_job(eval_flag))
+        player_job_info = EasyDict(player.get_job(eval_flag) if job is None else job)
         return {
             'agent_num': 2,
             'launch_player': player.player_id,